@@ -10,7 +10,17 @@ __version__ = "0.1.0"
 Core functionality for the Notegold package.
 """
 
-# Import commonly used modules to make them available via src.*
-from . import models
-from . import processors
-from . import utils 
+import importlib
+
+# Subpackages available as src.*, imported on first access (PEP 562) so
+# CLI startup only pays for the modules a command actually uses
+_SUBPACKAGES = ("models", "processors", "utils")
+
+def __getattr__(name):
+    if name in _SUBPACKAGES:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(list(globals()) + list(_SUBPACKAGES))
+
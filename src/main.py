@@ -6,16 +6,9 @@ import argparse
 import time
 from datetime import datetime
 
-from src.utils.file_utils import (
-    setup_meeting_directory,
-    save_json,
-    load_text
-)
-from src.utils.graph_utils import (
-    load_graph,
-    create_default_graph,
-    execute_graph
-)
+# Only light modules are imported here; each command imports the graph
+# engine and its utilities when it runs, so --help and argument errors are fast
+from src.utils.deadline_utils import DeadlineExceeded, RunCancelled
 
 def parse_arguments():
     parser = argparse.ArgumentParser(description="Process meeting notes")
@@ -26,7 +19,9 @@ def parse_arguments():
     
     return parser.parse_args()
 
-def process_meeting_notes(meeting_notes_path, meeting_id=None, graph_path=None, output_dir='.'):
+def process_meeting_notes(meeting_notes_path, meeting_id=None, graph_path=None, output_dir='.', max_parallelism=None,
+                          force=False, force_nodes=None, dry_run=False, resume=False,
+                          from_node=None, until_node=None, only=None, timeout=None, node_timeout=None):
     """
     Process meeting notes through the content flywheel.
     
@@ -35,10 +30,23 @@ def process_meeting_notes(meeting_notes_path, meeting_id=None, graph_path=None,
         meeting_id: Meeting ID (defaults to filename if not provided)
         graph_path: Path to the processing graph (defaults to built-in graph)
         output_dir: Output directory (defaults to current directory)
+        max_parallelism: Maximum graph nodes running at once (defaults to NOTEGOLD_GRAPH_PARALLELISM or 4)
+        force: Re-run every node, even those whose inputs are unchanged since their last run
+        force_nodes: IDs of nodes to re-run even if their inputs are unchanged
+        dry_run: Only report which nodes would run, without running them
+        resume: Continue the meeting's last run from its first unfinished node
+        from_node: Run only this node and the nodes downstream of it
+        until_node: Run only this node and the nodes upstream of it
+        only: Run only these node IDs; inputs from skipped nodes are read from existing artifacts
+        timeout: Seconds the whole run may take (overrides the graph's timeout)
+        node_timeout: Seconds each node may take, for nodes without their own timeout
     
     Returns:
         Dictionary with processing results
     """
+    from src.utils.file_utils import setup_meeting_directory, save_json, load_text
+    from src.utils.graph_utils import load_execution_plan, execute_graph, plan_graph, save_graph
+    
     # Setup directory structure
     directories = setup_meeting_directory(meeting_notes_path, meeting_id, output_dir)
     
@@ -49,11 +57,9 @@ def process_meeting_notes(meeting_notes_path, meeting_id=None, graph_path=None,
     # Load the meeting notes
     meeting_notes = load_text(directories["meeting_notes_path"])
     
-    # Load or create the processing graph
-    if graph_path:
-        graph = load_graph(graph_path)
-    else:
-        graph = create_default_graph()
+    # Load or create the processing graph, compiled once per graph file version
+    plan = load_execution_plan(graph_path)
+    graph = plan.graph
     
     # Prepare initial context
     context = {
@@ -65,9 +71,25 @@ def process_meeting_notes(meeting_notes_path, meeting_id=None, graph_path=None,
         "meeting_id": directories["meeting_id"]
     }
     
+    # Report what would run without running anything
+    if dry_run:
+        steps = plan_graph(plan, context, force, force_nodes or [], from_node, until_node, only)
+        print("\nExecution plan:")
+        for step in steps:
+            print(f"  {step['action']:<5} {step['node_id']:<24} {step['reason']}")
+        return {
+            "status": "dry_run",
+            "meeting_id": directories["meeting_id"],
+            "plan": steps
+        }
+    
+    # Keep the graph with the meeting so the run can be resumed with it
+    save_graph(graph, os.path.join(directories["metadata_dir"], "processing_graph.json"))
+    
     # Execute the graph
     try:
-        result_context = execute_graph(graph, context)
+        result_context = execute_graph(plan, context, max_parallelism, force, force_nodes or [], resume,
+                                       from_node, until_node, only, timeout, node_timeout)
         
         # Add metadata about the run
         metadata = {
@@ -114,10 +136,189 @@ def process_meeting_notes(meeting_notes_path, meeting_id=None, graph_path=None,
         # Print error message
         end_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         print(f"[{end_time}] ❌ Error processing meeting notes: {str(e)}")
+        if isinstance(e, (DeadlineExceeded, RunCancelled)):
+            print(f"Completed work was checkpointed; continue with: notegold resume {directories['meeting_id']}")
         
         # Re-raise the exception
         raise e
 
+def run_resume(meeting_id, output_dir='.', max_parallelism=None, timeout=None, node_timeout=None):
+    """
+    Resume a meeting's failed run from its checkpoint.
+    
+    Args:
+        meeting_id: ID of the meeting to resume
+        output_dir: Output directory the meeting was processed in
+        max_parallelism: Maximum graph nodes running at once
+        timeout: Seconds the resumed run may take
+        node_timeout: Seconds each node may take, for nodes without their own timeout
+    
+    Returns:
+        Dictionary with processing results
+    """
+    meeting_dir = os.path.join(output_dir, "meetings", meeting_id)
+    notes_dir = os.path.join(meeting_dir, "notes")
+    if not os.path.isdir(notes_dir) or not os.listdir(notes_dir):
+        raise ValueError(f"No meeting notes found for meeting: {meeting_id}")
+    meeting_notes_path = os.path.join(notes_dir, sorted(os.listdir(notes_dir))[0])
+    
+    # Resume with the graph the run started with, if it was saved
+    graph_path = os.path.join(meeting_dir, "metadata", "processing_graph.json")
+    
+    return process_meeting_notes(
+        meeting_notes_path,
+        meeting_id=meeting_id,
+        graph_path=graph_path if os.path.exists(graph_path) else None,
+        output_dir=output_dir,
+        max_parallelism=max_parallelism,
+        resume=True,
+        timeout=timeout,
+        node_timeout=node_timeout
+    )
+
+def run_batch(source, output_dir='.', graph_path=None, max_parallelism=None, max_meetings=None,
+              fail_fast=False, force=False, timeout=None, node_timeout=None):
+    """
+    Process every meeting notes file in a directory or glob in this process.
+    
+    Args:
+        source: Directory of notes files, or a glob pattern
+        output_dir: Output directory
+        graph_path: Path to the processing graph (defaults to built-in graph)
+        max_parallelism: Maximum graph nodes running at once across all meetings
+        max_meetings: Maximum meetings in progress at once
+        fail_fast: Stop the batch after the first failed meeting
+        force: Re-run every node, even those whose inputs are unchanged since their last run
+        timeout: Seconds the whole batch may take
+        node_timeout: Seconds each node may take, for nodes without their own timeout
+    
+    Returns:
+        Batch report dictionary
+    """
+    from src.utils import batch_utils
+    from src.utils.graph_utils import load_execution_plan
+    
+    notes_paths = batch_utils.find_notes_files(source)
+    plan = load_execution_plan(graph_path)
+    report = batch_utils.run_batch(
+        notes_paths,
+        plan,
+        output_dir=output_dir,
+        max_parallelism=max_parallelism,
+        max_meetings=max_meetings,
+        continue_on_error=not fail_fast,
+        force=force,
+        timeout=timeout,
+        node_timeout=node_timeout
+    )
+    
+    counts = report["counts"]
+    print(f"\nBatch complete in {report['wall_time_s']}s: {counts['success']} succeeded, {counts['error']} failed, "
+          f"{counts['cancelled']} cancelled, {counts['skipped']} skipped")
+    print(f"  Report: {os.path.join(output_dir, 'batch_report.md')}")
+    return report
+
+def run_watch(directory, output_dir='.', graph_path=None, max_parallelism=None, max_meetings=None,
+              settle_seconds=None, polling=False, poll_interval=None, node_timeout=None):
+    """
+    Process meeting notes as they are dropped into a directory, until stopped.
+    
+    Args:
+        directory: Directory to watch
+        output_dir: Output directory
+        graph_path: Path to the processing graph (defaults to built-in graph)
+        max_parallelism: Maximum graph nodes running at once across all meetings
+        max_meetings: Maximum meetings in progress at once
+        settle_seconds: Seconds a file must stay unchanged before it is processed
+        polling: Poll the directory instead of using inotify
+        poll_interval: Seconds between scans when polling
+        node_timeout: Seconds each node may take, for nodes without their own timeout
+    
+    Returns:
+        Counts of meetings that succeeded and failed
+    """
+    from src.utils import watch_utils
+    from src.utils.graph_utils import load_execution_plan
+    
+    plan = load_execution_plan(graph_path)
+    counts = watch_utils.watch_directory(
+        directory,
+        plan,
+        output_dir=output_dir,
+        max_parallelism=max_parallelism,
+        max_meetings=max_meetings,
+        settle_seconds=watch_utils.DEFAULT_SETTLE_SECONDS if settle_seconds is None else settle_seconds,
+        polling=polling,
+        poll_interval=poll_interval or watch_utils.DEFAULT_POLL_SECONDS,
+        node_timeout=node_timeout
+    )
+    print(f"Processed {counts['success']} meetings ({counts['error']} failed)")
+    return counts
+
+def run_server(host="127.0.0.1", port=8000, output_dir='.', graph_path=None, max_parallelism=None,
+               max_meetings=None, node_timeout=None):
+    """Run the local HTTP job server until interrupted."""
+    from src.utils.graph_utils import load_execution_plan
+    from src.utils.server_utils import JobServer, create_job_server
+    
+    job_server = JobServer(load_execution_plan(graph_path), output_dir, max_parallelism, max_meetings, node_timeout)
+    server = create_job_server(job_server, host, port)
+    bound_host, bound_port = server.server_address[:2]
+    counts = job_server.queue.counts()
+    print(f"Job server listening on http://{bound_host}:{bound_port} "
+          f"({job_server.max_meetings} workers, {job_server.max_parallelism} nodes; {counts['queued']} jobs queued)")
+    print(f"Submit notes with: curl --data-binary @notes.txt 'http://{bound_host}:{bound_port}/jobs?meeting_id=acme'")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print("Stopping; running jobs will be queued again on the next start")
+        server.server_close()
+        job_server.close()
+    return 0
+
+def run_query(text=None, output_dir='.', kinds=None, priority=None, min_score=None, since=None, until=None,
+              meeting_id=None, limit=20, as_json=False):
+    """Search the meeting catalog and print the results."""
+    import os
+    import json
+    import time
+    from src.utils.catalog_utils import search_catalog
+    
+    start_time = time.perf_counter()
+    results = search_catalog(os.path.join(output_dir, "meetings"), text, kinds, priority, min_score,
+                             since, until, meeting_id, limit)
+    elapsed_ms = (time.perf_counter() - start_time) * 1000
+    
+    if as_json:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+        return results
+    for result in results:
+        score = f" [{result['priority']}, {result['value_score']:g}]" if result["value_score"] is not None else ""
+        print(f"{result['date']}  {result['meeting_id']}  {result['kind']}: {result['title']}{score}")
+        print(f"    {' '.join(result['snippet'].split())}")
+    print(f"{len(results)} results in {elapsed_ms:.1f}ms")
+    return results
+
+def run_catalog(action, output_dir='.'):
+    """Rebuild the meeting catalog or show what it holds."""
+    import os
+    import time
+    from src.utils.catalog_utils import catalog_stats, rebuild_catalog
+    
+    meetings_dir = os.path.join(output_dir, "meetings")
+    if not os.path.isdir(meetings_dir):
+        raise ValueError(f"No meetings directory in {output_dir}")
+    if action == "rebuild":
+        start_time = time.perf_counter()
+        count = rebuild_catalog(meetings_dir)
+        print(f"Indexed {count} meetings in {time.perf_counter() - start_time:.2f}s")
+    stats = catalog_stats(meetings_dir)
+    print(f"Catalog: {stats['meetings']} meetings, {stats['topics']} topics, "
+          f"{stats['aida']} AIDA contents, {stats['social_posts']} social posts")
+    return stats
+
 def interactive_start():
     """Interactive version of the command to walk users through the process."""
     import os
@@ -140,7 +341,7 @@ def interactive_start():
     
     # Call the main processing function
     try:
-        return process_meeting_notes(
+        process_meeting_notes(
             meeting_notes_path=meeting_notes_path,
             meeting_id=meeting_id,
             graph_path=None,  # Use default graph
@@ -149,6 +350,99 @@ def interactive_start():
     except Exception as e:
         print(f"Error processing meeting notes: {e}")
         return 1
+    return 0
+
+def run_fake_llm_server(host="127.0.0.1", port=8765, config_path=None):
+    """Run a local fake LLM server speaking the OpenAI chat completions protocol."""
+    from src.utils.fake_llm_utils import create_fake_llm_server, load_fake_llm_config
+    
+    server = create_fake_llm_server(host, port, load_fake_llm_config(config_path))
+    bound_host, bound_port = server.server_address[:2]
+    print(f"Fake LLM server listening on http://{bound_host}:{bound_port}/v1")
+    print(f"Use it with: LLM_PROVIDER=openai OPENAI_API_KEY=fake OPENAI_BASE_URL=http://{bound_host}:{bound_port}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+def run_benchmark(meeting_notes_path, runs=5, output_dir=None, graph_path=None, fake=False, fake_config_path=None, use_cache=False, max_parallelism=None):
+    """
+    Process the same meeting notes several times and report latency percentiles.
+    
+    Args:
+        meeting_notes_path: Path to the meeting notes file
+        runs: Number of pipeline runs
+        output_dir: Directory for benchmark meetings (defaults to a temporary directory)
+        graph_path: Path to the processing graph (defaults to built-in graph)
+        fake: Use the in-process fake LLM instead of the configured provider
+        fake_config_path: Fake LLM config file
+        use_cache: Keep the completion cache enabled (disabled by default so every run calls the LLM)
+        max_parallelism: Maximum graph nodes running at once
+    
+    Returns:
+        Benchmark report dictionary
+    """
+    import tempfile
+    from src.utils.file_utils import load_json, save_json
+    from src.utils.metrics_utils import summarize_latencies
+    
+    if fake:
+        os.environ["LLM_PROVIDER"] = "fake"
+    if fake_config_path:
+        os.environ["NOTEGOLD_FAKE_LLM_CONFIG"] = fake_config_path
+    if not use_cache:
+        os.environ["NOTEGOLD_CACHE"] = "0"
+    
+    output_dir = output_dir or tempfile.mkdtemp(prefix="notegold_bench_")
+    run_times_ms = []
+    stage_times_ms = {}
+    node_tokens = {}
+    
+    bench_start = time.time()
+    for run in range(runs):
+        run_start = time.time()
+        result = process_meeting_notes(
+            meeting_notes_path,
+            meeting_id=f"bench_{run + 1}",
+            graph_path=graph_path,
+            output_dir=output_dir,
+            max_parallelism=max_parallelism
+        )
+        run_times_ms.append((time.time() - run_start) * 1000)
+        
+        # Collect per-stage latencies and per-node token usage from the run's process log
+        logs_dir = result["artifacts"]["logs_dir"]
+        process_log = load_json(os.path.join(logs_dir, "process_log.json"))
+        for entry in process_log["log_entries"]:
+            stage_times_ms.setdefault(entry["target"], []).append(entry["execution_time_ms"])
+        for node_id, metrics in (process_log.get("node_metrics") or {}).items():
+            node_tokens.setdefault(node_id, []).append(metrics.get("prompt_tokens", 0) + metrics.get("completion_tokens", 0))
+    bench_time = time.time() - bench_start
+    
+    report = {
+        "meeting_notes_path": meeting_notes_path,
+        "provider": os.environ.get("LLM_PROVIDER", "openai"),
+        "runs": runs,
+        "throughput_runs_per_minute": round(runs / bench_time * 60, 2) if bench_time else 0.0,
+        "run_ms": summarize_latencies(run_times_ms),
+        "stages_ms": {stage: summarize_latencies(times) for stage, times in stage_times_ms.items()},
+        "node_tokens": {node_id: summarize_latencies(tokens) for node_id, tokens in node_tokens.items()}
+    }
+    
+    report_path = os.path.join(output_dir, "bench_report.json")
+    save_json(report, report_path)
+    
+    print("\nBenchmark Results:")
+    print(f"  Runs: {runs} ({report['throughput_runs_per_minute']} runs/min)")
+    print(f"  {'stage':<24}{'p50':>10}{'p95':>10}{'p99':>10}")
+    for stage, stats in [("total", report["run_ms"])] + list(report["stages_ms"].items()):
+        print(f"  {stage:<24}{stats['p50']:>10.0f}{stats['p95']:>10.0f}{stats['p99']:>10.0f}")
+    print(f"  Report: {report_path}")
+    
+    return report
 
 def main():
     parser = argparse.ArgumentParser(description="Process meeting notes")
@@ -162,25 +456,202 @@ def main():
     process_parser.add_argument("--meeting-id", help="Meeting ID (defaults to filename if not provided)")
     process_parser.add_argument("--graph-path", help="Path to the processing graph")
     process_parser.add_argument("--output-dir", default=".", help="Output directory")
+    process_parser.add_argument("--max-parallelism", type=int, help="Maximum graph nodes running at once")
+    process_parser.add_argument("--force", action="store_true", help="Re-run every node, even if it is up to date")
+    process_parser.add_argument("--force-node", action="append", default=[], dest="force_nodes",
+                                help="Re-run this node even if it is up to date (repeatable)")
+    process_parser.add_argument("--dry-run", action="store_true", help="Show which nodes would run, without running them")
+    process_parser.add_argument("--resume", action="store_true", help="Continue the meeting's last run from its first unfinished node")
+    process_parser.add_argument("--from-node", help="Run only this node and the nodes downstream of it")
+    process_parser.add_argument("--until-node", help="Run only this node and the nodes upstream of it")
+    process_parser.add_argument("--only", action="append", default=[],
+                                help="Run only these nodes (comma-separated or repeatable); other inputs come from existing artifacts")
+    process_parser.add_argument("--timeout", type=float, help="Seconds the whole run may take (overrides the graph's timeout)")
+    process_parser.add_argument("--node-timeout", type=float, help="Seconds each node may take, for nodes without their own timeout")
+    
+    # "resume" command - continue a failed run from its checkpoint
+    resume_parser = subparsers.add_parser("resume", help="Resume a failed run of a meeting")
+    resume_parser.add_argument("meeting_id", help="ID of the meeting to resume")
+    resume_parser.add_argument("--output-dir", default=".", help="Output directory the meeting was processed in")
+    resume_parser.add_argument("--max-parallelism", type=int, help="Maximum graph nodes running at once")
+    resume_parser.add_argument("--timeout", type=float, help="Seconds the resumed run may take")
+    resume_parser.add_argument("--node-timeout", type=float, help="Seconds each node may take, for nodes without their own timeout")
+    
+    # "batch" command - many meetings concurrently in one process
+    batch_parser = subparsers.add_parser("batch", help="Process a directory of meeting notes concurrently")
+    batch_parser.add_argument("source", help="Directory of meeting notes files, or a glob pattern (quote it)")
+    batch_parser.add_argument("--output-dir", default=".", help="Output directory")
+    batch_parser.add_argument("--graph-path", help="Path to the processing graph")
+    batch_parser.add_argument("--max-parallelism", type=int, help="Maximum graph nodes running at once across all meetings")
+    batch_parser.add_argument("--max-meetings", type=int, help="Maximum meetings in progress at once (defaults to --max-parallelism)")
+    batch_parser.add_argument("--fail-fast", action="store_true", help="Stop the batch after the first failed meeting")
+    batch_parser.add_argument("--force", action="store_true", help="Re-run every node, even if it is up to date")
+    batch_parser.add_argument("--timeout", type=float, help="Seconds the whole batch may take")
+    batch_parser.add_argument("--node-timeout", type=float, help="Seconds each node may take, for nodes without their own timeout")
+    
+    # "watch" command - process notes as they are dropped into a directory
+    watch_parser = subparsers.add_parser("watch", help="Process meeting notes as they appear in a directory")
+    watch_parser.add_argument("directory", help="Directory to watch for meeting notes files")
+    watch_parser.add_argument("--output-dir", default=".", help="Output directory")
+    watch_parser.add_argument("--graph-path", help="Path to the processing graph")
+    watch_parser.add_argument("--max-parallelism", type=int, help="Maximum graph nodes running at once across all meetings")
+    watch_parser.add_argument("--max-meetings", type=int, help="Maximum meetings in progress at once (defaults to --max-parallelism)")
+    watch_parser.add_argument("--settle-seconds", type=float, help="Seconds a file must stay unchanged before it is processed (default 2)")
+    watch_parser.add_argument("--polling", action="store_true", help="Poll the directory instead of using inotify")
+    watch_parser.add_argument("--poll-interval", type=float, help="Seconds between directory scans when polling (default 2)")
+    watch_parser.add_argument("--node-timeout", type=float, help="Seconds each node may take, for nodes without their own timeout")
+    
+    # "serve" command - local HTTP job server with a warm worker pool
+    serve_parser = subparsers.add_parser("serve", help="Run a local HTTP job server for submitting meeting notes")
+    serve_parser.add_argument("--host", default="127.0.0.1", help="Host to bind")
+    serve_parser.add_argument("--port", type=int, default=8000, help="Port to bind")
+    serve_parser.add_argument("--output-dir", default=".", help="Output directory")
+    serve_parser.add_argument("--graph-path", help="Path to the processing graph")
+    serve_parser.add_argument("--max-parallelism", type=int, help="Maximum graph nodes running at once across all jobs")
+    serve_parser.add_argument("--max-meetings", type=int, help="Jobs processed at once (defaults to --max-parallelism)")
+    serve_parser.add_argument("--node-timeout", type=float, help="Seconds each node may take, for nodes without their own timeout")
+    
+    # "query" command - search the meeting catalog
+    query_parser = subparsers.add_parser("query", help="Search processed meetings, topics, AIDA content and social posts")
+    query_parser.add_argument("text", nargs="?", help="Words that must all appear (end a word with * to match prefixes)")
+    query_parser.add_argument("--output-dir", default=".", help="Output directory the meetings were processed in")
+    query_parser.add_argument("--kind", action="append", choices=["meeting", "topic", "aida", "social"], dest="kinds",
+                              help="Only this kind of result (repeatable)")
+    query_parser.add_argument("--priority", help="Only topics with this priority, and their content (e.g. High)")
+    query_parser.add_argument("--min-score", type=float, help="Only topics with at least this Value Equation score, and their content")
+    query_parser.add_argument("--since", help="Only meetings on or after this date (YYYY-MM-DD)")
+    query_parser.add_argument("--until", help="Only meetings on or before this date (YYYY-MM-DD)")
+    query_parser.add_argument("--meeting-id", help="Only this meeting")
+    query_parser.add_argument("--limit", type=int, default=20, help="Maximum results")
+    query_parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    
+    # "catalog" command - maintain the meeting catalog
+    catalog_parser = subparsers.add_parser("catalog", help="Rebuild the meeting catalog or show what it holds")
+    catalog_parser.add_argument("action", choices=["rebuild", "stats"], help="Rebuild from the meeting directories, or count what is indexed")
+    catalog_parser.add_argument("--output-dir", default=".", help="Output directory the meetings were processed in")
     
     # "start" command - simplified interactive version
     subparsers.add_parser("start", help="Interactive guided setup")
     
+    # "fake-llm-server" command - local OpenAI-compatible stand-in for benchmarking
+    fake_server_parser = subparsers.add_parser("fake-llm-server", help="Run a local fake LLM server for offline benchmarking")
+    fake_server_parser.add_argument("--host", default="127.0.0.1", help="Host to bind")
+    fake_server_parser.add_argument("--port", type=int, default=8765, help="Port to bind")
+    fake_server_parser.add_argument("--config", help="Fake LLM config JSON (latency, error rate, canned responses)")
+    
+    # "bench" command - repeated runs with latency percentiles
+    bench_parser = subparsers.add_parser("bench", help="Benchmark the pipeline on meeting notes")
+    bench_parser.add_argument("meeting_notes_path", help="Path to the meeting notes file")
+    bench_parser.add_argument("--runs", type=int, default=5, help="Number of pipeline runs")
+    bench_parser.add_argument("--output-dir", help="Directory for benchmark output (defaults to a temporary directory)")
+    bench_parser.add_argument("--graph-path", help="Path to the processing graph")
+    bench_parser.add_argument("--fake", action="store_true", help="Use the in-process fake LLM")
+    bench_parser.add_argument("--fake-config", help="Fake LLM config JSON")
+    bench_parser.add_argument("--use-cache", action="store_true", help="Keep the completion cache enabled")
+    bench_parser.add_argument("--max-parallelism", type=int, help="Maximum graph nodes running at once")
+    
     args = parser.parse_args()
     
     if args.command == "start":
         return interactive_start()
+    elif args.command == "serve":
+        return run_server(args.host, args.port, args.output_dir, args.graph_path, args.max_parallelism,
+                          args.max_meetings, args.node_timeout)
+    elif args.command in ("query", "catalog"):
+        try:
+            if args.command == "query":
+                run_query(args.text, args.output_dir, args.kinds, args.priority, args.min_score, args.since,
+                          args.until, args.meeting_id, args.limit, args.json)
+            else:
+                run_catalog(args.action, args.output_dir)
+        except Exception as e:
+            print(f"Error {'searching' if args.command == 'query' else 'updating'} the catalog: {e}")
+            return 1
+        return 0
+    elif args.command == "fake-llm-server":
+        return run_fake_llm_server(args.host, args.port, args.config)
+    elif args.command == "bench":
+        run_benchmark(
+            args.meeting_notes_path,
+            runs=args.runs,
+            output_dir=args.output_dir,
+            graph_path=args.graph_path,
+            fake=args.fake,
+            fake_config_path=args.fake_config,
+            use_cache=args.use_cache,
+            max_parallelism=args.max_parallelism
+        )
+        return 0
     elif args.command == "process":
+        # The run's results are in the meeting directory; only its status is returned
         try:
-            return process_meeting_notes(
+            process_meeting_notes(
                 meeting_notes_path=args.meeting_notes_path,
                 meeting_id=args.meeting_id,
                 graph_path=args.graph_path,
-                output_dir=args.output_dir
+                output_dir=args.output_dir,
+                max_parallelism=args.max_parallelism,
+                force=args.force,
+                force_nodes=args.force_nodes,
+                dry_run=args.dry_run,
+                resume=args.resume,
+                from_node=args.from_node,
+                until_node=args.until_node,
+                only=[node_id.strip() for value in args.only for node_id in value.split(",") if node_id.strip()],
+                timeout=args.timeout,
+                node_timeout=args.node_timeout
             )
+        except RunCancelled:
+            return 130
         except Exception as e:
             print(f"Error processing meeting notes: {e}")
             return 1
+        return 0
+    elif args.command == "batch":
+        try:
+            report = run_batch(
+                args.source,
+                output_dir=args.output_dir,
+                graph_path=args.graph_path,
+                max_parallelism=args.max_parallelism,
+                max_meetings=args.max_meetings,
+                fail_fast=args.fail_fast,
+                force=args.force,
+                timeout=args.timeout,
+                node_timeout=args.node_timeout
+            )
+        except RunCancelled:
+            return 130
+        except Exception as e:
+            print(f"Error processing batch: {e}")
+            return 1
+        return 0 if report["counts"]["success"] == report["meetings"] else 1
+    elif args.command == "watch":
+        try:
+            run_watch(
+                args.directory,
+                output_dir=args.output_dir,
+                graph_path=args.graph_path,
+                max_parallelism=args.max_parallelism,
+                max_meetings=args.max_meetings,
+                settle_seconds=args.settle_seconds,
+                polling=args.polling,
+                poll_interval=args.poll_interval,
+                node_timeout=args.node_timeout
+            )
+        except Exception as e:
+            print(f"Error watching directory: {e}")
+            return 1
+        return 0
+    elif args.command == "resume":
+        try:
+            run_resume(args.meeting_id, args.output_dir, args.max_parallelism, args.timeout, args.node_timeout)
+        except RunCancelled:
+            return 130
+        except Exception as e:
+            print(f"Error resuming meeting: {e}")
+            return 1
+        return 0
     else:
         # Default to showing help if no command specified
         parser.print_help()
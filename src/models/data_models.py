@@ -14,6 +14,20 @@ class MeetingMetadata:
     extraction_date: str = field(default_factory=lambda: datetime.now().strftime("%Y-%m-%d"))
     meeting_notes_path: str = ""
 
+@dataclass
+class ExtractedMetadata:
+    """Metadata the LLM extracts from a meeting transcript."""
+    meeting_title: str = ""
+    meeting_date: str = ""  # YYYY-MM-DD or empty
+    attendees: List[str] = field(default_factory=list)
+    client_name: str = ""
+    primary_contact: str = ""
+    project_name: str = ""
+    main_topics: List[str] = field(default_factory=list)
+    pain_points: List[str] = field(default_factory=list)
+    requested_deliverables: List[str] = field(default_factory=list)
+    next_steps: List[str] = field(default_factory=list)
+
 @dataclass
 class TopicIdea:
     title: str
@@ -66,6 +80,10 @@ class ProcessingNode:
     input_artifacts: List[str] = field(default_factory=list)
     output_artifacts: List[str] = field(default_factory=list)
     parameters: Dict[str, any] = field(default_factory=dict)
+    map_over: str = ""         # List artifact to run the processor on item by item
+    map_limit: int = 0         # Only map over the first map_limit items (0 for all)
+    reduce_function: str = ""  # Function combining the per-item results of a map node
+    timeout: float = 0         # Seconds the node may run before it fails (0 for no limit)
 
 @dataclass
 class ProcessingEdge:
@@ -80,4 +98,5 @@ class ProcessingGraph:
     nodes: List[ProcessingNode] = field(default_factory=list)
     edges: List[ProcessingEdge] = field(default_factory=list)
     name: str = "Default Graph"
-    description: str = "" 
\ No newline at end of file
+    description: str = ""
+    timeout: float = 0  # Seconds a run of the whole graph may take (0 for no limit) 
\ No newline at end of file
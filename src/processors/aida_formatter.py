@@ -1,45 +1,152 @@
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple, Union
 import os
 import re
+import time
+import functools
 from src.models.data_models import AIDAContent
-from src.utils.llm_utils import chat_completion
-from src.utils.file_utils import load_json, save_json
+from src.utils.llm_utils import run_with_concurrency, stream_completion_to_file
+from src.utils.artifact_utils import load_artifact, save_artifact
+from src.utils.similarity_utils import TopicIndex, find_duplicate_topic, get_topic_index
 
-def apply_aida_format(ranked_topics_path: str, artifacts_dir: str, outputs_dir: str, top_n: int = 3) -> Dict[str, Any]:
+AIDA_SECTIONS = {
+    "Attention": "attention",
+    "Interest": "interest",
+    "Desire": "desire",
+    "Action": "action",
+    "Full Content": "full_content"
+}
+
+SECTION_HEADING_PATTERN = re.compile(r'^\s*#+\s*(Attention|Interest|Desire|Action|Full Content)[:\s]*(.*)$')
+
+class AIDASectionParser:
+    """
+    Incrementally splits a streamed AIDA response into its sections.
+    
+    Text is fed in arbitrary chunks and parsed line by line as it arrives,
+    so sections are available as soon as the response is complete.
+    """
+    
+    def __init__(self):
+        """Initialize the parser with no sections seen."""
+        self.sections: Dict[str, list] = {}
+        self.current_section: Optional[str] = None
+        self._partial_line = ""
+    
+    def feed(self, chunk: str) -> None:
+        """
+        Parse the complete lines in a chunk of streamed text.
+        
+        Args:
+            chunk: Next piece of the response
+        """
+        lines = (self._partial_line + chunk).split("\n")
+        self._partial_line = lines.pop()
+        for line in lines:
+            self._parse_line(line)
+    
+    def close(self) -> Dict[str, str]:
+        """
+        Finish parsing and return the section texts.
+        
+        Returns:
+            Dictionary mapping AIDAContent field names to section text
+        """
+        if self._partial_line:
+            self._parse_line(self._partial_line)
+            self._partial_line = ""
+        
+        return {
+            AIDA_SECTIONS[name]: "\n".join(lines).strip()
+            for name, lines in self.sections.items()
+        }
+    
+    def _parse_line(self, line: str) -> None:
+        heading_match = SECTION_HEADING_PATTERN.match(line)
+        
+        # Only the first heading for each section starts it; repeats stay in the current section
+        if heading_match and heading_match.group(1) not in self.sections:
+            self.current_section = heading_match.group(1)
+            self.sections[self.current_section] = [heading_match.group(2)]
+        elif self.current_section:
+            self.sections[self.current_section].append(line)
+
+AIDA_SYSTEM_MESSAGE = """
+        You are an expert content strategist who specializes in the AIDA framework:
+        - Attention: Grab interest with a hook that speaks directly to a pain point
+        - Interest: Build credibility with relevant insights and information
+        - Desire: Create a vivid picture of the outcome readers want
+        - Action: Provide a clear next step
+        
+        Format your response with clear sections for each AIDA component, followed by a combined full version.
+        """
+
+def apply_aida_format(
+    ranked_topics_path: Union[str, List[Dict[str, Any]]],
+    artifacts_dir: str,
+    outputs_dir: str,
+    top_n: int = 3,
+    max_concurrency: Optional[int] = None
+) -> Dict[str, Any]:
     """
     Apply AIDA format to top-ranked topics.
     
+    The default graph runs format_topic as a map node instead, so that
+    social content for a topic can start as soon as its AIDA content is done.
+    
     Args:
-        ranked_topics_path: Path to ranked topics JSON
+        ranked_topics_path: Path to ranked topics JSON, or the ranked topics themselves
         artifacts_dir: Directory to save artifacts
         outputs_dir: Directory to save outputs
         top_n: Number of top topics to format
+        max_concurrency: Maximum concurrent LLM calls (defaults to NOTEGOLD_LLM_CONCURRENCY)
         
     Returns:
-        Dictionary with AIDA content and output paths
+        Dictionary with AIDA content, output paths, per-output streaming timings
+        and the artifacts of other meetings the content came from
     """
     # Load ranked topics
-    ranked_topics = load_json(ranked_topics_path)
+    ranked_topics = load_artifact(ranked_topics_path)
     
     # Take top N topics
     top_topics = ranked_topics[:top_n]
     
-    aida_contents = []
-    output_paths = []
+    # Stream AIDA content for all topics concurrently, collecting results in topic order
+    tasks = [functools.partial(format_topic, topic, outputs_dir) for topic in top_topics]
+    results = run_with_concurrency(tasks, max_concurrency)
     
-    for topic in top_topics:
-        # Create prompt for AIDA formatting
-        system_message = """
-        You are an expert content strategist who specializes in the AIDA framework:
-        - Attention: Grab interest with a hook that speaks directly to a pain point
-        - Interest: Build credibility with relevant insights and information
-        - Desire: Create a vivid picture of the outcome readers want
-        - Action: Provide a clear next step
-        
-        Format your response with clear sections for each AIDA component, followed by a combined full version.
-        """
+    return collect_aida_content(results, artifacts_dir)
+
+def format_topic(
+    topic: Dict[str, Any],
+    outputs_dir: str,
+    dedup: Optional[str] = None,
+    dedup_threshold: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Apply AIDA format to one ranked topic.
+    
+    If another meeting already has AIDA content for a near-duplicate topic,
+    it is linked from the new content ("link"), or reused instead of
+    generating it again ("reuse"); see similarity_utils. Reused content
+    lists the other meeting's artifacts under dependency_paths, so a
+    recorded run of the node is redone when they change (see NodeRunStore).
+    Linked content is generated afresh and doesn't depend on them.
+    
+    Args:
+        topic: Ranked topic dictionary
+        outputs_dir: Directory to save outputs
+        dedup: "link", "reuse" or "off" (defaults to NOTEGOLD_TOPIC_DEDUP, then "link")
+        dedup_threshold: Similarity above which topics are duplicates (defaults to NOTEGOLD_TOPIC_DEDUP_THRESHOLD, then 0.85)
         
-        prompt = f"""
+    Returns:
+        Dictionary with the AIDA content, its output path, streaming timings
+        and the paths of the artifacts it was reused from (none unless reused)
+    """
+    duplicate = find_duplicate_topic(topic, outputs_dir, dedup, dedup_threshold)
+    if duplicate is not None and duplicate["mode"] == "reuse":
+        return _reuse_aida_content(topic, duplicate, outputs_dir)
+    
+    prompt = f"""
         Apply the AIDA framework to this content topic:
         
         Title: {topic["title"]}
@@ -56,59 +163,151 @@ def apply_aida_format(ranked_topics_path: str, artifacts_dir: str, outputs_dir:
         
         Format your response with markdown headings for each section.
         """
+    
+    aida_content, output_path, timings = _generate_aida_content(topic, prompt, AIDA_SYSTEM_MESSAGE, outputs_dir)
+    if duplicate is not None:
+        aida_content["duplicate_of"] = duplicate
+        _write_aida_markdown(aida_content, output_path)
+        print(f"  Near-duplicate: {topic['title']} ~ {duplicate['title']} "
+              f"({duplicate['meeting_id']}, similarity {duplicate['similarity']})")
+    
+    return {
+        "aida_content": aida_content,
+        "output_path": output_path,
+        "output_timings": [timings],
+        "dependency_paths": []
+    }
+
+def collect_aida_content(results: List[Dict[str, Any]], artifacts_dir: str) -> Dict[str, Any]:
+    """
+    Save the AIDA content of every formatted topic.
+    
+    Args:
+        results: format_topic results, in topic order
+        artifacts_dir: Directory to save artifacts
         
-        # Get AIDA content using LLM
-        response = chat_completion(prompt, system_message)
-        
-        # Create AIDAContent object
-        aida_content = AIDAContent(
-            topic=topic,
-            full_content=response
-        )
-        
-        # Try to extract individual AIDA components from the response
-        attention_match = re.search(r'#+\s*Attention[:\s]+(.*?)(?=#+\s*Interest|$)', response, re.DOTALL)
-        interest_match = re.search(r'#+\s*Interest[:\s]+(.*?)(?=#+\s*Desire|$)', response, re.DOTALL)
-        desire_match = re.search(r'#+\s*Desire[:\s]+(.*?)(?=#+\s*Action|$)', response, re.DOTALL)
-        action_match = re.search(r'#+\s*Action[:\s]+(.*?)(?=#+\s*Full Content|$)', response, re.DOTALL)
-        
-        if attention_match:
-            aida_content.attention = attention_match.group(1).strip()
-        if interest_match:
-            aida_content.interest = interest_match.group(1).strip()
-        if desire_match:
-            aida_content.desire = desire_match.group(1).strip()
-        if action_match:
-            aida_content.action = action_match.group(1).strip()
-        
-        # Create clean title for filename
-        clean_title = ''.join(c if c.isalnum() else '_' for c in topic["title"])
-        
-        # Save AIDA content to markdown file in outputs directory
-        output_path = os.path.join(outputs_dir, f"aida_{clean_title}.md")
-        
-        with open(output_path, 'w') as f:
-            f.write(f"# AIDA Format: {topic['title']}\n\n")
-            f.write("## Attention\n\n")
-            f.write(f"{aida_content.attention}\n\n")
-            f.write("## Interest\n\n")
-            f.write(f"{aida_content.interest}\n\n")
-            f.write("## Desire\n\n")
-            f.write(f"{aida_content.desire}\n\n")
-            f.write("## Action\n\n")
-            f.write(f"{aida_content.action}\n\n")
-            f.write("## Full Content\n\n")
-            f.write(f"{aida_content.full_content}")
-        
-        aida_contents.append(aida_content.__dict__)
-        output_paths.append(output_path)
+    Returns:
+        Dictionary with AIDA content, output paths and per-output streaming timings
+    """
+    aida_content = [result["aida_content"] for result in results]
     
     # Save all AIDA content to JSON file in artifacts directory
     json_output_path = os.path.join(artifacts_dir, "aida_content.json")
-    save_json(aida_contents, json_output_path)
+    save_artifact(aida_content, json_output_path)
     
     return {
-        "aida_contents": aida_contents,
+        "aida_content": aida_content,
         "aida_content_path": json_output_path,
-        "output_paths": output_paths
-    } 
\ No newline at end of file
+        "output_paths": [result["output_path"] for result in results],
+        "output_timings": [timing for result in results for timing in result["output_timings"]],
+        "dependency_paths": sorted({path for result in results for path in result.get("dependency_paths", [])})
+    }
+
+def _generate_aida_content(
+    topic: Dict[str, Any],
+    prompt: str,
+    system_message: str,
+    outputs_dir: str
+) -> Tuple[Dict[str, Any], str, Dict[str, Any]]:
+    """
+    Stream AIDA content for one topic into its markdown file.
+    
+    While the response streams, the file shows the raw response as it
+    arrives. Once complete, it is rewritten with the parsed sections.
+    
+    Args:
+        topic: Ranked topic dictionary
+        prompt: AIDA prompt for the topic
+        system_message: AIDA system message
+        outputs_dir: Directory to save outputs
+        
+    Returns:
+        Tuple of the AIDA content dict, output path and streaming timings
+    """
+    # Create clean title for filename
+    clean_title = ''.join(c if c.isalnum() else '_' for c in topic["title"])
+    output_path = os.path.join(outputs_dir, f"aida_{clean_title}.md")
+    
+    # Stream the response to the output file, parsing sections as it arrives
+    parser = AIDASectionParser()
+    response, timings = stream_completion_to_file(
+        prompt,
+        system_message,
+        output_path,
+        header=f"# AIDA Format: {topic['title']}\n\n*Generating...*\n\n",
+        on_chunk=parser.feed
+    )
+    sections = parser.close()
+    
+    # Create AIDAContent object
+    aida_content = AIDAContent(
+        topic=topic,
+        attention=sections.get("attention", ""),
+        interest=sections.get("interest", ""),
+        desire=sections.get("desire", ""),
+        action=sections.get("action", ""),
+        full_content=response
+    )
+    
+    # Replace the streamed draft with the structured AIDA markdown
+    _write_aida_markdown(aida_content.__dict__, output_path)
+    
+    print(f"  Streamed: {os.path.basename(output_path)} "
+          f"(first token {timings['ttfb_ms']}ms, total {timings['total_ms']}ms)")
+    
+    return aida_content.__dict__, output_path, timings
+
+def _reuse_aida_content(topic: Dict[str, Any], duplicate: Dict[str, Any], outputs_dir: str) -> Dict[str, Any]:
+    """
+    Reuse the AIDA content of a near-duplicate topic from another meeting.
+    
+    Args:
+        topic: Ranked topic dictionary
+        duplicate: Duplicate found by find_duplicate_topic
+        outputs_dir: Directory to save outputs
+        
+    Returns:
+        Dictionary with the AIDA content, its output path, (zero) timings and dependency paths, as format_topic returns
+    """
+    start_time = time.time()
+    prior = _topic_index(outputs_dir).load_aida_content(duplicate)
+    aida_content = dict(prior, topic=topic, duplicate_of=duplicate)
+    
+    clean_title = ''.join(c if c.isalnum() else '_' for c in topic["title"])
+    output_path = os.path.join(outputs_dir, f"aida_{clean_title}.md")
+    _write_aida_markdown(aida_content, output_path)
+    
+    print(f"  Reused: {os.path.basename(output_path)} from {duplicate['meeting_id']} "
+          f"({duplicate['title']}, similarity {duplicate['similarity']})")
+    
+    elapsed_ms = int((time.time() - start_time) * 1000)
+    return {
+        "aida_content": aida_content,
+        "output_path": output_path,
+        "output_timings": [{"output_path": output_path, "ttfb_ms": elapsed_ms, "total_ms": elapsed_ms}],
+        "dependency_paths": _topic_index(outputs_dir).artifact_paths(duplicate)
+    }
+
+def _topic_index(outputs_dir: str) -> TopicIndex:
+    """Get the topic index of the meetings directory an outputs directory is in."""
+    return get_topic_index(os.path.dirname(os.path.dirname(os.path.abspath(outputs_dir))))
+
+def _write_aida_markdown(aida_content: Dict[str, Any], output_path: str) -> None:
+    """Write AIDA content as markdown, noting the meeting it was reused from, if any."""
+    topic = aida_content["topic"]
+    duplicate = aida_content.get("duplicate_of")
+    with open(output_path, 'w') as f:
+        f.write(f"# AIDA Format: {topic['title']}\n\n")
+        if duplicate:
+            verb = "Reused from" if duplicate["mode"] == "reuse" else "Similar to"
+            f.write(f"*{verb} {duplicate['meeting_id']}: {duplicate['title']} (similarity {duplicate['similarity']})*\n\n")
+        f.write("## Attention\n\n")
+        f.write(f"{aida_content['attention']}\n\n")
+        f.write("## Interest\n\n")
+        f.write(f"{aida_content['interest']}\n\n")
+        f.write("## Desire\n\n")
+        f.write(f"{aida_content['desire']}\n\n")
+        f.write("## Action\n\n")
+        f.write(f"{aida_content['action']}\n\n")
+        f.write("## Full Content\n\n")
+        f.write(f"{aida_content['full_content']}")
@@ -1,44 +1,92 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple, Union
 import os
 import json
+import time
+import functools
 from src.models.data_models import SocialMediaPost
-from src.utils.llm_utils import chat_completion, extract_json_from_response
-from src.utils.file_utils import load_json, save_json
+from src.utils.json_utils import IncrementalJSONExtractor
+from src.utils.llm_utils import parse_json_response, run_with_concurrency, stream_completion_to_file, structured_output_format
+from src.utils.artifact_utils import load_artifact, save_artifact
+from src.utils.schema_utils import dataclass_json_schema, list_json_schema, unwrap_list
+from src.utils.similarity_utils import get_topic_index
 
-def create_social_content(aida_content_path: str, artifacts_dir: str, outputs_dir: str) -> Dict[str, Any]:
+SOCIAL_SYSTEM_MESSAGE = """
+        You are a social media content expert who creates engaging variations to test content ideas.
+        For each platform, create multiple approaches to see which resonates best with the audience.
+        """
+
+def create_social_content(
+    aida_content_path: Union[str, List[Dict[str, Any]]],
+    artifacts_dir: str,
+    outputs_dir: str,
+    max_concurrency: Optional[int] = None
+) -> Dict[str, Any]:
     """
     Create social media content variations based on AIDA content.
     
+    The default graph runs create_topic_social_posts as a map node instead,
+    fed topic by topic as AIDA content is completed.
+    
     Args:
-        aida_content_path: Path to AIDA content JSON
+        aida_content_path: Path to AIDA content JSON, or the AIDA content itself
         artifacts_dir: Directory to save artifacts
         outputs_dir: Directory to save final outputs
+        max_concurrency: Maximum concurrent LLM calls (defaults to NOTEGOLD_LLM_CONCURRENCY)
         
     Returns:
-        Dictionary with social content and output paths
+        Dictionary with social content, output paths, per-output streaming timings
+        and the artifacts of other meetings posts were reused from
     """
     # Load AIDA content
-    aida_contents = load_json(aida_content_path)
+    aida_contents = load_artifact(aida_content_path)
     
-    all_social_posts = []
-    output_paths = []
+    # Stream social content for all topics concurrently, collecting results in topic order
+    tasks = [functools.partial(create_topic_social_posts, content, outputs_dir) for content in aida_contents]
+    results = run_with_concurrency(tasks, max_concurrency)
     
-    for content in aida_contents:
-        topic_title = content.get("topic", {}).get("title", "Untitled Topic")
-        
-        # Create prompt for social content variations
-        system_message = """
-        You are a social media content expert who creates engaging variations to test content ideas.
-        For each platform, create multiple approaches to see which resonates best with the audience.
-        """
+    return summarize_social_content(results, artifacts_dir, outputs_dir)
+
+def create_topic_social_posts(aida_content: Dict[str, Any], outputs_dir: str) -> Dict[str, Any]:
+    """
+    Create social media content variations for one topic's AIDA content.
+    
+    When the AIDA content was reused from a near-duplicate topic of another
+    meeting, that topic's social posts are reused too, and that meeting's
+    artifacts are listed under dependency_paths (see NodeRunStore).
+    
+    Args:
+        aida_content: AIDA content dictionary for the topic
+        outputs_dir: Directory to save outputs
         
-        prompt = f"""
+    Returns:
+        Dictionary with the topic, its social posts, output path, streaming timings
+        and the paths of the artifacts they were reused from
+    """
+    topic_title = aida_content.get("topic", {}).get("title", "Untitled Topic")
+    
+    duplicate = aida_content.get("duplicate_of")
+    if duplicate and duplicate["mode"] == "reuse":
+        reused = _reuse_social_posts(topic_title, duplicate, outputs_dir)
+        if reused is not None:
+            social_posts, output_path, timings, dependency_paths = reused
+            return {
+                "topic": aida_content.get("topic", {}),
+                "social_posts": social_posts,
+                "output_path": output_path,
+                "output_timings": [timings],
+                "dependency_paths": dependency_paths
+            }
+    
+    # The duplicate link is bookkeeping, not content for the model
+    aida_content = {key: value for key, value in aida_content.items() if key != "duplicate_of"}
+    
+    prompt = f"""
         Create 3 different versions of social media posts for this topic:
         
         Topic: {topic_title}
         
         AIDA Content:
-        {json.dumps(content, indent=2)}
+        {json.dumps(aida_content, indent=2)}
         
         For each platform (Twitter/X, LinkedIn), create 3 variations:
         
@@ -52,58 +100,41 @@ def create_social_content(aida_content_path: str, artifacts_dir: str, outputs_di
         - content (string: the actual post content)
         - estimated_time (integer: minutes to create this type of content)
         """
+    
+    social_posts, output_path, timings = _generate_social_posts(topic_title, prompt, SOCIAL_SYSTEM_MESSAGE, outputs_dir)
+    
+    return {
+        "topic": aida_content.get("topic", {}),
+        "social_posts": social_posts,
+        "output_path": output_path,
+        "output_timings": [timings],
+        "dependency_paths": []
+    }
+
+def summarize_social_content(results: List[Dict[str, Any]], artifacts_dir: str, outputs_dir: str) -> Dict[str, Any]:
+    """
+    Save the social posts of every topic and write the content summary.
+    
+    Args:
+        results: create_topic_social_posts results, in topic order
+        artifacts_dir: Directory to save artifacts
+        outputs_dir: Directory to save final outputs
         
-        # Get social content using LLM
-        response = chat_completion(prompt, system_message)
-        social_posts_data = extract_json_from_response(response)
-        
-        # Handle case where response might not be an array
-        if not isinstance(social_posts_data, list):
-            if "posts" in social_posts_data and isinstance(social_posts_data["posts"], list):
-                social_posts_data = social_posts_data["posts"]
-            else:
-                social_posts_data = []
-        
-        # Create SocialMediaPost objects
-        social_posts = []
-        for item in social_posts_data:
-            post = SocialMediaPost(
-                topic_title=topic_title,
-                platform=item.get("platform", ""),
-                approach=item.get("approach", ""),
-                content=item.get("content", ""),
-                estimated_time=item.get("estimated_time", 15)
-            )
-            social_posts.append(post.__dict__)
-        
-        # Create clean title for filename
-        clean_title = ''.join(c if c.isalnum() else '_' for c in topic_title)
-        
-        # Save social posts to markdown file
-        output_path = os.path.join(outputs_dir, f"social_posts_{clean_title}.md")
-        
-        with open(output_path, 'w') as f:
-            f.write(f"# Social Media Content: {topic_title}\n\n")
-            
-            # Group by platform
-            platforms = set(post["platform"] for post in social_posts)
-            
-            for platform in platforms:
-                f.write(f"## {platform}\n\n")
-                platform_posts = [p for p in social_posts if p["platform"] == platform]
-                
-                for post in platform_posts:
-                    f.write(f"### Approach: {post['approach']}\n\n")
-                    f.write(f"{post['content']}\n\n")
-                    f.write(f"*Estimated creation time: {post['estimated_time']} minutes*\n\n")
-                    f.write("---\n\n")
-        
-        all_social_posts.extend(social_posts)
-        output_paths.append(output_path)
+    Returns:
+        Dictionary with social content, output paths and per-output streaming timings
+    """
+    all_social_posts = []
+    output_paths = []
+    output_timings = []
+    
+    for result in results:
+        all_social_posts.extend(result["social_posts"])
+        output_paths.append(result["output_path"])
+        output_timings.extend(result["output_timings"])
     
     # Save all social posts to JSON file
     json_output_path = os.path.join(artifacts_dir, "social_posts.json")
-    save_json(all_social_posts, json_output_path)
+    save_artifact(all_social_posts, json_output_path)
     
     # Generate a summary report
     summary_path = os.path.join(outputs_dir, "content_summary.md")
@@ -112,14 +143,14 @@ def create_social_content(aida_content_path: str, artifacts_dir: str, outputs_di
         f.write("# Content Flywheel Summary\n\n")
         
         f.write("## Topics Generated\n\n")
-        for content in aida_contents:
-            topic = content.get("topic", {})
+        for result in results:
+            topic = result["topic"]
             f.write(f"- **{topic.get('title', 'Untitled')}** (Priority: {topic.get('priority', 'Unknown')})\n")
             f.write(f"  - Value Score: {topic.get('value_score', 0):.2f}\n")
             f.write(f"  - Format: {topic.get('content_format', 'Unknown')}\n\n")
         
         f.write("## Social Media Content\n\n")
-        platforms = set(post["platform"] for post in all_social_posts)
+        platforms = list(dict.fromkeys(post["platform"] for post in all_social_posts))
         
         for platform in platforms:
             platform_posts = [p for p in all_social_posts if p["platform"] == platform]
@@ -140,5 +171,121 @@ def create_social_content(aida_content_path: str, artifacts_dir: str, outputs_di
     return {
         "social_posts": all_social_posts,
         "social_content_paths": output_paths,
-        "summary_path": summary_path
-    } 
\ No newline at end of file
+        "summary_path": summary_path,
+        "output_timings": output_timings,
+        "dependency_paths": sorted({path for result in results for path in result.get("dependency_paths", [])})
+    }
+
+def _generate_social_posts(
+    topic_title: str,
+    prompt: str,
+    system_message: str,
+    outputs_dir: str
+) -> Tuple[List[Dict[str, Any]], str, Dict[str, Any]]:
+    """
+    Stream social media posts for one topic into its markdown file.
+    
+    While the response streams, the file shows the raw response as it
+    arrives. Once complete, it is rewritten with the posts grouped by platform.
+    
+    Args:
+        topic_title: Title of the topic
+        prompt: Social content prompt for the topic
+        system_message: Social content system message
+        outputs_dir: Directory to save outputs
+        
+    Returns:
+        Tuple of the social post dicts, output path and streaming timings
+    """
+    # Create clean title for filename
+    clean_title = ''.join(c if c.isalnum() else '_' for c in topic_title)
+    output_path = os.path.join(outputs_dir, f"social_posts_{clean_title}.md")
+    
+    # The topic title is filled in here, so the model only generates the other fields
+    schema = list_json_schema(dataclass_json_schema(SocialMediaPost, exclude=("topic_title",)), "posts")
+    
+    # Stream the response to the output file as it arrives, scanning for JSON as it streams
+    extractor = IncrementalJSONExtractor()
+    response, timings = stream_completion_to_file(
+        prompt,
+        system_message,
+        output_path,
+        header=f"# Social Media Content: {topic_title}\n\n*Generating...*\n\n",
+        on_chunk=extractor.feed,
+        response_format=structured_output_format("social_posts", schema)
+    )
+    
+    # Accept either a bare array or {"posts": [...]}
+    social_posts_data = unwrap_list(parse_json_response(response, schema, extractor), "posts") or []
+    
+    # Create SocialMediaPost objects
+    social_posts = []
+    for item in social_posts_data:
+        post = SocialMediaPost(
+            topic_title=topic_title,
+            platform=item.get("platform", ""),
+            approach=item.get("approach", ""),
+            content=item.get("content", ""),
+            estimated_time=item.get("estimated_time", 15)
+        )
+        social_posts.append(post.__dict__)
+    
+    # Replace the streamed draft with posts grouped by platform
+    _write_social_markdown(topic_title, social_posts, output_path)
+    
+    print(f"  Streamed: {os.path.basename(output_path)} "
+          f"(first token {timings['ttfb_ms']}ms, total {timings['total_ms']}ms)")
+    
+    return social_posts, output_path, timings
+
+def _reuse_social_posts(
+    topic_title: str,
+    duplicate: Dict[str, Any],
+    outputs_dir: str
+) -> Optional[Tuple[List[Dict[str, Any]], str, Dict[str, Any], List[str]]]:
+    """
+    Reuse the social posts of a near-duplicate topic from another meeting.
+    
+    Args:
+        topic_title: Title of the topic
+        duplicate: Duplicate the topic's AIDA content was reused from
+        outputs_dir: Directory to save outputs
+        
+    Returns:
+        Tuple of the social post dicts, output path, timings and the paths of
+        the duplicate's artifacts, or None if the duplicate has no posts
+    """
+    start_time = time.time()
+    index = get_topic_index(os.path.dirname(os.path.dirname(os.path.abspath(outputs_dir))))
+    prior_posts = index.load_social_posts(duplicate)
+    if not prior_posts:
+        return None
+    social_posts = [dict(post, topic_title=topic_title) for post in prior_posts]
+    
+    clean_title = ''.join(c if c.isalnum() else '_' for c in topic_title)
+    output_path = os.path.join(outputs_dir, f"social_posts_{clean_title}.md")
+    _write_social_markdown(topic_title, social_posts, output_path)
+    
+    print(f"  Reused: {os.path.basename(output_path)} from {duplicate['meeting_id']}")
+    
+    elapsed_ms = int((time.time() - start_time) * 1000)
+    timings = {"output_path": output_path, "ttfb_ms": elapsed_ms, "total_ms": elapsed_ms}
+    return social_posts, output_path, timings, index.artifact_paths(duplicate)
+
+def _write_social_markdown(topic_title: str, social_posts: List[Dict[str, Any]], output_path: str) -> None:
+    """Write social posts as markdown, grouped by platform."""
+    with open(output_path, 'w') as f:
+        f.write(f"# Social Media Content: {topic_title}\n\n")
+        
+        # Group by platform, in first-seen order so output is deterministic
+        platforms = list(dict.fromkeys(post["platform"] for post in social_posts))
+        
+        for platform in platforms:
+            f.write(f"## {platform}\n\n")
+            platform_posts = [p for p in social_posts if p["platform"] == platform]
+            
+            for post in platform_posts:
+                f.write(f"### Approach: {post['approach']}\n\n")
+                f.write(f"{post['content']}\n\n")
+                f.write(f"*Estimated creation time: {post['estimated_time']} minutes*\n\n")
+                f.write("---\n\n")
@@ -1,17 +1,77 @@
-from typing import Dict, Any
+from typing import Dict, List, Any, Optional
 import os
-from src.utils.llm_utils import chat_completion, extract_json_from_response
-from src.utils.file_utils import save_json
+import functools
+from collections import Counter
+from src.models.data_models import ExtractedMetadata
+from src.utils.llm_utils import run_with_concurrency, structured_completion
+from src.utils.artifact_utils import save_artifact
+from src.utils.schema_utils import dataclass_json_schema
+from src.utils.text_utils import chunk_transcript, normalize_text
 import time
 from datetime import datetime
 
-def extract_metadata(meeting_notes_path: str, artifacts_dir: str) -> Dict[str, Any]:
+METADATA_SCALAR_FIELDS = ["meeting_title", "meeting_date", "client_name", "primary_contact", "project_name"]
+METADATA_LIST_FIELDS = ["attendees", "main_topics", "pain_points", "requested_deliverables", "next_steps"]
+
+def merge_metadata(partials: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Merge metadata extracted from separate transcript chunks.
+    
+    Scalar fields take the most common non-empty value (earliest chunk wins
+    ties). List fields are concatenated in chunk order with duplicates removed.
+    
+    Args:
+        partials: Metadata dictionaries, one per chunk
+        
+    Returns:
+        Merged metadata dictionary
+    """
+    # Chunks whose response couldn't be parsed carry an error instead of metadata
+    valid_partials = [partial for partial in partials if isinstance(partial, dict) and "error" not in partial]
+    if not valid_partials:
+        return partials[0] if partials else {}
+    if len(valid_partials) == 1:
+        return valid_partials[0]
+    partials = valid_partials
+    
+    merged = {}
+    
+    for field in METADATA_SCALAR_FIELDS:
+        values = [partial.get(field) for partial in partials if partial.get(field)]
+        merged[field] = Counter(values).most_common(1)[0][0] if values else ""
+    
+    for field in METADATA_LIST_FIELDS:
+        seen = set()
+        merged[field] = []
+        for partial in partials:
+            values = partial.get(field) or []
+            if isinstance(values, str):
+                values = [values]
+            for value in values:
+                key = normalize_text(str(value))
+                if key and key not in seen:
+                    seen.add(key)
+                    merged[field].append(value)
+    
+    return merged
+
+def extract_metadata(
+    meeting_notes_path: str,
+    artifacts_dir: str,
+    chunk_tokens: int = 3000,
+    max_concurrency: Optional[int] = None
+) -> Dict[str, Any]:
     """
     Extract metadata from meeting notes.
     
+    Long transcripts are split into token-bounded chunks on speaker turns.
+    Metadata is extracted from each chunk concurrently and then merged.
+    
     Args:
         meeting_notes_path: Path to the meeting notes file
         artifacts_dir: Directory to save artifacts
+        chunk_tokens: Maximum transcript tokens sent per LLM call
+        max_concurrency: Maximum concurrent LLM calls (defaults to NOTEGOLD_LLM_CONCURRENCY)
         
     Returns:
         Dictionary with metadata and output path
@@ -30,39 +90,48 @@ def extract_metadata(meeting_notes_path: str, artifacts_dir: str) -> Dict[str, A
     Your response should be valid JSON only.
     """
     
-    prompt = f"""
-    Extract the following metadata from these meeting notes:
-    
-    1. Meeting title (descriptive title based on content)
-    2. Meeting date (if mentioned, otherwise leave empty)
-    3. Attendees (names of people in the meeting)
-    4. Client name (the organization being consulted)
-    5. Primary contact (main client representative)
-    6. Project name (if mentioned)
-    7. Main topics discussed (list of 3-5 key topics)
-    8. Key pain points (list of problems/challenges mentioned)
-    9. Requested deliverables (specific outputs requested by client)
-    10. Next steps (agreed follow-up actions)
-    
-    Meeting notes:
-    {transcript[:4000]}
-    
-    Format your response as a JSON object with these keys:
-    - meeting_title (string)
-    - meeting_date (string, YYYY-MM-DD format or empty)
-    - attendees (array of strings)
-    - client_name (string)
-    - primary_contact (string)
-    - project_name (string)
-    - main_topics (array of strings)
-    - pain_points (array of strings)
-    - requested_deliverables (array of strings)
-    - next_steps (array of strings)
-    """
+    chunks = chunk_transcript(transcript, chunk_tokens)
+    
+    # Constrain the response to the metadata schema on models that support it
+    schema = dataclass_json_schema(ExtractedMetadata)
+    
+    tasks = []
+    for i, chunk in enumerate(chunks):
+        part = f" (part {i + 1} of {len(chunks)})" if len(chunks) > 1 else ""
+        prompt = f"""
+        Extract the following metadata from these meeting notes:
+        
+        1. Meeting title (descriptive title based on content)
+        2. Meeting date (if mentioned, otherwise leave empty)
+        3. Attendees (names of people in the meeting)
+        4. Client name (the organization being consulted)
+        5. Primary contact (main client representative)
+        6. Project name (if mentioned)
+        7. Main topics discussed (list of 3-5 key topics)
+        8. Key pain points (list of problems/challenges mentioned)
+        9. Requested deliverables (specific outputs requested by client)
+        10. Next steps (agreed follow-up actions)
+        
+        Meeting notes{part}:
+        {chunk}
+        
+        Format your response as a JSON object with these keys:
+        - meeting_title (string)
+        - meeting_date (string, YYYY-MM-DD format or empty)
+        - attendees (array of strings)
+        - client_name (string)
+        - primary_contact (string)
+        - project_name (string)
+        - main_topics (array of strings)
+        - pain_points (array of strings)
+        - requested_deliverables (array of strings)
+        - next_steps (array of strings)
+        """
+        tasks.append(functools.partial(structured_completion, prompt, system_message, schema, "meeting_metadata"))
     
-    # Get metadata using LLM
-    response = chat_completion(prompt, system_message)
-    metadata = extract_json_from_response(response)
+    # Extract metadata from all chunks concurrently (map), then merge (reduce)
+    results = run_with_concurrency(tasks, max_concurrency)
+    metadata = merge_metadata([data for data, response in results])
     
     # Add additional metadata
     metadata['meeting_id'] = meeting_id
@@ -71,7 +140,7 @@ def extract_metadata(meeting_notes_path: str, artifacts_dir: str) -> Dict[str, A
     
     # Save metadata to JSON file
     output_path = os.path.join(artifacts_dir, f"{meeting_id}_metadata.json")
-    save_json(metadata, output_path)
+    save_artifact(metadata, output_path)
     
     return {
         "metadata": metadata,
@@ -1,15 +1,41 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Union
 import os
-import json
 import re
+import functools
 from src.models.data_models import TopicIdea
-from src.utils.llm_utils import chat_completion, extract_json_from_response
-from src.utils.file_utils import save_json
+from src.utils.llm_utils import parse_json_response, run_with_concurrency, structured_completion
+from src.utils.artifact_utils import load_artifact, save_artifact
+from src.utils.schema_utils import dataclass_json_schema, list_json_schema, unwrap_list
+from src.utils.text_utils import chunk_transcript, normalize_text
+
+# Topic headings like "Topic 1: Title", "1. Title", "- Title", "Title: Title" or "# Title"
+TOPIC_TITLE_PATTERN = re.compile(r'^\s*(?:Topic\s+\d+:|\d+\.|-|Title:|#+)\s*(.+)$', re.IGNORECASE)
+
+# Field lines like "Pain Point: ..." or "- **Target Audience:** ..."
+TOPIC_FIELD_PATTERN = re.compile(
+    r'^\s*(?:[-*]\s*)?(?:\*\*)?(description|pain\s+points?|value\s+proposition|(?:target\s+)?audience|(?:(?:recommended\s+)?content\s+)?format)'
+    r'(?:\*\*)?\s*:(?:\*\*)?\s*(.+)$',
+    re.IGNORECASE
+)
+
+TOPIC_FIELD_KEYS = {
+    "description": "description",
+    "pain": "pain_point",
+    "value": "value_proposition",
+    "target": "audience",
+    "audience": "audience",
+    "recommended": "content_format",
+    "content": "content_format",
+    "format": "content_format"
+}
 
 def extract_topics_from_response(text: str) -> List[Dict[str, Any]]:
     """
     Extract topic data from text when JSON parsing fails.
     
+    The text is scanned line by line once: a title line starts a new topic
+    and field lines ("Pain Point: ...") fill in the current topic.
+    
     Args:
         text: Text response from LLM
         
@@ -18,52 +44,24 @@ def extract_topics_from_response(text: str) -> List[Dict[str, Any]]:
     """
     topics = []
     
-    # Try to find title patterns like "Topic 1: Title" or "1. Title" or "- Title"
-    title_pattern = r'(?:Topic\s+\d+:|^\d+\.|\-)\s*([^\n]+)'
-    titles = re.findall(title_pattern, text, re.MULTILINE)
-    
-    # If no titles found, look for "Title:" or "# Title"
-    if not titles:
-        title_pattern = r'(?:Title:|#)\s*([^\n]+)'
-        titles = re.findall(title_pattern, text, re.MULTILINE)
-    
-    for title in titles:
-        # Create a simple topic with the title
-        topic = {
-            "title": title.strip(),
-            "description": "Extracted from text response",
-            "pain_point": "",
-            "value_proposition": "",
-            "audience": "General audience",
-            "content_format": "blog"
-        }
-        
-        # Try to extract description
-        desc_match = re.search(f'{re.escape(title)}.*?(?:Description:|:)\s*([^\n]+)', text, re.DOTALL)
-        if desc_match:
-            topic["description"] = desc_match.group(1).strip()
-        
-        # Try to extract pain point
-        pain_match = re.search(r'Pain\s+Point.*?:\s*([^\n]+)', text, re.DOTALL)
-        if pain_match:
-            topic["pain_point"] = pain_match.group(1).strip()
+    for line in text.splitlines():
+        field_match = TOPIC_FIELD_PATTERN.match(line)
+        if field_match and topics:
+            key = TOPIC_FIELD_KEYS[field_match.group(1).split()[0].lower()]
+            topics[-1][key] = field_match.group(2).strip().strip("*").strip()
+            continue
         
-        # Try to extract value proposition
-        value_match = re.search(r'Value\s+Proposition.*?:\s*([^\n]+)', text, re.DOTALL)
-        if value_match:
-            topic["value_proposition"] = value_match.group(1).strip()
-        
-        # Try to extract audience
-        audience_match = re.search(r'(?:Target\s+)?Audience.*?:\s*([^\n]+)', text, re.DOTALL)
-        if audience_match:
-            topic["audience"] = audience_match.group(1).strip()
-        
-        # Try to extract content format
-        format_match = re.search(r'(?:Content\s+)?Format.*?:\s*([^\n]+)', text, re.DOTALL)
-        if format_match:
-            topic["content_format"] = format_match.group(1).strip()
-        
-        topics.append(topic)
+        title_match = TOPIC_TITLE_PATTERN.match(line)
+        if title_match and not field_match:
+            # Create a simple topic with the title
+            topics.append({
+                "title": title_match.group(1).strip().strip("*").strip(),
+                "description": "Extracted from text response",
+                "pain_point": "",
+                "value_proposition": "",
+                "audience": "General audience",
+                "content_format": "blog"
+            })
     
     # If we still couldn't find any topics, create a single generic one
     if not topics:
@@ -78,21 +76,90 @@ def extract_topics_from_response(text: str) -> List[Dict[str, Any]]:
     
     return topics
 
-def generate_topics(metadata_path: str, artifacts_dir: str, meeting_notes_path: str = None) -> Dict[str, Any]:
+def parse_topics_response(
+    response: str,
+    schema: Optional[Dict[str, Any]] = None,
+    data: Optional[Any] = None
+) -> List[Dict[str, Any]]:
+    """
+    Parse topic ideas from an LLM response.
+    
+    Falls back to repairing invalid JSON, then to scanning the text for
+    topic headings.
+    
+    Args:
+        response: Text response from LLM
+        schema: Optional topics schema, used when repairing invalid JSON
+        data: JSON already parsed from the response, if any
+        
+    Returns:
+        List of topic dictionaries
+    """
+    if data is None:
+        data = parse_json_response(response, schema)
+    
+    # Accept either a bare array or {"topics": [...]}
+    topics_data = unwrap_list(data, "topics")
+    if topics_data is None:
+        topics_data = extract_topics_from_response(response)
+    
+    return topics_data
+
+def dedupe_topics(topics: List[Dict[str, Any]], similarity_threshold: float = 0.8) -> List[Dict[str, Any]]:
+    """
+    Remove duplicate topics generated from different transcript chunks.
+    
+    Two topics are duplicates when their normalized titles share at least
+    similarity_threshold of their words (Jaccard similarity). The first
+    occurrence is kept.
+    
+    Args:
+        topics: Topic dictionaries in generation order
+        similarity_threshold: Minimum title word overlap to count as a duplicate
+        
+    Returns:
+        Deduplicated topic dictionaries
+    """
+    kept = []
+    kept_words = []
+    
+    for topic in topics:
+        words = set(normalize_text(topic.get("title", "")).split())
+        is_duplicate = any(
+            words == other or (words and other and len(words & other) / len(words | other) >= similarity_threshold)
+            for other in kept_words
+        )
+        if not is_duplicate:
+            kept.append(topic)
+            kept_words.append(words)
+    
+    return kept
+
+def generate_topics(
+    metadata_path: Union[str, Dict[str, Any]],
+    artifacts_dir: str,
+    meeting_notes_path: str = None,
+    chunk_tokens: int = 3000,
+    max_concurrency: Optional[int] = None
+) -> Dict[str, Any]:
     """
     Generate potential content topics based on meeting data.
     
+    Long transcripts are split into token-bounded chunks on speaker turns.
+    Topics are generated for each chunk concurrently and then deduplicated.
+    
     Args:
-        metadata_path: Path to meeting metadata JSON
+        metadata_path: Path to meeting metadata JSON, or the metadata itself
         artifacts_dir: Directory to save artifacts
         meeting_notes_path: Optional path to meeting notes for additional context
+        chunk_tokens: Maximum transcript tokens sent per LLM call
+        max_concurrency: Maximum concurrent LLM calls (defaults to NOTEGOLD_LLM_CONCURRENCY)
         
     Returns:
         Dictionary with list of topics and output path
     """
     # Load meeting metadata
-    with open(metadata_path, 'r') as f:
-        metadata = json.load(f)
+    metadata = load_artifact(metadata_path)
     
     # Optionally load transcript for additional context
     transcript_text = ""
@@ -116,54 +183,58 @@ def generate_topics(metadata_path: str, artifacts_dir: str, meeting_notes_path:
     Format your response as a JSON array with these fields for each topic.
     """
     
-    # Format metadata into structured prompt
-    prompt = f"""
-    Generate content topic ideas based on this meeting data:
-    
-    Client: {metadata.get('client_name', '')}
-    Industry: {metadata.get('industry', '')}
-    Pain Points: {', '.join(metadata.get('pain_points', []))}
-    Goals: {', '.join(metadata.get('goals', []))}
+    # Split the transcript on speaker turns so no part of a long meeting is dropped
+    chunks = chunk_transcript(transcript_text, chunk_tokens) if transcript_text else []
     
-    For each topic, provide:
-    - title: A clear, compelling headline
-    - description: 1-2 sentence summary
-    - pain_point: Specific problem it addresses
-    - value_proposition: How it helps the audience
-    - audience: Who would benefit most
-    - content_format: Recommended format (blog, whitepaper, case study, video, etc.)
-    
-    Format your response as a JSON array of topic objects.
-    
-    Additional context from meeting notes:
-    {transcript_text[:2000] if transcript_text else "No additional context provided."}
-    """
+    # Constrain the response to the topic schema on models that support it
+    schema = list_json_schema(dataclass_json_schema(TopicIdea), "topics")
     
-    # Get topic ideas using LLM
-    response = chat_completion(prompt, system_message)
+    # A cascade escalates when a cheaper model returns no topics
+    def check(data: Any) -> List[str]:
+        return [] if unwrap_list(data, "topics") else ["no topics returned"]
     
-    try:
-        # Try to parse as JSON
-        topics_data = extract_json_from_response(response)
+    tasks = []
+    for i, chunk in enumerate(chunks or [None]):
+        part = f" (part {i + 1} of {len(chunks)})" if len(chunks) > 1 else ""
         
-        # Ensure it's a list
-        if not isinstance(topics_data, list):
-            # If not a list but has a topics key that is a list
-            if isinstance(topics_data, dict) and 'topics' in topics_data and isinstance(topics_data['topics'], list):
-                topics_data = topics_data['topics']
-            else:
-                # Fallback to extraction
-                topics_data = extract_topics_from_response(response)
-    except:
-        # Fallback to extraction
-        topics_data = extract_topics_from_response(response)
+        # Format metadata into structured prompt
+        prompt = f"""
+        Generate content topic ideas based on this meeting data:
+        
+        Client: {metadata.get('client_name', '')}
+        Industry: {metadata.get('industry', '')}
+        Pain Points: {', '.join(metadata.get('pain_points', []))}
+        Goals: {', '.join(metadata.get('goals', []))}
+        
+        For each topic, provide:
+        - title: A clear, compelling headline
+        - description: 1-2 sentence summary
+        - pain_point: Specific problem it addresses
+        - value_proposition: How it helps the audience
+        - audience: Who would benefit most
+        - content_format: Recommended format (blog, whitepaper, case study, video, etc.)
+        
+        Format your response as a JSON array of topic objects.
+        
+        Additional context from meeting notes{part}:
+        {chunk if chunk else "No additional context provided."}
+        """
+        tasks.append(functools.partial(structured_completion, prompt, system_message, schema, "topic_ideas", check))
+    
+    # Generate topics for all chunks concurrently (map), then deduplicate (reduce)
+    results = run_with_concurrency(tasks, max_concurrency)
+    topics_data = dedupe_topics([
+        topic
+        for data, response in results
+        for topic in parse_topics_response(response, schema, data)
+    ])
     
     # Create Topic objects
     topics = [TopicIdea(**topic) for topic in topics_data]
     
     # Save topics to JSON file
     output_path = os.path.join(artifacts_dir, "topic_ideas.json")
-    save_json([topic.__dict__ for topic in topics], output_path)
+    save_artifact([topic.__dict__ for topic in topics], output_path)
     
     return {
         "topics": [topic.__dict__ for topic in topics],
@@ -1,23 +1,26 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Union
 import os
 import json
 from src.models.data_models import RankedTopic
-from src.utils.llm_utils import chat_completion, extract_json_from_response
-from src.utils.file_utils import load_json, save_json
+from src.utils.llm_utils import structured_completion
+from src.utils.artifact_utils import load_artifact, save_artifact
+from src.utils.schema_utils import dataclass_json_schema, list_json_schema, unwrap_list
 
-def rank_topics(topics_path: str, artifacts_dir: str) -> Dict[str, Any]:
+SCORE_FIELDS = ["dream_outcome_score", "probability_score", "time_score", "effort_score"]
+
+def rank_topics(topics_path: Union[str, List[Dict[str, Any]]], artifacts_dir: str) -> Dict[str, Any]:
     """
     Rank topics using the Value Equation.
     
     Args:
-        topics_path: Path to topic ideas JSON
+        topics_path: Path to topic ideas JSON, or the topic ideas themselves
         artifacts_dir: Directory to save artifacts
         
     Returns:
         Dictionary with ranked topics and output path
     """
     # Load topics
-    topics = load_json(topics_path)
+    topics = load_artifact(topics_path)
     
     # Create prompt for topic ranking
     system_message = """
@@ -55,16 +58,25 @@ def rank_topics(topics_path: str, artifacts_dir: str) -> Dict[str, Any]:
     - priority (string: "High", "Medium", or "Low")
     """
     
-    # Get ranked topics using LLM
-    response = chat_completion(prompt, system_message)
-    ranked_data = extract_json_from_response(response)
+    # Get ranked topics using LLM, constrained to the ranked topic schema where supported
+    schema = list_json_schema(dataclass_json_schema(RankedTopic), "topics")
+    
+    # A cascade escalates when a cheaper model skips topics or scores outside 1-10
+    def check(data: Any) -> List[str]:
+        ranked = unwrap_list(data, "topics") or []
+        if len(ranked) != len(topics):
+            return [f"ranked {len(ranked)} of {len(topics)} topics"]
+        for item in ranked:
+            for field in SCORE_FIELDS:
+                score = item.get(field)
+                if not isinstance(score, int) or not 1 <= score <= 10:
+                    return [f"{field} {score!r} outside 1-10"]
+        return []
+    
+    ranked_data, response = structured_completion(prompt, system_message, schema, "ranked_topics", check)
     
-    # Handle case where response might not be an array
-    if not isinstance(ranked_data, list):
-        if "topics" in ranked_data and isinstance(ranked_data["topics"], list):
-            ranked_data = ranked_data["topics"]
-        else:
-            ranked_data = []
+    # Accept either a bare array or {"topics": [...]}
+    ranked_data = unwrap_list(ranked_data, "topics") or []
     
     # Create RankedTopic objects
     ranked_topics = []
@@ -94,7 +106,7 @@ def rank_topics(topics_path: str, artifacts_dir: str) -> Dict[str, Any]:
     
     # Save ranked topics to JSON file
     output_path = os.path.join(artifacts_dir, "ranked_topics.json")
-    save_json(ranked_topics, output_path)
+    save_artifact(ranked_topics, output_path)
     
     return {
         "ranked_topics": ranked_topics,
@@ -0,0 +1,206 @@
+"""In-memory artifact passing between graph nodes, with write-behind persistence."""
+import os
+import json
+import queue
+import hashlib
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+from src.utils.file_utils import ensure_dir, load_json, save_json
+
+_active_writer: contextvars.ContextVar[Optional["ArtifactWriter"]] = contextvars.ContextVar("notegold_artifact_writer", default=None)
+
+class _PendingArtifact:
+    """An artifact held in memory until the writer thread has persisted it."""
+
+    def __init__(self, data: Any):
+        self.data = data
+        self.digest: Optional[str] = None
+        self.serialized = threading.Event()
+
+class ArtifactWriter:
+    """
+    Keeps the JSON artifacts saved during a graph run in memory and writes them on a background thread.
+
+    Nodes read artifacts saved by earlier nodes straight from memory (see
+    load_artifact), so they don't wait for them to be written and parsed
+    again. Writes happen in the order they were submitted. Errors from the
+    writer thread are raised by flush.
+
+    Saved objects are serialized on the writer thread, so processors must
+    not modify them after saving them.
+    """
+
+    def __init__(self):
+        """Initialize the writer and start its thread."""
+        self._artifacts: Dict[str, _PendingArtifact] = {}
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue[Optional[Callable[[], None]]]" = queue.Queue()
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, name="notegold-artifact-writer", daemon=True)
+        self._thread.start()
+
+    def save_json(self, data: Any, filepath: str) -> str:
+        """
+        Keep a JSON artifact in memory and queue it to be written.
+
+        Args:
+            data: JSON-serializable data
+            filepath: Path to write it to
+
+        Returns:
+            filepath
+        """
+        artifact = _PendingArtifact(data)
+        with self._lock:
+            self._artifacts[os.path.abspath(filepath)] = artifact
+        self._queue.put(lambda: self._write_json(artifact, filepath))
+        return filepath
+
+    def submit(self, func: Callable[..., Any], *args: Any) -> None:
+        """
+        Queue a write to run after the writes already queued.
+
+        Args:
+            func: Function doing the write
+            args: Its arguments
+        """
+        self._queue.put(lambda: func(*args))
+
+    def get(self, filepath: str) -> Optional[_PendingArtifact]:
+        """Get an artifact saved through this writer, if any."""
+        with self._lock:
+            return self._artifacts.get(os.path.abspath(filepath))
+
+    def flush(self) -> None:
+        """
+        Wait for every queued write to finish.
+
+        Raises:
+            Exception: The first error raised by a write
+        """
+        self._queue.join()
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def close(self) -> None:
+        """Flush the queued writes and stop the writer thread."""
+        try:
+            self.flush()
+        finally:
+            self._queue.put(None)
+            self._thread.join()
+            with self._lock:
+                self._artifacts.clear()
+
+    def _write_json(self, artifact: _PendingArtifact, filepath: str) -> None:
+        try:
+            # Same bytes as save_json, so the digest matches a hash of the file
+            encoded = json.dumps(artifact.data, indent=2).encode()
+            artifact.digest = hashlib.sha256(encoded).hexdigest()
+        finally:
+            artifact.serialized.set()
+
+        ensure_dir(os.path.dirname(filepath))
+        with open(filepath, 'wb') as f:
+            f.write(encoded)
+
+    def _run(self) -> None:
+        while True:
+            task = self._queue.get()
+            try:
+                if task is None:
+                    return
+                task()
+            except BaseException as e:
+                if self._error is None:
+                    self._error = e
+            finally:
+                self._queue.task_done()
+
+@contextmanager
+def use_artifact_writer(writer: ArtifactWriter) -> Iterator[ArtifactWriter]:
+    """
+    Route save_artifact and load_artifact through a writer within the block.
+
+    The writer is held in a context variable, so it follows work submitted
+    with contextvars.copy_context (as the graph executor does).
+
+    Args:
+        writer: ArtifactWriter for the run
+    """
+    token = _active_writer.set(writer)
+    try:
+        yield writer
+    finally:
+        _active_writer.reset(token)
+
+def save_artifact(data: Any, filepath: str) -> str:
+    """
+    Save a JSON artifact, behind the active writer if there is one.
+
+    Args:
+        data: JSON-serializable data
+        filepath: Path to save it to
+
+    Returns:
+        filepath
+    """
+    writer = _active_writer.get()
+    if writer is None:
+        return save_json(data, filepath)
+    return writer.save_json(data, filepath)
+
+def load_artifact(artifact: Any) -> Any:
+    """
+    Load a JSON artifact given either its data or its path.
+
+    Paths saved during the current run are served from memory.
+
+    Args:
+        artifact: Artifact data, or path to a JSON file
+
+    Returns:
+        Artifact data
+    """
+    if not isinstance(artifact, str):
+        return artifact
+
+    writer = _active_writer.get()
+    pending = writer.get(artifact) if writer is not None else None
+    if pending is not None:
+        return pending.data
+    return load_json(artifact)
+
+def artifact_digest(filepath: str) -> Optional[str]:
+    """
+    Get the SHA-256 of an artifact saved during the current run, without waiting for it to be written.
+
+    Args:
+        filepath: Path of the artifact
+
+    Returns:
+        Hex digest of its JSON, or None if it wasn't saved through the active writer
+    """
+    writer = _active_writer.get()
+    pending = writer.get(filepath) if writer is not None else None
+    if pending is None:
+        return None
+    pending.serialized.wait()
+    return pending.digest
+
+def defer_write(func: Callable[..., Any], *args: Any) -> None:
+    """
+    Run a write after the artifacts already saved, behind the active writer if there is one.
+
+    Args:
+        func: Function doing the write
+        args: Its arguments
+    """
+    writer = _active_writer.get()
+    if writer is None:
+        func(*args)
+    else:
+        writer.submit(func, *args)
@@ -0,0 +1,300 @@
+"""Batch processing of many meetings' notes in one process, sharing one node budget."""
+import os
+import glob
+import time
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+from src.utils.deadline_utils import Deadline, RunCancelled, cancel_on_interrupt
+from src.utils.file_utils import save_json, save_text, setup_meeting_directory
+from src.utils.graph_utils import ExecutionPlan, execute_graph, get_max_parallelism, save_graph
+from src.utils.log_utils import capture_console
+from src.utils.metrics_utils import summarize_latencies
+
+# Files in a batch directory treated as meeting notes
+NOTES_EXTENSIONS = (".txt", ".md")
+
+# Seconds between checks for Ctrl-C while waiting for meetings to finish
+BATCH_POLL_SECONDS = 0.5
+
+def find_notes_files(source: str) -> List[str]:
+    """
+    Find the meeting notes files for a batch.
+
+    Args:
+        source: Directory of notes files, or a glob pattern (** matches subdirectories)
+
+    Returns:
+        Sorted notes file paths
+
+    Raises:
+        ValueError: If no notes files are found
+    """
+    if os.path.isdir(source):
+        paths = [os.path.join(source, name) for name in os.listdir(source)
+                 if name.lower().endswith(NOTES_EXTENSIONS) and not name.startswith(".")]
+    else:
+        paths = glob.glob(source, recursive=True)
+    paths = sorted(path for path in paths if os.path.isfile(path))
+    if not paths:
+        raise ValueError(f"No meeting notes found in: {source}")
+    return paths
+
+def meeting_id_for(notes_path: str) -> str:
+    """Derive a meeting ID from a notes filename, as setup_meeting_directory does."""
+    base_name = os.path.splitext(os.path.basename(notes_path))[0]
+    return base_name if base_name.startswith("meeting_") else f"meeting_{base_name}"
+
+def process_meeting(
+    notes_path: str,
+    meeting_id: str,
+    plan: ExecutionPlan,
+    output_dir: str,
+    executor: ThreadPoolExecutor,
+    max_parallelism: int,
+    force: bool = False,
+    timeout: Optional[float] = None,
+    node_timeout: Optional[float] = None,
+    deadline: Optional[Deadline] = None
+) -> Dict[str, Any]:
+    """
+    Process one meeting of a batch, with its console output in logs/console.log.
+
+    Args:
+        notes_path: Path to the meeting notes file
+        meeting_id: Meeting ID
+        plan: Compiled processing graph
+        output_dir: Base output directory
+        executor: Node thread pool shared by the batch
+        max_parallelism: Maximum of the meeting's nodes running at once
+        force: Re-run every node, even those whose inputs are unchanged
+        timeout: Seconds the meeting's run may take
+        node_timeout: Seconds each node may take, for nodes without their own timeout
+        deadline: Batch deadline the run's is derived from
+
+    Returns:
+        Dictionary with the meeting's status, duration and error, if any
+    """
+    start = time.time()
+    directories = setup_meeting_directory(notes_path, meeting_id, output_dir)
+    context = {
+        "meeting_notes_path": directories["meeting_notes_path"],
+        "artifacts_dir": directories["artifacts_dir"],
+        "outputs_dir": directories["outputs_dir"],
+        "metadata_dir": directories["metadata_dir"],
+        "logs_dir": directories["logs_dir"],
+        "meeting_id": directories["meeting_id"]
+    }
+    save_graph(plan.graph, os.path.join(directories["metadata_dir"], "processing_graph.json"))
+
+    result = {
+        "meeting_id": meeting_id,
+        "notes_path": notes_path,
+        "meeting_dir": os.path.dirname(directories["metadata_dir"]),
+        "status": "success",
+        "error": None
+    }
+    with capture_console(os.path.join(directories["logs_dir"], "console.log")):
+        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Starting to process meeting notes: {notes_path}")
+        try:
+            execute_graph(plan, context, max_parallelism, force, timeout=timeout, node_timeout=node_timeout,
+                          deadline=deadline, executor=executor)
+        except Exception as e:
+            result.update(status="cancelled" if isinstance(e, RunCancelled) else "error", error=str(e))
+            print(f"❌ Error processing meeting notes: {e}")
+
+    metadata = {
+        "meeting_id": meeting_id,
+        "processed_at": datetime.now().isoformat(),
+        "status": "success" if result["status"] == "success" else "error",
+        "graph_name": plan.graph.name
+    }
+    if result["error"]:
+        metadata["error"] = result["error"]
+    filename = "processing_metadata.json" if result["status"] == "success" else "processing_error.json"
+    save_json(metadata, os.path.join(directories["metadata_dir"], filename))
+
+    result["duration_s"] = round(time.time() - start, 2)
+    return result
+
+def run_batch(
+    notes_paths: Sequence[str],
+    plan: ExecutionPlan,
+    output_dir: str = '.',
+    max_parallelism: Optional[int] = None,
+    max_meetings: Optional[int] = None,
+    continue_on_error: bool = True,
+    force: bool = False,
+    timeout: Optional[float] = None,
+    node_timeout: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Process a batch of meetings concurrently in this process.
+
+    Every meeting's nodes run on one shared thread pool, so max_parallelism
+    bounds the nodes running across the whole batch, and meetings share
+    the warm LLM client, rate limiter and completion cache. A status line
+    is printed as each meeting starts and finishes; each meeting's own
+    console output goes to its logs/console.log. The batch report is
+    written to batch_report.json and batch_report.md in output_dir.
+
+    When the batch is stopped (a meeting failed without continue_on_error,
+    the timeout passed or Ctrl-C), meetings in progress are cancelled
+    through the batch deadline and reported as cancelled, and meetings not
+    yet started as skipped. run_batch returns once every cancelled meeting
+    and its nodes have stopped, unless Ctrl-C is pressed a second time.
+
+    Args:
+        notes_paths: Meeting notes files
+        plan: Compiled processing graph
+        output_dir: Base output directory
+        max_parallelism: Maximum graph nodes running at once across the batch (defaults to NOTEGOLD_GRAPH_PARALLELISM or 4)
+        max_meetings: Maximum meetings in progress at once (defaults to max_parallelism)
+        continue_on_error: Keep processing other meetings after one fails; otherwise cancel the rest
+        force: Re-run every node, even those whose inputs are unchanged
+        timeout: Seconds the whole batch may take
+        node_timeout: Seconds each node may take, for nodes without their own timeout
+
+    Returns:
+        Batch report dictionary
+
+    Raises:
+        ValueError: If two notes files would have the same meeting ID
+    """
+    meeting_ids: Dict[str, str] = {}
+    for notes_path in notes_paths:
+        meeting_id = meeting_id_for(notes_path)
+        if meeting_id in meeting_ids:
+            raise ValueError(f"Notes files {meeting_ids[meeting_id]} and {notes_path} would both be meeting {meeting_id}")
+        meeting_ids[meeting_id] = notes_path
+
+    max_parallelism = get_max_parallelism(max_parallelism)
+    max_meetings = max(1, max_meetings or max_parallelism)
+    batch_deadline = Deadline(timeout, name="Batch")
+    total = len(notes_paths)
+    results: List[Dict[str, Any]] = []
+    started = set()
+    lock = threading.Lock()
+
+    def run(notes_path: str, meeting_id: str) -> Dict[str, Any]:
+        if batch_deadline.cancelled() or batch_deadline.expired():
+            return {"meeting_id": meeting_id, "notes_path": notes_path, "status": "skipped",
+                    "error": f"Batch {batch_deadline.reason() or 'deadline passed'}", "duration_s": 0.0}
+        with lock:
+            started.add(meeting_id)
+            print(f"[{len(results)}/{total}] ▶ {meeting_id}")
+        result = process_meeting(notes_path, meeting_id, plan, output_dir, node_executor, max_parallelism,
+                                 force, None, node_timeout, batch_deadline)
+        with lock:
+            results.append(result)
+            symbol = {"success": "✅", "error": "❌", "cancelled": "⏹"}[result["status"]]
+            line = f"[{len(results)}/{total}] {symbol} {meeting_id} ({result['duration_s']:.1f}s)"
+            print(f"{line}: {result['error']}" if result["error"] else line)
+        if result["status"] == "error" and not continue_on_error and not batch_deadline.cancelled():
+            with lock:
+                running = len(started) - len(results)
+                print(f"Stopping the batch after {meeting_id} failed" + (f"; cancelling {running} running meetings" if running else ""))
+            batch_deadline.cancel(f"stopped after {meeting_id} failed")
+        return result
+
+    print(f"Processing {total} meetings ({max_meetings} at a time, {max_parallelism} nodes across the batch)")
+    start = time.time()
+    node_executor = ThreadPoolExecutor(max_workers=max_parallelism, thread_name_prefix="notegold-node")
+    meeting_executor = ThreadPoolExecutor(max_workers=max_meetings, thread_name_prefix="notegold-meeting")
+    futures = {}
+    aborted = False
+    try:
+        with cancel_on_interrupt(batch_deadline):
+            futures = {meeting_executor.submit(run, notes_path, meeting_id): meeting_id
+                       for meeting_id, notes_path in meeting_ids.items()}
+            pending = set(futures)
+            while pending:
+                # Wait in short steps so Ctrl-C is handled promptly; cancelled meetings finish as they stop
+                _, pending = wait(pending, timeout=BATCH_POLL_SECONDS, return_when=FIRST_COMPLETED)
+    except BaseException:
+        # A second Ctrl-C doesn't wait for meetings or nodes to stop
+        aborted = True
+        raise
+    finally:
+        meeting_executor.shutdown(wait=not aborted, cancel_futures=True)
+        # Nodes a cancelled meeting abandoned still hold the pool; don't return while they write artifacts
+        node_executor.shutdown(wait=not aborted, cancel_futures=True)
+    wall_time = time.time() - start
+
+    # Meetings stopped before finishing are reported as cancelled, and those never started as skipped
+    meetings = []
+    for future, meeting_id in futures.items():
+        if future.done() and not future.cancelled() and future.exception() is None:
+            meetings.append(future.result())
+        else:
+            error = future.exception() if future.done() and not future.cancelled() else None
+            status = "error" if error else "cancelled" if meeting_id in started else "skipped"
+            meetings.append({"meeting_id": meeting_id, "notes_path": meeting_ids[meeting_id], "status": status,
+                             "error": str(error) if error else f"Batch {batch_deadline.reason() or 'stopped'}",
+                             "duration_s": 0.0})
+
+    report = build_batch_report(meetings, wall_time, max_parallelism, max_meetings)
+    save_json(report, os.path.join(output_dir, "batch_report.json"))
+    save_text(format_batch_report(report), os.path.join(output_dir, "batch_report.md"))
+    if batch_deadline.cancelled() and batch_deadline.reason() == "interrupted":
+        raise RunCancelled("Batch interrupted")
+    return report
+
+def build_batch_report(meetings: List[Dict[str, Any]], wall_time: float, max_parallelism: int, max_meetings: int) -> Dict[str, Any]:
+    """
+    Aggregate the results of a batch's meetings.
+
+    Args:
+        meetings: Per-meeting results from process_meeting
+        wall_time: Seconds the batch took
+        max_parallelism: Node budget of the batch
+        max_meetings: Maximum meetings in progress at once
+
+    Returns:
+        Batch report dictionary
+    """
+    counts = {status: 0 for status in ("success", "error", "cancelled", "skipped")}
+    for meeting in meetings:
+        counts[meeting["status"]] += 1
+    finished = [meeting["duration_s"] for meeting in meetings if meeting["status"] in ("success", "error")]
+    return {
+        "completed_at": datetime.now().isoformat(),
+        "meetings": len(meetings),
+        "counts": counts,
+        "max_parallelism": max_parallelism,
+        "max_meetings": max_meetings,
+        "wall_time_s": round(wall_time, 2),
+        "throughput_meetings_per_minute": round(counts["success"] / wall_time * 60, 2) if wall_time else 0.0,
+        "meeting_duration_s": summarize_latencies(finished),
+        "results": meetings
+    }
+
+def format_batch_report(report: Dict[str, Any]) -> str:
+    """
+    Format a batch report as Markdown.
+
+    Args:
+        report: Batch report from build_batch_report
+
+    Returns:
+        Markdown text
+    """
+    counts = report["counts"]
+    durations = report["meeting_duration_s"]
+    lines = [
+        "# Batch Report",
+        "",
+        f"- Meetings: {report['meetings']} ({counts['success']} succeeded, {counts['error']} failed, "
+        f"{counts['cancelled']} cancelled, {counts['skipped']} skipped)",
+        f"- Wall time: {report['wall_time_s']}s ({report['throughput_meetings_per_minute']} meetings/min)",
+        f"- Meeting duration: p50 {durations['p50']}s, p95 {durations['p95']}s, max {durations['max']}s",
+        f"- Concurrency: {report['max_meetings']} meetings, {report['max_parallelism']} nodes",
+        "",
+        "| Meeting | Status | Duration (s) | Error |",
+        "|---|---|---|---|"
+    ]
+    for meeting in report["results"]:
+        error = (meeting["error"] or "").replace("|", "\\|").replace("\n", " ")
+        lines.append(f"| {meeting['meeting_id']} | {meeting['status']} | {meeting['duration_s']} | {error} |")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,364 @@
+"""On-disk cache for LLM completions."""
+import os
+import json
+import time
+import hashlib
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+from src.utils.deadline_utils import DeadlineExceeded
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_MAX_ENTRIES = 10000
+DEFAULT_MAX_AGE_SECONDS = 30 * 24 * 60 * 60
+
+# Number of writes between full eviction sweeps of the cache directory
+EVICTION_INTERVAL = 50
+
+def default_cache_dir() -> str:
+    """
+    Get the default completion cache directory, under the user's cache directory.
+
+    Returns:
+        $XDG_CACHE_HOME/notegold/completions, or ~/.cache/notegold/completions
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "notegold", "completions")
+
+def make_cache_key(
+    model: str,
+    temperature: float,
+    system_message: str,
+    prompt: str,
+    max_tokens: Optional[int] = None,
+    response_format: Optional[Dict[str, Any]] = None
+) -> str:
+    """
+    Build a content-addressed cache key for a completion request.
+
+    Args:
+        model: Model name
+        temperature: Sampling temperature
+        system_message: System message
+        prompt: User prompt
+        max_tokens: Maximum tokens in response
+        response_format: Structured output format, if any
+
+    Returns:
+        SHA-256 hex digest identifying the request
+    """
+    request = {
+        "model": model,
+        "temperature": temperature,
+        "system_message": system_message,
+        "prompt": prompt,
+        "max_tokens": max_tokens
+    }
+    # Only included when set, so keys for plain requests are unchanged
+    if response_format:
+        request["response_format"] = response_format
+    payload = json.dumps(request, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class _InFlight:
+    """A completion currently being computed by one caller on behalf of others."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class CompletionCache:
+    """
+    Persistent completion cache with size- and age-based eviction.
+
+    Entries are stored as one JSON file per key under a two-level directory
+    fan-out. Reads refresh the entry's mtime so eviction is least-recently-used.
+    Concurrent requests for the same key are merged into a single computation.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory to store cache entries (default: default_cache_dir())
+            max_bytes: Maximum total size of cache entries
+            max_entries: Maximum number of cache entries
+            max_age_seconds: Entries older than this are treated as misses
+        """
+        self.cache_dir = os.path.abspath(cache_dir or default_cache_dir())
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.max_age_seconds = max_age_seconds
+
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, _InFlight] = {}
+        self._writes_since_eviction = 0
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "writes": 0,
+            "evictions": 0,
+            "errors": 0
+        }
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def _count(self, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[counter] += amount
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached completion.
+
+        Args:
+            key: Cache key from make_cache_key
+
+        Returns:
+            Cached completion text, or None on a miss
+        """
+        path = self._entry_path(key)
+        try:
+            age = time.time() - os.path.getmtime(path)
+            if age > self.max_age_seconds:
+                os.remove(path)
+                self._count("evictions")
+                return None
+
+            with open(path, 'r') as f:
+                entry = json.load(f)
+
+            # Touch the entry so eviction keeps recently used completions
+            os.utime(path, None)
+            return entry["response"]
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError):
+            self._count("errors")
+            return None
+
+    def set(self, key: str, response: str) -> None:
+        """
+        Store a completion in the cache.
+
+        Args:
+            key: Cache key from make_cache_key
+            response: Completion text
+        """
+        path = self._entry_path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, 'w') as f:
+                json.dump({"key": key, "created_at": time.time(), "response": response}, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            self._count("errors")
+            return
+
+        with self._lock:
+            self._counters["writes"] += 1
+            self._writes_since_eviction += 1
+            sweep = self._writes_since_eviction >= EVICTION_INTERVAL
+            if sweep:
+                self._writes_since_eviction = 0
+
+        if sweep:
+            self.evict()
+
+    def lookup(self, key: str) -> Optional[str]:
+        """
+        Look up a cached completion, counting the hit or miss.
+
+        Args:
+            key: Cache key from make_cache_key
+
+        Returns:
+            Cached completion text, or None on a miss
+        """
+        cached = self.get(key)
+        self._count("hits" if cached is not None else "misses")
+        return cached
+
+    def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Tuple[str, bool]],
+        deadline: Optional[float] = None
+    ) -> str:
+        """
+        Return the cached completion for key, computing it on a miss.
+
+        If another thread is already computing the same key, wait for its
+        result instead of issuing a duplicate upstream call.
+
+        Args:
+            key: Cache key from make_cache_key
+            compute: Function that produces the completion on a miss, and whether it may be cached
+            deadline: Optional time.time() after which to stop waiting for another thread's result
+
+        Returns:
+            Completion text
+
+        Raises:
+            DeadlineExceeded: If the deadline passes while waiting for another thread
+        """
+        cached = self.get(key)
+        if cached is not None:
+            self._count("hits")
+            return cached
+
+        with self._lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = _InFlight()
+                self._inflight[key] = flight
+
+        if not leader:
+            self._count("coalesced")
+            if not flight.done.wait(None if deadline is None else max(0.0, deadline - time.time())):
+                raise DeadlineExceeded("Deadline passed while waiting for an identical request in flight")
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        self._count("misses")
+        try:
+            flight.result, cacheable = compute()
+            if cacheable:
+                self.set(key, flight.result)
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.done.set()
+
+    def evict(self) -> int:
+        """
+        Remove expired entries, then the least recently used entries until
+        the cache is within its size and entry limits.
+
+        Returns:
+            Number of entries removed
+        """
+        entries = []
+        now = time.time()
+        removed = 0
+
+        if not os.path.isdir(self.cache_dir):
+            return 0
+
+        for shard in os.scandir(self.cache_dir):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if not entry.name.endswith(".json"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                if now - stat.st_mtime > self.max_age_seconds:
+                    removed += self._remove(entry.path)
+                else:
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        # Drop oldest entries first until within limits
+        entries.sort()
+        total_bytes = sum(size for _, size, _ in entries)
+        total_entries = len(entries)
+        for _, size, path in entries:
+            if total_bytes <= self.max_bytes and total_entries <= self.max_entries:
+                break
+            removed += self._remove(path)
+            total_bytes -= size
+            total_entries -= 1
+
+        self._count("evictions", removed)
+        return removed
+
+    def _remove(self, path: str) -> int:
+        try:
+            os.remove(path)
+            return 1
+        except FileNotFoundError:
+            return 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters.
+
+        Returns:
+            Dictionary with hit, miss, coalesced, write, eviction and error counts
+        """
+        with self._lock:
+            stats = dict(self._counters)
+
+        lookups = stats["hits"] + stats["misses"] + stats["coalesced"]
+        stats["hit_rate"] = round((stats["hits"] + stats["coalesced"]) / lookups, 3) if lookups else 0.0
+        return stats
+
+_completion_cache: Optional[CompletionCache] = None
+_completion_cache_lock = threading.Lock()
+
+def get_completion_cache() -> Optional[CompletionCache]:
+    """
+    Get the shared completion cache configured from environment variables.
+
+    NOTEGOLD_CACHE=0 disables caching entirely. NOTEGOLD_CACHE_DIR,
+    NOTEGOLD_CACHE_MAX_MB, NOTEGOLD_CACHE_MAX_ENTRIES and
+    NOTEGOLD_CACHE_MAX_AGE_DAYS override the defaults.
+
+    Returns:
+        CompletionCache, or None if caching is disabled
+    """
+    global _completion_cache
+
+    if os.environ.get("NOTEGOLD_CACHE", "1").lower() in ("0", "false", "off", "no"):
+        return None
+
+    with _completion_cache_lock:
+        if _completion_cache is None:
+            _completion_cache = CompletionCache(
+                cache_dir=os.environ.get("NOTEGOLD_CACHE_DIR") or None,
+                max_bytes=int(float(os.environ.get("NOTEGOLD_CACHE_MAX_MB", DEFAULT_MAX_BYTES / (1024 * 1024))) * 1024 * 1024),
+                max_entries=int(os.environ.get("NOTEGOLD_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)),
+                max_age_seconds=float(os.environ.get("NOTEGOLD_CACHE_MAX_AGE_DAYS", DEFAULT_MAX_AGE_SECONDS / 86400)) * 86400
+            )
+        return _completion_cache
+
+def get_cache_stats(since: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Get counters for the shared completion cache.
+
+    Args:
+        since: Optional earlier snapshot; if given, return the difference
+
+    Returns:
+        Dictionary of cache counters
+    """
+    cache = get_completion_cache()
+    stats = cache.stats() if cache else {"enabled": False}
+    if cache:
+        stats["enabled"] = True
+
+    if since and stats.get("enabled") and since.get("enabled"):
+        for counter in ("hits", "misses", "coalesced", "writes", "evictions", "errors"):
+            stats[counter] -= since.get(counter, 0)
+        lookups = stats["hits"] + stats["misses"] + stats["coalesced"]
+        stats["hit_rate"] = round((stats["hits"] + stats["coalesced"]) / lookups, 3) if lookups else 0.0
+
+    return stats
@@ -0,0 +1,347 @@
+"""SQLite catalog of processed meetings and their artifacts, with full-text search."""
+import os
+import re
+import glob
+import json
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+from src.utils.file_utils import load_json
+
+CATALOG_FILENAME = "catalog.db"
+
+# Kinds of searchable documents
+DOCUMENT_KINDS = ("meeting", "topic", "aida", "social")
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS meetings (
+        meeting_id TEXT PRIMARY KEY,
+        title TEXT,
+        date TEXT,
+        client_name TEXT,
+        project_name TEXT,
+        metadata TEXT,
+        indexed_at TEXT
+    );
+    CREATE TABLE IF NOT EXISTS topics (
+        id INTEGER PRIMARY KEY,
+        meeting_id TEXT NOT NULL,
+        rank INTEGER,
+        title TEXT,
+        description TEXT,
+        pain_point TEXT,
+        value_proposition TEXT,
+        audience TEXT,
+        content_format TEXT,
+        dream_outcome_score REAL,
+        probability_score REAL,
+        time_score REAL,
+        effort_score REAL,
+        value_score REAL,
+        priority TEXT
+    );
+    CREATE INDEX IF NOT EXISTS topics_meeting ON topics (meeting_id, title);
+    CREATE TABLE IF NOT EXISTS aida (
+        id INTEGER PRIMARY KEY,
+        meeting_id TEXT NOT NULL,
+        topic_title TEXT,
+        attention TEXT,
+        interest TEXT,
+        desire TEXT,
+        action TEXT,
+        full_content TEXT
+    );
+    CREATE INDEX IF NOT EXISTS aida_meeting ON aida (meeting_id);
+    CREATE TABLE IF NOT EXISTS social_posts (
+        id INTEGER PRIMARY KEY,
+        meeting_id TEXT NOT NULL,
+        topic_title TEXT,
+        platform TEXT,
+        approach TEXT,
+        content TEXT,
+        estimated_time INTEGER
+    );
+    CREATE INDEX IF NOT EXISTS social_posts_meeting ON social_posts (meeting_id);
+    CREATE VIRTUAL TABLE IF NOT EXISTS documents USING fts5 (
+        kind UNINDEXED,
+        meeting_id UNINDEXED,
+        ref UNINDEXED,
+        title,
+        body,
+        tokenize = 'porter unicode61'
+    );
+"""
+
+_DATE_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+_TERM_PATTERN = re.compile(r"[\w*]+", re.UNICODE)
+
+def get_catalog_path(meetings_dir: str) -> str:
+    """Get the catalog database of a meetings directory."""
+    return os.path.join(meetings_dir, CATALOG_FILENAME)
+
+def connect_catalog(catalog_path: str) -> sqlite3.Connection:
+    """
+    Open (or create) a catalog.
+
+    Args:
+        catalog_path: Catalog database file
+
+    Returns:
+        Connection in autocommit mode; callers open their own transactions
+
+    Raises:
+        ValueError: If SQLite was built without FTS5
+    """
+    db = sqlite3.connect(catalog_path, timeout=30, isolation_level=None)
+    db.row_factory = sqlite3.Row
+    db.execute("PRAGMA journal_mode=WAL")
+    try:
+        db.executescript(_SCHEMA)
+    except sqlite3.OperationalError as e:
+        db.close()
+        if "fts5" in str(e):
+            raise ValueError("The meeting catalog needs SQLite with FTS5, which this Python's sqlite3 lacks") from e
+        raise
+    return db
+
+def _read_meeting(meeting_dir: str) -> Optional[Dict[str, Any]]:
+    """Read the artifacts of a meeting directory, or None if it has none."""
+    artifacts_dir = os.path.join(meeting_dir, "artifacts")
+    metadata_paths = sorted(glob.glob(os.path.join(artifacts_dir, "*_metadata.json")))
+    if not metadata_paths:
+        return None
+
+    def optional(filename: str) -> List[Dict[str, Any]]:
+        path = os.path.join(artifacts_dir, filename)
+        return load_json(path) if os.path.exists(path) else []
+
+    metadata = load_json(metadata_paths[-1])
+    date = metadata.get("meeting_date") or ""
+    if not _DATE_PATTERN.match(date):
+        # Meetings without a usable date are dated by when they were processed
+        date = datetime.fromtimestamp(os.path.getmtime(metadata_paths[-1])).strftime("%Y-%m-%d")
+    return {
+        "metadata": metadata,
+        "date": date,
+        "topics": optional("ranked_topics.json") or optional("topic_ideas.json"),
+        "aida": optional("aida_content.json"),
+        "social_posts": optional("social_posts.json")
+    }
+
+def _index_meeting(db: sqlite3.Connection, meeting_id: str, meeting: Dict[str, Any]) -> None:
+    """Replace a meeting's rows; callers hold a transaction."""
+    _delete_meeting(db, meeting_id)
+    metadata = meeting["metadata"]
+
+    def document(kind: str, ref: Optional[int], title: str, *texts: Any) -> None:
+        body = "\n".join(" ".join(text) if isinstance(text, list) else str(text or "") for text in texts)
+        db.execute("INSERT INTO documents (kind, meeting_id, ref, title, body) VALUES (?, ?, ?, ?, ?)",
+                   (kind, meeting_id, ref, title, body))
+
+    db.execute(
+        "INSERT INTO meetings (meeting_id, title, date, client_name, project_name, metadata, indexed_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (meeting_id, metadata.get("meeting_title", ""), meeting["date"], metadata.get("client_name", ""),
+         metadata.get("project_name", ""), json.dumps(metadata), datetime.now().isoformat())
+    )
+    document("meeting", None, metadata.get("meeting_title", ""), metadata.get("client_name"), metadata.get("project_name"),
+             metadata.get("attendees"), metadata.get("main_topics"), metadata.get("pain_points"),
+             metadata.get("requested_deliverables"), metadata.get("next_steps"))
+
+    for rank, topic in enumerate(meeting["topics"], 1):
+        cursor = db.execute(
+            """INSERT INTO topics (meeting_id, rank, title, description, pain_point, value_proposition, audience, content_format,
+                                   dream_outcome_score, probability_score, time_score, effort_score, value_score, priority)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            (meeting_id, rank, topic.get("title"), topic.get("description"), topic.get("pain_point"),
+             topic.get("value_proposition"), topic.get("audience"), topic.get("content_format"),
+             topic.get("dream_outcome_score"), topic.get("probability_score"), topic.get("time_score"),
+             topic.get("effort_score"), topic.get("value_score"), topic.get("priority"))
+        )
+        document("topic", cursor.lastrowid, topic.get("title", ""), topic.get("description"), topic.get("pain_point"),
+                 topic.get("value_proposition"), topic.get("audience"))
+
+    for content in meeting["aida"]:
+        title = content.get("topic", {}).get("title", "")
+        cursor = db.execute(
+            "INSERT INTO aida (meeting_id, topic_title, attention, interest, desire, action, full_content) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (meeting_id, title, content.get("attention"), content.get("interest"), content.get("desire"),
+             content.get("action"), content.get("full_content"))
+        )
+        document("aida", cursor.lastrowid, title, content.get("attention"), content.get("interest"),
+                 content.get("desire"), content.get("action"))
+
+    for post in meeting["social_posts"]:
+        cursor = db.execute(
+            "INSERT INTO social_posts (meeting_id, topic_title, platform, approach, content, estimated_time) VALUES (?, ?, ?, ?, ?, ?)",
+            (meeting_id, post.get("topic_title"), post.get("platform"), post.get("approach"),
+             post.get("content"), post.get("estimated_time"))
+        )
+        document("social", cursor.lastrowid, post.get("topic_title", ""), post.get("platform"), post.get("content"))
+
+def _delete_meeting(db: sqlite3.Connection, meeting_id: str) -> None:
+    for table in ("meetings", "topics", "aida", "social_posts", "documents"):
+        db.execute(f"DELETE FROM {table} WHERE meeting_id = ?", (meeting_id,))
+
+def update_catalog(meeting_dir: str) -> bool:
+    """
+    Index a meeting's artifacts in its meetings directory's catalog, in one transaction.
+
+    Called at the end of every successful graph run; NOTEGOLD_CATALOG=0
+    turns this off. Failures are reported but don't fail the run, as the
+    catalog can be rebuilt from the meeting directories.
+
+    Args:
+        meeting_dir: Meeting directory
+
+    Returns:
+        Whether the meeting was indexed
+    """
+    if os.environ.get("NOTEGOLD_CATALOG", "1").lower() in ("0", "false", "off", "no"):
+        return False
+    try:
+        meeting = _read_meeting(meeting_dir)
+        if meeting is None:
+            return False
+        with closing(connect_catalog(get_catalog_path(os.path.dirname(os.path.abspath(meeting_dir))))) as db:
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                _index_meeting(db, os.path.basename(os.path.abspath(meeting_dir)), meeting)
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+        return True
+    except (OSError, ValueError, sqlite3.Error) as e:
+        print(f"Warning: could not update the meeting catalog: {e}")
+        return False
+
+def rebuild_catalog(meetings_dir: str) -> int:
+    """
+    Rebuild a catalog from the meeting directories, replacing its contents.
+
+    Args:
+        meetings_dir: Directory holding one directory per meeting
+
+    Returns:
+        Number of meetings indexed
+    """
+    meetings = {}
+    for entry in sorted(os.scandir(meetings_dir), key=lambda entry: entry.name):
+        if entry.is_dir():
+            meeting = _read_meeting(entry.path)
+            if meeting is not None:
+                meetings[entry.name] = meeting
+
+    with closing(connect_catalog(get_catalog_path(meetings_dir))) as db:
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            for table in ("meetings", "topics", "aida", "social_posts", "documents"):
+                db.execute(f"DELETE FROM {table}")
+            for meeting_id, meeting in meetings.items():
+                _index_meeting(db, meeting_id, meeting)
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        db.execute("INSERT INTO documents (documents) VALUES ('optimize')")
+    return len(meetings)
+
+def _match_expression(text: str) -> str:
+    """Turn free text into an FTS5 query matching all of its words (a trailing * matches prefixes)."""
+    terms = []
+    for term in _TERM_PATTERN.findall(text):
+        prefix = term.endswith("*")
+        term = term.strip("*")
+        if term:
+            terms.append(f'"{term}"*' if prefix else f'"{term}"')
+    return " ".join(terms)
+
+def search_catalog(
+    meetings_dir: str,
+    text: Optional[str] = None,
+    kinds: Optional[Sequence[str]] = None,
+    priority: Optional[str] = None,
+    min_score: Optional[float] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    meeting_id: Optional[str] = None,
+    limit: int = 20
+) -> List[Dict[str, Any]]:
+    """
+    Search the catalog.
+
+    Args:
+        meetings_dir: Directory holding one directory per meeting
+        text: Words that must all appear (best matches first); None lists the newest documents
+        kinds: Only these document kinds (see DOCUMENT_KINDS)
+        priority: Only topics, and their AIDA and social content, with this priority
+        min_score: Only topics, and their content, with at least this Value Equation score
+        since: Only meetings on or after this date (YYYY-MM-DD)
+        until: Only meetings on or before this date (YYYY-MM-DD)
+        meeting_id: Only this meeting
+        limit: Maximum results
+
+    Returns:
+        Matching documents with their kind, meeting, date, title, snippet,
+        and topic priority and score where there is one
+
+    Raises:
+        ValueError: If there is no catalog, or a kind or date is invalid
+    """
+    catalog_path = get_catalog_path(meetings_dir)
+    if not os.path.exists(catalog_path):
+        raise ValueError(f"No catalog in {meetings_dir}; build one with: notegold catalog rebuild")
+    for kind in kinds or ():
+        if kind not in DOCUMENT_KINDS:
+            raise ValueError(f"Unknown document kind {kind!r}; expected one of {', '.join(DOCUMENT_KINDS)}")
+    for date in (since, until):
+        if date and not _DATE_PATTERN.match(date):
+            raise ValueError(f"Dates must be YYYY-MM-DD, got {date!r}")
+
+    conditions = []
+    params: List[Any] = []
+    match = _match_expression(text or "")
+    if match:
+        conditions.append("documents MATCH ?")
+        params.append(match)
+    if kinds:
+        conditions.append(f"d.kind IN ({', '.join('?' for _ in kinds)})")
+        params.extend(kinds)
+    if priority:
+        conditions.append("t.priority = ? COLLATE NOCASE")
+        params.append(priority)
+    if min_score is not None:
+        conditions.append("t.value_score >= ?")
+        params.append(min_score)
+    if since:
+        conditions.append("m.date >= ?")
+        params.append(since)
+    if until:
+        conditions.append("m.date <= ?")
+        params.append(until)
+    if meeting_id:
+        conditions.append("d.meeting_id = ?")
+        params.append(meeting_id)
+
+    # AIDA and social documents are titled by their topic, which carries the priority and score
+    query = f"""
+        SELECT d.kind, d.meeting_id, m.date, m.title AS meeting_title, d.title,
+               {"snippet(documents, 4, '[', ']', '…', 12)" if match else "substr(d.body, 1, 120)"} AS snippet,
+               t.priority, t.value_score
+        FROM documents d
+        JOIN meetings m ON m.meeting_id = d.meeting_id
+        LEFT JOIN topics t ON d.kind != 'meeting' AND t.meeting_id = d.meeting_id AND t.title = d.title
+        {"WHERE " + " AND ".join(conditions) if conditions else ""}
+        ORDER BY {"bm25(documents)" if match else "m.date DESC, d.meeting_id, d.rowid"}
+        LIMIT ?
+    """
+    params.append(limit)
+    with closing(connect_catalog(catalog_path)) as db:
+        return [dict(row) for row in db.execute(query, params)]
+
+def catalog_stats(meetings_dir: str) -> Dict[str, int]:
+    """Count the meetings, topics, AIDA contents and social posts in a catalog."""
+    with closing(connect_catalog(get_catalog_path(meetings_dir))) as db:
+        return {table: db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("meetings", "topics", "aida", "social_posts")}
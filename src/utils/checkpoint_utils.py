@@ -0,0 +1,145 @@
+"""Durable checkpoints of graph runs, so a failed run can be resumed."""
+import os
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+from src.utils.artifact_utils import defer_write
+from src.utils.file_utils import save_text_atomic
+
+CHECKPOINT_FILENAME = "checkpoint.json"
+
+class RunCheckpoint:
+    """
+    Checkpoint of a graph run, kept in a meeting's metadata directory.
+
+    After every node finishes, the run's context and the IDs of the
+    completed nodes are written atomically, so the file always holds the
+    state after some whole number of nodes, even if the process crashes
+    mid-write. The results of a map node's finished items are checkpointed
+    as they come in, so a run stopped mid-node (e.g. by a deadline) resumes
+    with only the remaining items. During a run with an artifact writer,
+    checkpoints are written after the artifacts saved before them, so a
+    checkpoint never lists a node whose artifacts aren't on disk yet.
+    """
+
+    def __init__(self, metadata_dir: str):
+        """
+        Initialize the checkpoint.
+
+        Args:
+            metadata_dir: Meeting metadata directory
+        """
+        self.path = os.path.join(metadata_dir, CHECKPOINT_FILENAME)
+        self.state: Dict[str, Any] = {}
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """
+        Load the last checkpoint.
+
+        Returns:
+            Checkpoint dictionary with status, completed_nodes and context,
+            or None if there is no readable checkpoint
+        """
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def start(
+        self,
+        graph_name: str,
+        context: Dict[str, Any],
+        completed_nodes: Iterable[str] = (),
+        map_results: Optional[Dict[str, Dict[int, Any]]] = None
+    ) -> None:
+        """
+        Record the start of a run.
+
+        Args:
+            graph_name: Name of the graph being run
+            context: Context the run starts with
+            completed_nodes: Nodes already completed by the run being resumed
+            map_results: Finished item results of map nodes the run being resumed left incomplete
+        """
+        self.state = {
+            "graph_name": graph_name,
+            "status": "running",
+            "started_at": datetime.now().isoformat(),
+            "completed_nodes": list(completed_nodes),
+            "failed_node": None,
+            "error": None,
+            "context": context,
+            "map_results": {node_id: {str(index): result for index, result in results.items()}
+                            for node_id, results in (map_results or {}).items()}
+        }
+        self._save()
+
+    def node_completed(self, node_id: str, context: Dict[str, Any]) -> None:
+        """
+        Record a completed node and the context after merging its results.
+
+        Args:
+            node_id: ID of the completed node
+            context: Context after the node's results were merged
+        """
+        if node_id not in self.state["completed_nodes"]:
+            self.state["completed_nodes"].append(node_id)
+        self.state["context"] = context
+        self.state["map_results"].pop(node_id, None)
+        self._save()
+
+    def map_item_completed(self, node_id: str, index: int, result: Dict[str, Any]) -> None:
+        """
+        Record the result of one item of a map node that is still running.
+
+        Args:
+            node_id: ID of the map node
+            index: Index of the item
+            result: The item's result
+        """
+        self.state["map_results"].setdefault(node_id, {})[str(index)] = result
+        self._save()
+
+    def node_failed(self, node_id: str, error: BaseException) -> None:
+        """
+        Record the node whose failure stopped the run.
+
+        Args:
+            node_id: ID of the failed node
+            error: Exception raised by the node
+        """
+        self.state.update(status="failed", failed_node=node_id, error=str(error))
+        self._save()
+
+    def run_completed(self) -> None:
+        """Record that every node has completed."""
+        self.state.update(status="complete", completed_at=datetime.now().isoformat())
+        self._save()
+
+    @staticmethod
+    def map_results(state: Dict[str, Any]) -> Dict[str, Dict[int, Any]]:
+        """
+        Get the finished item results of incomplete map nodes from a loaded checkpoint.
+
+        Args:
+            state: Checkpoint dictionary (see load)
+
+        Returns:
+            Dictionary mapping map node IDs to their item results by index
+        """
+        return {
+            node_id: {int(index): result for index, result in results.items()}
+            for node_id, results in state.get("map_results", {}).items()
+        }
+
+    @property
+    def completed_nodes(self) -> List[str]:
+        """IDs of the nodes completed so far, in completion order."""
+        return list(self.state.get("completed_nodes", []))
+
+    def _save(self) -> None:
+        self.state["updated_at"] = datetime.now().isoformat()
+        defer_write(save_text_atomic, json.dumps(self.state, indent=2, default=str), self.path)
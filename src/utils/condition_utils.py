@@ -0,0 +1,201 @@
+"""A small, sandboxed expression language for processing graph edge conditions."""
+import ast
+import operator
+from typing import Any, Callable, Dict
+from src.utils.artifact_utils import load_artifact
+
+# Longest condition accepted, to keep evaluation cheap
+MAX_CONDITION_LENGTH = 500
+
+def _numeric(function: Callable[[Any, Any], Any], verb: str) -> Callable[[Any, Any], Any]:
+    """Restrict an arithmetic operator to numbers."""
+    def apply(left: Any, right: Any) -> Any:
+        # Repeating, concatenating or %-formatting strings and lists could build arbitrarily large values
+        if not isinstance(left, (int, float)) or not isinstance(right, (int, float)):
+            raise ConditionError(f"Only numbers can be {verb} in conditions")
+        return function(left, right)
+    return apply
+
+def _mean(values: Any) -> float:
+    values = list(values)
+    return sum(values) / len(values) if values else 0.0
+
+SAFE_FUNCTIONS: Dict[str, Callable[..., Any]] = {
+    "len": len,
+    "min": min,
+    "max": max,
+    "sum": sum,
+    "mean": _mean,
+    "any": any,
+    "all": all,
+    "abs": abs,
+    "round": round
+}
+
+_BINARY_OPERATORS = {
+    ast.Add: _numeric(operator.add, "added"),
+    ast.Sub: _numeric(operator.sub, "subtracted"),
+    ast.Mult: _numeric(operator.mul, "multiplied"),
+    ast.Div: _numeric(operator.truediv, "divided"),
+    ast.Mod: _numeric(operator.mod, "used with %")
+}
+
+_UNARY_OPERATORS = {
+    ast.Not: operator.not_,
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos
+}
+
+_COMPARISONS = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.In: lambda left, right: left in right,
+    ast.NotIn: lambda left, right: left not in right
+}
+
+class ConditionError(ValueError):
+    """Raised when a condition is invalid or can't be evaluated against the context."""
+
+class Condition:
+    """
+    A parsed edge condition, evaluated against a graph run's context.
+
+    Conditions are Python-like expressions limited to literals, context
+    names, comparisons, boolean operators, arithmetic on numbers, indexing
+    and the functions in SAFE_FUNCTIONS. An attribute of a list maps over its items,
+    so ranked_topics.value_score is the list of every topic's score:
+
+        max(ranked_topics.value_score) > 2.0
+        len(topics) > 0 and ranked_topics[0].priority == "high"
+
+    A name that isn't in the context but has a "<name>_path" entry is loaded
+    from that artifact.
+    """
+
+    def __init__(self, expression: str):
+        """
+        Parse and check a condition.
+
+        Args:
+            expression: Condition text
+
+        Raises:
+            ConditionError: If the expression is too long, isn't valid syntax
+                or uses anything outside the condition language
+        """
+        self.expression = expression.strip()
+        if len(self.expression) > MAX_CONDITION_LENGTH:
+            raise ConditionError(f"Condition is longer than {MAX_CONDITION_LENGTH} characters: {self.expression[:40]}...")
+        try:
+            self._tree = ast.parse(self.expression, mode="eval").body
+        except SyntaxError as e:
+            raise ConditionError(f"Invalid condition {self.expression!r}: {e.msg}") from e
+        self._check(self._tree)
+
+    def evaluate(self, context: Dict[str, Any]) -> bool:
+        """
+        Evaluate the condition.
+
+        Args:
+            context: Graph run context
+
+        Returns:
+            Truth value of the condition
+
+        Raises:
+            ConditionError: If a name is missing or an operation fails
+        """
+        try:
+            return bool(self._evaluate(self._tree, context))
+        except ConditionError:
+            raise
+        except Exception as e:
+            raise ConditionError(f"Cannot evaluate condition {self.expression!r}: {e}") from e
+
+    def __repr__(self) -> str:
+        return f"Condition({self.expression!r})"
+
+    def _check(self, node: ast.AST) -> None:
+        """Reject any syntax outside the condition language."""
+        if isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.func.id not in SAFE_FUNCTIONS:
+                raise ConditionError(f"Condition {self.expression!r} calls an unknown function; allowed: {sorted(SAFE_FUNCTIONS)}")
+            if node.keywords:
+                raise ConditionError(f"Condition {self.expression!r} uses keyword arguments")
+            for arg in node.args:
+                self._check(arg)
+            return
+
+        allowed = (
+            ast.BoolOp, ast.And, ast.Or, ast.UnaryOp, ast.BinOp, ast.Compare, ast.Name, ast.Load,
+            ast.Constant, ast.Attribute, ast.Subscript, ast.Slice, ast.List, ast.Tuple,
+            *_BINARY_OPERATORS, *_UNARY_OPERATORS, *_COMPARISONS
+        )
+        if not isinstance(node, allowed):
+            raise ConditionError(f"Condition {self.expression!r} uses unsupported syntax: {type(node).__name__}")
+        if isinstance(node, ast.Attribute) and node.attr.startswith("_"):
+            raise ConditionError(f"Condition {self.expression!r} uses a private attribute: {node.attr}")
+        for child in ast.iter_child_nodes(node):
+            self._check(child)
+
+    def _evaluate(self, node: ast.AST, context: Dict[str, Any]) -> Any:
+        if isinstance(node, ast.Constant):
+            return node.value
+        if isinstance(node, ast.Name):
+            return _lookup(node.id, context)
+        if isinstance(node, (ast.List, ast.Tuple)):
+            return [self._evaluate(element, context) for element in node.elts]
+        if isinstance(node, ast.BoolOp):
+            # Short-circuit, so "len(x) > 0 and max(x) > 1" is safe on empty lists
+            result = isinstance(node.op, ast.And)
+            for value in node.values:
+                result = self._evaluate(value, context)
+                if isinstance(node.op, ast.And) != bool(result):
+                    return result
+            return result
+        if isinstance(node, ast.UnaryOp):
+            return _UNARY_OPERATORS[type(node.op)](self._evaluate(node.operand, context))
+        if isinstance(node, ast.BinOp):
+            return _BINARY_OPERATORS[type(node.op)](self._evaluate(node.left, context), self._evaluate(node.right, context))
+        if isinstance(node, ast.Compare):
+            left = self._evaluate(node.left, context)
+            for op, comparator in zip(node.ops, node.comparators):
+                right = self._evaluate(comparator, context)
+                if not _COMPARISONS[type(op)](left, right):
+                    return False
+                left = right
+            return True
+        if isinstance(node, ast.Attribute):
+            return _field(self._evaluate(node.value, context), node.attr)
+        if isinstance(node, ast.Subscript):
+            value = self._evaluate(node.value, context)
+            if isinstance(node.slice, ast.Slice):
+                bounds = [self._evaluate(bound, context) if bound is not None else None
+                          for bound in (node.slice.lower, node.slice.upper, node.slice.step)]
+                return value[slice(*bounds)]
+            return value[self._evaluate(node.slice, context)]
+        if isinstance(node, ast.Call):
+            return SAFE_FUNCTIONS[node.func.id](*(self._evaluate(arg, context) for arg in node.args))
+        raise ConditionError(f"Condition {self.expression!r} uses unsupported syntax: {type(node).__name__}")
+
+def _lookup(name: str, context: Dict[str, Any]) -> Any:
+    """Get a name from the context, loading it from its artifact path if only that is there."""
+    if name in context:
+        return context[name]
+    if f"{name}_path" in context:
+        return load_artifact(context[f"{name}_path"])
+    raise ConditionError(f"Unknown name in condition: {name}")
+
+def _field(value: Any, name: str) -> Any:
+    """Get a field of a dictionary, or of every dictionary in a list."""
+    if isinstance(value, list):
+        return [_field(item, name) for item in value]
+    if isinstance(value, dict):
+        if name not in value:
+            raise ConditionError(f"No field {name!r} in condition value")
+        return value[name]
+    raise ConditionError(f"Cannot get field {name!r} of {type(value).__name__}")
@@ -0,0 +1,209 @@
+"""Deadlines and cooperative cancellation for graph runs and the LLM calls they make."""
+import os
+import signal
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+# How often work waiting on something else checks whether its deadline passed or was cancelled, in seconds
+CANCEL_CHECK_SECONDS = 0.25
+
+_current_deadline: contextvars.ContextVar[Optional["Deadline"]] = contextvars.ContextVar("notegold_deadline", default=None)
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a node or run takes longer than its timeout."""
+
+class RunCancelled(Exception):
+    """Raised when a run is cancelled, e.g. by Ctrl-C."""
+
+class Deadline:
+    """
+    A point in time by which work must finish, which can also be cancelled.
+
+    A deadline with a parent expires no later than the parent and is
+    cancelled along with it, so a node's deadline is bounded by its run's.
+    Work checks its deadline cooperatively (see check_deadline): LLM calls
+    check it before each attempt and between streamed chunks, and bound
+    their HTTP timeouts by the time remaining.
+    """
+
+    def __init__(self, timeout: Optional[float] = None, parent: Optional["Deadline"] = None, name: str = "run"):
+        """
+        Initialize the deadline.
+
+        Args:
+            timeout: Seconds from now (None or 0 for no time limit)
+            parent: Enclosing deadline
+            name: What the deadline applies to, used in error messages
+        """
+        self.parent = parent
+        self.name = name
+        self.restart(timeout)
+        self._cancelled = threading.Event()
+        self._reason = ""
+
+    def restart(self, timeout: Optional[float] = None) -> None:
+        """
+        Set the time limit again, counting from now.
+
+        Used when the work a deadline bounds can't really start until later
+        than the deadline is needed, e.g. a node fed item by item by another.
+
+        Args:
+            timeout: Seconds from now (None or 0 for no time limit)
+        """
+        self.timeout = timeout or None
+        expires_at = time.time() + timeout if timeout else None
+        if self.parent is not None and self.parent.expires_at is not None:
+            expires_at = self.parent.expires_at if expires_at is None else min(expires_at, self.parent.expires_at)
+        self.expires_at = expires_at
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left before the deadline (never negative), or None without a time limit."""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.time())
+
+    def expired(self) -> bool:
+        """Check whether the deadline has passed."""
+        return self.expires_at is not None and time.time() >= self.expires_at
+
+    def cancel(self, reason: str = "cancelled") -> None:
+        """Cancel the work under this deadline and any deadline derived from it."""
+        if not self._cancelled.is_set():
+            self._reason = reason
+            self._cancelled.set()
+
+    def cancelled(self) -> bool:
+        """Check whether this deadline, or its parent, was cancelled."""
+        return self._cancelled.is_set() or (self.parent is not None and self.parent.cancelled())
+
+    def check(self) -> None:
+        """
+        Raise if the work should stop.
+
+        Raises:
+            RunCancelled: If the deadline or its parent was cancelled
+            DeadlineExceeded: If the deadline has passed
+        """
+        if self.cancelled():
+            raise RunCancelled(f"{self.name} {self.reason()}")
+        if self.expired():
+            raise self.exceeded()
+
+    def reason(self) -> str:
+        """Why the deadline was cancelled (its own reason, else its parent's)."""
+        if self._cancelled.is_set():
+            return self._reason
+        return self.parent.reason() if self.parent is not None else ""
+
+    def exceeded(self) -> DeadlineExceeded:
+        """Build the error for this deadline having passed."""
+        if self.parent is not None and self.parent.expires_at == self.expires_at and self.parent.expired():
+            return self.parent.exceeded()
+        return DeadlineExceeded(f"{self.name} exceeded its {self.timeout:g}s timeout" if self.timeout else f"{self.name} exceeded its deadline")
+
+    def bound(self, timeout: float) -> float:
+        """Limit a timeout in seconds to the time remaining."""
+        remaining = self.remaining()
+        return timeout if remaining is None else min(timeout, remaining)
+
+@contextmanager
+def use_deadline(deadline: Optional[Deadline]) -> Iterator[Optional[Deadline]]:
+    """
+    Apply a deadline to the work done within the block.
+
+    The deadline is held in a context variable, so it follows the calls a
+    processor fans out to other threads (see run_with_concurrency).
+
+    Args:
+        deadline: Deadline to apply (None for none)
+    """
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+def get_deadline() -> Optional[Deadline]:
+    """Get the deadline applied by the enclosing use_deadline block, if any."""
+    return _current_deadline.get()
+
+def check_deadline() -> None:
+    """Raise if the current deadline has passed or was cancelled (see Deadline.check)."""
+    deadline = _current_deadline.get()
+    if deadline is not None:
+        deadline.check()
+
+def sleep_checking_deadline(seconds: float) -> None:
+    """
+    Sleep, waking to raise as soon as the current deadline passes or is cancelled.
+
+    Args:
+        seconds: How long to sleep
+
+    Raises:
+        RunCancelled: If the current deadline is cancelled
+        DeadlineExceeded: If the current deadline passes
+    """
+    deadline = _current_deadline.get()
+    if deadline is None:
+        time.sleep(seconds)
+        return
+
+    wake_at = time.time() + seconds
+    while True:
+        deadline.check()
+        remaining = wake_at - time.time()
+        if remaining <= 0:
+            return
+        time.sleep(deadline.bound(min(remaining, CANCEL_CHECK_SECONDS)))
+
+def deadline_timestamp() -> Optional[float]:
+    """Get the time.time() at which the current deadline expires, if it has one."""
+    deadline = _current_deadline.get()
+    return deadline.expires_at if deadline is not None else None
+
+def get_cancel_grace(grace: Optional[float] = None) -> float:
+    """
+    Resolve how long a cancelled run waits for running nodes to stop before abandoning them.
+
+    Args:
+        grace: Explicit grace period in seconds (overrides NOTEGOLD_CANCEL_GRACE)
+
+    Returns:
+        Grace period in seconds (default 5)
+    """
+    if grace is None:
+        grace = float(os.environ.get("NOTEGOLD_CANCEL_GRACE", 5))
+    return max(0.0, grace)
+
+@contextmanager
+def cancel_on_interrupt(deadline: Deadline) -> Iterator[None]:
+    """
+    Turn Ctrl-C into a cancellation of a deadline within the block.
+
+    The first Ctrl-C cancels the deadline so running work can stop
+    cleanly; a second one raises KeyboardInterrupt as usual. Outside the
+    main thread, where signal handlers can't be installed, this does nothing.
+
+    Args:
+        deadline: Deadline to cancel
+    """
+    if threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def handle_interrupt(signum, frame):
+        if deadline.cancelled():
+            raise KeyboardInterrupt
+        print("\nInterrupted; stopping running nodes (press Ctrl-C again to abort)")
+        deadline.cancel("interrupted")
+
+    previous = signal.signal(signal.SIGINT, handle_interrupt)
+    try:
+        yield
+    finally:
+        signal.signal(signal.SIGINT, previous)
@@ -0,0 +1,482 @@
+"""Deterministic stand-in for the OpenAI chat completions API, for offline benchmarking."""
+import os
+import re
+import json
+import time
+import random
+import hashlib
+import itertools
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+DEFAULT_FAKE_LLM_CONFIG = {
+    # Seed for latency and error sampling; response content depends only on the prompt
+    "seed": 0,
+    # Time to first token: "fixed" (median_ms), "uniform" (low_ms..high_ms) or "lognormal" (median_ms, sigma)
+    "latency": {
+        "distribution": "lognormal",
+        "median_ms": 800,
+        "sigma": 0.5,
+        "low_ms": 200,
+        "high_ms": 2000,
+        "max_ms": 60000
+    },
+    # Generation speed after the first token (0 for instant)
+    "tokens_per_second": 50,
+    # Fraction of requests that fail with error_status
+    "error_rate": 0.0,
+    "error_status": 429,
+    "retry_after": 1,
+    # Canned responses by task (metadata, topics, ranking, aida, social, generic);
+    # strings are returned as-is, other values are returned as JSON
+    "responses": {},
+    # Number of topics generated for the topics task
+    "topic_count": 5
+}
+
+TASK_MARKERS = [
+    ("social", "social media posts"),
+    ("aida", "AIDA framework"),
+    ("ranking", "Value Equation"),
+    ("topics", "content topic ideas"),
+    ("metadata", "metadata from these meeting notes")
+]
+
+WORDS = (
+    "workflow automation pipeline insight strategy adoption onboarding latency "
+    "integration roadmap customer team process quality delivery platform scale "
+    "analytics experiment outcome growth cost efficiency review feedback launch"
+).split()
+
+def load_fake_llm_config(config_path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Load fake LLM settings, merged over DEFAULT_FAKE_LLM_CONFIG.
+
+    Args:
+        config_path: JSON config file (defaults to NOTEGOLD_FAKE_LLM_CONFIG if set)
+
+    Returns:
+        Configuration dictionary
+    """
+    config = json.loads(json.dumps(DEFAULT_FAKE_LLM_CONFIG))
+    config_path = config_path or os.environ.get("NOTEGOLD_FAKE_LLM_CONFIG")
+    if config_path:
+        with open(config_path, 'r') as f:
+            overrides = json.load(f)
+        latency = overrides.pop("latency", {})
+        config.update(overrides)
+        config["latency"].update(latency)
+    return config
+
+def detect_task(messages: List[Dict[str, str]]) -> str:
+    """
+    Work out which processor a request comes from, based on its prompt.
+
+    Args:
+        messages: Chat messages
+
+    Returns:
+        Task name (metadata, topics, ranking, aida, social or generic)
+    """
+    text = "\n".join(message.get("content", "") for message in messages)
+    for task, marker in TASK_MARKERS:
+        if marker in text:
+            return task
+    return "generic"
+
+def _estimate_tokens(text: str) -> int:
+    return len(text) // 4 + 1
+
+def _phrase(rng: random.Random, length: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(length)).capitalize()
+
+def _embedded_json(text: str) -> Any:
+    """Find the first JSON array embedded in a prompt (e.g. the topics being ranked)."""
+    match = re.search(r'\[\s*\{[\s\S]*\}\s*\]', text)
+    if not match:
+        return []
+    try:
+        return json.loads(match.group(0))
+    except json.JSONDecodeError:
+        return []
+
+def _fake_metadata(rng: random.Random) -> Dict[str, Any]:
+    return {
+        "meeting_title": _phrase(rng, 4),
+        "meeting_date": "",
+        "attendees": [_phrase(rng, 2) for _ in range(3)],
+        "client_name": _phrase(rng, 2),
+        "primary_contact": _phrase(rng, 2),
+        "project_name": _phrase(rng, 3),
+        "main_topics": [_phrase(rng, 3) for _ in range(4)],
+        "pain_points": [_phrase(rng, 5) for _ in range(3)],
+        "requested_deliverables": [_phrase(rng, 4) for _ in range(2)],
+        "next_steps": [_phrase(rng, 5) for _ in range(2)]
+    }
+
+def _fake_topics(rng: random.Random, count: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "title": _phrase(rng, 6),
+            "description": _phrase(rng, 18),
+            "pain_point": _phrase(rng, 8),
+            "value_proposition": _phrase(rng, 12),
+            "audience": _phrase(rng, 4),
+            "content_format": rng.choice(["blog", "whitepaper", "case study", "video"])
+        }
+        for _ in range(count)
+    ]
+
+def _fake_ranking(rng: random.Random, prompt: str) -> List[Dict[str, Any]]:
+    ranked = []
+    for topic in _embedded_json(prompt):
+        scores = {
+            "dream_outcome_score": rng.randint(4, 10),
+            "probability_score": rng.randint(4, 10),
+            "time_score": rng.randint(1, 8),
+            "effort_score": rng.randint(1, 8)
+        }
+        value_score = (scores["dream_outcome_score"] * scores["probability_score"]) / (scores["time_score"] * scores["effort_score"])
+        ranked.append(dict(
+            topic,
+            **scores,
+            value_score=round(value_score, 2),
+            priority="High" if value_score >= 4 else "Medium" if value_score >= 1.5 else "Low"
+        ))
+    return ranked
+
+def _fake_aida(rng: random.Random) -> str:
+    sections = ["Attention", "Interest", "Desire", "Action"]
+    body = {section: " ".join(_phrase(rng, 12) + "." for _ in range(3)) for section in sections}
+    lines = []
+    for section in sections:
+        lines.append(f"## {section}\n\n{body[section]}\n")
+    lines.append("## Full Content\n\n" + "\n\n".join(body[section] for section in sections) + "\n")
+    return "\n".join(lines)
+
+def _fake_social(rng: random.Random) -> List[Dict[str, Any]]:
+    return [
+        {
+            "platform": platform,
+            "approach": approach,
+            "content": " ".join(_phrase(rng, 10) + "." for _ in range(2 if platform == "Twitter" else 4)),
+            "estimated_time": rng.randint(5, 30)
+        }
+        for platform in ["Twitter", "LinkedIn"]
+        for approach in ["surprising insight", "common mistake", "transformative outcome"]
+    ]
+
+class FakeLLMError(Exception):
+    """Simulated API error carrying a status code and Retry-After header like the OpenAI client's errors."""
+
+    def __init__(self, status_code: int, retry_after: Optional[float] = None):
+        super().__init__(f"Fake LLM error {status_code}")
+        self.status_code = status_code
+        headers = {"retry-after": str(retry_after)} if retry_after is not None else {}
+        self.response = SimpleNamespace(status_code=status_code, headers=headers)
+
+class FakeLLM:
+    """
+    Generates deterministic, schema-valid completions for each notegold processor.
+
+    Response content is derived from a hash of the request, so the same
+    prompt always gets the same answer. Latency and errors are sampled from
+    a seeded generator, so a sequence of requests is reproducible.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the fake LLM.
+
+        Args:
+            config: Settings (defaults to load_fake_llm_config())
+        """
+        self.config = config or load_fake_llm_config()
+        self._rng = random.Random(self.config["seed"])
+        self._lock = threading.Lock()
+
+    def generate(self, messages: List[Dict[str, str]], json_mode: bool = False) -> str:
+        """
+        Produce the completion text for a request.
+
+        Args:
+            messages: Chat messages
+            json_mode: Return bare JSON objects instead of markdown-fenced JSON
+
+        Returns:
+            Completion text
+        """
+        task = detect_task(messages)
+        digest = hashlib.sha256(json.dumps(messages, sort_keys=True).encode("utf-8")).hexdigest()
+        rng = random.Random(int(digest[:16], 16) ^ self.config["seed"])
+        prompt = messages[-1].get("content", "") if messages else ""
+
+        canned = self.config["responses"].get(task)
+        if canned is not None:
+            return canned if isinstance(canned, str) else json.dumps(canned, indent=2)
+
+        if task == "metadata":
+            data = _fake_metadata(rng)
+        elif task == "topics":
+            data = _fake_topics(rng, self.config["topic_count"])
+            if json_mode:
+                data = {"topics": data}
+        elif task == "ranking":
+            data = _fake_ranking(rng, prompt)
+            if json_mode:
+                data = {"topics": data}
+        elif task == "social":
+            data = _fake_social(rng)
+            if json_mode:
+                data = {"posts": data}
+        elif task == "aida":
+            return _fake_aida(rng)
+        else:
+            return _phrase(rng, 40) + "."
+
+        text = json.dumps(data, indent=2)
+        return text if json_mode else f"```json\n{text}\n```"
+
+    def sample_latency(self) -> float:
+        """Sample a time to first token in seconds."""
+        latency = self.config["latency"]
+        with self._lock:
+            if latency["distribution"] == "fixed":
+                latency_ms = latency["median_ms"]
+            elif latency["distribution"] == "uniform":
+                latency_ms = self._rng.uniform(latency["low_ms"], latency["high_ms"])
+            else:
+                latency_ms = self._rng.lognormvariate(0, latency["sigma"]) * latency["median_ms"]
+        return min(latency_ms, latency["max_ms"]) / 1000
+
+    def sample_error(self) -> Optional[FakeLLMError]:
+        """Decide whether the next request fails, returning the error to raise."""
+        with self._lock:
+            failed = self._rng.random() < self.config["error_rate"]
+        if failed:
+            return FakeLLMError(self.config["error_status"], self.config["retry_after"])
+        return None
+
+    def complete(self, params: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Answer a non-streaming chat completion request.
+
+        Args:
+            params: OpenAI chat completion request parameters
+            timeout: Request timeout in seconds, as passed to the client
+
+        Returns:
+            Dictionary with "content", "finish_reason" and "usage"
+        """
+        error = self.sample_error()
+        self._wait(self.sample_latency(), timeout)
+        if error:
+            raise error
+
+        content, finish_reason = self._content(params)
+        tokens_per_second = self.config["tokens_per_second"]
+        if tokens_per_second:
+            time.sleep(_estimate_tokens(content) / tokens_per_second)
+        return {"content": content, "finish_reason": finish_reason, "usage": self._usage(params, content)}
+
+    def stream(self, params: Dict[str, Any], timeout: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Answer a streaming chat completion request.
+
+        Args:
+            params: OpenAI chat completion request parameters
+            timeout: Request timeout in seconds, as passed to the client
+
+        Yields:
+            Dictionaries with a "content" chunk, then one with the "finish_reason", then a final one with "usage"
+        """
+        error = self.sample_error()
+        self._wait(self.sample_latency(), timeout)
+        if error:
+            raise error
+
+        content, finish_reason = self._content(params)
+        tokens_per_second = self.config["tokens_per_second"]
+        # Emit roughly one token (4 characters) per chunk
+        for i in range(0, len(content), 4):
+            if tokens_per_second and i:
+                time.sleep(1 / tokens_per_second)
+            yield {"content": content[i:i + 4]}
+        yield {"content": "", "finish_reason": finish_reason}
+        yield {"content": "", "usage": self._usage(params, content)}
+
+    def _wait(self, latency: float, timeout: Optional[float]) -> None:
+        # Like a real client, give up once the request's timeout passes
+        if timeout is not None and latency > timeout:
+            time.sleep(timeout)
+            raise TimeoutError(f"Fake LLM request timed out after {timeout:.2f}s")
+        time.sleep(latency)
+
+    def _content(self, params: Dict[str, Any]) -> Tuple[str, str]:
+        response_format = params.get("response_format") or {}
+        json_mode = response_format.get("type") in ("json_object", "json_schema")
+        content = self.generate(params.get("messages", []), json_mode=json_mode)
+        # Like a real model, stop mid-response when max_tokens runs out
+        max_tokens = params.get("max_tokens")
+        if max_tokens is not None and _estimate_tokens(content) > max_tokens:
+            return content[:max_tokens * 4], "length"
+        return content, "stop"
+
+    def _usage(self, params: Dict[str, Any], content: str) -> Dict[str, int]:
+        prompt_tokens = sum(_estimate_tokens(m.get("content", "")) for m in params.get("messages", []))
+        completion_tokens = _estimate_tokens(content)
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens
+        }
+
+def _to_namespace(data: Any) -> Any:
+    if isinstance(data, dict):
+        return SimpleNamespace(**{key: _to_namespace(value) for key, value in data.items()})
+    if isinstance(data, list):
+        return [_to_namespace(item) for item in data]
+    return data
+
+class FakeLLMClient:
+    """In-process client exposing the subset of the OpenAI client interface notegold uses."""
+
+    def __init__(self, fake_llm: Optional[FakeLLM] = None):
+        """
+        Initialize the client.
+
+        Args:
+            fake_llm: FakeLLM to answer requests (defaults to one built from load_fake_llm_config())
+        """
+        self.fake_llm = fake_llm or FakeLLM()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, **params: Any) -> Any:
+        model = params.get("model", "fake")
+        timeout = params.pop("timeout", None)
+        if params.get("stream"):
+            # Like the real client, wait for the response to start before returning the stream
+            chunks = self.fake_llm.stream(params, timeout)
+            first_chunk = next(chunks)
+            return self._stream(itertools.chain([first_chunk], chunks), model)
+
+        result = self.fake_llm.complete(params, timeout)
+        return _to_namespace({
+            "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": result["content"]}, "finish_reason": result["finish_reason"]}],
+            "usage": result["usage"]
+        })
+
+    def _stream(self, chunks: Iterator[Dict[str, Any]], model: str) -> Iterator[Any]:
+        for chunk in chunks:
+            if "usage" in chunk:
+                yield _to_namespace({"model": model, "choices": [], "usage": chunk["usage"]})
+            else:
+                yield _to_namespace({
+                    "model": model,
+                    "choices": [{"index": 0, "delta": {"content": chunk["content"]}, "finish_reason": chunk.get("finish_reason")}],
+                    "usage": None
+                })
+
+    def close(self) -> None:
+        """Nothing to release; present for interface compatibility."""
+
+class _FakeLLMRequestHandler(BaseHTTPRequestHandler):
+    """Serves the OpenAI chat completions protocol from a FakeLLM."""
+
+    fake_llm: FakeLLM = None
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "/v1/models":
+            self._send_json(200, {"object": "list", "data": [{"id": "fake", "object": "model"}]})
+        else:
+            self._send_json(404, {"error": {"message": "Not found"}})
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/v1/chat/completions":
+            self._send_json(404, {"error": {"message": "Not found"}})
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        params = json.loads(self.rfile.read(length) or b"{}")
+        completion_id = f"chatcmpl-fake-{int(time.time() * 1000)}"
+        model = params.get("model", "fake")
+
+        try:
+            if params.get("stream"):
+                self._stream(params, completion_id, model)
+            else:
+                result = self.fake_llm.complete(params)
+                self._send_json(200, {
+                    "id": completion_id,
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": model,
+                    "choices": [{"index": 0, "message": {"role": "assistant", "content": result["content"]}, "finish_reason": result["finish_reason"]}],
+                    "usage": result["usage"]
+                })
+        except FakeLLMError as e:
+            self._send_json(e.status_code, {"error": {"message": str(e), "type": "fake_error"}}, e.response.headers)
+
+    def _stream(self, params: Dict[str, Any], completion_id: str, model: str) -> None:
+        chunks = self.fake_llm.stream(params)
+        # Sample latency and errors before committing to a 200 response
+        first_chunk = next(chunks)
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+
+        include_usage = (params.get("stream_options") or {}).get("include_usage")
+        for chunk in [first_chunk, *chunks]:
+            event = {"id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()), "model": model}
+            if "usage" in chunk:
+                if not include_usage:
+                    continue
+                event.update(choices=[], usage=chunk["usage"])
+            else:
+                event.update(choices=[{"index": 0, "delta": {"content": chunk["content"]}, "finish_reason": chunk.get("finish_reason")}])
+            self.wfile.write(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+        self.close_connection = True
+
+    def _send_json(self, status: int, data: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Keep benchmark output clean
+        pass
+
+def create_fake_llm_server(host: str = "127.0.0.1", port: int = 8765, config: Optional[Dict[str, Any]] = None) -> ThreadingHTTPServer:
+    """
+    Create an HTTP server speaking the OpenAI chat completions protocol.
+
+    Point the OpenAI client at it with OPENAI_BASE_URL=http://<host>:<port>/v1.
+
+    Args:
+        host: Host to bind
+        port: Port to bind (0 picks a free port)
+        config: Fake LLM settings (defaults to load_fake_llm_config())
+
+    Returns:
+        Server ready for serve_forever()
+    """
+    handler = type("FakeLLMRequestHandler", (_FakeLLMRequestHandler,), {"fake_llm": FakeLLM(config)})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
@@ -1,6 +1,7 @@
 import os
 import json
 import shutil
+import tempfile
 from typing import Any, Dict, Optional
 
 def ensure_dir(directory: str) -> str:
@@ -18,6 +19,38 @@ def save_json(data: Any, filepath: str) -> str:
     
     return filepath
 
+def save_json_atomic(data: Any, filepath: str) -> str:
+    """
+    Save data as JSON so that readers see either the old or the new file, never a partial one.
+    
+    See save_text_atomic.
+    """
+    return save_text_atomic(json.dumps(data, indent=2, default=str), filepath)
+
+def save_text_atomic(text: str, filepath: str) -> str:
+    """
+    Save text so that readers see either the old or the new file, never a partial one.
+    
+    The text is written to a temporary file in the same directory, flushed
+    to disk and then renamed over filepath.
+    """
+    directory = os.path.dirname(filepath)
+    ensure_dir(directory)
+    
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(filepath)}.", suffix=".tmp", dir=directory or ".")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    
+    return filepath
+
 def load_json(filepath: str) -> Dict:
     """Load JSON data from filepath."""
     with open(filepath, 'r') as f:
@@ -1,10 +1,37 @@
+import glob
 import json
 import os
 import time
-from typing import Dict, Any, Callable, Optional
+import functools
+import threading
+import contextvars
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Dict, Any, Callable, FrozenSet, Iterable, List, Mapping, Optional, Tuple, Union
 import importlib
+import inspect
 from src.models.data_models import ProcessingGraph, ProcessingNode, ProcessingEdge
 from src.utils.log_utils import ProcessLogger
+from src.utils.artifact_utils import ArtifactWriter, load_artifact, use_artifact_writer
+from src.utils.cache_utils import get_cache_stats
+from src.utils.catalog_utils import update_catalog
+from src.utils.llm_utils import LLM_SETTING_KEYS, get_latency_histograms, use_llm_settings
+from src.utils.checkpoint_utils import RunCheckpoint
+from src.utils.condition_utils import Condition, ConditionError
+from src.utils.deadline_utils import Deadline, DeadlineExceeded, RunCancelled, cancel_on_interrupt, get_cancel_grace, use_deadline
+from src.utils.memo_utils import NodeRunStore, item_fingerprint, item_run_id, node_fingerprint, processor_fingerprint
+from src.utils.metrics_utils import LLMUsageRecorder
+from src.utils.similarity_utils import update_topic_index
+
+# Files the built-in processors write to artifacts/, used to find the inputs of a partial run
+ARTIFACT_FILE_PATTERNS = {
+    "metadata_path": "*_metadata.json",
+    "topics_path": "topic_ideas.json",
+    "ranked_topics_path": "ranked_topics.json",
+    "aida_content_path": "aida_content.json"
+}
 
 def load_graph(graph_path: str) -> ProcessingGraph:
     """
@@ -23,12 +50,217 @@ def load_graph(graph_path: str) -> ProcessingGraph:
     nodes = [ProcessingNode(**node_data) for node_data in graph_data.get("nodes", [])]
     edges = [ProcessingEdge(**edge_data) for edge_data in graph_data.get("edges", [])]
     
-    return ProcessingGraph(
+    graph = ProcessingGraph(
         nodes=nodes,
         edges=edges,
         name=graph_data.get("name", "Default Graph"),
-        description=graph_data.get("description", "")
+        description=graph_data.get("description", ""),
+        timeout=graph_data.get("timeout", 0)
     )
+    
+    # Reject broken graphs before anything runs
+    topological_order(graph)
+    
+    return graph
+
+def topological_order(graph: ProcessingGraph) -> List[str]:
+    """
+    Validate a graph and order its nodes so each comes after its dependencies.
+    
+    Uses Kahn's algorithm, which is O(V+E). Nodes without dependencies
+    between them keep their order in the graph.
+    
+    Args:
+        graph: ProcessingGraph to check
+        
+    Returns:
+        Node IDs in topological order
+        
+    Raises:
+        ValueError: If node IDs are duplicated, an edge references an unknown
+            node, or the edges contain a cycle
+    """
+    node_ids = [node.id for node in graph.nodes]
+    duplicates = sorted(node_id for node_id, count in Counter(node_ids).items() if count > 1)
+    if duplicates:
+        raise ValueError(f"Duplicate node IDs in graph: {duplicates}")
+    
+    successors, in_degree = _graph_adjacency(graph)
+    
+    ready = deque(node_id for node_id in node_ids if in_degree[node_id] == 0)
+    order = []
+    while ready:
+        node_id = ready.popleft()
+        order.append(node_id)
+        for successor in successors[node_id]:
+            in_degree[successor] -= 1
+            if in_degree[successor] == 0:
+                ready.append(successor)
+    
+    if len(order) < len(node_ids):
+        ordered = set(order)
+        unexecuted = [node_id for node_id in node_ids if node_id not in ordered]
+        raise ValueError(f"Dependency cycle detected in graph. Unexecuted nodes: {unexecuted}")
+    
+    return order
+
+def _graph_adjacency(graph: ProcessingGraph) -> Tuple[Dict[str, List[str]], Dict[str, int]]:
+    """Build successor lists and in-degrees for a graph, checking that edges reference known nodes."""
+    successors = {node.id: [] for node in graph.nodes}
+    in_degree = {node.id: 0 for node in graph.nodes}
+    
+    for edge in graph.edges:
+        for node_id in (edge.source_node_id, edge.target_node_id):
+            if node_id not in successors:
+                raise ValueError(f"Edge {edge.source_node_id} → {edge.target_node_id} references unknown node: {node_id}")
+        successors[edge.source_node_id].append(edge.target_node_id)
+        in_degree[edge.target_node_id] += 1
+    
+    return successors, in_degree
+
+def select_subgraph(
+    graph: ProcessingGraph,
+    from_node: Optional[str] = None,
+    until_node: Optional[str] = None,
+    only: Optional[Iterable[str]] = None
+) -> ProcessingGraph:
+    """
+    Prune a graph to the nodes a partial run should execute.
+    
+    from_node keeps that node and everything downstream of it, until_node
+    keeps that node and everything upstream of it, and only keeps exactly
+    the listed nodes. When several are given, the nodes must satisfy all of
+    them. Edges are kept when both of their nodes are.
+    
+    Args:
+        graph: ProcessingGraph to prune
+        from_node: ID of the first node to run
+        until_node: ID of the last node to run
+        only: IDs of the only nodes to run
+        
+    Returns:
+        ProcessingGraph with the selected nodes (the graph itself if nothing is selected)
+        
+    Raises:
+        ValueError: If a node ID is unknown or the selection is empty
+    """
+    only = list(only or [])
+    if from_node is None and until_node is None and not only:
+        return graph
+    
+    successors, _ = _graph_adjacency(graph)
+    predecessors = {node.id: [] for node in graph.nodes}
+    for edge in graph.edges:
+        predecessors[edge.target_node_id].append(edge.source_node_id)
+    
+    unknown = [node_id for node_id in [from_node, until_node, *only] if node_id is not None and node_id not in successors]
+    if unknown:
+        raise ValueError(f"Unknown node IDs: {unknown}")
+    
+    selected = set(successors)
+    if from_node is not None:
+        selected &= _reachable(from_node, successors)
+    if until_node is not None:
+        selected &= _reachable(until_node, predecessors)
+    if only:
+        selected &= set(only)
+    if not selected:
+        raise ValueError(f"No nodes match the selection (from {from_node}, until {until_node}, only {only})")
+    
+    return ProcessingGraph(
+        nodes=[node for node in graph.nodes if node.id in selected],
+        edges=[edge for edge in graph.edges if edge.source_node_id in selected and edge.target_node_id in selected],
+        name=graph.name,
+        description=graph.description,
+        timeout=graph.timeout
+    )
+
+def _reachable(start: str, neighbors: Dict[str, List[str]]) -> set:
+    """Collect a node and every node reachable from it through neighbors."""
+    reached = {start}
+    pending = [start]
+    while pending:
+        for neighbor in neighbors[pending.pop()]:
+            if neighbor not in reached:
+                reached.add(neighbor)
+                pending.append(neighbor)
+    return reached
+
+def resolve_input_artifacts(graph: ProcessingGraph, subgraph: ProcessingGraph, context: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Find the artifacts a partial run needs from nodes it doesn't run.
+    
+    An input artifact of a selected node that is produced by a pruned node
+    is taken from that node's last recorded run (metadata/node_runs.json) if
+    its files still exist, and otherwise from the file the built-in
+    processor writes to artifacts/ (see ARTIFACT_FILE_PATTERNS).
+    
+    Args:
+        graph: Full ProcessingGraph
+        subgraph: Nodes selected to run (see select_subgraph)
+        context: Context the run starts with
+        
+    Returns:
+        Dictionary of resolved artifacts to add to the context
+        
+    Raises:
+        ValueError: If a required artifact can't be found
+    """
+    selected = {node.id for node in subgraph.nodes}
+    producers = {}
+    for node in graph.nodes:
+        if node.id not in selected:
+            for artifact_name in node.output_artifacts:
+                producers.setdefault(artifact_name, node.id)
+    
+    needed = []
+    for node in subgraph.nodes:
+        for artifact_name in node.input_artifacts:
+            if artifact_name in producers and artifact_name not in context and artifact_name not in needed:
+                needed.append(artifact_name)
+    
+    run_store = get_node_run_store(context)
+    resolved = {}
+    missing = []
+    for artifact_name in needed:
+        value = None
+        recorded = run_store.last_result(producers[artifact_name]) if run_store is not None else None
+        if recorded and _artifact_exists(recorded.get(artifact_name)):
+            value = recorded[artifact_name]
+        elif artifact_name in ARTIFACT_FILE_PATTERNS and "artifacts_dir" in context:
+            matches = sorted(glob.glob(os.path.join(context["artifacts_dir"], ARTIFACT_FILE_PATTERNS[artifact_name])), key=os.path.getmtime)
+            if matches:
+                value = matches[-1]
+        
+        if value is None:
+            missing.append(f"{artifact_name} (from {producers[artifact_name]})")
+        else:
+            resolved[artifact_name] = value
+    
+    if missing:
+        raise ValueError(f"Missing artifacts for partial run, run the upstream nodes first: {missing}")
+    
+    return resolved
+
+def _artifact_exists(value: Any) -> bool:
+    """Check that an artifact path, or every path in a list of them, exists."""
+    if isinstance(value, list):
+        return bool(value) and all(_artifact_exists(item) for item in value)
+    return isinstance(value, str) and os.path.exists(value)
+
+def get_max_parallelism(max_parallelism: Optional[int] = None) -> int:
+    """
+    Resolve how many graph nodes may run at once.
+    
+    Args:
+        max_parallelism: Explicit limit; if None, NOTEGOLD_GRAPH_PARALLELISM or 4 is used
+        
+    Returns:
+        Parallelism limit (at least 1)
+    """
+    if max_parallelism is None:
+        max_parallelism = int(os.environ.get("NOTEGOLD_GRAPH_PARALLELISM", 4))
+    return max(1, max_parallelism)
 
 def save_graph(graph: ProcessingGraph, output_path: str) -> str:
     """
@@ -45,6 +277,7 @@ def save_graph(graph: ProcessingGraph, output_path: str) -> str:
     graph_dict = {
         "name": graph.name,
         "description": graph.description,
+        "timeout": graph.timeout,
         "nodes": [node.__dict__ for node in graph.nodes],
         "edges": [edge.__dict__ for edge in graph.edges]
     }
@@ -98,19 +331,24 @@ def create_default_graph() -> ProcessingGraph:
             id="apply_aida",
             name="Apply AIDA Format",
             description="Apply AIDA format to top-ranked topics",
-            processor_function="processors.aida_formatter.apply_aida_format",
+            processor_function="processors.aida_formatter.format_topic",
             input_artifacts=["ranked_topics_path"],
-            output_artifacts=["aida_content_path"],
-            parameters={"top_n": 3}
+            output_artifacts=["aida_content_path", "aida_content"],
+            parameters={},
+            map_over="ranked_topics",
+            map_limit=3,
+            reduce_function="processors.aida_formatter.collect_aida_content"
         ),
         ProcessingNode(
             id="create_social",
             name="Create Social Media Content",
             description="Create social media content variations",
-            processor_function="processors.content_generator.create_social_content",
+            processor_function="processors.content_generator.create_topic_social_posts",
             input_artifacts=["aida_content_path"],
             output_artifacts=["social_content_paths"],
-            parameters={}
+            parameters={},
+            map_over="aida_content",
+            reduce_function="processors.content_generator.summarize_social_content"
         )
     ]
     
@@ -141,10 +379,13 @@ def create_default_graph() -> ProcessingGraph:
         description="Transform meeting transcripts into valuable content assets"
     )
 
+@functools.lru_cache(maxsize=None)
 def import_processor_function(function_path: str) -> Callable:
     """
     Dynamically import a processor function from its path.
     
+    Imports are cached, so each function is resolved once per process.
+    
     Args:
         function_path: Path to the function (e.g., "processors.metadata_extractor.extract_metadata")
         
@@ -155,30 +396,300 @@ def import_processor_function(function_path: str) -> Callable:
     module = importlib.import_module(f"src.{module_path}")
     return getattr(module, function_name)
 
-def execute_node(node: ProcessingNode, context: Dict[str, Any], logger: Optional[ProcessLogger] = None) -> Dict[str, Any]:
+# Context paths passed to processors alongside their input artifacts
+CONTEXT_DIRECTORIES = ("artifacts_dir", "outputs_dir")
+
+# How often a run waiting on its nodes checks for deadlines and cancellation, in seconds
+CANCEL_POLL_SECONDS = 0.5
+
+@dataclass(frozen=True)
+class CompiledNode:
+    """A graph node with its processor resolved and its arguments checked against the processor's signature."""
+    node: ProcessingNode
+    processor: Callable
+    # Keyword arguments the processor takes, and those it requires
+    accepted: FrozenSet[str]
+    required: FrozenSet[str]
+    # Whether the processor takes **kwargs
+    accepts_any: bool
+    # Hash of the processor's code (see processor_fingerprint)
+    processor_hash: str
+    # Map nodes: the argument receiving each item, and the reduce function
+    item_argument: Optional[str] = None
+    reduce: Optional[Callable] = None
+    reduce_accepted: FrozenSet[str] = frozenset()
+    
+    def accepts(self, name: str) -> bool:
+        """Check whether the processor takes a keyword argument."""
+        return self.accepts_any or name in self.accepted
+
+def _signature_binding(func: Callable) -> Tuple[List[str], FrozenSet[str], bool]:
+    """Get a function's positional parameter names, its required parameters and whether it takes **kwargs."""
+    parameters = inspect.signature(func).parameters.values()
+    names = [p.name for p in parameters if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD, p.KEYWORD_ONLY)]
+    required = frozenset(p.name for p in parameters if p.default is p.empty and p.kind not in (p.VAR_POSITIONAL, p.VAR_KEYWORD))
+    return names, required, any(p.kind == p.VAR_KEYWORD for p in parameters)
+
+def compile_node(node: ProcessingNode) -> CompiledNode:
     """
-    Execute a processing node with the given context.
+    Resolve a node's processor and check that it accepts the node's arguments.
     
     Args:
-        node: ProcessingNode to execute
-        context: Dictionary with context variables
-        logger: Optional ProcessLogger for logging
+        node: ProcessingNode to compile
         
     Returns:
-        Node execution result
+        CompiledNode
+        
+    Raises:
+        ValueError: If a function can't be imported, or the processor doesn't
+            take an argument the node would pass it
+    """
+    try:
+        processor = import_processor_function(node.processor_function)
+        reduce = import_processor_function(node.reduce_function) if node.reduce_function else None
+    except (ImportError, AttributeError, ValueError) as e:
+        raise ValueError(f"Node {node.id}: cannot import its functions: {e}") from e
+    
+    names, required, accepts_any = _signature_binding(processor)
+    parameters = [key for key in node.parameters if key not in LLM_SETTING_KEYS]
+    
+    item_argument = None
+    if node.map_over:
+        # Map processors get the item first, then only the arguments they ask for
+        if not names:
+            raise ValueError(f"Node {node.id}: map processor {node.processor_function} takes no item argument")
+        item_argument = names[0]
+        names = names[1:]
+        required = required - {item_argument}
+        passed = parameters
+    else:
+        passed = ["artifacts_dir", *node.input_artifacts, *parameters]
+    
+    if not accepts_any:
+        unexpected = [name for name in passed if name not in names]
+        if unexpected:
+            raise ValueError(f"Node {node.id}: {node.processor_function} does not take arguments {unexpected}")
+    
+    reduce_accepted = frozenset()
+    if reduce is not None:
+        reduce_names, _, reduce_any = _signature_binding(reduce)
+        if not reduce_names:
+            raise ValueError(f"Node {node.id}: reduce function {node.reduce_function} takes no results argument")
+        reduce_accepted = frozenset(name for name in CONTEXT_DIRECTORIES if reduce_any or name in reduce_names[1:])
+    
+    return CompiledNode(
+        node=node,
+        processor=processor,
+        accepted=frozenset(names),
+        required=required,
+        accepts_any=accepts_any,
+        processor_hash=processor_fingerprint(processor),
+        item_argument=item_argument,
+        reduce=reduce,
+        reduce_accepted=reduce_accepted
+    )
+
+@dataclass(frozen=True)
+class ExecutionPlan:
     """
-    # Import the processor function
-    processor_func = import_processor_function(node.processor_function)
+    A validated graph, compiled once and reused for every run.
     
-    # Prepare function arguments
+    Holds the compiled nodes, a topological order and the graph's
+    adjacency, so runs don't import processors, inspect signatures or
+    re-validate the graph.
+    """
+    graph: ProcessingGraph
+    order: Tuple[str, ...]
+    nodes: Mapping[str, CompiledNode]
+    successors: Mapping[str, Tuple[str, ...]]
+    dependencies: Mapping[str, Tuple[str, ...]]
+    # Conditions on each node's incoming edges, as (source node ID, condition)
+    conditions: Mapping[str, Tuple[Tuple[str, Condition], ...]]
+    # Source of the first incoming edge of each node, logged as the edge being executed
+    edge_sources: Mapping[str, str]
+    # Artifacts produced by each node's ancestors
+    upstream_outputs: Mapping[str, FrozenSet[str]]
+    _subplans: Dict[Tuple, "ExecutionPlan"] = field(default_factory=dict, repr=False, compare=False)
+    
+    def in_degrees(self) -> Dict[str, int]:
+        """Count each node's dependencies, as a fresh dictionary a run can count down."""
+        in_degree = {node_id: 0 for node_id in self.order}
+        for successors in self.successors.values():
+            for successor in successors:
+                in_degree[successor] += 1
+        return in_degree
+    
+    def select(
+        self,
+        from_node: Optional[str] = None,
+        until_node: Optional[str] = None,
+        only: Optional[Iterable[str]] = None
+    ) -> "ExecutionPlan":
+        """
+        Get the plan for part of the graph (see select_subgraph), reusing the compiled nodes.
+        
+        Returns:
+            ExecutionPlan for the selected nodes (this plan if nothing is selected)
+        """
+        key = (from_node, until_node, tuple(only or ()))
+        if key not in self._subplans:
+            subgraph = select_subgraph(self.graph, from_node, until_node, only)
+            self._subplans[key] = self if subgraph is self.graph else compile_graph(subgraph, self.nodes)
+        return self._subplans[key]
+    
+    def skip_reason(self, node_id: str, context: Dict[str, Any], skipped: Iterable[str] = ()) -> Optional[str]:
+        """
+        Decide whether a node whose dependencies have finished should be skipped.
+        
+        A node is skipped when one of its dependencies was skipped, or when
+        the condition on one of its incoming edges is false.
+        
+        Args:
+            node_id: ID of the node
+            context: Context after its dependencies finished
+            skipped: IDs of the nodes skipped so far
+            
+        Returns:
+            Why the node is skipped, or None if it should run
+            
+        Raises:
+            ConditionError: If a condition can't be evaluated against the context
+        """
+        skipped = set(skipped)
+        for dependency in self.dependencies[node_id]:
+            if dependency in skipped:
+                return f"upstream node skipped: {dependency}"
+        
+        for source, condition in self.conditions.get(node_id, ()):
+            if not condition.evaluate(context):
+                return f"condition false: {condition.expression}"
+        return None
+    
+    def check_inputs(self, context: Dict[str, Any]) -> None:
+        """
+        Check that every argument a processor requires will be available when its node runs.
+        
+        Args:
+            context: Context the run starts with
+            
+        Raises:
+            ValueError: Listing each node's missing arguments
+        """
+        missing = []
+        for node_id in self.order:
+            compiled = self.nodes[node_id]
+            node = compiled.node
+            available = set(context) | self.upstream_outputs[node_id]
+            
+            bound_from_context = set(CONTEXT_DIRECTORIES) | (set() if node.map_over else set(node.input_artifacts))
+            for name in sorted(compiled.required):
+                if name not in node.parameters and not (name in bound_from_context and name in available):
+                    missing.append(f"{node_id}: {name}")
+            
+            if node.map_over and node.map_over not in available and f"{node.map_over}_path" not in available:
+                missing.append(f"{node_id}: {node.map_over}")
+        
+        if missing:
+            raise ValueError(f"Missing processor inputs: {missing}")
+
+def compile_graph(graph: ProcessingGraph, compiled_nodes: Optional[Mapping[str, CompiledNode]] = None) -> ExecutionPlan:
+    """
+    Validate a graph and compile it into an execution plan.
+    
+    Args:
+        graph: ProcessingGraph to compile
+        compiled_nodes: Already compiled nodes to reuse, by ID
+        
+    Returns:
+        ExecutionPlan
+        
+    Raises:
+        ValueError: If the graph is invalid (see topological_order), a node
+            doesn't match its processor (see compile_node) or an edge
+            condition is invalid (see Condition)
+    """
+    order = topological_order(graph)
+    successors, _ = _graph_adjacency(graph)
+    compiled_nodes = compiled_nodes or {}
+    
+    nodes = {}
+    for node in graph.nodes:
+        reusable = compiled_nodes.get(node.id)
+        nodes[node.id] = reusable if reusable is not None and reusable.node is node else compile_node(node)
+    
+    edge_sources = {}
+    dependencies = {node_id: [] for node_id in order}
+    conditions = {}
+    for edge in graph.edges:
+        edge_sources.setdefault(edge.target_node_id, edge.source_node_id)
+        dependencies[edge.target_node_id].append(edge.source_node_id)
+        if edge.condition.strip():
+            try:
+                condition = Condition(edge.condition)
+            except ConditionError as e:
+                raise ValueError(f"Edge {edge.source_node_id} -> {edge.target_node_id}: {e}") from e
+            conditions.setdefault(edge.target_node_id, []).append((edge.source_node_id, condition))
+    
+    # Ancestors come first in topological order, so their outputs are known when each node is reached
+    upstream_outputs = {node_id: set() for node_id in order}
+    for node_id in order:
+        for successor in successors[node_id]:
+            upstream_outputs[successor] |= upstream_outputs[node_id] | set(nodes[node_id].node.output_artifacts)
+    
+    return ExecutionPlan(
+        graph=graph,
+        order=tuple(order),
+        nodes=MappingProxyType(nodes),
+        successors=MappingProxyType({node_id: tuple(targets) for node_id, targets in successors.items()}),
+        dependencies=MappingProxyType({node_id: tuple(sources) for node_id, sources in dependencies.items()}),
+        conditions=MappingProxyType({node_id: tuple(edges) for node_id, edges in conditions.items()}),
+        edge_sources=MappingProxyType(edge_sources),
+        upstream_outputs=MappingProxyType({node_id: frozenset(outputs) for node_id, outputs in upstream_outputs.items()})
+    )
+
+_plan_cache: Dict[Tuple[Optional[str], int], ExecutionPlan] = {}
+_plan_cache_lock = threading.Lock()
+
+def load_execution_plan(graph_path: Optional[str] = None) -> ExecutionPlan:
+    """
+    Get the compiled plan for a graph file, or for the default graph.
+    
+    Plans are cached by path and modification time, so processing many
+    meetings compiles the graph once, and editing the file recompiles it.
+    
+    Args:
+        graph_path: Path to the graph JSON (defaults to create_default_graph)
+        
+    Returns:
+        ExecutionPlan
+    """
+    key = (os.path.abspath(graph_path), os.stat(graph_path).st_mtime_ns) if graph_path else (None, 0)
+    with _plan_cache_lock:
+        plan = _plan_cache.get(key)
+    if plan is None:
+        plan = compile_graph(load_graph(graph_path) if graph_path else create_default_graph())
+        with _plan_cache_lock:
+            # Drop plans for older versions of the same file
+            for stale_key in [cached for cached in _plan_cache if cached[0] == key[0]]:
+                del _plan_cache[stale_key]
+            _plan_cache[key] = plan
+    return plan
+
+def _as_plan(graph: Union[ProcessingGraph, ExecutionPlan]) -> ExecutionPlan:
+    """Use a compiled plan as is, or compile a graph."""
+    return graph if isinstance(graph, ExecutionPlan) else compile_graph(graph)
+
+def _processor_arguments(compiled: CompiledNode, context: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Build a processor's keyword arguments from the context and node parameters, keeping LLM settings aside."""
+    node = compiled.node
     args = {}
     
     # Always add artifacts_dir
     if "artifacts_dir" in context:
         args["artifacts_dir"] = context["artifacts_dir"]
     
-    # Add outputs_dir only for nodes that need it
-    if "outputs_dir" in context and node.id in ["apply_aida", "create_social"]:
+    # Add outputs_dir only for processors that take it
+    if "outputs_dir" in context and compiled.accepts("outputs_dir"):
         args["outputs_dir"] = context["outputs_dir"]
     
     # Add input artifacts
@@ -187,113 +698,710 @@ def execute_node(node: ProcessingNode, context: Dict[str, Any], logger: Optional
             # Use artifact name as is for paths
             args[artifact_name] = context[artifact_name]
     
-    # Add parameters
-    args.update(node.parameters)
+    # Add parameters, keeping LLM settings aside
+    llm_settings = {key: value for key, value in node.parameters.items() if key in LLM_SETTING_KEYS}
+    args.update({key: value for key, value in node.parameters.items() if key not in LLM_SETTING_KEYS})
+    
+    # Map processors take one item, so they only get the arguments they ask for
+    if node.map_over:
+        args = {key: value for key, value in args.items() if compiled.accepts(key)}
+    
+    return args, llm_settings
+
+def _log_node_result(node: ProcessingNode, result: Dict[str, Any], logger: ProcessLogger) -> None:
+    """Log the output artifacts and streaming timings of a node's result."""
+    for output_artifact in node.output_artifacts:
+        if output_artifact in result:
+            artifact_path = result[output_artifact]
+            artifact_type = output_artifact.replace("_path", "")
+            
+            # Handle both single paths and lists of paths; other values stay in memory
+            for path in artifact_path if isinstance(artifact_path, list) else [artifact_path]:
+                if isinstance(path, str):
+                    logger.log_artifact(path, artifact_type, node.id)
+    
+    # Log streaming timings for processors that stream their outputs
+    for timing in result.get("output_timings", []):
+        logger.log_output_timing(timing["output_path"], timing["ttfb_ms"], timing["total_ms"], node.id)
+
+def execute_node(
+    node: ProcessingNode,
+    context: Dict[str, Any],
+    logger: Optional[ProcessLogger] = None,
+    compiled: Optional[CompiledNode] = None
+) -> Dict[str, Any]:
+    """
+    Execute a processing node with the given context.
+    
+    The model, temperature, max_tokens and cascade node parameters configure
+    the node's LLM calls instead of being passed to the processor.
+    
+    Args:
+        node: ProcessingNode to execute
+        context: Dictionary with context variables
+        logger: Optional ProcessLogger for logging
+        compiled: The node compiled by an ExecutionPlan (compiled here if not given)
+        
+    Returns:
+        Node execution result
+    """
+    compiled = compiled or compile_node(node)
+    processor_func = compiled.processor
+    args, llm_settings = _processor_arguments(compiled, context)
     
-    # Execute the function
-    result = processor_func(**args)
+    # Execute the function, recording the latency and token usage of its LLM calls
+    recorder = LLMUsageRecorder()
+    start_time = time.time()
+    with use_llm_settings(llm_settings, recorder, node.id):
+        result = processor_func(**args)
+    execution_time_ms = int((time.time() - start_time) * 1000)
     
-    # Log artifacts if logger is provided
     if logger:
-        for output_artifact in node.output_artifacts:
-            if output_artifact in result:
-                artifact_path = result[output_artifact]
-                artifact_type = output_artifact.replace("_path", "")
-                
-                # Handle both single paths and lists of paths
-                if isinstance(artifact_path, list):
-                    for path in artifact_path:
-                        logger.log_artifact(path, artifact_type)
-                else:
-                    logger.log_artifact(artifact_path, artifact_type)
+        logger.log_node_metrics(node.id, {
+            "execution_time_ms": execution_time_ms,
+            "llm_settings": llm_settings,
+            **recorder.summary(),
+            "latency_histograms": get_latency_histograms(node.id)
+        })
+        _log_node_result(node, result, logger)
     
     return result
 
-def execute_graph(graph: ProcessingGraph, initial_context: Dict[str, Any]) -> Dict[str, Any]:
+def map_items(node: ProcessingNode, context: Dict[str, Any]) -> List[Any]:
+    """
+    Get the items a map node runs over.
+    
+    The items are the node's map_over artifact from the context or, if only
+    its path is there (e.g. ranked_topics_path for ranked_topics), loaded
+    from that file.
+    
+    Args:
+        node: Map node
+        context: Context the node runs with
+        
+    Returns:
+        Items, limited to the first map_limit if it is set
+        
+    Raises:
+        ValueError: If the artifact is missing or is not a list
+    """
+    items = context.get(node.map_over)
+    if items is None and f"{node.map_over}_path" in context:
+        items = load_artifact(context[f"{node.map_over}_path"])
+    if not isinstance(items, list):
+        raise ValueError(f"Node {node.id} maps over {node.map_over}, which is not a list in the context")
+    return items[:node.map_limit] if node.map_limit else items
+
+def execute_map_item(compiled: CompiledNode, item: Any, context: Dict[str, Any], recorder: LLMUsageRecorder) -> Dict[str, Any]:
+    """
+    Run a map node's processor on one item.
+    
+    The item is passed as the processor's first argument, followed by
+    whichever context paths and node parameters the processor accepts.
+    
+    Args:
+        compiled: Compiled map node
+        item: Item to process
+        context: Context the node runs with
+        recorder: Recorder shared by all of the node's items
+        
+    Returns:
+        Per-item result dictionary
+    """
+    args, llm_settings = _processor_arguments(compiled, context)
+    with use_llm_settings(llm_settings, recorder, compiled.node.id):
+        return compiled.processor(item, **args)
+
+def reduce_map_results(compiled: CompiledNode, results: List[Dict[str, Any]], context: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Combine a map node's per-item results into the node's result.
+    
+    With a reduce_function, it is called with the results (and artifacts_dir
+    and outputs_dir if it accepts them). Otherwise each key of the per-item
+    results, and each output artifact, maps to the list of its values in
+    item order.
+    
+    Args:
+        compiled: Compiled map node
+        results: Per-item results, in item order
+        context: Context the node ran with
+        
+    Returns:
+        Node result dictionary
+    """
+    if compiled.reduce is None:
+        keys = dict.fromkeys([*compiled.node.output_artifacts, *(key for result in results for key in result)])
+        return {key: [result.get(key) for result in results] for key in keys}
+    
+    args = {key: context[key] for key in compiled.reduce_accepted if key in context}
+    return compiled.reduce(results, **args)
+
+def _run_with_deadline(deadline: Deadline, func: Callable[..., Any], *args: Any) -> Any:
+    """Run a node's work under its deadline, failing at once if it has already passed."""
+    with use_deadline(deadline):
+        deadline.check()
+        return func(*args)
+
+def _deadline_error(deadline: Deadline, error: Exception) -> Exception:
+    """Report a failure caused by a passed or cancelled deadline (e.g. a timed out request) as such."""
+    if isinstance(error, (DeadlineExceeded, RunCancelled)) or not (deadline.expired() or deadline.cancelled()):
+        return error
+    try:
+        deadline.check()
+    except (DeadlineExceeded, RunCancelled) as stop:
+        stop.__cause__ = error
+        return stop
+    return error
+
+class _MapRun:
+    """Progress of a map node whose items are being processed."""
+    
+    def __init__(self, compiled: CompiledNode, context: Dict[str, Any], fingerprint: Optional[str], upstream: Optional[str] = None):
+        self.compiled = compiled
+        self.node = compiled.node
+        self.context = context
+        self.fingerprint = fingerprint
+        # Map node whose items feed this one item by item, if any
+        self.upstream = upstream
+        self.expected: Optional[int] = None
+        self.results: Dict[int, Dict[str, Any]] = {}
+        # Fingerprints of the items being run, for nodes memoized item by item, and how many items were reused
+        self.item_fingerprints: Dict[int, str] = {}
+        self.reused = 0
+        self.recorder = LLMUsageRecorder()
+        self.start_time = time.time()
+    
+    def done(self) -> bool:
+        return self.expected is not None and len(self.results) == self.expected
+
+def get_node_run_store(context: Dict[str, Any]) -> Optional[NodeRunStore]:
+    """Get the store of previous node runs for a meeting (metadata/node_runs.json), if it has a metadata_dir."""
+    if "metadata_dir" not in context:
+        return None
+    return NodeRunStore(os.path.join(context["metadata_dir"], "node_runs.json"))
+
+def plan_graph(
+    graph: Union[ProcessingGraph, ExecutionPlan],
+    initial_context: Dict[str, Any],
+    force: bool = False,
+    force_nodes: Iterable[str] = (),
+    from_node: Optional[str] = None,
+    until_node: Optional[str] = None,
+    only: Optional[Iterable[str]] = None
+) -> List[Dict[str, str]]:
+    """
+    Report which nodes execute_graph would run and which it would skip as up to date.
+    
+    Nodes downstream of a node that will run are reported as running too,
+    although at execution time they are skipped if that node's outputs
+    come out unchanged or an edge condition is false. Conditions are only
+    evaluated when every node upstream is up to date.
+    
+    Args:
+        graph: ProcessingGraph, or ExecutionPlan, to plan
+        initial_context: Dictionary with initial context variables
+        force: Plan to run every node
+        force_nodes: IDs of nodes to run regardless of their previous runs
+        from_node, until_node, only: Plan a partial run (see select_subgraph)
+        
+    Returns:
+        List of {"node_id", "action" ("run" or "skip"), "reason"} in execution order
+        
+    Raises:
+        ConditionError: If a condition can't be evaluated against up-to-date results
+    """
+    context = initial_context.copy()
+    force_nodes = set(force_nodes)
+    run_store = get_node_run_store(context)
+    
+    execution_plan = _as_plan(graph)
+    selected_plan = execution_plan.select(from_node, until_node, only)
+    if selected_plan is not execution_plan:
+        context.update(resolve_input_artifacts(execution_plan.graph, selected_plan.graph, context))
+    execution_plan = selected_plan
+    execution_plan.check_inputs(context)
+    
+    plan = []
+    will_run = set()
+    skipped = set()
+    for node_id in execution_plan.order:
+        compiled = execution_plan.nodes[node_id]
+        node = compiled.node
+        upstream_runs = any(dependency in will_run for dependency in execution_plan.dependencies[node_id])
+        skip_reason = None if upstream_runs else execution_plan.skip_reason(node_id, context, skipped)
+        if skip_reason is not None:
+            skipped.add(node_id)
+            plan.append({"node_id": node_id, "action": "skip", "reason": skip_reason})
+            continue
+        
+        if force or node_id in force_nodes:
+            reason = "forced"
+        elif upstream_runs:
+            reason = "upstream node will run"
+        elif run_store is None:
+            reason = "no run records"
+        else:
+            fingerprint = node_fingerprint(node, context, compiled.processor, compiled.processor_hash)
+            reason = run_store.describe(node_id, fingerprint)
+            if reason == "up to date":
+                context.update(run_store.lookup(node_id, fingerprint))
+        
+        action = "skip" if reason == "up to date" else "run"
+        if action == "run":
+            will_run.add(node_id)
+        plan.append({"node_id": node_id, "action": action, "reason": reason})
+    
+    return plan
+
+def execute_graph(
+    graph: Union[ProcessingGraph, ExecutionPlan],
+    initial_context: Dict[str, Any],
+    max_parallelism: Optional[int] = None,
+    force: bool = False,
+    force_nodes: Iterable[str] = (),
+    resume: bool = False,
+    from_node: Optional[str] = None,
+    until_node: Optional[str] = None,
+    only: Optional[Iterable[str]] = None,
+    timeout: Optional[float] = None,
+    node_timeout: Optional[float] = None,
+    deadline: Optional[Deadline] = None,
+    executor: Optional[Executor] = None
+) -> Dict[str, Any]:
     """
     Execute a processing graph with the given initial context.
     
+    Nodes are scheduled with Kahn's algorithm: a node becomes ready once all
+    of its dependencies have finished, and ready nodes run concurrently on a
+    thread pool. Each node sees the context as it was when it started, and
+    its results are merged into the context when it finishes. Runs can
+    share one pool (e.g. across a batch of meetings), which then bounds
+    the nodes running across all of them.
+    
+    A map node (one with map_over) runs its processor once per item of a
+    list artifact, each item as a separate task on the pool, and its
+    per-item results are combined by reduce_map_results. A map node whose
+    only dependency is another running map node, and which maps over one of
+    that node's outputs, starts with it: item i is processed as soon as
+    item i upstream is done, so a topic's social posts can be written while
+    later topics are still being formatted.
+    
+    When the context has a metadata_dir, each successful node run is
+    recorded with a fingerprint of its inputs (see node_fingerprint). A node
+    whose fingerprint matches its last run is skipped and its recorded
+    results are restored into the context instead. A map node fed item by
+    item can't be fingerprinted until the node feeding it finishes, so its
+    items are recorded and reused one by one (see item_fingerprint): only
+    the items whose upstream results changed are run again.
+    
+    The context after each completed node is also checkpointed to
+    metadata/checkpoint.json. With resume, the nodes the checkpoint lists
+    as completed are not run again and their results come from it, so a
+    failed run continues from its first unfinished node.
+    
+    An edge with a condition (see Condition) is only followed when the
+    condition holds against the context once its target's dependencies
+    have finished. Otherwise the target is skipped, and so is every node
+    depending on a skipped node.
+    
+    from_node, until_node and only restrict the run to part of the graph
+    (see select_subgraph). The inputs the selected nodes need from the
+    nodes left out are resolved from existing artifacts (see
+    resolve_input_artifacts).
+    
+    The run as a whole, and each node, can be given a timeout (the graph's
+    and node's timeout fields, overridden by timeout and node_timeout).
+    The time remaining bounds every LLM call the node makes, and streamed
+    responses stop as soon as it runs out (see Deadline). A node past its
+    deadline fails with DeadlineExceeded. A map node fed item by item by
+    another has its timeout counted from when that node finishes, so time
+    spent waiting for upstream items doesn't count. If the run's deadline
+    passes or the run is cancelled (Ctrl-C, or cancelling the deadline
+    passed in), every running node is stopped. Nodes that don't stop within
+    NOTEGOLD_CANCEL_GRACE seconds are abandoned. Completed nodes, and the
+    finished items of map nodes, are checkpointed, so a resume continues
+    from where the run stopped.
+    
+    The graph is compiled into an ExecutionPlan unless a plan is passed in;
+    every processor's required inputs are checked before any node runs.
+    
+    JSON artifacts saved by processors (see save_artifact) are handed to
+    later nodes in memory and written to disk on a background thread. All
+    of them are on disk by the time execute_graph returns or raises.
+    
     Args:
-        graph: ProcessingGraph to execute
+        graph: ProcessingGraph, or compiled ExecutionPlan, to execute
         initial_context: Dictionary with initial context variables
+        max_parallelism: Maximum nodes running at once (see get_max_parallelism)
+        force: Run every node, even if it is up to date
+        force_nodes: IDs of nodes to run even if they are up to date
+        resume: Continue the run recorded in the meeting's checkpoint
+        from_node: ID of the first node to run
+        until_node: ID of the last node to run
+        only: IDs of the only nodes to run
+        timeout: Seconds the whole run may take (overrides the graph's timeout; 0 for no limit)
+        node_timeout: Seconds each node may take, for nodes without their own timeout
+        deadline: Deadline the run's is derived from, e.g. so another thread can cancel it
+        executor: Thread pool to run nodes on, shared with other runs (a pool is created for the run if not given)
         
     Returns:
         Final context after execution
+        
+    Raises:
+        DeadlineExceeded: If a node or the run took longer than its timeout
+        RunCancelled: If the run was cancelled
     """
     context = initial_context.copy()
-    executed_nodes = set()
+    max_parallelism = get_max_parallelism(max_parallelism)
+    force_nodes = set(force_nodes)
+    run_store = get_node_run_store(context)
+    
+    # Restore completed nodes and their results from the last checkpoint
+    checkpoint = RunCheckpoint(context["metadata_dir"]) if "metadata_dir" in context else None
+    resumed_nodes = set()
+    resumed_items: Dict[str, Dict[int, Any]] = {}
+    if resume and checkpoint is not None:
+        state = checkpoint.load()
+        if state:
+            resumed_nodes = set(state.get("completed_nodes", [])) - force_nodes
+            if not force:
+                resumed_items = {node_id: results for node_id, results in RunCheckpoint.map_results(state).items()
+                                 if node_id not in force_nodes}
+            # Paths for this run take precedence over checkpointed ones
+            context.update({key: value for key, value in state.get("context", {}).items() if key not in initial_context})
+    
+    # Run only the selected part of the graph, reading its other inputs from disk
+    plan = _as_plan(graph)
+    selected_plan = plan.select(from_node, until_node, only)
+    if selected_plan is not plan:
+        context.update(resolve_input_artifacts(plan.graph, selected_plan.graph, context))
+    plan = selected_plan
+    graph = plan.graph
+    
+    # Fail before any node runs if a processor would be missing an argument
+    plan.check_inputs(context)
     
     # Initialize logger if logs_dir is in context
     logger = None
     if "logs_dir" in context:
         logger = ProcessLogger(context["logs_dir"])
     
-    # Keep track of node dependencies
-    node_dependencies = {node.id: [] for node in graph.nodes}
-    for edge in graph.edges:
-        node_dependencies[edge.target_node_id].append(edge.source_node_id)
+    # Snapshot cache counters so the summary reports this run only
+    cache_stats_start = get_cache_stats()
     
-    # Execute nodes in topological order
-    while len(executed_nodes) < len(graph.nodes):
-        executed_node_this_round = False
-        
-        for node in graph.nodes:
-            # Skip already executed nodes
-            if node.id in executed_nodes:
-                continue
+    resumed_nodes &= set(plan.order)
+    resumed_items = {node_id: results for node_id, results in resumed_items.items() if node_id in plan.nodes}
+    
+    # The run's deadline bounds every node's; Ctrl-C cancels it
+    run_deadline = Deadline(graph.timeout if timeout is None else timeout, deadline, "Run")
+    deadlines: Dict[str, Deadline] = {}
+    grace = get_cancel_grace()
+    
+    def node_deadline(node: ProcessingNode, started: bool = True) -> Deadline:
+        # A node not yet started has no time limit of its own until it is restarted
+        deadlines[node.id] = Deadline(node.timeout or node_timeout if started else None, run_deadline, f"Node {node.id}")
+        return deadlines[node.id]
+    
+    # Artifacts are passed between nodes in memory and written to disk in the background
+    writer = ArtifactWriter()
+    try:
+        with use_artifact_writer(writer):
+            if checkpoint is not None:
+                checkpoint.start(graph.name, context, [node.id for node in graph.nodes if node.id in resumed_nodes], resumed_items)
+            successors = plan.successors
+            in_degree = plan.in_degrees()
+            edge_sources = plan.edge_sources
+            
+            ready = deque(node_id for node_id in plan.order if in_degree[node_id] == 0)
+            # Items of running map nodes waiting for a worker, as (node ID, item index, item)
+            ready_items: deque = deque()
+            map_runs: Dict[str, _MapRun] = {}
+            completed = set()
+            skipped = set()
+            running: Dict[Future, Tuple[ProcessingNode, float, Optional[str], Optional[int]]] = {}
+            error: Optional[Exception] = None
+            # Running nodes past their deadline or cancelled, with the time that was noticed
+            stopping: Dict[str, float] = {}
+            abandoned = set()
+            
+            def finish(node_id: str, result: Dict[str, Any]) -> None:
+                # Update context with the results; nodes whose dependencies have all finished become ready
+                context.update(result)
+                completed.add(node_id)
+                if checkpoint is not None:
+                    checkpoint.node_completed(node_id, context)
+                for successor in successors[node_id]:
+                    in_degree[successor] -= 1
+                    # Map nodes fed item by item by this node are already running
+                    if in_degree[successor] == 0 and successor not in map_runs:
+                        ready.append(successor)
+            
+            def fail(node: ProcessingNode, e: Exception, execution_time_ms: int) -> None:
+                # Log edge error; nodes already running finish before the error is raised
+                nonlocal error
+                if logger and node.id in edge_sources:
+                    logger.log_edge_complete(execution_time_ms, f"error: {str(e)}", node.id)
+                if checkpoint is not None and error is None:
+                    checkpoint.node_failed(node.id, e)
+                error = error or e
             
-            # Check if all dependencies have been executed
-            if all(dep in executed_nodes for dep in node_dependencies[node.id]):
-                # Find the edge being executed (for logging)
-                edge_source = None
-                for edge in graph.edges:
-                    if edge.target_node_id == node.id:
-                        edge_source = edge.source_node_id
-                        break
+            def complete(node: ProcessingNode, result: Dict[str, Any], execution_time_ms: int, fingerprint: Optional[str]) -> None:
+                # Log edge completion
+                if logger and node.id in edge_sources:
+                    logger.log_edge_complete(execution_time_ms, "complete", node.id)
                 
-                # Start logging this edge
-                if logger and edge_source:
-                    logger.log_edge_start(edge_source, node.id)
+                if run_store is not None:
+                    # Nodes fed item by item are fingerprinted once their upstream results are in the context
+                    if fingerprint is None:
+                        compiled = plan.nodes[node.id]
+                        fingerprint = node_fingerprint(node, context, compiled.processor, compiled.processor_hash)
+                    run_store.record(node.id, fingerprint, result)
                 
-                # Measure execution time
-                start_time = time.time()
+                finish(node.id, result)
+            
+            def pipelined(node_id: str) -> List[_MapRun]:
+                return [run for run in map_runs.values() if run.upstream == node_id]
+            
+            def start_map(node: ProcessingNode, fingerprint: Optional[str], upstream: Optional[str] = None) -> None:
+                if logger and node.id in edge_sources:
+                    logger.log_edge_start(edge_sources[node.id], node.id)
+                map_runs[node.id] = _MapRun(plan.nodes[node.id], dict(context), fingerprint, upstream)
+                # A node fed item by item only has its own time limit once the node feeding it is done
+                node_deadline(node, started=upstream is None)
                 
-                # Execute the node
+                # Map nodes depending only on this one start now and take its items as each one finishes
+                for successor_id in successors[node.id]:
+                    successor = plan.nodes[successor_id].node
+                    if (successor.map_over in node.output_artifacts and in_degree[successor_id] == 1
+                            and successor_id not in plan.conditions
+                            and not (successor_id in resumed_nodes and not force)):
+                        start_map(successor, None, node.id)
+                
+                if upstream is None:
+                    items = map_items(node, context)
+                    # Items finished before a resume keep their checkpointed results, if the node's inputs were resumed too
+                    restored = {}
+                    if node.id in resumed_items and all(dependency in resumed_nodes for dependency in plan.dependencies[node.id]):
+                        restored = resumed_items[node.id]
+                    ready_items.extend((node.id, index, item) for index, item in enumerate(items) if index not in restored)
+                    set_expected(node.id, len(items))
+                    for index in sorted(restored):
+                        if index < map_runs[node.id].expected:
+                            item_completed(node.id, index, restored[index])
+                    complete_map(node.id)
+            
+            def set_expected(node_id: str, count: int) -> None:
+                run = map_runs[node_id]
+                run.expected = min(count, run.node.map_limit) if run.node.map_limit else count
+                for downstream in pipelined(node_id):
+                    set_expected(downstream.node.id, run.expected)
+            
+            def item_completed(node_id: str, index: int, result: Dict[str, Any]) -> None:
+                map_runs[node_id].results[index] = result
+                for downstream in pipelined(node_id):
+                    if index < downstream.expected:
+                        ready_items.append((downstream.node.id, index, result.get(downstream.node.map_over)))
+                complete_map(node_id)
+            
+            def complete_map(node_id: str) -> None:
+                # A map node completes once all of its items, and the node feeding it, have finished
+                run = map_runs[node_id]
+                if node_id in completed or not run.done() or (run.upstream is not None and run.upstream not in completed):
+                    return
+                
+                node = run.node
+                execution_time_ms = int((time.time() - run.start_time) * 1000)
                 try:
-                    result = execute_node(node, context, logger)
-                    
-                    # Calculate execution time
-                    execution_time_ms = int((time.time() - start_time) * 1000)
-                    
-                    # Log edge completion
-                    if logger and edge_source:
-                        logger.log_edge_complete(execution_time_ms, "complete")
-                    
-                    # Update context with the results
-                    context.update(result)
-                    
-                    # Mark as executed
-                    executed_nodes.add(node.id)
-                    executed_node_this_round = True
-                    
+                    result = reduce_map_results(run.compiled, [run.results[index] for index in range(run.expected)], run.context)
                 except Exception as e:
-                    # Calculate execution time
-                    execution_time_ms = int((time.time() - start_time) * 1000)
-                    
-                    # Log edge error
-                    if logger and edge_source:
-                        logger.log_edge_complete(execution_time_ms, f"error: {str(e)}")
+                    fail(node, e, execution_time_ms)
+                    return
+                
+                if logger:
+                    logger.log_node_metrics(node.id, {
+                        "execution_time_ms": execution_time_ms,
+                        "items": run.expected,
+                        "reused_items": run.reused,
+                        "llm_settings": {key: value for key, value in node.parameters.items() if key in LLM_SETTING_KEYS},
+                        **run.recorder.summary(),
+                        "latency_histograms": get_latency_histograms(node.id)
+                    })
+                    _log_node_result(node, result, logger)
+                
+                complete(node, result, execution_time_ms, run.fingerprint)
+                for downstream in pipelined(node_id):
+                    deadlines[downstream.node.id].restart(downstream.node.timeout or node_timeout)
+                    complete_map(downstream.node.id)
+            
+            def stop_overdue() -> None:
+                # Nodes past their deadline, or cancelled, get a grace period to stop before being abandoned
+                now = time.time()
+                for node_id in {node.id for node, _, _, _ in running.values()}:
+                    deadline = deadlines[node_id]
+                    if not (deadline.expired() or deadline.cancelled()):
+                        continue
+                    if now - stopping.setdefault(node_id, now) < grace:
+                        continue
                     
-                    # Re-raise the exception
-                    raise e
-        
-        # If no nodes were executed in this round, we have a dependency cycle
-        if not executed_node_this_round and len(executed_nodes) < len(graph.nodes):
-            unexecuted = [node.id for node in graph.nodes if node.id not in executed_nodes]
-            raise ValueError(f"Dependency cycle detected in graph. Unexecuted nodes: {unexecuted}")
+                    futures = [future for future, (node, _, _, _) in running.items() if node.id == node_id]
+                    node, start_time, _, _ = running[futures[0]]
+                    for future in futures:
+                        del running[future]
+                    abandoned.add(node_id)
+                    stopped = TimeoutError(f"Node {node_id} did not stop within {grace:g}s and was abandoned")
+                    fail(node, _deadline_error(deadline, stopped), int((now - start_time) * 1000))
+            
+            def wait_timeout() -> float:
+                # Wake up for the next deadline or end of a grace period, and poll for cancellation
+                timeouts = [CANCEL_POLL_SECONDS]
+                for node_id in {node.id for node, _, _, _ in running.values()}:
+                    remaining = deadlines[node_id].remaining()
+                    if remaining is not None:
+                        timeouts.append(remaining)
+                    if node_id in stopping:
+                        timeouts.append(stopping[node_id] + grace - time.time())
+                return max(0.0, min(timeouts))
+            
+            own_executor = executor is None
+            if own_executor:
+                executor = ThreadPoolExecutor(max_workers=max_parallelism, thread_name_prefix="notegold-node")
+            try:
+                with cancel_on_interrupt(run_deadline):
+                    while ready or ready_items or running:
+                        # Start ready map items, then ready nodes, unless a node has failed
+                        while (ready or ready_items) and error is None and len(running) < max_parallelism:
+                            if ready_items:
+                                node_id, index, item = ready_items.popleft()
+                                run = map_runs[node_id]
+                                
+                                # Items of a node fed item by item are reused if the same item was run before
+                                if run.upstream is not None and run_store is not None:
+                                    fingerprint = item_fingerprint(run.node, item, run.compiled.processor, run.compiled.processor_hash)
+                                    recorded = None
+                                    if not (force or node_id in force_nodes):
+                                        recorded = run_store.lookup(item_run_id(node_id, index), fingerprint)
+                                    if recorded is not None:
+                                        run.reused += 1
+                                        if checkpoint is not None:
+                                            checkpoint.map_item_completed(node_id, index, recorded)
+                                        item_completed(node_id, index, recorded)
+                                        continue
+                                    run.item_fingerprints[index] = fingerprint
+                                
+                                future = executor.submit(contextvars.copy_context().run, _run_with_deadline, deadlines[node_id],
+                                                         execute_map_item, run.compiled, item, run.context, run.recorder)
+                                running[future] = (run.node, run.start_time, run.fingerprint, index)
+                                continue
+                            
+                            compiled = plan.nodes[ready.popleft()]
+                            node = compiled.node
+                            
+                            # Nodes completed before a resume keep their checkpointed results
+                            if node.id in resumed_nodes and not force:
+                                if logger:
+                                    logger.log_node_skipped(node.id, "completed before resume", edge_sources.get(node.id))
+                                finish(node.id, {})
+                                continue
+                            
+                            # Don't start nodes once the run is out of time or cancelled
+                            try:
+                                run_deadline.check()
+                            except (DeadlineExceeded, RunCancelled) as e:
+                                fail(node, e, 0)
+                                continue
+                            
+                            # Skip nodes behind a false edge condition or a skipped node
+                            try:
+                                skip_reason = plan.skip_reason(node.id, context, skipped)
+                            except ConditionError as e:
+                                fail(node, e, 0)
+                                continue
+                            if skip_reason is not None:
+                                if logger:
+                                    logger.log_node_skipped(node.id, skip_reason, edge_sources.get(node.id))
+                                skipped.add(node.id)
+                                finish(node.id, {})
+                                continue
+                            
+                            # Skip nodes whose inputs haven't changed since their last successful run
+                            fingerprint = None
+                            if run_store is not None:
+                                fingerprint = node_fingerprint(node, context, compiled.processor, compiled.processor_hash)
+                                recorded = None if force or node.id in force_nodes else run_store.lookup(node.id, fingerprint)
+                                if recorded is not None:
+                                    if logger:
+                                        logger.log_node_skipped(node.id, "up to date", edge_sources.get(node.id))
+                                    finish(node.id, recorded)
+                                    continue
+                            
+                            # Map nodes queue one task per item
+                            if node.map_over:
+                                try:
+                                    start_map(node, fingerprint)
+                                except Exception as e:
+                                    fail(node, e, 0)
+                                continue
+                            
+                            # Start logging this edge
+                            if logger and node.id in edge_sources:
+                                logger.log_edge_start(edge_sources[node.id], node.id)
+                            
+                            future = executor.submit(contextvars.copy_context().run, _run_with_deadline, node_deadline(node),
+                                                     execute_node, node, dict(context), logger, compiled)
+                            running[future] = (node, time.time(), fingerprint, None)
+                        
+                        if not running:
+                            break
+                        
+                        done, _ = wait(running, timeout=wait_timeout(), return_when=FIRST_COMPLETED)
+                        for future in done:
+                            node, start_time, fingerprint, index = running.pop(future)
+                            
+                            # Calculate execution time
+                            execution_time_ms = int((time.time() - start_time) * 1000)
+                            
+                            try:
+                                result = future.result()
+                            except Exception as e:
+                                fail(node, _deadline_error(deadlines[node.id], e), execution_time_ms)
+                                continue
+                            
+                            if index is None:
+                                complete(node, result, execution_time_ms, fingerprint)
+                            else:
+                                if checkpoint is not None:
+                                    checkpoint.map_item_completed(node.id, index, result)
+                                if index in map_runs[node.id].item_fingerprints:
+                                    run_store.record(item_run_id(node.id, index), map_runs[node.id].item_fingerprints[index], result)
+                                item_completed(node.id, index, result)
+                        
+                        stop_overdue()
+            finally:
+                # Don't wait for abandoned nodes, or for running ones after a second Ctrl-C
+                if own_executor:
+                    executor.shutdown(wait=not (running or abandoned), cancel_futures=True)
+                else:
+                    for future in running:
+                        future.cancel()
+    
+    finally:
+        # Persist every artifact saved so far, even if a node failed
+        writer.close()
+    
+    if error is not None:
+        raise error
+    
+    if checkpoint is not None:
+        checkpoint.run_completed()
+    
+    # Make the meeting searchable and its topics findable as duplicates, now that all its artifacts are on disk
+    if "artifacts_dir" in context:
+        update_catalog(os.path.dirname(context["artifacts_dir"]))
+        update_topic_index(os.path.dirname(context["artifacts_dir"]))
     
     # Generate summary logs
     if logger:
+        logger.log_cache_stats(get_cache_stats(since=cache_stats_start))
         summary = logger.log_summary()
         context["processing_summary"] = summary
     
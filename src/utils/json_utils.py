@@ -0,0 +1,132 @@
+"""Incremental JSON extraction from LLM output."""
+import json
+from typing import Any, List, Optional, Tuple
+
+OPENERS = {"{": "}", "[": "]"}
+CLOSERS = {"}", "]"}
+
+class IncrementalJSONExtractor:
+    """
+    Finds JSON values embedded in text, scanning each character once.
+
+    Text may be fed in arbitrary chunks (e.g. as a response streams), so
+    values are available as soon as their closing bracket arrives. Prose,
+    markdown fences and other text between values are skipped. Bracketed
+    spans that fail to parse are kept as invalid fragments so that only
+    the broken part needs to be repaired.
+    """
+
+    def __init__(self):
+        """Initialize the extractor with an empty buffer."""
+        self.values: List[Tuple[int, int, Any]] = []
+        self.invalid_fragments: List[Tuple[str, str]] = []
+
+        self._buffer: List[str] = []
+        self._position = 0
+        self._start: Optional[int] = None
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, chunk: str) -> List[Any]:
+        """
+        Scan the next chunk of text.
+
+        Args:
+            chunk: Next piece of text
+
+        Returns:
+            JSON values completed within this chunk
+        """
+        completed = []
+
+        for char in chunk:
+            self._buffer.append(char)
+            index = self._position
+            self._position += 1
+
+            if self._start is None:
+                if char in OPENERS:
+                    self._start = index
+                    self._stack = [OPENERS[char]]
+                continue
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char in OPENERS:
+                self._stack.append(OPENERS[char])
+            elif char in CLOSERS:
+                if char != self._stack.pop():
+                    self._reject(index + 1, "Mismatched closing bracket")
+                elif not self._stack:
+                    value = self._accept(index + 1)
+                    if value is not None:
+                        completed.append(value[0])
+
+        return completed
+
+    def close(self) -> Optional[str]:
+        """
+        Finish scanning.
+
+        Returns:
+            The unterminated trailing fragment if the text ended inside a
+            JSON value (e.g. a truncated response), otherwise None
+        """
+        if self._start is None:
+            return None
+
+        fragment = "".join(self._buffer[self._start:])
+        self.invalid_fragments.append((fragment, "Unterminated JSON value"))
+        self._reset()
+        return fragment
+
+    def best_value(self) -> Optional[Any]:
+        """
+        Get the most substantial JSON value found.
+
+        Responses sometimes mention small bracketed values (e.g. "[1-10]")
+        before the real payload, so the longest value wins.
+
+        Returns:
+            Parsed JSON value, or None if no value was found
+        """
+        if not self.values:
+            return None
+        start, end, value = max(self.values, key=lambda item: item[1] - item[0])
+        return value
+
+    def _accept(self, end: int) -> Optional[Tuple[Any]]:
+        fragment = "".join(self._buffer[self._start:end])
+        start = self._start
+        self._reset()
+        try:
+            value = json.loads(fragment)
+        except json.JSONDecodeError as e:
+            # Skip short bracketed prose like "[note]"; keep real JSON-looking fragments for repair
+            if any(char in fragment for char in '":'):
+                self.invalid_fragments.append((fragment, f"{e.msg} at position {e.pos}"))
+            return None
+        self.values.append((start, end, value))
+        return (value,)
+
+    def _reject(self, end: int, reason: str) -> None:
+        fragment = "".join(self._buffer[self._start:end])
+        if any(char in fragment for char in '":'):
+            self.invalid_fragments.append((fragment, reason))
+        self._reset()
+
+    def _reset(self) -> None:
+        self._start = None
+        self._stack = []
+        self._in_string = False
+        self._escaped = False
@@ -1,43 +1,387 @@
 import os
 import json
 import re
-from typing import Dict, List, Any, Optional
+import contextvars
+import functools
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from typing import Dict, List, Any, Optional, Awaitable, Callable, Iterable, Iterator, Tuple, Union
+from src.utils.cache_utils import get_completion_cache, make_cache_key
+from src.utils.deadline_utils import (
+    CANCEL_CHECK_SECONDS,
+    DeadlineExceeded,
+    RunCancelled,
+    check_deadline,
+    deadline_timestamp,
+    get_deadline
+)
+from src.utils.json_utils import IncrementalJSONExtractor
+from src.utils.metrics_utils import LLMUsageRecorder
+from src.utils.rate_limit_utils import (
+    DEFAULT_COMPLETION_TOKEN_ESTIMATE,
+    HedgeCancelled,
+    estimate_tokens,
+    get_hedge_policy,
+    get_request_throttle,
+    retry_with_backoff
+)
+from src.utils.schema_utils import coerce_to_schema, validate_json
 
-def initialize_openai_client():
-    """Initialize OpenAI client with API key from environment."""
+DEFAULT_MODEL = "gpt-4"
+DEFAULT_TEMPERATURE = 0.7
+
+# Node parameters that configure LLM calls rather than being passed to the processor
+LLM_SETTING_KEYS = ("model", "temperature", "max_tokens", "cascade", "hedge")
+
+# LLM settings, usage recorder and ID of the graph node currently executing
+_node_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("notegold_node_id", default=None)
+_llm_settings: contextvars.ContextVar[Dict[str, Any]] = contextvars.ContextVar("notegold_llm_settings", default={})
+_usage_recorder: contextvars.ContextVar[Optional[LLMUsageRecorder]] = contextvars.ContextVar("notegold_usage_recorder", default=None)
+
+# Models accepting response_format={"type": "json_schema"} (strict structured outputs)
+JSON_SCHEMA_MODEL_PREFIXES = ("gpt-4o", "gpt-4.1", "gpt-5", "o1", "o3", "o4")
+
+# Models accepting only response_format={"type": "json_object"}
+JSON_MODE_MODEL_PREFIXES = ("gpt-4-turbo", "gpt-4-1106", "gpt-4-0125", "gpt-3.5-turbo")
+
+def get_client_config() -> Dict[str, Any]:
+    """
+    Get HTTP connection pool and timeout settings for LLM clients.
+    
+    Values come from OPENAI_MAX_CONNECTIONS, OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+    OPENAI_KEEPALIVE_EXPIRY, OPENAI_TIMEOUT, OPENAI_CONNECT_TIMEOUT and
+    OPENAI_MAX_RETRIES, falling back to defaults suited to a single pipeline run.
+    Client-level retries are off by default because chat_completion retries
+    through the shared rate limiter instead.
+    
+    Returns:
+        Dictionary of client settings
+    """
+    return {
+        "max_connections": int(os.environ.get("OPENAI_MAX_CONNECTIONS", 20)),
+        "max_keepalive_connections": int(os.environ.get("OPENAI_MAX_KEEPALIVE_CONNECTIONS", 10)),
+        "keepalive_expiry": float(os.environ.get("OPENAI_KEEPALIVE_EXPIRY", 30.0)),
+        "timeout": float(os.environ.get("OPENAI_TIMEOUT", 120.0)),
+        "connect_timeout": float(os.environ.get("OPENAI_CONNECT_TIMEOUT", 10.0)),
+        "max_retries": int(os.environ.get("OPENAI_MAX_RETRIES", 0))
+    }
+
+def create_openai_client():
+    """Create an OpenAI client with a pooled keep-alive HTTP connection."""
     try:
         import openai
-        api_key = os.environ.get("OPENAI_API_KEY")
-        if not api_key:
-            raise ValueError("OPENAI_API_KEY environment variable not set")
-        
-        openai.api_key = api_key
-        return openai
+        import httpx
     except ImportError:
         raise ImportError("OpenAI package not installed. Install with: pip install openai")
+    
+    api_key = os.environ.get("OPENAI_API_KEY")
+    if not api_key:
+        raise ValueError("OPENAI_API_KEY environment variable not set")
+    
+    config = get_client_config()
+    http_client = httpx.Client(
+        limits=httpx.Limits(
+            max_connections=config["max_connections"],
+            max_keepalive_connections=config["max_keepalive_connections"],
+            keepalive_expiry=config["keepalive_expiry"]
+        ),
+        timeout=httpx.Timeout(config["timeout"], connect=config["connect_timeout"])
+    )
+    
+    return openai.OpenAI(
+        api_key=api_key,
+        base_url=os.environ.get("OPENAI_BASE_URL") or None,
+        timeout=config["timeout"],
+        max_retries=config["max_retries"],
+        http_client=http_client
+    )
+
+def create_fake_llm_client():
+    """Create an in-process fake LLM client for offline benchmarking (see fake_llm_utils)."""
+    from src.utils.fake_llm_utils import FakeLLMClient
+    return FakeLLMClient()
+
+class ProviderRegistry:
+    """
+    Registry of LLM providers and the long-lived clients they own.
+    
+    Each provider's client is created once on first use and shared by all
+    threads, so HTTP connections are kept alive across calls. After a fork
+    the child discards the inherited clients and creates its own, since
+    pooled sockets cannot be shared between processes.
+    """
+    
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._clients: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+    
+    def register(self, name: str, factory: Callable[[], Any]) -> None:
+        """
+        Register a provider.
+        
+        Args:
+            name: Provider name (matched against LLM_PROVIDER)
+            factory: Function that creates the provider's client
+        """
+        with self._lock:
+            self._factories[name] = factory
+            self._clients.pop(name, None)
+    
+    def get_client(self, name: str) -> Any:
+        """
+        Get the shared client for a provider, creating it on first use.
+        
+        Args:
+            name: Provider name
+            
+        Returns:
+            Provider client
+        """
+        if self._pid != os.getpid():
+            self._after_fork()
+        
+        client = self._clients.get(name)
+        if client is not None:
+            return client
+        
+        with self._lock:
+            client = self._clients.get(name)
+            if client is None:
+                if name not in self._factories:
+                    raise ValueError(f"Unsupported LLM provider: {name}")
+                client = self._factories[name]()
+                self._clients[name] = client
+            return client
+    
+    def close(self) -> None:
+        """Close all clients and their connection pools."""
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        
+        for client in clients:
+            close = getattr(client, "close", None)
+            if close:
+                close()
+    
+    def _after_fork(self) -> None:
+        # Drop (rather than close) the parent's clients so its sockets are untouched
+        self._lock = threading.Lock()
+        self._clients = {}
+        self._pid = os.getpid()
+
+_provider_registry = ProviderRegistry()
+_provider_registry.register("openai", create_openai_client)
+_provider_registry.register("fake", create_fake_llm_client)
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_provider_registry._after_fork)
+
+def get_provider_registry() -> ProviderRegistry:
+    """Get the process-wide LLM provider registry."""
+    return _provider_registry
+
+def get_llm_client(provider: Optional[str] = None) -> Any:
+    """
+    Get the shared client for the configured LLM provider.
+    
+    Args:
+        provider: Provider name (defaults to LLM_PROVIDER, then "openai")
+        
+    Returns:
+        Provider client
+    """
+    if provider is None:
+        provider = os.environ.get("LLM_PROVIDER", "openai").lower()
+    return _provider_registry.get_client(provider)
+
+def initialize_openai_client():
+    """Get the shared OpenAI client, creating it on first use."""
+    return get_llm_client("openai")
+
+@contextmanager
+def use_llm_settings(
+    settings: Dict[str, Any],
+    recorder: Optional[LLMUsageRecorder] = None,
+    node_id: Optional[str] = None
+) -> Iterator[None]:
+    """
+    Apply LLM settings to every completion made within the block.
+    
+    Settings are held in a context variable, so they follow the calls a
+    processor fans out to other threads (see run_with_concurrency) without
+    affecting nodes running elsewhere.
+    
+    Args:
+        settings: Any of model, temperature, max_tokens, cascade (a list of
+            models tried in order by structured_completion) and hedge
+            (overrides NOTEGOLD_LLM_HEDGE)
+        recorder: Optional recorder for the latency and token usage of each request
+        node_id: Optional graph node ID, which keys the node's latency histograms
+    """
+    settings_token = _llm_settings.set(dict(settings))
+    recorder_token = _usage_recorder.set(recorder)
+    node_token = _node_id.set(node_id)
+    try:
+        yield
+    finally:
+        _node_id.reset(node_token)
+        _usage_recorder.reset(recorder_token)
+        _llm_settings.reset(settings_token)
+
+def get_llm_settings() -> Dict[str, Any]:
+    """Get the LLM settings applied by the enclosing use_llm_settings block, if any."""
+    return _llm_settings.get()
+
+def hedging_enabled() -> bool:
+    """Check whether requests should be hedged: the node's hedge setting, else NOTEGOLD_LLM_HEDGE."""
+    hedge = _llm_settings.get().get("hedge")
+    if hedge is None:
+        hedge = os.environ.get("NOTEGOLD_LLM_HEDGE", "0").lower() in ("1", "true", "on", "yes")
+    return bool(hedge)
+
+def get_latency_histograms(node_id: str) -> Dict[str, Dict[str, float]]:
+    """
+    Get the hedging latency histograms recorded for a graph node.
+    
+    Args:
+        node_id: Graph node ID
+        
+    Returns:
+        Dictionary mapping "<kind>:<model>" (kind is completion or first_chunk)
+        to the histogram's sample count and percentiles in milliseconds
+    """
+    return {
+        f"{kind}:{model}": histogram
+        for (kind, key_node_id, model), histogram in get_hedge_policy().histograms().items()
+        if key_node_id == node_id
+    }
+
+def _resolve_settings(
+    model: Optional[str],
+    temperature: Optional[float],
+    max_tokens: Optional[int]
+) -> Tuple[str, float, Optional[int]]:
+    """Fill in unspecified model, temperature and max_tokens from the node settings, then the defaults."""
+    settings = _llm_settings.get()
+    if model is None:
+        model = settings.get("model", DEFAULT_MODEL)
+    if temperature is None:
+        temperature = settings.get("temperature", DEFAULT_TEMPERATURE)
+    if max_tokens is None:
+        max_tokens = settings.get("max_tokens")
+    return model, temperature, max_tokens
 
 def chat_completion(
     prompt: str, 
     system_message: str = "",
-    model: str = "gpt-4",
-    temperature: float = 0.7,
-    max_tokens: Optional[int] = None
-) -> str:
+    model: Optional[str] = None,
+    temperature: Optional[float] = None,
+    max_tokens: Optional[int] = None,
+    use_cache: bool = True,
+    stream: bool = False,
+    response_format: Optional[Dict[str, Any]] = None
+) -> Union[str, Iterator[str]]:
     """
     Get completion from OpenAI chat model.
     
+    Identical requests are served from the on-disk completion cache, and
+    identical requests in flight at the same time share one upstream call.
+    Within a use_deadline block, the request gives up once the deadline
+    passes or is cancelled (see Deadline).
+    
     Args:
         prompt: The user prompt
         system_message: Optional system message
-        model: Model to use (default: gpt-4)
-        temperature: Temperature (0.0 to 1.0)
-        max_tokens: Maximum tokens in response
+        model: Model to use (default: the node's model setting, then gpt-4)
+        temperature: Temperature (0.0 to 1.0; default: the node's setting, then 0.7)
+        max_tokens: Maximum tokens in response (default: the node's setting)
+        use_cache: Set to False to bypass the completion cache for this call
+        stream: If True, return an iterator of text chunks (see stream_chat_completion)
+        response_format: Optional structured output format (see structured_output_format)
         
     Returns:
-        Generated text
+        Generated text, or an iterator of text chunks when streaming
+    """
+    if stream:
+        return stream_chat_completion(prompt, system_message, model, temperature, max_tokens, use_cache, response_format)
+    
+    model, temperature, max_tokens = _resolve_settings(model, temperature, max_tokens)
+    params = _build_request_params(prompt, system_message, model, temperature, max_tokens, response_format)
+    
+    cache = get_completion_cache() if use_cache else None
+    if cache is None:
+        return _request_completion(params)[0]
+    
+    # Responses cut short by max_tokens or a content filter aren't cached
+    def compute() -> Tuple[str, bool]:
+        content, finish_reason = _request_completion(params)
+        return content, finish_reason == "stop"
+    
+    key = make_cache_key(model, temperature, system_message, prompt, max_tokens, response_format)
+    return cache.get_or_compute(key, compute, deadline_timestamp())
+
+def stream_chat_completion(
+    prompt: str,
+    system_message: str = "",
+    model: Optional[str] = None,
+    temperature: Optional[float] = None,
+    max_tokens: Optional[int] = None,
+    use_cache: bool = True,
+    response_format: Optional[Dict[str, Any]] = None
+) -> Iterator[str]:
+    """
+    Stream a completion from OpenAI chat model, yielding text as it arrives.
+    
+    A cached completion is yielded as a single chunk. A streamed completion
+    is added to the cache once it has been received in full.
+    
+    Args:
+        prompt: The user prompt
+        system_message: Optional system message
+        model: Model to use (default: the node's model setting, then gpt-4)
+        temperature: Temperature (0.0 to 1.0; default: the node's setting, then 0.7)
+        max_tokens: Maximum tokens in response (default: the node's setting)
+        use_cache: Set to False to bypass the completion cache for this call
+        response_format: Optional structured output format (see structured_output_format)
+        
+    Yields:
+        Chunks of generated text
     """
-    openai = initialize_openai_client()
+    model, temperature, max_tokens = _resolve_settings(model, temperature, max_tokens)
+    params = _build_request_params(prompt, system_message, model, temperature, max_tokens, response_format)
+    
+    cache = get_completion_cache() if use_cache else None
+    key = None
+    if cache is not None:
+        key = make_cache_key(model, temperature, system_message, prompt, max_tokens, response_format)
+        cached = cache.lookup(key)
+        if cached is not None:
+            yield cached
+            return
     
+    chunks = []
+    outcome = {}
+    for chunk in _request_completion_stream(params, outcome):
+        chunks.append(chunk)
+        yield chunk
+    
+    if cache is not None and outcome.get("finish_reason") == "stop":
+        cache.set(key, "".join(chunks))
+
+def _build_request_params(
+    prompt: str,
+    system_message: str,
+    model: str,
+    temperature: float,
+    max_tokens: Optional[int],
+    response_format: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Build chat completion request parameters."""
     messages = []
     if system_message:
         messages.append({"role": "system", "content": system_message})
@@ -53,32 +397,598 @@ def chat_completion(
     if max_tokens:
         params["max_tokens"] = max_tokens
     
-    response = openai.chat.completions.create(**params)
-    return response.choices[0].message.content
+    if response_format:
+        params["response_format"] = response_format
+    
+    return params
 
-def extract_json_from_response(response: str) -> Dict:
+def _estimate_request_tokens(params: Dict[str, Any]) -> int:
+    """Estimate the tokens a request will use, for charging the rate limiter up front."""
+    prompt_text = "".join(message["content"] for message in params["messages"])
+    return estimate_tokens(prompt_text) + (params.get("max_tokens") or DEFAULT_COMPLETION_TOKEN_ESTIMATE)
+
+def _request_timeout() -> Dict[str, Any]:
+    """Get the timeout argument bounding a request by the current deadline, if there is one."""
+    deadline = get_deadline()
+    if deadline is None or deadline.expires_at is None:
+        return {}
+    return {"timeout": max(0.001, deadline.bound(get_client_config()["timeout"]))}
+
+def _call_cancellable(request: Callable[[], Any], cancelled: Optional[threading.Event] = None) -> Any:
     """
-    Extract and parse JSON from a text response.
-    Handles cases where JSON might be embedded in markdown or other text.
+    Send a blocking request, returning early if the current deadline passes or is cancelled.
+    
+    With a deadline or a hedge cancel event, the request runs on a daemon
+    thread while the caller waits on it, so a cancelled run or a hedged
+    attempt that lost stops waiting at once instead of when the HTTP call
+    returns. The abandoned call finishes in the background, and a response
+    it returns late is closed.
+    
+    Args:
+        request: Function sending the request
+        cancelled: Optional event set once another hedged attempt has won
+        
+    Raises:
+        HedgeCancelled: If cancelled is set before the response arrives
     """
-    # Try to find JSON block in markdown
-    json_match = re.search(r'```(?:json)?\s*([\s\S]*?)\s*```', response)
+    deadline = get_deadline()
+    if deadline is None and cancelled is None:
+        return request()
+    
+    done = threading.Event()
+    abandoned = threading.Event()
+    outcome: Dict[str, Any] = {}
     
-    if json_match:
+    def run() -> None:
         try:
-            return json.loads(json_match.group(1))
-        except json.JSONDecodeError:
-            pass
+            outcome["result"] = request()
+        except BaseException as e:
+            outcome["error"] = e
+        finally:
+            done.set()
+        if abandoned.is_set():
+            _close_response(outcome.get("result"))
+    
+    threading.Thread(target=contextvars.copy_context().run, args=(run,), name="notegold-llm-request", daemon=True).start()
+    try:
+        while not done.wait(deadline.bound(CANCEL_CHECK_SECONDS) if deadline is not None else CANCEL_CHECK_SECONDS):
+            if cancelled is not None and cancelled.is_set():
+                raise HedgeCancelled()
+            if deadline is not None:
+                deadline.check()
+    except BaseException:
+        # Whichever of the two threads sees the other finish closes the response
+        abandoned.set()
+        if done.is_set():
+            _close_response(outcome.get("result"))
+        raise
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["result"]
+
+def _close_response(response: Any) -> None:
+    """Close an abandoned response (e.g. a stream), if it can be closed."""
+    close = getattr(response, "close", None)
+    if close is not None:
+        close()
+
+def _retry_until_deadline(attempt: Callable[[], Any]) -> Any:
+    """Retry a request attempt with backoff, reporting a failure caused by the deadline as DeadlineExceeded."""
+    def checked_attempt():
+        check_deadline()
+        return attempt()
+    
+    try:
+        return retry_with_backoff(
+            checked_attempt,
+            max_retries=int(os.environ.get("NOTEGOLD_LLM_MAX_RETRIES", 5)),
+            on_retry=_log_retry,
+            deadline=deadline_timestamp()
+        )
+    except (DeadlineExceeded, RunCancelled):
+        raise
+    except Exception as e:
+        # A request timed out by the deadline fails with the provider's own timeout error
+        deadline = get_deadline()
+        if deadline is not None and (deadline.expired() or deadline.cancelled()):
+            try:
+                deadline.check()
+            except (DeadlineExceeded, RunCancelled) as stop:
+                raise stop from e
+        raise
+
+def _request_completion(params: Dict[str, Any]) -> Tuple[str, Optional[str]]:
+    """Send a chat completion request to the configured provider and return the generated text and finish reason."""
+    client = get_llm_client()
+    
+    # Charge the rate limiter up front, correcting with real usage afterwards
+    throttle = get_request_throttle()
+    estimated_tokens = _estimate_request_tokens(params)
+    
+    def send(cancelled: threading.Event) -> Any:
+        def attempt():
+            with throttle.request(estimated_tokens, deadline_timestamp()) as usage:
+                # A hedged attempt that lost while waiting for a slot never sends, so its tokens are refunded
+                if cancelled.is_set():
+                    usage["total_tokens"] = 0
+                    raise HedgeCancelled()
+                sent_at = time.time()
+                response = _call_cancellable(lambda: client.chat.completions.create(**params, **_request_timeout()), cancelled)
+                _record_hedge_latency("completion", params["model"], time.time() - sent_at)
+                usage["total_tokens"] = getattr(getattr(response, "usage", None), "total_tokens", None)
+            return response
+        
+        return _retry_until_deadline(attempt)
+    
+    start_time = time.time()
+    if hedging_enabled():
+        response = _run_hedged(send, "completion", params["model"])
+    else:
+        response = send(threading.Event())
+    _record_usage(params["model"], start_time, getattr(response, "usage", None))
+    choice = response.choices[0]
+    return choice.message.content, getattr(choice, "finish_reason", None)
+
+def _request_completion_stream(params: Dict[str, Any], outcome: Dict[str, Any]) -> Iterator[str]:
+    """
+    Send a streaming chat completion request and yield text chunks as they arrive.
+    
+    The stream's finish reason is stored in outcome["finish_reason"] once it ends.
+    """
+    if not hedging_enabled():
+        yield from _open_completion_stream(params, outcome=outcome)
+        return
+    
+    # Hedge on time to first chunk; the losing stream is closed once it produces one
+    def open_stream(cancelled: threading.Event) -> Tuple[Optional[str], Iterator[str], Dict[str, Any]]:
+        if cancelled.is_set():
+            raise HedgeCancelled()
+        attempt_outcome = {}
+        stream = _open_completion_stream(params, cancelled, attempt_outcome)
+        return next(stream, None), stream, attempt_outcome
     
-    # Try to parse the entire response as JSON
+    first_chunk, stream, attempt_outcome = _run_hedged(
+        open_stream, "first_chunk", params["model"], on_discard=lambda result: result[1].close()
+    )
     try:
-        return json.loads(response)
-    except json.JSONDecodeError:
-        pass
+        if first_chunk is not None:
+            yield first_chunk
+        yield from stream
+        outcome.update(attempt_outcome)
+    finally:
+        stream.close()
+
+def _run_hedged(
+    func: Callable[[threading.Event], Any],
+    kind: str,
+    model: str,
+    on_discard: Optional[Callable[[Any], None]] = None
+) -> Any:
+    """Run a request attempt through the hedge policy, keyed by the current node and model."""
+    key, fallback_key = _hedge_keys(kind, model)
+    result, hedged, hedge_won = get_hedge_policy().run(func, key, fallback_key, on_discard=on_discard)
+    
+    recorder = _usage_recorder.get()
+    if hedged and recorder is not None:
+        recorder.record_hedge(hedge_won)
+    return result
+
+def _hedge_keys(kind: str, model: str) -> Tuple[Tuple[str, Optional[str], str], Tuple[str, None, str]]:
+    """Get the latency histogram keys of a request: per current node and model, and per model."""
+    return (kind, _node_id.get(), model), (kind, None, model)
+
+def _record_hedge_latency(kind: str, model: str, latency: float) -> None:
+    """Record how long the provider took to answer a request, if requests are hedged."""
+    if hedging_enabled():
+        get_hedge_policy().record(latency, *_hedge_keys(kind, model))
+
+def _open_completion_stream(
+    params: Dict[str, Any],
+    cancelled: Optional[threading.Event] = None,
+    outcome: Optional[Dict[str, Any]] = None
+) -> Iterator[str]:
+    """
+    Open a streaming chat completion request and yield text chunks as they arrive.
+    
+    The stream is closed, ending the request, if the current deadline
+    passes or is cancelled while it is being read. A hedged attempt passes
+    its cancel event, so it stops opening the stream once it has lost.
+    The finish reason reported by the stream is stored in outcome, if given.
+    """
+    client = get_llm_client()
+    params = dict(params, stream=True, stream_options={"include_usage": True})
+    
+    throttle = get_request_throttle()
+    estimated_tokens = _estimate_request_tokens(params)
+    start_time = time.time()
+    final_usage = None
+    
+    with ExitStack() as stack:
+        # Only opening the stream is retried; a failure mid-stream propagates
+        def attempt():
+            with ExitStack() as attempt_stack:
+                usage = attempt_stack.enter_context(throttle.request(estimated_tokens, deadline_timestamp()))
+                if cancelled is not None and cancelled.is_set():
+                    usage["total_tokens"] = 0
+                    raise HedgeCancelled()
+                sent_at = time.time()
+                response_stream = _call_cancellable(lambda: client.chat.completions.create(**params, **_request_timeout()), cancelled)
+                return usage, response_stream, sent_at, attempt_stack.pop_all()
+        
+        usage, response_stream, sent_at, request_stack = _retry_until_deadline(attempt)
+        stack.enter_context(request_stack)
+        if hasattr(response_stream, "close"):
+            stack.callback(response_stream.close)
+        
+        first_chunk = True
+        for chunk in response_stream:
+            check_deadline()
+            if getattr(chunk, "usage", None):
+                final_usage = chunk.usage
+                usage["total_tokens"] = chunk.usage.total_tokens
+            if chunk.choices and outcome is not None and getattr(chunk.choices[0], "finish_reason", None):
+                outcome["finish_reason"] = chunk.choices[0].finish_reason
+            if chunk.choices and chunk.choices[0].delta.content:
+                if first_chunk:
+                    _record_hedge_latency("first_chunk", params["model"], time.time() - sent_at)
+                    first_chunk = False
+                yield chunk.choices[0].delta.content
+    
+    _record_usage(params["model"], start_time, final_usage)
+
+def _record_usage(model: str, start_time: float, usage: Any) -> None:
+    """Record a finished request with the current node's usage recorder, if any."""
+    recorder = _usage_recorder.get()
+    if recorder is not None:
+        recorder.record_request(
+            model,
+            (time.time() - start_time) * 1000,
+            getattr(usage, "prompt_tokens", None),
+            getattr(usage, "completion_tokens", None)
+        )
+
+def _log_retry(error: BaseException, attempt: int, delay: float) -> None:
+    print(f"  LLM request failed ({type(error).__name__}: {error}); retry {attempt} in {delay:.1f}s")
+
+def stream_completion_to_file(
+    prompt: str,
+    system_message: str,
+    output_path: str,
+    header: str = "",
+    on_chunk: Optional[Callable[[str], None]] = None,
+    **completion_kwargs: Any
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Stream a completion into a file, so partial output is visible while it is generated.
+    
+    Args:
+        prompt: The user prompt
+        system_message: Optional system message
+        output_path: File to write the streamed text to
+        header: Text written before the completion
+        on_chunk: Optional callback for each chunk (e.g. an incremental parser)
+        **completion_kwargs: Extra arguments for stream_chat_completion
+        
+    Returns:
+        Tuple of the full completion text and a timings dict with
+        output_path, ttfb_ms (time to first chunk) and total_ms
+    """
+    start_time = time.time()
+    first_chunk_time = None
+    chunks = []
+    
+    with open(output_path, 'w') as f:
+        f.write(header)
+        f.flush()
+        for chunk in stream_chat_completion(prompt, system_message, **completion_kwargs):
+            if first_chunk_time is None:
+                first_chunk_time = time.time()
+            chunks.append(chunk)
+            if on_chunk:
+                on_chunk(chunk)
+            f.write(chunk)
+            f.flush()
+    
+    end_time = time.time()
+    timings = {
+        "output_path": output_path,
+        "ttfb_ms": int(((first_chunk_time or end_time) - start_time) * 1000),
+        "total_ms": int((end_time - start_time) * 1000)
+    }
+    return "".join(chunks), timings
+
+async def async_chat_completion(
+    prompt: str,
+    system_message: str = "",
+    model: Optional[str] = None,
+    temperature: Optional[float] = None,
+    max_tokens: Optional[int] = None,
+    use_cache: bool = True,
+    response_format: Optional[Dict[str, Any]] = None
+) -> str:
+    """
+    Async version of chat_completion.
+    
+    The request runs on the event loop's default executor so that it shares
+    the completion cache and in-flight request merging with sync callers.
+    It runs in a copy of the caller's context, so node LLM settings apply.
+    
+    Args:
+        prompt: The user prompt
+        system_message: Optional system message
+        model: Model to use (default: the node's model setting, then gpt-4)
+        temperature: Temperature (0.0 to 1.0; default: the node's setting, then 0.7)
+        max_tokens: Maximum tokens in response (default: the node's setting)
+        use_cache: Set to False to bypass the completion cache for this call
+        response_format: Optional structured output format (see structured_output_format)
+        
+    Returns:
+        Generated text
+    """
+    import asyncio
+    
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        None,
+        contextvars.copy_context().run,
+        functools.partial(
+            chat_completion,
+            prompt,
+            system_message=system_message,
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            use_cache=use_cache,
+            response_format=response_format
+        )
+    )
+
+def get_max_concurrency(max_concurrency: Optional[int] = None) -> int:
+    """
+    Resolve the number of LLM calls a processor may have in flight at once.
+    
+    Args:
+        max_concurrency: Explicit limit; if None, NOTEGOLD_LLM_CONCURRENCY or 4 is used
+        
+    Returns:
+        Concurrency limit (at least 1)
+    """
+    if max_concurrency is None:
+        max_concurrency = int(os.environ.get("NOTEGOLD_LLM_CONCURRENCY", 4))
+    return max(1, max_concurrency)
+
+async def gather_with_concurrency(aws: Iterable[Awaitable], max_concurrency: int) -> List[Any]:
+    """
+    Await several awaitables with at most max_concurrency running at once.
+    
+    Args:
+        aws: Awaitables to run
+        max_concurrency: Maximum number running at the same time
+        
+    Returns:
+        Results in the same order as aws
+    """
+    import asyncio
+    
+    semaphore = asyncio.Semaphore(max_concurrency)
+    
+    async def bounded(aw: Awaitable) -> Any:
+        async with semaphore:
+            return await aw
+    
+    return await asyncio.gather(*(bounded(aw) for aw in aws))
+
+def run_with_concurrency(funcs: List[Callable[[], Any]], max_concurrency: Optional[int] = None) -> List[Any]:
+    """
+    Run blocking functions concurrently from synchronous code.
+    
+    Args:
+        funcs: Zero-argument functions to run (e.g. functools.partial objects)
+        max_concurrency: Maximum concurrent calls (see get_max_concurrency)
+        
+    Returns:
+        Results in the same order as funcs
+    """
+    if not funcs:
+        return []
+    
+    # asyncio is imported on first use, as it is slow to import and only processors need it
+    import asyncio
+    
+    # Each function runs in a copy of the caller's context so node LLM settings apply
+    async def run_in_executor(func: Callable[[], Any]) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(None, contextvars.copy_context().run, func)
+    
+    return asyncio.run(gather_with_concurrency(
+        [run_in_executor(func) for func in funcs],
+        get_max_concurrency(max_concurrency)
+    ))
+
+def chat_completions(requests: List[Dict[str, Any]], max_concurrency: Optional[int] = None) -> List[str]:
+    """
+    Run several chat completions concurrently from synchronous code.
+    
+    Args:
+        requests: List of keyword argument dicts for chat_completion
+        max_concurrency: Maximum concurrent requests (see get_max_concurrency)
+        
+    Returns:
+        Generated texts in the same order as requests
+    """
+    if not requests:
+        return []
+    
+    import asyncio
+    
+    return asyncio.run(gather_with_concurrency(
+        [async_chat_completion(**request) for request in requests],
+        get_max_concurrency(max_concurrency)
+    ))
+
+def structured_output_format(name: str, schema: Dict[str, Any], model: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Build a response_format that constrains the model's output to a JSON schema.
+    
+    Models with structured output support get a strict json_schema format;
+    models that only support JSON mode get json_object; older models (such
+    as the default gpt-4) get None and rely on the prompt plus
+    parse_json_response. NOTEGOLD_STRUCTURED_OUTPUT=0 disables this.
+    
+    Args:
+        name: Schema name
+        schema: JSON schema (object at the top level)
+        model: Model the request will use (default: the node's model setting, then gpt-4)
+        
+    Returns:
+        response_format dictionary, or None if the model doesn't support it
+    """
+    model = _resolve_settings(model, None, None)[0]
+    if os.environ.get("NOTEGOLD_STRUCTURED_OUTPUT", "1").lower() in ("0", "false", "off", "no"):
+        return None
+    
+    provider = os.environ.get("LLM_PROVIDER", "openai").lower()
+    if provider == "fake" or model.startswith(JSON_SCHEMA_MODEL_PREFIXES):
+        return {"type": "json_schema", "json_schema": {"name": name, "schema": schema, "strict": True}}
+    if model.startswith(JSON_MODE_MODEL_PREFIXES):
+        return {"type": "json_object"}
+    return None
+
+def extract_json_from_response(response: str) -> Dict:
+    """
+    Extract and parse JSON from a text response.
+    Handles cases where JSON might be embedded in markdown or other text.
+    
+    The response is scanned once; the longest embedded JSON value wins.
+    """
+    extractor = IncrementalJSONExtractor()
+    extractor.feed(response)
+    extractor.close()
+    
+    value = extractor.best_value()
+    if value is not None:
+        return value
     
     # If all else fails, return an error object
     return {"error": "Could not extract JSON from response", "raw_response": response}
 
+def repair_json(fragment: str, error: str, schema: Optional[Dict[str, Any]] = None, model: Optional[str] = None) -> Optional[Any]:
+    """
+    Ask the LLM to fix an invalid JSON fragment.
+    
+    Only the broken fragment is sent, not the original prompt.
+    
+    Args:
+        fragment: Invalid JSON text
+        error: Parser error describing what is wrong
+        schema: Optional JSON schema the result should follow
+        model: Model to use (default: the node's model setting, then gpt-4)
+        
+    Returns:
+        Parsed JSON value, or None if the repaired text still doesn't parse
+    """
+    system_message = "You repair malformed JSON. Respond with the corrected JSON only, with no commentary."
+    prompt = f"This JSON is invalid ({error}). Fix the syntax without changing its content:\n\n{fragment}"
+    if schema:
+        prompt += f"\n\nIt must match this JSON schema:\n{json.dumps(schema)}"
+    
+    response_format = structured_output_format("repaired_json", schema, model) if schema else None
+    response = chat_completion(prompt, system_message, model=model, temperature=0.0, response_format=response_format)
+    
+    extractor = IncrementalJSONExtractor()
+    extractor.feed(response)
+    extractor.close()
+    return extractor.best_value()
+
+def parse_json_response(
+    response: str,
+    schema: Optional[Dict[str, Any]] = None,
+    extractor: Optional[IncrementalJSONExtractor] = None,
+    repair: bool = True
+) -> Any:
+    """
+    Parse JSON from an LLM response, repairing only the invalid fragment if needed.
+    
+    Args:
+        response: Text response from LLM
+        schema: Optional JSON schema, passed along when repairing
+        extractor: Extractor already fed with the streamed response (avoids rescanning)
+        repair: Whether to ask the LLM to repair an invalid fragment
+        
+    Returns:
+        Parsed JSON value, or an error dictionary like extract_json_from_response
+    """
+    if extractor is None:
+        extractor = IncrementalJSONExtractor()
+        extractor.feed(response)
+    extractor.close()
+    
+    value = extractor.best_value()
+    if value is not None:
+        return value
+    
+    if repair and extractor.invalid_fragments:
+        fragment, error = max(extractor.invalid_fragments, key=lambda item: len(item[0]))
+        print(f"  Repairing invalid JSON in LLM response ({error})")
+        value = repair_json(fragment, error, schema)
+        if value is not None:
+            return value
+    
+    return {"error": "Could not extract JSON from response", "raw_response": response}
+
+def structured_completion(
+    prompt: str,
+    system_message: str,
+    schema: Dict[str, Any],
+    name: str,
+    check: Optional[Callable[[Any], List[str]]] = None,
+    **completion_kwargs: Any
+) -> Tuple[Any, str]:
+    """
+    Get a JSON completion matching schema, escalating through the node's model cascade.
+    
+    Without a cascade setting this is a single request to the node's model.
+    With one (e.g. ["gpt-4o-mini", "gpt-4o"]) each model is tried in order
+    until a response passes schema validation and the optional check; the
+    last model's response is returned either way. Only the last model's
+    invalid JSON is repaired, since escalating is the better fix before then.
+    
+    Args:
+        prompt: The user prompt
+        system_message: System message
+        schema: JSON schema the response must match
+        name: Schema name (see structured_output_format)
+        check: Optional function returning problems with the parsed value (a confidence check)
+        **completion_kwargs: Extra arguments for chat_completion (temperature, max_tokens, ...)
+        
+    Returns:
+        Tuple of the parsed JSON value (see parse_json_response) and the raw response text
+    """
+    # An explicit model skips the cascade
+    model = completion_kwargs.pop("model", None)
+    models = [model] if model else (_llm_settings.get().get("cascade") or [None])
+    
+    for i, model in enumerate(models):
+        is_last = i == len(models) - 1
+        response = chat_completion(
+            prompt,
+            system_message,
+            model=model,
+            response_format=structured_output_format(name, schema, model),
+            **completion_kwargs
+        )
+        data = coerce_to_schema(parse_json_response(response, schema, repair=is_last), schema)
+        if is_last:
+            return data, response
+        
+        problems = validate_json(data, schema) + (check(data) if check else [])
+        if not problems:
+            return data, response
+        
+        print(f"  {model} response rejected ({problems[0]}); escalating to {models[i + 1]}")
+        recorder = _usage_recorder.get()
+        if recorder is not None:
+            recorder.record_escalation(model, models[i + 1], problems[0])
+
 def get_llm_provider():
     """
     Get configured LLM provider based on environment variables.
@@ -90,8 +1000,16 @@ def get_llm_provider():
         return {
             "name": "openai",
             "chat_completion": chat_completion,
+            "client": get_llm_client("openai"),
             "default_model": os.environ.get("OPENAI_MODEL", "gpt-4")
         }
+    elif provider == "fake":
+        return {
+            "name": "fake",
+            "chat_completion": chat_completion,
+            "client": get_llm_client("fake"),
+            "default_model": "fake"
+        }
     elif provider == "anthropic":
         # Placeholder for future implementation
         raise NotImplementedError("Anthropic provider not yet implemented")
@@ -1,12 +1,22 @@
 import os
+import sys
 import json
 import time
+import threading
+import contextvars
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Iterator, Optional, TextIO
+
+_console: contextvars.ContextVar[Optional[TextIO]] = contextvars.ContextVar("notegold_console", default=None)
 
 class ProcessLogger:
     """
     Logger for tracking the processing steps and artifacts in the content flywheel.
+    
+    Several edges can be in progress at once when independent nodes run in
+    parallel; they are tracked by target node ID. Methods that take an
+    optional node_id fall back to the only edge in progress.
     """
     
     def __init__(self, logs_dir: str):
@@ -19,8 +29,11 @@ class ProcessLogger:
         self.logs_dir = logs_dir
         self.process_log_path = os.path.join(logs_dir, "process_log.json")
         self.log_entries = []
-        self.current_edge = None
+        self.active_edges: Dict[str, Dict[str, Any]] = {}
+        self.cache_stats = None
+        self.node_metrics = {}
         self.start_time = time.time()
+        self._lock = threading.RLock()
         
         # Initialize log file
         self._save_log()
@@ -33,55 +46,134 @@ class ProcessLogger:
             source_node: Source node ID
             target_node: Target node ID
         """
-        self.current_edge = {
-            "source": source_node,
-            "target": target_node,
-            "status": "processing",
-            "start_time": datetime.now().isoformat(),
-            "artifacts": [],
-            "execution_time_ms": 0
-        }
-        
-        print(f"Processing: {source_node} → {target_node}...")
-        self._save_log()
+        with self._lock:
+            self.active_edges[target_node] = {
+                "source": source_node,
+                "target": target_node,
+                "status": "processing",
+                "start_time": datetime.now().isoformat(),
+                "artifacts": [],
+                "execution_time_ms": 0
+            }
+            
+            print(f"Processing: {source_node} → {target_node}...")
+            self._save_log()
     
-    def log_edge_complete(self, execution_time_ms: int, status: str = "complete") -> None:
+    def log_edge_complete(self, execution_time_ms: int, status: str = "complete", node_id: Optional[str] = None) -> None:
         """
-        Log the completion of processing the current edge.
+        Log the completion of processing an edge.
         
         Args:
             execution_time_ms: Execution time in milliseconds
             status: Status of the edge (complete, error, etc.)
+            node_id: Target node of the edge (defaults to the only edge in progress)
         """
-        if self.current_edge:
-            self.current_edge["status"] = status
-            self.current_edge["execution_time_ms"] = execution_time_ms
-            self.log_entries.append(self.current_edge)
-            
-            source = self.current_edge["source"]
-            target = self.current_edge["target"]
+        with self._lock:
+            edge = self._active_edge(node_id)
+            if edge:
+                edge["status"] = status
+                edge["execution_time_ms"] = execution_time_ms
+                self.log_entries.append(edge)
+                del self.active_edges[edge["target"]]
+                
+                print(f"✓ Completed: {edge['source']} → {edge['target']} ({execution_time_ms}ms)")
+                self._save_log()
+    
+    def log_node_skipped(self, node_id: str, reason: str, source_node: Optional[str] = None) -> None:
+        """
+        Log a node that was not executed.
+        
+        Args:
+            node_id: ID of the skipped node
+            reason: Why it was skipped (e.g. "up to date")
+            source_node: Source of the node's incoming edge, if any
+        """
+        with self._lock:
+            if source_node:
+                self.log_entries.append({
+                    "source": source_node,
+                    "target": node_id,
+                    "status": f"skipped: {reason}",
+                    "start_time": datetime.now().isoformat(),
+                    "artifacts": [],
+                    "execution_time_ms": 0
+                })
             
-            print(f"✓ Completed: {source} → {target} ({execution_time_ms}ms)")
+            print(f"↷ Skipped: {node_id} ({reason})")
             self._save_log()
-            self.current_edge = None
     
-    def log_artifact(self, artifact_path: str, artifact_type: str) -> None:
+    def log_artifact(self, artifact_path: str, artifact_type: str, node_id: Optional[str] = None) -> None:
         """
         Log the creation of an artifact.
         
         Args:
             artifact_path: Path to the artifact
             artifact_type: Type of artifact (metadata, topics, etc.)
+            node_id: Node that created the artifact (defaults to the only edge in progress)
         """
-        if self.current_edge:
-            artifact = {
-                "path": artifact_path,
-                "type": artifact_type,
-                "created_at": datetime.now().isoformat()
-            }
-            self.current_edge["artifacts"].append(artifact)
+        with self._lock:
+            edge = self._active_edge(node_id)
+            if edge:
+                artifact = {
+                    "path": artifact_path,
+                    "type": artifact_type,
+                    "created_at": datetime.now().isoformat()
+                }
+                edge["artifacts"].append(artifact)
+                
+                print(f"  Output: {artifact_type} → {os.path.basename(artifact_path)}")
+                self._save_log()
+    
+    def log_output_timing(self, output_path: str, ttfb_ms: int, total_ms: int, node_id: Optional[str] = None) -> None:
+        """
+        Log streaming timings for an output generated by an edge.
+        
+        Args:
+            output_path: Path to the output file
+            ttfb_ms: Time to first streamed token in milliseconds
+            total_ms: Total generation time in milliseconds
+            node_id: Node that generated the output (defaults to the only edge in progress)
+        """
+        with self._lock:
+            edge = self._active_edge(node_id)
+            if edge:
+                edge.setdefault("output_timings", []).append({
+                    "path": output_path,
+                    "ttfb_ms": ttfb_ms,
+                    "total_ms": total_ms
+                })
+                self._save_log()
+    
+    def log_cache_stats(self, cache_stats: Dict[str, Any]) -> None:
+        """
+        Log LLM completion cache counters for this run.
+        
+        Args:
+            cache_stats: Dictionary of cache counters (hits, misses, etc.)
+        """
+        with self._lock:
+            self.cache_stats = cache_stats
             
-            print(f"  Output: {artifact_type} → {os.path.basename(artifact_path)}")
+            if cache_stats.get("enabled"):
+                print(f"LLM cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, "
+                      f"{cache_stats['coalesced']} coalesced")
+            self._save_log()
+    
+    def log_node_metrics(self, node_id: str, metrics: Dict[str, Any]) -> None:
+        """
+        Log execution time and LLM usage for a node.
+        
+        Args:
+            node_id: ID of the node
+            metrics: Dictionary with execution_time_ms, llm_settings and LLM usage
+                (see LLMUsageRecorder.summary)
+        """
+        with self._lock:
+            self.node_metrics[node_id] = metrics
+            
+            if metrics.get("requests"):
+                print(f"  LLM usage ({node_id}): {metrics['requests']} requests, "
+                      f"{metrics['prompt_tokens'] + metrics['completion_tokens']} tokens")
             self._save_log()
     
     def log_summary(self) -> Dict[str, Any]:
@@ -101,10 +193,13 @@ class ProcessLogger:
             "completed_at": datetime.now().isoformat()
         }
         
-        # Save summary to summary.json
+        if self.cache_stats is not None:
+            summary["llm_cache"] = self.cache_stats
+        
+        # Save summary to summary.json, with the per-node LLM usage
         summary_path = os.path.join(self.logs_dir, "summary.json")
         with open(summary_path, 'w') as f:
-            json.dump(summary, f, indent=2)
+            json.dump(dict(summary, node_metrics=self.node_metrics), f, indent=2)
         
         # Create markdown summary
         markdown_path = os.path.join(self.logs_dir, "summary.md")
@@ -115,6 +210,28 @@ class ProcessLogger:
             f.write(f"**Total processing steps:** {len(self.log_entries)}\n")
             f.write(f"**Total artifacts:** {summary['total_artifacts']}\n\n")
             
+            if self.cache_stats and self.cache_stats.get("enabled"):
+                f.write("## LLM Cache\n\n")
+                f.write(f"- **Hits:** {self.cache_stats['hits']}\n")
+                f.write(f"- **Misses:** {self.cache_stats['misses']}\n")
+                f.write(f"- **Coalesced:** {self.cache_stats['coalesced']}\n")
+                f.write(f"- **Hit rate:** {self.cache_stats['hit_rate']:.0%}\n\n")
+            
+            if self.node_metrics:
+                f.write("## LLM Usage by Node\n\n")
+                f.write("| Node | Models | Requests | Prompt tokens | Completion tokens | p50 latency | p95 latency | Escalations | Hedges (won) |\n")
+                f.write("| --- | --- | --- | --- | --- | --- | --- | --- | --- |\n")
+                for node_id, metrics in self.node_metrics.items():
+                    latencies = [usage["latency_ms"] for usage in metrics.get("models", {}).values()]
+                    p50 = max((latency["p50"] for latency in latencies), default=0)
+                    p95 = max((latency["p95"] for latency in latencies), default=0)
+                    hedges = metrics.get("hedges", {})
+                    f.write(f"| {node_id} | {', '.join(metrics.get('models', {})) or '-'} | {metrics.get('requests', 0)} | "
+                            f"{metrics.get('prompt_tokens', 0)} | {metrics.get('completion_tokens', 0)} | "
+                            f"{p50/1000:.2f}s | {p95/1000:.2f}s | {len(metrics.get('escalations', []))} | "
+                            f"{hedges.get('fired', 0)} ({hedges.get('won', 0)}) |\n")
+                f.write("\n")
+            
             f.write("## Processing Steps\n\n")
             for i, entry in enumerate(self.log_entries):
                 f.write(f"### {i+1}. {entry['source']} → {entry['target']}\n\n")
@@ -126,17 +243,91 @@ class ProcessLogger:
                     for artifact in entry["artifacts"]:
                         f.write(f"  - {artifact['type']}: `{artifact['path']}`\n")
                 
+                if entry.get("output_timings"):
+                    f.write("- **Streamed outputs:**\n")
+                    for timing in entry["output_timings"]:
+                        f.write(f"  - `{os.path.basename(timing['path'])}`: first token "
+                                f"{timing['ttfb_ms']/1000:.2f}s, total {timing['total_ms']/1000:.2f}s\n")
+                
                 f.write("\n")
         
         return summary
     
+    def _active_edge(self, node_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Get the edge in progress into node_id, or the only edge in progress if node_id is None."""
+        if node_id is not None:
+            return self.active_edges.get(node_id)
+        if len(self.active_edges) == 1:
+            return next(iter(self.active_edges.values()))
+        return None
+    
     def _save_log(self) -> None:
         """Save the current log entries to the log file."""
         log_data = {
             "log_entries": self.log_entries,
-            "current_edge": self.current_edge,
+            "active_edges": list(self.active_edges.values()),
+            "llm_cache": self.cache_stats,
+            "node_metrics": self.node_metrics,
             "last_updated": datetime.now().isoformat()
         }
         
         with open(self.process_log_path, 'w') as f:
-            json.dump(log_data, f, indent=2) 
\ No newline at end of file
+            json.dump(log_data, f, indent=2)
+
+class _ContextConsole:
+    """Stand-in for sys.stdout that writes to the current context's console file, if it has one."""
+    
+    def __init__(self, stream: TextIO):
+        self.stream = stream
+    
+    def write(self, text: str) -> int:
+        console = _console.get()
+        if console is not None:
+            try:
+                return console.write(text)
+            except ValueError:
+                # Closed by a run that finished while an abandoned node was still printing
+                pass
+        return self.stream.write(text)
+    
+    def flush(self) -> None:
+        console = _console.get()
+        if console is not None and not console.closed:
+            console.flush()
+        self.stream.flush()
+    
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.stream, name)
+
+_console_lock = threading.Lock()
+_console_users = 0
+
+@contextmanager
+def capture_console(path: str) -> Iterator[None]:
+    """
+    Send console output from the block to a file instead of stdout.
+    
+    The file is held in a context variable, so output from threads the
+    block hands work to (graph nodes, concurrent LLM calls) goes to the
+    same file, while other threads, such as other meetings in a batch,
+    keep printing to their own console.
+    
+    Args:
+        path: File to append console output to
+    """
+    global _console_users
+    
+    with open(path, "a", buffering=1) as console:
+        with _console_lock:
+            if _console_users == 0:
+                sys.stdout = _ContextConsole(sys.stdout)
+            _console_users += 1
+        token = _console.set(console)
+        try:
+            yield
+        finally:
+            _console.reset(token)
+            with _console_lock:
+                _console_users -= 1
+                if _console_users == 0 and isinstance(sys.stdout, _ContextConsole):
+                    sys.stdout = sys.stdout.stream
@@ -0,0 +1,253 @@
+"""Input fingerprints and run records for skipping up-to-date graph nodes."""
+import os
+import json
+import hashlib
+import inspect
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+from src.models.data_models import ProcessingNode
+from src.utils.artifact_utils import artifact_digest
+from src.utils.file_utils import save_json_atomic
+
+# Bump to invalidate every recorded node run (e.g. when the fingerprint format changes)
+FINGERPRINT_VERSION = 1
+
+def hash_file(path: str) -> str:
+    """
+    Hash a file's contents.
+
+    Args:
+        path: Path to the file
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _file_digest(path: str) -> Optional[str]:
+    """Hash an artifact file, using the in-memory copy if it was saved during this run; None if there is no such file."""
+    digest = artifact_digest(path)
+    if digest is None and os.path.isfile(path):
+        digest = hash_file(path)
+    return digest
+
+def _artifact_fingerprint(value: Any) -> Any:
+    """Describe an artifact by content: files by hash, lists item by item, other values as-is."""
+    digest = _file_digest(value) if isinstance(value, str) else None
+    if digest is not None:
+        return {"file_sha256": digest}
+    if isinstance(value, (list, tuple)):
+        return [_artifact_fingerprint(item) for item in value]
+    return value
+
+def processor_fingerprint(processor_func: Callable) -> str:
+    """
+    Identify a processor function's code, including its inline prompt templates.
+
+    Args:
+        processor_func: Processor function
+
+    Returns:
+        Hash of the function's qualified name and the source of its module
+    """
+    digest = hashlib.sha256(f"{processor_func.__module__}.{processor_func.__qualname__}".encode())
+    source_path = inspect.getsourcefile(processor_func)
+    if source_path and os.path.isfile(source_path):
+        digest.update(hash_file(source_path).encode())
+    return digest.hexdigest()
+
+def node_fingerprint(
+    node: ProcessingNode,
+    context: Dict[str, Any],
+    processor_func: Callable,
+    processor_hash: Optional[str] = None
+) -> str:
+    """
+    Fingerprint everything a node's result depends on.
+
+    Covers the content of its input artifacts, its parameters (including LLM
+    settings) and the processor's code and prompts. An optional
+    "prompt_version" node parameter can be bumped to force a rerun.
+
+    Args:
+        node: ProcessingNode
+        context: Context the node would run with
+        processor_func: The node's processor function
+        processor_hash: processor_fingerprint(processor_func), if already computed
+
+    Returns:
+        Hex SHA-256 fingerprint
+    """
+    fingerprint = {
+        "version": FINGERPRINT_VERSION,
+        "processor": processor_hash or processor_fingerprint(processor_func),
+        "parameters": node.parameters,
+        "inputs": {name: _artifact_fingerprint(context.get(name)) for name in node.input_artifacts}
+    }
+    if node.map_over:
+        fingerprint["map"] = {"over": node.map_over, "limit": node.map_limit, "reduce": node.reduce_function}
+    encoded = json.dumps(fingerprint, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+def item_fingerprint(
+    node: ProcessingNode,
+    item: Any,
+    processor_func: Callable,
+    processor_hash: Optional[str] = None
+) -> str:
+    """
+    Fingerprint one item of a map node: the item, the node's parameters and the processor's code.
+
+    Args:
+        node: Map node
+        item: Item the processor runs on
+        processor_func: The node's processor function
+        processor_hash: processor_fingerprint(processor_func), if already computed
+
+    Returns:
+        Hex SHA-256 fingerprint
+    """
+    fingerprint = {
+        "version": FINGERPRINT_VERSION,
+        "processor": processor_hash or processor_fingerprint(processor_func),
+        "parameters": node.parameters,
+        "item": _artifact_fingerprint(item)
+    }
+    encoded = json.dumps(fingerprint, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+def item_run_id(node_id: str, index: int) -> str:
+    """Get the ID an item of a map node is recorded under in a NodeRunStore."""
+    return f"{node_id}[{index}]"
+
+def _output_files(value: Any, files: Dict[str, str]) -> None:
+    """Collect the files referenced by a node result, with their hashes."""
+    digest = _file_digest(value) if isinstance(value, str) else None
+    if digest is not None:
+        files[value] = digest
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _output_files(item, files)
+
+# Result key under which processors list files outside their input artifacts that their result depends on
+DEPENDENCY_PATHS_KEY = "dependency_paths"
+
+class NodeRunStore:
+    """
+    Records each node's last successful run in a JSON file.
+
+    A run is reused when the node's fingerprint is unchanged and the output
+    files it produced are still on disk, unmodified. Files a result lists
+    under dependency_paths (e.g. another meeting's artifacts it reused) are
+    hashed too, and the run is redone when they change.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize the store.
+
+        Args:
+            path: Path to the JSON file (e.g. metadata/node_runs.json)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._runs: Dict[str, Dict[str, Any]] = {}
+
+        if os.path.exists(path):
+            try:
+                with open(path, "r") as f:
+                    self._runs = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                self._runs = {}
+
+    def lookup(self, node_id: str, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the recorded result of a node if it is still up to date.
+
+        Args:
+            node_id: Node ID
+            fingerprint: Current fingerprint of the node
+
+        Returns:
+            Recorded result dictionary, or None if the node must run
+        """
+        with self._lock:
+            run = self._runs.get(node_id)
+
+        if not run or run.get("fingerprint") != fingerprint:
+            return None
+
+        for path, digest in {**run.get("output_files", {}), **run.get("dependency_files", {})}.items():
+            if _file_digest(path) != digest:
+                return None
+        return run["result"]
+
+    def last_result(self, node_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the result of a node's last successful run, whether or not it is up to date.
+
+        Args:
+            node_id: Node ID
+
+        Returns:
+            Recorded result dictionary, or None if the node has no recorded run
+        """
+        with self._lock:
+            run = self._runs.get(node_id)
+        return run["result"] if run else None
+
+    def describe(self, node_id: str, fingerprint: str) -> str:
+        """
+        Explain whether a node is up to date.
+
+        Args:
+            node_id: Node ID
+            fingerprint: Current fingerprint of the node
+
+        Returns:
+            "up to date", or the reason the node must run
+        """
+        with self._lock:
+            run = self._runs.get(node_id)
+
+        if not run:
+            return "no previous run"
+        if run.get("fingerprint") != fingerprint:
+            return "inputs, parameters or code changed"
+        if any(_file_digest(path) != digest for path, digest in run.get("dependency_files", {}).items()):
+            return "files it depends on changed"
+        if self.lookup(node_id, fingerprint) is None:
+            return "outputs missing or modified"
+        return "up to date"
+
+    def record(self, node_id: str, fingerprint: str, result: Dict[str, Any]) -> None:
+        """
+        Record a successful node run.
+
+        Args:
+            node_id: Node ID
+            fingerprint: Fingerprint the node ran with
+            result: Result dictionary returned by the processor
+        """
+        output_files: Dict[str, str] = {}
+        _output_files([value for key, value in result.items() if key != DEPENDENCY_PATHS_KEY], output_files)
+        dependency_files: Dict[str, str] = {}
+        _output_files(result.get(DEPENDENCY_PATHS_KEY, []), dependency_files)
+
+        run = {
+            "fingerprint": fingerprint,
+            "completed_at": datetime.now().isoformat(),
+            # Round-trip through JSON so only serializable results are kept
+            "result": json.loads(json.dumps(result, default=str)),
+            "output_files": output_files,
+            "dependency_files": dependency_files
+        }
+
+        with self._lock:
+            self._runs[node_id] = run
+            save_json_atomic(self._runs, self.path)
@@ -0,0 +1,206 @@
+"""Latency and usage metrics utilities."""
+import math
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+def percentile(values: Sequence[float], p: float) -> float:
+    """
+    Compute a percentile using linear interpolation between closest ranks.
+    
+    Args:
+        values: Sample values
+        p: Percentile between 0 and 100
+        
+    Returns:
+        Percentile value (0.0 for an empty sample)
+    """
+    if not values:
+        return 0.0
+    
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * p / 100
+    lower = math.floor(rank)
+    upper = math.ceil(rank)
+    if lower == upper:
+        return float(ordered[lower])
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+def summarize_latencies(values: List[float]) -> Dict[str, float]:
+    """
+    Summarize a latency sample.
+    
+    Args:
+        values: Latencies (any unit)
+        
+    Returns:
+        Dictionary with count, mean, p50, p95, p99 and max
+    """
+    return {
+        "count": len(values),
+        "mean": round(sum(values) / len(values), 2) if values else 0.0,
+        "p50": round(percentile(values, 50), 2),
+        "p95": round(percentile(values, 95), 2),
+        "p99": round(percentile(values, 99), 2),
+        "max": round(max(values), 2) if values else 0.0
+    }
+
+class LatencyHistogram:
+    """
+    Latency histogram with logarithmic buckets and exponential aging.
+    
+    Buckets grow by a fixed factor, so percentiles are accurate to within
+    that factor at any scale. Once the sample count passes max_samples all
+    counts are halved, so the histogram follows recent latency. Not
+    thread-safe; callers hold their own lock.
+    """
+    
+    def __init__(self, growth: float = 1.1, min_ms: float = 1.0, max_samples: int = 1000):
+        """
+        Initialize an empty histogram.
+        
+        Args:
+            growth: Ratio between consecutive bucket bounds
+            min_ms: Upper bound of the first bucket
+            max_samples: Sample count at which older samples are aged out
+        """
+        self.growth = growth
+        self.min_ms = min_ms
+        self.max_samples = max_samples
+        self.counts: Dict[int, float] = {}
+        self.count = 0.0
+    
+    def add(self, latency_ms: float) -> None:
+        """Add a latency sample in milliseconds."""
+        bucket = max(0, math.ceil(math.log(max(latency_ms, self.min_ms) / self.min_ms, self.growth)))
+        self.counts[bucket] = self.counts.get(bucket, 0.0) + 1
+        self.count += 1
+        
+        if self.count > self.max_samples:
+            self.counts = {bucket: count / 2 for bucket, count in self.counts.items() if count >= 1}
+            self.count = sum(self.counts.values())
+    
+    def percentile(self, p: float) -> float:
+        """
+        Estimate a percentile.
+        
+        Args:
+            p: Percentile between 0 and 100
+            
+        Returns:
+            Upper bound of the bucket holding the percentile, in milliseconds (0.0 if empty)
+        """
+        if not self.count:
+            return 0.0
+        
+        target = self.count * p / 100
+        cumulative = 0.0
+        for bucket in sorted(self.counts):
+            cumulative += self.counts[bucket]
+            if cumulative >= target:
+                return self.min_ms * self.growth ** bucket
+        return self.min_ms * self.growth ** max(self.counts)
+    
+    def summary(self) -> Dict[str, float]:
+        """Summarize the histogram as a sample count and p50, p95 and p99 in milliseconds."""
+        return {
+            "count": round(self.count, 2),
+            "p50": round(self.percentile(50), 2),
+            "p95": round(self.percentile(95), 2),
+            "p99": round(self.percentile(99), 2)
+        }
+
+class LLMUsageRecorder:
+    """
+    Collects latency and token usage for the LLM calls made by one node.
+    
+    Safe to share between the threads a processor fans out to.
+    """
+    
+    def __init__(self):
+        """Initialize an empty recorder."""
+        self._lock = threading.Lock()
+        self._models: Dict[str, Dict[str, Any]] = {}
+        self._escalations: List[Dict[str, str]] = []
+        self._hedges = 0
+        self._hedge_wins = 0
+    
+    def record_request(
+        self,
+        model: str,
+        latency_ms: float,
+        prompt_tokens: Optional[int] = None,
+        completion_tokens: Optional[int] = None
+    ) -> None:
+        """
+        Record one upstream LLM request.
+        
+        Args:
+            model: Model the request used
+            latency_ms: Request latency in milliseconds (including retries)
+            prompt_tokens: Prompt tokens reported by the provider
+            completion_tokens: Completion tokens reported by the provider
+        """
+        with self._lock:
+            usage = self._models.setdefault(model, {
+                "requests": 0,
+                "prompt_tokens": 0,
+                "completion_tokens": 0,
+                "latencies_ms": []
+            })
+            usage["requests"] += 1
+            usage["prompt_tokens"] += prompt_tokens or 0
+            usage["completion_tokens"] += completion_tokens or 0
+            usage["latencies_ms"].append(latency_ms)
+    
+    def record_escalation(self, from_model: str, to_model: str, reason: str) -> None:
+        """
+        Record a cascade escalating from a cheaper model to the next one.
+        
+        Args:
+            from_model: Model whose response was rejected
+            to_model: Model tried next
+            reason: Why the response was rejected
+        """
+        with self._lock:
+            self._escalations.append({"from": from_model, "to": to_model, "reason": reason})
+    
+    def record_hedge(self, won: bool) -> None:
+        """
+        Record a hedged (duplicate) request.
+        
+        Args:
+            won: Whether the hedge answered before the original request
+        """
+        with self._lock:
+            self._hedges += 1
+            self._hedge_wins += int(won)
+    
+    def summary(self) -> Dict[str, Any]:
+        """
+        Summarize the recorded calls.
+        
+        Returns:
+            Dictionary with totals, per-model usage and latency percentiles,
+            escalations and hedged requests
+        """
+        with self._lock:
+            models = {
+                model: {
+                    "requests": usage["requests"],
+                    "prompt_tokens": usage["prompt_tokens"],
+                    "completion_tokens": usage["completion_tokens"],
+                    "latency_ms": summarize_latencies(usage["latencies_ms"])
+                }
+                for model, usage in self._models.items()
+            }
+            escalations = list(self._escalations)
+            hedges = {"fired": self._hedges, "won": self._hedge_wins}
+        
+        return {
+            "requests": sum(usage["requests"] for usage in models.values()),
+            "prompt_tokens": sum(usage["prompt_tokens"] for usage in models.values()),
+            "completion_tokens": sum(usage["completion_tokens"] for usage in models.values()),
+            "models": models,
+            "escalations": escalations,
+            "hedges": hedges
+        }
@@ -0,0 +1,657 @@
+"""Rate limiting, adaptive concurrency, retry and hedging utilities for LLM calls."""
+import os
+import json
+import time
+import random
+import threading
+import contextvars
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional, Tuple, TypeVar
+from src.utils.deadline_utils import CANCEL_CHECK_SECONDS, DeadlineExceeded, RunCancelled, get_deadline, sleep_checking_deadline
+from src.utils.metrics_utils import LatencyHistogram
+
+try:
+    import fcntl
+except ImportError:  # Windows: limiter state is shared between threads only
+    fcntl = None
+
+# Status codes worth retrying: timeouts, lock conflicts, rate limits and server errors
+RETRYABLE_STATUS_CODES = {408, 409, 429}
+RETRYABLE_ERROR_NAMES = {"APITimeoutError", "APIConnectionError", "Timeout", "ConnectError", "ReadTimeout"}
+
+# Tokens assumed for the completion when max_tokens isn't set
+DEFAULT_COMPLETION_TOKEN_ESTIMATE = 1000
+
+def estimate_tokens(text: str) -> int:
+    """Roughly estimate the number of tokens in text (about 4 characters per token)."""
+    return len(text) // 4 + 1
+
+def get_status_code(error: BaseException) -> Optional[int]:
+    """Get the HTTP status code carried by an API error, if any."""
+    status_code = getattr(error, "status_code", None)
+    if status_code is None:
+        response = getattr(error, "response", None)
+        status_code = getattr(response, "status_code", None)
+    return status_code if isinstance(status_code, int) else None
+
+def get_retry_after(error: BaseException) -> Optional[float]:
+    """
+    Get the server-requested delay from an API error's Retry-After header.
+
+    Args:
+        error: Exception raised by the API client
+
+    Returns:
+        Delay in seconds, or None if the server didn't specify one
+    """
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+
+    try:
+        return float(retry_after)
+    except ValueError:
+        pass
+
+    # Retry-After may also be an HTTP date (email.utils is slow to import, so only loaded here)
+    from email.utils import parsedate_to_datetime
+    try:
+        retry_at = parsedate_to_datetime(retry_after)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+def is_retryable_error(error: BaseException) -> bool:
+    """Check whether an API error is transient and the call should be retried."""
+    # Running out of time or being cancelled isn't transient
+    if isinstance(error, (DeadlineExceeded, RunCancelled)):
+        return False
+
+    status_code = get_status_code(error)
+    if status_code is not None:
+        return status_code in RETRYABLE_STATUS_CODES or status_code >= 500
+
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+
+    return type(error).__name__ in RETRYABLE_ERROR_NAMES
+
+def retry_with_backoff(
+    func: Callable[[], Any],
+    max_retries: int = 5,
+    base_delay: float = 1.0,
+    max_delay: float = 60.0,
+    should_retry: Callable[[BaseException], bool] = is_retryable_error,
+    on_retry: Optional[Callable[[BaseException, int, float], None]] = None,
+    deadline: Optional[float] = None
+) -> Any:
+    """
+    Call func, retrying transient failures with jittered exponential backoff.
+
+    Delays use "full jitter" (a random delay up to base_delay * 2**attempt,
+    capped at max_delay). A Retry-After header on the error is honored as a
+    lower bound. The backoff ends early, raising, if the current deadline
+    (see deadline_utils) passes or is cancelled, e.g. by Ctrl-C.
+
+    Args:
+        func: Function to call
+        max_retries: Maximum number of retries after the first attempt
+        base_delay: Backoff base in seconds
+        max_delay: Maximum backoff in seconds
+        should_retry: Predicate deciding whether an error is retryable
+        on_retry: Optional callback (error, attempt, delay) before each retry
+        deadline: Optional time.time() by which the call must finish; the
+            error is raised instead of retrying once the retry would start after it
+
+    Returns:
+        Result of func
+    """
+    attempt = 0
+    while True:
+        try:
+            return func()
+        except Exception as e:
+            if attempt >= max_retries or not should_retry(e):
+                raise
+
+            delay = random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+            retry_after = get_retry_after(e)
+            if retry_after is not None:
+                delay = max(delay, min(retry_after, max_delay))
+            if deadline is not None and time.time() + delay >= deadline:
+                raise
+
+            attempt += 1
+            if on_retry:
+                on_retry(e, attempt, delay)
+            sleep_checking_deadline(delay)
+
+class TokenBucketLimiter:
+    """
+    Token-bucket limiter budgeting both requests per minute and tokens per minute.
+
+    When state_path is given, bucket levels live in that file and are updated
+    under an exclusive file lock, so every process pointing at the same file
+    draws from one shared budget.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        state_path: Optional[str] = None
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            requests_per_minute: Request budget (None for unlimited)
+            tokens_per_minute: Token budget (None for unlimited)
+            state_path: Optional file for sharing state across processes
+        """
+        self.capacities = {}
+        if requests_per_minute:
+            self.capacities["requests"] = float(requests_per_minute)
+        if tokens_per_minute:
+            self.capacities["tokens"] = float(tokens_per_minute)
+
+        self.state_path = state_path
+        self._lock = threading.Lock()
+        self._state: Dict[str, Any] = {}
+
+        if state_path:
+            os.makedirs(os.path.dirname(os.path.abspath(state_path)), exist_ok=True)
+
+    @contextmanager
+    def _locked_state(self) -> Iterator[Dict[str, Any]]:
+        """Hold the limiter lock and yield mutable state, saving it afterwards."""
+        with self._lock:
+            if not self.state_path:
+                yield self._state
+                return
+
+            with open(f"{self.state_path}.lock", 'a') as lock_file:
+                if fcntl:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                try:
+                    try:
+                        with open(self.state_path, 'r') as f:
+                            state = json.load(f)
+                    except (FileNotFoundError, ValueError):
+                        state = {}
+
+                    yield state
+
+                    tmp_path = f"{self.state_path}.{os.getpid()}.tmp"
+                    with open(tmp_path, 'w') as f:
+                        json.dump(state, f)
+                    os.replace(tmp_path, self.state_path)
+                finally:
+                    if fcntl:
+                        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _refill(self, state: Dict[str, Any], now: float) -> None:
+        for name, capacity in self.capacities.items():
+            bucket = state.setdefault(name, {"level": capacity, "updated": now})
+            elapsed = max(0.0, now - bucket["updated"])
+            bucket["level"] = min(capacity, bucket["level"] + elapsed * capacity / 60.0)
+            bucket["updated"] = now
+
+    def acquire(self, tokens: int = 0, deadline: Optional[float] = None) -> None:
+        """
+        Block until one request and the given number of tokens are available.
+
+        The wait ends early, raising, if the current deadline (see
+        deadline_utils) passes or is cancelled.
+
+        Args:
+            tokens: Estimated tokens for the request
+            deadline: Optional time.time() after which to give up with TimeoutError
+        """
+        if not self.capacities:
+            return
+
+        while True:
+            with self._locked_state() as state:
+                now = time.time()
+                self._refill(state, now)
+
+                # A request larger than the whole budget waits for a full bucket
+                needed = {"requests": 1.0, "tokens": float(tokens)}
+                wait = max(0.0, state.get("paused_until", 0.0) - now)
+                for name, capacity in self.capacities.items():
+                    amount = min(needed[name], capacity)
+                    shortfall = amount - state[name]["level"]
+                    if shortfall > 0:
+                        wait = max(wait, shortfall * 60.0 / capacity)
+
+                if wait <= 0:
+                    for name, capacity in self.capacities.items():
+                        state[name]["level"] -= min(needed[name], capacity)
+                    return
+
+            if deadline is not None and time.time() + wait > deadline:
+                raise TimeoutError("Rate limiter wait would exceed the deadline")
+            sleep_checking_deadline(min(wait, 5.0) + random.uniform(0, 0.05))
+
+    def reconcile(self, estimated_tokens: int, actual_tokens: int) -> None:
+        """
+        Correct the token bucket once the real token usage of a request is known.
+
+        Args:
+            estimated_tokens: Tokens charged by acquire
+            actual_tokens: Tokens actually used
+        """
+        if "tokens" not in self.capacities or actual_tokens == estimated_tokens:
+            return
+
+        with self._locked_state() as state:
+            self._refill(state, time.time())
+            capacity = self.capacities["tokens"]
+            bucket = state["tokens"]
+            bucket["level"] = min(capacity, bucket["level"] + estimated_tokens - actual_tokens)
+
+    def refund(self, tokens: int = 0) -> None:
+        """
+        Give back the request and tokens charged by acquire, for a request that won't be sent.
+
+        Args:
+            tokens: Tokens charged by acquire
+        """
+        if not self.capacities:
+            return
+
+        with self._locked_state() as state:
+            self._refill(state, time.time())
+            for name, amount in (("requests", 1.0), ("tokens", float(tokens))):
+                if name in self.capacities:
+                    capacity = self.capacities[name]
+                    state[name]["level"] = min(capacity, state[name]["level"] + min(amount, capacity))
+
+    def pause(self, seconds: float) -> None:
+        """
+        Stop granting requests for a while, e.g. after the server returns 429.
+
+        Args:
+            seconds: How long to pause
+        """
+        with self._locked_state() as state:
+            state["paused_until"] = max(state.get("paused_until", 0.0), time.time() + seconds)
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Limits in-flight LLM requests, adapting the limit with AIMD.
+
+    The limit grows additively (by 1/limit per fast success) and is halved
+    on a 429 response, or reduced gently when latency exceeds the target.
+    """
+
+    def __init__(
+        self,
+        initial_limit: float = 8,
+        min_limit: float = 1,
+        max_limit: float = 32,
+        target_latency: Optional[float] = None,
+        decrease_cooldown: float = 1.0
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            initial_limit: Starting concurrency limit
+            min_limit: Lowest allowed limit
+            max_limit: Highest allowed limit
+            target_latency: Latency in seconds above which the limit shrinks (None to ignore latency)
+            decrease_cooldown: Minimum seconds between multiplicative decreases
+        """
+        self.limit = float(initial_limit)
+        self.min_limit = float(min_limit)
+        self.max_limit = float(max_limit)
+        self.target_latency = target_latency
+        self.decrease_cooldown = decrease_cooldown
+
+        self.in_flight = 0
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+
+    def acquire(self, deadline: Optional[float] = None) -> None:
+        """
+        Wait for a free request slot.
+
+        The wait ends early, raising, if the current deadline (see
+        deadline_utils) passes or is cancelled.
+
+        Args:
+            deadline: Optional time.time() after which to give up with TimeoutError
+        """
+        current_deadline = get_deadline()
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                if current_deadline is not None:
+                    current_deadline.check()
+                timeout = None if deadline is None else deadline - time.time()
+                if timeout is not None and timeout <= 0:
+                    raise TimeoutError("Timed out waiting for an LLM request slot")
+                if current_deadline is not None:
+                    timeout = CANCEL_CHECK_SECONDS if timeout is None else min(timeout, CANCEL_CHECK_SECONDS)
+                self._condition.wait(timeout)
+            self.in_flight += 1
+
+    def release(self, latency: float, throttled: bool = False, adapt: bool = True) -> None:
+        """
+        Release a request slot and adapt the limit.
+
+        Args:
+            latency: Request latency in seconds
+            throttled: Whether the request was rejected with a rate limit error
+            adapt: Whether to adapt the limit (not for a request abandoned before it finished)
+        """
+        with self._condition:
+            self.in_flight -= 1
+            now = time.time()
+
+            if not adapt:
+                pass
+            elif throttled:
+                if now - self._last_decrease >= self.decrease_cooldown:
+                    self.limit = max(self.min_limit, self.limit / 2)
+                    self._last_decrease = now
+            elif self.target_latency and latency > self.target_latency:
+                if now - self._last_decrease >= self.decrease_cooldown:
+                    self.limit = max(self.min_limit, self.limit * 0.9)
+                    self._last_decrease = now
+            else:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+            self._condition.notify_all()
+
+class RequestThrottle:
+    """Combines the token bucket and adaptive concurrency limits around each LLM request."""
+
+    def __init__(self, bucket: TokenBucketLimiter, concurrency: AdaptiveConcurrencyLimiter):
+        """
+        Initialize the throttle.
+
+        Args:
+            bucket: Requests/tokens per minute limiter
+            concurrency: In-flight request limiter
+        """
+        self.bucket = bucket
+        self.concurrency = concurrency
+
+    @contextmanager
+    def request(self, estimated_tokens: int, deadline: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Wait for capacity, then run one request inside the with-block.
+
+        Set "total_tokens" on the yielded dict to correct the token budget
+        with the actual usage reported by the API (0 for a request that was
+        never sent). A request abandoned with HedgeCancelled frees its slot
+        without adapting the concurrency limit.
+
+        Args:
+            estimated_tokens: Estimated tokens for the request
+            deadline: Optional time.time() after which to give up waiting
+        """
+        self.bucket.acquire(estimated_tokens, deadline)
+        try:
+            self.concurrency.acquire(deadline)
+        except BaseException:
+            # The request won't be sent, so its charge goes back to the (possibly shared) budget
+            self.bucket.refund(estimated_tokens)
+            raise
+
+        usage: Dict[str, Any] = {"total_tokens": None}
+        start_time = time.time()
+        try:
+            yield usage
+        except Exception as e:
+            throttled = get_status_code(e) == 429
+            self.concurrency.release(time.time() - start_time, throttled=throttled, adapt=not isinstance(e, HedgeCancelled))
+            if throttled:
+                self.bucket.pause(get_retry_after(e) or 1.0)
+            if usage["total_tokens"] is not None:
+                self.bucket.reconcile(estimated_tokens, usage["total_tokens"])
+            raise
+
+        self.concurrency.release(time.time() - start_time)
+        if usage["total_tokens"] is not None:
+            self.bucket.reconcile(estimated_tokens, usage["total_tokens"])
+
+_request_throttle: Optional[RequestThrottle] = None
+_request_throttle_lock = threading.Lock()
+
+def get_request_throttle() -> RequestThrottle:
+    """
+    Get the shared request throttle configured from environment variables.
+
+    NOTEGOLD_RATE_LIMIT_RPM and NOTEGOLD_RATE_LIMIT_TPM set the per-minute
+    budgets (unlimited if unset). NOTEGOLD_RATE_LIMIT_STATE names a file
+    through which separate worker processes share those budgets.
+    NOTEGOLD_LLM_MAX_INFLIGHT and NOTEGOLD_LLM_TARGET_LATENCY tune the
+    adaptive concurrency limit.
+
+    Returns:
+        RequestThrottle
+    """
+    global _request_throttle
+
+    with _request_throttle_lock:
+        if _request_throttle is None:
+            target_latency = os.environ.get("NOTEGOLD_LLM_TARGET_LATENCY")
+            max_inflight = int(os.environ.get("NOTEGOLD_LLM_MAX_INFLIGHT", 32))
+            _request_throttle = RequestThrottle(
+                TokenBucketLimiter(
+                    requests_per_minute=float(os.environ.get("NOTEGOLD_RATE_LIMIT_RPM", 0)) or None,
+                    tokens_per_minute=float(os.environ.get("NOTEGOLD_RATE_LIMIT_TPM", 0)) or None,
+                    state_path=os.environ.get("NOTEGOLD_RATE_LIMIT_STATE") or None
+                ),
+                AdaptiveConcurrencyLimiter(
+                    initial_limit=min(8, max_inflight),
+                    max_limit=max_inflight,
+                    target_latency=float(target_latency) if target_latency else None
+                )
+            )
+        return _request_throttle
+
+T = TypeVar("T")
+
+class HedgeCancelled(Exception):
+    """Raised by a hedged attempt that noticed it lost, before or while sending its request."""
+
+class HedgePolicy:
+    """
+    Sends a duplicate request when the first one is slower than usual.
+
+    If a request hasn't finished after the given percentile of recent
+    latencies for its key, a second identical request is started and the
+    first to succeed wins. The loser is told to stop through its cancel
+    event: an attempt still waiting for a rate-limit slot never sends, and
+    one already sent stops waiting for its response, frees its slot and
+    closes the response if it arrives later. Hedges are capped at a fraction
+    of all requests so a slow provider isn't hit with double the load.
+
+    Latencies are kept in a histogram per key (e.g. graph node and model),
+    falling back to a histogram per model until a key has enough samples.
+    Attempts record their own latencies (see record), timing only the
+    request itself, so waits for rate-limit slots and retry backoff don't
+    inflate the threshold while the provider is throttling.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        budget: float = 0.05,
+        min_samples: int = 20,
+        max_workers: int = 64
+    ):
+        """
+        Initialize the policy.
+
+        Args:
+            percentile: Latency percentile after which a hedge is sent
+            budget: Maximum hedges as a fraction of requests
+            min_samples: Samples a histogram needs before it is used
+            max_workers: Maximum attempts running at once across all requests
+        """
+        self.percentile = percentile
+        self.budget = budget
+        self.min_samples = min_samples
+        self.max_workers = max_workers
+        self.requests = 0
+        self.hedges = 0
+
+        self._histograms: Dict[Hashable, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pid = os.getpid()
+
+    def threshold(self, key: Hashable, fallback_key: Optional[Hashable] = None) -> Optional[float]:
+        """
+        Get the delay after which a request should be hedged.
+
+        Args:
+            key: Histogram key for the request
+            fallback_key: Histogram key used while key has too few samples
+
+        Returns:
+            Delay in seconds, or None if there isn't enough latency data yet
+        """
+        with self._lock:
+            for candidate in (key, fallback_key):
+                histogram = self._histograms.get(candidate)
+                if histogram is not None and histogram.count >= self.min_samples:
+                    return histogram.percentile(self.percentile) / 1000
+        return None
+
+    def record(self, latency: float, *keys: Hashable) -> None:
+        """
+        Record a request latency.
+
+        Args:
+            latency: Latency in seconds
+            *keys: Histogram keys to add the sample to
+        """
+        with self._lock:
+            # Outside a node the key and fallback key are the same; count the sample once
+            for key in dict.fromkeys(keys):
+                if key is not None:
+                    self._histograms.setdefault(key, LatencyHistogram()).add(latency * 1000)
+
+    def histograms(self) -> Dict[Hashable, Dict[str, float]]:
+        """Get a percentile summary of each latency histogram."""
+        with self._lock:
+            return {key: histogram.summary() for key, histogram in self._histograms.items()}
+
+    def run(
+        self,
+        func: Callable[[threading.Event], T],
+        key: Hashable,
+        fallback_key: Optional[Hashable] = None,
+        on_discard: Optional[Callable[[T], None]] = None
+    ) -> Tuple[T, bool, bool]:
+        """
+        Run func, hedging it with a second call if it is slow.
+
+        Args:
+            func: Attempt to run; receives an event that is set once another
+                attempt has won, and may raise HedgeCancelled when it sees it.
+                It records the latency of the request it sends with record
+            key: Histogram key for the request
+            fallback_key: Histogram key used while key has too few samples
+            on_discard: Called with the result of a losing attempt that still
+                completes (e.g. to close a stream)
+
+        Returns:
+            Tuple of the winning result, whether a hedge was sent and whether the hedge won
+        """
+        with self._lock:
+            self.requests += 1
+        delay = self.threshold(key, fallback_key)
+
+        cancel_events = [threading.Event()]
+        futures = [self._submit(func, cancel_events[0])]
+
+        if delay is not None and not wait(futures, timeout=delay).done and self._spend_hedge():
+            cancel_events.append(threading.Event())
+            futures.append(self._submit(func, cancel_events[1]))
+
+        pending = set(futures)
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    error = error if isinstance(future.exception(), HedgeCancelled) else future.exception()
+                    continue
+
+                winner = futures.index(future)
+                for i, other in enumerate(futures):
+                    if i != winner:
+                        cancel_events[i].set()
+                        if on_discard:
+                            other.add_done_callback(lambda f: f.exception() is None and on_discard(f.result()))
+                return future.result(), len(futures) > 1, winner == 1
+
+        raise error
+
+    def _spend_hedge(self) -> bool:
+        with self._lock:
+            if self.hedges + 1 > self.budget * self.requests:
+                return False
+            self.hedges += 1
+            return True
+
+    def _submit(
+        self,
+        func: Callable[[threading.Event], T],
+        cancelled: threading.Event
+    ) -> Future:
+        with self._lock:
+            # Worker threads don't survive a fork; start a fresh pool in the child
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="notegold-hedge")
+                self._pid = os.getpid()
+            executor = self._executor
+
+        # Attempts run in a copy of the caller's context so node settings follow them
+        return executor.submit(contextvars.copy_context().run, func, cancelled)
+
+_hedge_policy: Optional[HedgePolicy] = None
+_hedge_policy_lock = threading.Lock()
+
+def get_hedge_policy() -> HedgePolicy:
+    """
+    Get the shared hedge policy configured from environment variables.
+
+    NOTEGOLD_LLM_HEDGE_PERCENTILE (default 95) sets when a request is
+    hedged, NOTEGOLD_LLM_HEDGE_BUDGET (default 0.05) caps hedges as a
+    fraction of requests, and NOTEGOLD_LLM_HEDGE_MIN_SAMPLES (default 20)
+    sets how many latencies are needed before hedging starts.
+
+    Returns:
+        HedgePolicy
+    """
+    global _hedge_policy
+
+    with _hedge_policy_lock:
+        if _hedge_policy is None:
+            _hedge_policy = HedgePolicy(
+                percentile=float(os.environ.get("NOTEGOLD_LLM_HEDGE_PERCENTILE", 95)),
+                budget=float(os.environ.get("NOTEGOLD_LLM_HEDGE_BUDGET", 0.05)),
+                min_samples=int(os.environ.get("NOTEGOLD_LLM_HEDGE_MIN_SAMPLES", 20))
+            )
+        return _hedge_policy
@@ -0,0 +1,175 @@
+"""JSON schema generation and validation for the data models."""
+import dataclasses
+import typing
+from typing import Any, Dict, Iterable, List, Optional
+
+JSON_TYPES = {
+    str: "string",
+    int: "integer",
+    float: "number",
+    bool: "boolean"
+}
+
+def type_json_schema(annotation: Any) -> Dict[str, Any]:
+    """
+    Convert a Python type annotation to a JSON schema.
+
+    Args:
+        annotation: Type annotation (str, List[str], a dataclass, ...)
+
+    Returns:
+        JSON schema dictionary
+    """
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+
+    if origin is typing.Union:
+        # Optional[X] is described as X; the schema lists the field as required anyway
+        non_null = [arg for arg in args if arg is not type(None)]
+        return type_json_schema(non_null[0]) if len(non_null) == 1 else {}
+    if origin in (list, List):
+        return {"type": "array", "items": type_json_schema(args[0]) if args else {}}
+    if origin in (dict, Dict) or annotation is dict:
+        return {"type": "object"}
+    if dataclasses.is_dataclass(annotation):
+        return dataclass_json_schema(annotation)
+    if annotation in JSON_TYPES:
+        return {"type": JSON_TYPES[annotation]}
+    return {}
+
+def dataclass_json_schema(cls: type, exclude: Iterable[str] = ()) -> Dict[str, Any]:
+    """
+    Build a strict JSON schema for a dataclass.
+
+    Every field is required and no other properties are allowed, as
+    required by strict structured outputs.
+
+    Args:
+        cls: Dataclass type
+        exclude: Field names to leave out (e.g. values filled in by code)
+
+    Returns:
+        JSON schema dictionary
+    """
+    hints = typing.get_type_hints(cls)
+    properties = {
+        field.name: type_json_schema(hints[field.name])
+        for field in dataclasses.fields(cls)
+        if field.name not in exclude
+    }
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties),
+        "additionalProperties": False
+    }
+
+def list_json_schema(item_schema: Dict[str, Any], key: str) -> Dict[str, Any]:
+    """
+    Wrap an item schema in an object holding a list of items.
+
+    Structured outputs must have an object at the top level, so lists are
+    requested as {key: [...]}.
+
+    Args:
+        item_schema: Schema for each item
+        key: Property name holding the list
+
+    Returns:
+        JSON schema dictionary
+    """
+    return {
+        "type": "object",
+        "properties": {key: {"type": "array", "items": item_schema}},
+        "required": [key],
+        "additionalProperties": False
+    }
+
+def validate_json(data: Any, schema: Dict[str, Any], path: str = "$") -> List[str]:
+    """
+    Check data against the subset of JSON schema produced by this module.
+
+    Args:
+        data: Parsed JSON value
+        schema: JSON schema
+        path: Location of data, used in error messages
+
+    Returns:
+        List of validation errors (empty if valid)
+    """
+    errors = []
+    expected = schema.get("type")
+
+    if expected == "object":
+        if not isinstance(data, dict):
+            return [f"{path}: expected object"]
+        for name in schema.get("required", []):
+            if name not in data:
+                errors.append(f"{path}.{name}: missing")
+        for name, property_schema in schema.get("properties", {}).items():
+            if name in data:
+                errors.extend(validate_json(data[name], property_schema, f"{path}.{name}"))
+    elif expected == "array":
+        if not isinstance(data, list):
+            return [f"{path}: expected array"]
+        for i, item in enumerate(data):
+            errors.extend(validate_json(item, schema.get("items", {}), f"{path}[{i}]"))
+    elif expected == "string" and not isinstance(data, str):
+        errors.append(f"{path}: expected string")
+    elif expected == "integer" and (not isinstance(data, int) or isinstance(data, bool)):
+        errors.append(f"{path}: expected integer")
+    elif expected == "number" and (not isinstance(data, (int, float)) or isinstance(data, bool)):
+        errors.append(f"{path}: expected number")
+    elif expected == "boolean" and not isinstance(data, bool):
+        errors.append(f"{path}: expected boolean")
+
+    return errors
+
+def unwrap_list(data: Any, key: str) -> Optional[List[Any]]:
+    """
+    Get a list of items from either a bare JSON array or an object wrapping it.
+
+    JSON mode only allows objects, so models sometimes wrap the list under
+    a different key; an object holding exactly one list is unwrapped too.
+
+    Args:
+        data: Parsed JSON value
+        key: Property name that may hold the list
+
+    Returns:
+        The list, or None if data holds neither form
+    """
+    if isinstance(data, list):
+        return data
+    if isinstance(data, dict) and isinstance(data.get(key), list):
+        return data[key]
+    if isinstance(data, dict) and "error" not in data:
+        lists = [value for value in data.values() if isinstance(value, list)]
+        if len(lists) == 1:
+            return lists[0]
+    return None
+
+def coerce_to_schema(data: Any, schema: Dict[str, Any]) -> Any:
+    """
+    Wrap a list in the object a list schema (see list_json_schema) expects.
+
+    Models without structured outputs may answer with a bare array, or with
+    the list under a different key; both are normalized to {key: [...]}.
+
+    Args:
+        data: Parsed JSON value
+        schema: JSON schema
+
+    Returns:
+        Normalized value (data unchanged if the schema isn't a list schema)
+    """
+    properties = schema.get("properties", {})
+    if len(properties) != 1:
+        return data
+
+    key, property_schema = next(iter(properties.items()))
+    if property_schema.get("type") != "array":
+        return data
+
+    items = unwrap_list(data, key)
+    return {key: items} if items is not None else data
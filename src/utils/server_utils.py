@@ -0,0 +1,470 @@
+"""Local HTTP job server that processes submitted meeting notes on a warm worker pool."""
+import os
+import re
+import json
+import time
+import uuid
+import sqlite3
+import mimetypes
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+from src.utils.batch_utils import process_meeting
+from src.utils.cache_utils import get_cache_stats
+from src.utils.deadline_utils import Deadline
+from src.utils.file_utils import ensure_dir, save_text
+from src.utils.graph_utils import ExecutionPlan, get_max_parallelism
+from src.utils.llm_utils import get_llm_client
+from src.utils.metrics_utils import LatencyHistogram
+
+JOBS_DB_FILENAME = "jobs.db"
+
+# Largest notes body accepted by POST /jobs
+MAX_NOTES_BYTES = 10 * 1024 * 1024
+
+# Jobs listed by GET /jobs by default, and at most
+DEFAULT_JOBS_LIMIT = 100
+MAX_JOBS_LIMIT = 1000
+
+# Seconds an idle worker waits before checking the queue again
+WORKER_POLL_SECONDS = 1.0
+
+# Meeting IDs become directory names, so they are restricted to a safe alphabet
+MEETING_ID_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]{0,127}$")
+
+_JOB_COLUMNS = ("id", "meeting_id", "notes_path", "status", "error", "submitted_at", "started_at", "finished_at")
+
+class JobQueue:
+    """
+    Durable queue of processing jobs in a SQLite database.
+
+    Jobs move from queued to running to succeeded or failed. Jobs left
+    running by a server that stopped are queued again when the queue is
+    opened, and rerun memoized nodes quickly (see memo_utils). A job isn't
+    claimed while another job for the same meeting is running.
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Open (or create) the queue.
+
+        Args:
+            db_path: SQLite database file
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                meeting_id TEXT NOT NULL,
+                notes_path TEXT NOT NULL,
+                status TEXT NOT NULL,
+                error TEXT,
+                submitted_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, submitted_at)")
+        with self._lock:
+            self._db.execute("UPDATE jobs SET status = 'queued', started_at = NULL WHERE status = 'running'")
+
+    def submit(self, meeting_id: str, notes_path: str) -> Dict[str, Any]:
+        """
+        Queue a job.
+
+        Args:
+            meeting_id: Meeting to process the notes as
+            notes_path: Notes file
+
+        Returns:
+            The new job
+        """
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO jobs (id, meeting_id, notes_path, status, submitted_at) VALUES (?, ?, ?, 'queued', ?)",
+                (job_id, meeting_id, notes_path, time.time())
+            )
+        return self.get(job_id)
+
+    def claim(self) -> Optional[Dict[str, Any]]:
+        """
+        Take the oldest queued job whose meeting isn't already running, marking it running.
+
+        Returns:
+            The claimed job, or None if there is none
+        """
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute("""
+                    SELECT id FROM jobs
+                    WHERE status = 'queued'
+                      AND meeting_id NOT IN (SELECT meeting_id FROM jobs WHERE status = 'running')
+                    ORDER BY submitted_at LIMIT 1
+                """).fetchone()
+                if row is not None:
+                    self._db.execute("UPDATE jobs SET status = 'running', started_at = ? WHERE id = ?", (time.time(), row["id"]))
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return self.get(row["id"]) if row is not None else None
+
+    def finish(self, job_id: str, error: Optional[str] = None) -> None:
+        """
+        Record the end of a running job.
+
+        Args:
+            job_id: Job ID
+            error: Error message if the job failed
+        """
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE id = ?",
+                ("failed" if error else "succeeded", error, time.time(), job_id)
+            )
+
+    def requeue(self, job_id: str) -> None:
+        """Return a running job to the queue, e.g. when the server stops mid-job."""
+        with self._lock:
+            self._db.execute("UPDATE jobs SET status = 'queued', started_at = NULL WHERE id = ?", (job_id,))
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a job by ID, or None if there is no such job."""
+        with self._lock:
+            row = self._db.execute(f"SELECT {', '.join(_JOB_COLUMNS)} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return _job(row) if row is not None else None
+
+    def list(self, status: Optional[str] = None, limit: int = DEFAULT_JOBS_LIMIT) -> List[Dict[str, Any]]:
+        """
+        List the most recently submitted jobs.
+
+        Args:
+            status: Only jobs with this status
+            limit: Maximum jobs to return
+
+        Returns:
+            Jobs, newest first
+        """
+        query = f"SELECT {', '.join(_JOB_COLUMNS)} FROM jobs"
+        params: tuple = ()
+        if status:
+            query += " WHERE status = ?"
+            params = (status,)
+        with self._lock:
+            rows = self._db.execute(f"{query} ORDER BY submitted_at DESC LIMIT ?", params + (limit,)).fetchall()
+        return [_job(row) for row in rows]
+
+    def counts(self) -> Dict[str, int]:
+        """Count jobs by status."""
+        counts = {status: 0 for status in ("queued", "running", "succeeded", "failed")}
+        with self._lock:
+            for row in self._db.execute("SELECT status, COUNT(*) AS count FROM jobs GROUP BY status"):
+                counts[row["status"]] = row["count"]
+        return counts
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._db.close()
+
+def _job(row: sqlite3.Row) -> Dict[str, Any]:
+    job = dict(row)
+    for key in ("submitted_at", "started_at", "finished_at"):
+        if job[key] is not None:
+            job[key] = datetime.fromtimestamp(job[key]).isoformat()
+    return job
+
+class JobServer:
+    """
+    Processes queued jobs on a pool of worker threads kept warm for the server's lifetime.
+
+    The graph is compiled once, and every job shares one node thread pool
+    (bounding nodes running across all jobs) as well as the process-wide
+    LLM client, rate limiter and caches, so a job starts without any of
+    the per-invocation startup of the CLI.
+    """
+
+    def __init__(
+        self,
+        plan: ExecutionPlan,
+        output_dir: str = '.',
+        max_parallelism: Optional[int] = None,
+        max_meetings: Optional[int] = None,
+        node_timeout: Optional[float] = None
+    ):
+        """
+        Open the job queue and start the workers.
+
+        Args:
+            plan: Compiled processing graph
+            output_dir: Base output directory; the queue and submitted notes are kept in its server/ directory
+            max_parallelism: Maximum graph nodes running at once across all jobs
+            max_meetings: Number of jobs processed at once (defaults to max_parallelism)
+            node_timeout: Seconds each node may take, for nodes without their own timeout
+        """
+        self.plan = plan
+        self.output_dir = output_dir
+        self.server_dir = ensure_dir(os.path.join(output_dir, "server"))
+        self.max_parallelism = get_max_parallelism(max_parallelism)
+        self.max_meetings = max(1, max_meetings or self.max_parallelism)
+        self.node_timeout = node_timeout
+        self.queue = JobQueue(os.path.join(self.server_dir, JOBS_DB_FILENAME))
+        self.started_at = time.time()
+        self.stop = Deadline(name="Server")
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._latencies = {"queue_wait": LatencyHistogram(), "run": LatencyHistogram()}
+
+        # Create the LLM client now, so the first job doesn't pay for it
+        get_llm_client()
+
+        self._node_executor = ThreadPoolExecutor(max_workers=self.max_parallelism, thread_name_prefix="notegold-node")
+        self._workers = [threading.Thread(target=self._work, name=f"notegold-worker-{i}", daemon=True)
+                         for i in range(self.max_meetings)]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, notes: str, meeting_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Queue meeting notes for processing.
+
+        Args:
+            notes: Meeting notes text
+            meeting_id: Meeting ID (defaults to one derived from the job ID)
+
+        Returns:
+            The new job
+
+        Raises:
+            ValueError: If the notes are empty or the meeting ID isn't a safe directory name
+        """
+        if not notes.strip():
+            raise ValueError("Meeting notes are empty")
+        inbox_id = uuid.uuid4().hex
+        meeting_id = meeting_id or f"meeting_{inbox_id[:12]}"
+        if not MEETING_ID_PATTERN.match(meeting_id):
+            raise ValueError(f"Invalid meeting ID: {meeting_id!r}")
+
+        # Named after the meeting, since that's the name it is copied into the meeting with
+        notes_path = os.path.join(self.server_dir, "inbox", inbox_id, f"{meeting_id}.txt")
+        save_text(notes, notes_path)
+        job = self.queue.submit(meeting_id, notes_path)
+        with self._wakeup:
+            self._wakeup.notify()
+        return job
+
+    def meeting_dir(self, job: Dict[str, Any]) -> str:
+        """Get the directory of a job's meeting."""
+        return os.path.join(self.output_dir, "meetings", job["meeting_id"])
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get live server statistics.
+
+        Returns:
+            Queue depth and job counts, queue wait and run time percentiles,
+            worker counts and completion cache counters
+        """
+        counts = self.queue.counts()
+        with self._lock:
+            latencies = {name: histogram.summary() for name, histogram in self._latencies.items()}
+        return {
+            "uptime_s": round(time.time() - self.started_at, 1),
+            "queue_depth": counts["queued"],
+            "jobs": counts,
+            "workers": self.max_meetings,
+            "max_parallelism": self.max_parallelism,
+            "latency_ms": latencies,
+            "cache": get_cache_stats()
+        }
+
+    def close(self) -> None:
+        """Stop the workers, returning their running jobs to the queue."""
+        self.stop.cancel("stopped")
+        with self._wakeup:
+            self._wakeup.notify_all()
+        for worker in self._workers:
+            worker.join()
+        self._node_executor.shutdown(wait=False, cancel_futures=True)
+        self.queue.close()
+
+    def _work(self) -> None:
+        while not self.stop.cancelled():
+            job = self.queue.claim()
+            if job is None:
+                with self._wakeup:
+                    self._wakeup.wait(WORKER_POLL_SECONDS)
+                continue
+
+            started = time.time()
+            print(f"[{datetime.now().strftime('%H:%M:%S')}] ▶ job {job['id'][:8]} ({job['meeting_id']})")
+            try:
+                result = process_meeting(job["notes_path"], job["meeting_id"], self.plan, self.output_dir,
+                                         self._node_executor, self.max_parallelism,
+                                         node_timeout=self.node_timeout, deadline=self.stop)
+            except Exception as e:
+                result = {"status": "error", "error": str(e), "duration_s": round(time.time() - started, 2)}
+            if result["status"] == "cancelled":
+                self.queue.requeue(job["id"])
+                continue
+            self.queue.finish(job["id"], result["error"])
+            symbol = "✅" if result["status"] == "success" else "❌"
+            line = f"[{datetime.now().strftime('%H:%M:%S')}] {symbol} job {job['id'][:8]} ({job['meeting_id']}, {result['duration_s']:.1f}s)"
+            print(f"{line}: {result['error']}" if result["error"] else line)
+
+            submitted = datetime.fromisoformat(job["submitted_at"]).timestamp()
+            with self._lock:
+                self._latencies["queue_wait"].add((started - submitted) * 1000)
+                self._latencies["run"].add((time.time() - started) * 1000)
+
+class _JobRequestHandler(BaseHTTPRequestHandler):
+    """Serves the job API of a JobServer."""
+
+    job_server: JobServer = None
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        parts = [part for part in url.path.split("/") if part]
+        query = parse_qs(url.query)
+
+        if parts == ["health"]:
+            self._send_json(200, {"status": "ok"})
+        elif parts == ["stats"]:
+            self._send_json(200, self.job_server.stats())
+        elif parts == ["jobs"]:
+            status = query.get("status", [None])[0]
+            try:
+                limit = int(query.get("limit", [DEFAULT_JOBS_LIMIT])[0])
+            except ValueError:
+                self._send_json(400, {"error": f"Invalid limit: {query['limit'][0]!r}"})
+                return
+            limit = min(max(limit, 1), MAX_JOBS_LIMIT)
+            self._send_json(200, {"jobs": self.job_server.queue.list(status, limit)})
+        elif len(parts) >= 2 and parts[0] == "jobs":
+            job = self.job_server.queue.get(parts[1])
+            if job is None:
+                self._send_json(404, {"error": f"No such job: {parts[1]}"})
+            elif len(parts) == 2:
+                self._send_json(200, job)
+            elif parts[2] == "artifacts":
+                self._send_artifact(job, "/".join(parts[3:]))
+            else:
+                self._send_json(404, {"error": "Not found"})
+        else:
+            self._send_json(404, {"error": "Not found"})
+
+    def do_POST(self):
+        if urlparse(self.path).path.rstrip("/") != "/jobs":
+            self._send_json(404, {"error": "Not found"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            length = -1
+        if length < 0:
+            # rfile.read(-1) would block until the client closes the connection
+            self._send_json(400, {"error": f"Invalid Content-Length: {self.headers['Content-Length']!r}"})
+            return
+        if length > MAX_NOTES_BYTES:
+            self._send_json(413, {"error": f"Notes are larger than {MAX_NOTES_BYTES} bytes"})
+            return
+        try:
+            body = self.rfile.read(length).decode("utf-8")
+        except UnicodeDecodeError:
+            self._send_json(400, {"error": "Notes aren't valid UTF-8"})
+            return
+
+        # JSON {"notes": ..., "meeting_id": ...}, or the notes as plain text with ?meeting_id=
+        if self.headers.get("Content-Type", "").startswith("application/json"):
+            try:
+                request = json.loads(body or "{}")
+            except json.JSONDecodeError as e:
+                self._send_json(400, {"error": f"Invalid JSON: {e}"})
+                return
+            if not isinstance(request, dict):
+                self._send_json(400, {"error": "Expected a JSON object"})
+                return
+            notes, meeting_id = request.get("notes", ""), request.get("meeting_id")
+            if not isinstance(notes, str) or not isinstance(meeting_id, (str, type(None))):
+                self._send_json(400, {"error": "notes and meeting_id must be strings"})
+                return
+        else:
+            notes, meeting_id = body, parse_qs(urlparse(self.path).query).get("meeting_id", [None])[0]
+
+        try:
+            job = self.job_server.submit(notes, meeting_id)
+        except ValueError as e:
+            self._send_json(400, {"error": str(e)})
+            return
+        self._send_json(202, job, {"Location": f"/jobs/{job['id']}"})
+
+    def _send_artifact(self, job: Dict[str, Any], path: str) -> None:
+        meeting_dir = os.path.realpath(self.job_server.meeting_dir(job))
+        if not path:
+            # List the meeting's artifacts and outputs
+            files = []
+            for subdir in ("artifacts", "outputs"):
+                directory = os.path.join(meeting_dir, subdir)
+                if os.path.isdir(directory):
+                    files.extend(f"{subdir}/{name}" for name in sorted(os.listdir(directory))
+                                 if os.path.isfile(os.path.join(directory, name)))
+            self._send_json(200, {"job_id": job["id"], "meeting_id": job["meeting_id"], "files": files})
+            return
+
+        file_path = os.path.realpath(os.path.join(meeting_dir, path))
+        if not file_path.startswith(meeting_dir + os.sep) or not os.path.isfile(file_path):
+            self._send_json(404, {"error": f"No such artifact: {path}"})
+            return
+        with open(file_path, "rb") as f:
+            body = f.read()
+        self.send_response(200)
+        self.send_header("Content-Type", mimetypes.guess_type(file_path)[0] or "application/octet-stream")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: int, data: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+        body = json.dumps(data, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Keep the console to job status
+        pass
+
+def create_job_server(job_server: JobServer, host: str = "127.0.0.1", port: int = 8000) -> ThreadingHTTPServer:
+    """
+    Create an HTTP server for a job server's API.
+
+    Endpoints: POST /jobs (notes as JSON {"notes", "meeting_id"} or plain
+    text with ?meeting_id=), GET /jobs, GET /jobs/<id>, GET
+    /jobs/<id>/artifacts[/<path>], GET /stats and GET /health.
+
+    Args:
+        job_server: Job server to serve
+        host: Host to bind
+        port: Port to bind (0 picks a free port)
+
+    Returns:
+        Server ready for serve_forever()
+    """
+    handler = type("JobRequestHandler", (_JobRequestHandler,), {"job_server": job_server})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
@@ -0,0 +1,322 @@
+"""Near-duplicate detection of topics across meetings, so their AIDA and social content can be reused."""
+import os
+import re
+import math
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+from src.utils.artifact_utils import load_artifact
+from src.utils.file_utils import load_json, save_json_atomic
+
+TOPIC_INDEX_FILENAME = "topic_index.json"
+
+# Bumped when the index format or the terms extracted from topics change
+TOPIC_INDEX_VERSION = 1
+
+# Cosine similarity at or above which two topics are treated as duplicates
+DEFAULT_DUPLICATE_THRESHOLD = 0.85
+
+# What to do with a near-duplicate: link it from the new content, reuse its content, or don't look
+DEDUP_MODES = ("link", "reuse", "off")
+
+_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+_STOPWORDS = frozenset("""
+    a an and are as at be by for from how in into is it its of on or our that the their this to
+    we what when why with your you vs
+""".split())
+
+def topic_terms(topic: Dict[str, Any]) -> Dict[str, int]:
+    """
+    Extract the term counts that represent a topic.
+
+    The title counts twice, as it says most about what the topic is; the
+    description, pain point and value proposition add context.
+
+    Args:
+        topic: Topic dictionary
+
+    Returns:
+        Dictionary mapping terms to counts
+    """
+    counts: Counter = Counter()
+    for field, weight in (("title", 2), ("description", 1), ("pain_point", 1), ("value_proposition", 1)):
+        for word in _WORD_PATTERN.findall(str(topic.get(field, "")).lower()):
+            if word not in _STOPWORDS and len(word) > 1:
+                counts[word] += weight
+    return dict(counts)
+
+def get_dedup_settings(mode: Optional[str] = None, threshold: Optional[float] = None) -> Tuple[str, float]:
+    """
+    Resolve how near-duplicate topics are handled.
+
+    Args:
+        mode: "link", "reuse" or "off" (overrides NOTEGOLD_TOPIC_DEDUP, default "link")
+        threshold: Similarity threshold (overrides NOTEGOLD_TOPIC_DEDUP_THRESHOLD, default 0.85)
+
+    Returns:
+        Tuple of the mode and threshold
+
+    Raises:
+        ValueError: If the mode is unknown or the threshold isn't between 0 and 1
+    """
+    mode = (mode or os.environ.get("NOTEGOLD_TOPIC_DEDUP", "link")).lower()
+    if mode not in DEDUP_MODES:
+        raise ValueError(f"Unknown topic dedup mode {mode!r}; expected one of {', '.join(DEDUP_MODES)}")
+    if threshold is None:
+        threshold = float(os.environ.get("NOTEGOLD_TOPIC_DEDUP_THRESHOLD", DEFAULT_DUPLICATE_THRESHOLD))
+    if not 0 < threshold <= 1:
+        raise ValueError(f"Topic dedup threshold must be between 0 and 1, got {threshold}")
+    return mode, threshold
+
+class TopicIndex:
+    """
+    TF-IDF index of the topics that already have AIDA content, across all meetings.
+
+    The index is kept in meetings/topic_index.json and updated incrementally:
+    the first lookup re-reads only the meetings whose aida_content.json or
+    social_posts.json changed since they were indexed, and drops meetings
+    that were removed. After that, meetings are re-indexed one at a time as
+    their runs finish (see update_topic_index), so lookups never scan the
+    meetings directory. Topics are compared by cosine similarity of their
+    TF-IDF weighted terms (see topic_terms).
+    """
+
+    def __init__(self, meetings_dir: str):
+        """
+        Load the index of a meetings directory.
+
+        Args:
+            meetings_dir: Directory holding one directory per meeting
+        """
+        self.meetings_dir = meetings_dir
+        self.path = os.path.join(meetings_dir, TOPIC_INDEX_FILENAME)
+        self._lock = threading.Lock()
+        self._meetings: Dict[str, Dict[str, Any]] = {}
+        self._vectors: Optional[List[Tuple[str, int, str, Dict[str, float]]]] = None
+        self._idf: Dict[str, float] = {}
+        self._refreshed = False
+
+        if os.path.exists(self.path):
+            try:
+                state = load_json(self.path)
+                if state.get("version") == TOPIC_INDEX_VERSION:
+                    self._meetings = state.get("meetings", {})
+            except (OSError, ValueError):
+                self._meetings = {}
+
+    def refresh(self) -> bool:
+        """
+        Index meetings whose AIDA or social content changed since they were last indexed.
+
+        Returns:
+            Whether the index changed
+        """
+        seen = set()
+        changed = False
+        with self._lock:
+            if os.path.isdir(self.meetings_dir):
+                for entry in os.scandir(self.meetings_dir):
+                    indexed = self._index_meeting(entry.name)
+                    if indexed is not None:
+                        seen.add(entry.name)
+                        changed |= indexed
+
+            for meeting_id in set(self._meetings) - seen:
+                del self._meetings[meeting_id]
+                changed = True
+
+            self._refreshed = True
+            if changed:
+                self._save()
+        return changed
+
+    def update_meeting(self, meeting_id: str) -> bool:
+        """
+        Re-index one meeting, e.g. once a run of it has finished.
+
+        Args:
+            meeting_id: Name of the meeting's directory
+
+        Returns:
+            Whether the index changed
+        """
+        with self._lock:
+            changed = self._index_meeting(meeting_id)
+            if changed is None:
+                changed = self._meetings.pop(meeting_id, None) is not None
+            if changed:
+                self._save()
+        return changed
+
+    def find_duplicate(
+        self,
+        topic: Dict[str, Any],
+        threshold: float = DEFAULT_DUPLICATE_THRESHOLD,
+        exclude_meeting: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Find the indexed topic most similar to a topic, if it is similar enough.
+
+        Args:
+            topic: Topic dictionary
+            threshold: Minimum cosine similarity
+            exclude_meeting: Meeting whose own topics are ignored
+
+        Returns:
+            Dictionary with the duplicate's meeting_id, title, index (in its
+            meeting's aida_content.json) and similarity, or None
+        """
+        if not self._refreshed:
+            self.refresh()
+        with self._lock:
+            vectors = self._weighted_vectors()
+            query = self._weigh(topic_terms(topic))
+        if not query:
+            return None
+
+        best = None
+        for meeting_id, index, title, vector in vectors:
+            if meeting_id == exclude_meeting:
+                continue
+            similarity = sum(weight * vector.get(term, 0.0) for term, weight in query.items())
+            if similarity >= threshold and (best is None or similarity > best["similarity"]):
+                best = {"meeting_id": meeting_id, "title": title, "index": index, "similarity": round(similarity, 3)}
+        return best
+
+    def load_aida_content(self, duplicate: Dict[str, Any]) -> Dict[str, Any]:
+        """Load the AIDA content of a duplicate found by find_duplicate."""
+        return load_artifact(os.path.join(self.meetings_dir, duplicate["meeting_id"], "artifacts", "aida_content.json"))[duplicate["index"]]
+
+    def artifact_paths(self, duplicate: Dict[str, Any]) -> List[str]:
+        """Get the paths of the artifacts a duplicate found by find_duplicate was read from."""
+        artifacts_dir = os.path.join(self.meetings_dir, duplicate["meeting_id"], "artifacts")
+        return [os.path.join(artifacts_dir, filename) for filename in ("aida_content.json", "social_posts.json")]
+
+    def load_social_posts(self, duplicate: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Load the social posts of a duplicate found by find_duplicate (empty if it has none)."""
+        path = os.path.join(self.meetings_dir, duplicate["meeting_id"], "artifacts", "social_posts.json")
+        if not os.path.exists(path):
+            return []
+        return [post for post in load_artifact(path) if post.get("topic_title") == duplicate["title"]]
+
+    def _index_meeting(self, meeting_id: str) -> Optional[bool]:
+        # Whether the meeting's entry changed, or None if it has no readable AIDA content; callers hold the lock
+        artifacts_dir = os.path.join(self.meetings_dir, meeting_id, "artifacts")
+        aida_path = os.path.join(artifacts_dir, "aida_content.json")
+        try:
+            signature = [os.path.getmtime(aida_path)]
+        except OSError:
+            return None
+        social_path = os.path.join(artifacts_dir, "social_posts.json")
+        if os.path.exists(social_path):
+            signature.append(os.path.getmtime(social_path))
+
+        indexed = self._meetings.get(meeting_id)
+        if indexed is not None and indexed["signature"] == signature:
+            return False
+        try:
+            aida_contents = load_artifact(aida_path)
+        except (OSError, ValueError):
+            return None
+        self._meetings[meeting_id] = {
+            "signature": signature,
+            "topics": [
+                {"title": content.get("topic", {}).get("title", ""), "terms": topic_terms(content.get("topic", {}))}
+                for content in aida_contents
+            ]
+        }
+        return True
+
+    def _save(self) -> None:
+        # Callers hold the lock
+        self._vectors = None
+        save_json_atomic({"version": TOPIC_INDEX_VERSION, "meetings": self._meetings}, self.path)
+
+    def _weighted_vectors(self) -> List[Tuple[str, int, str, Dict[str, float]]]:
+        # Rebuilt only when the index changes; callers hold the lock
+        if self._vectors is None:
+            documents = [(meeting_id, index, topic["title"], topic["terms"])
+                         for meeting_id, meeting in sorted(self._meetings.items())
+                         for index, topic in enumerate(meeting["topics"])]
+            document_frequency: Counter = Counter()
+            for *_, terms in documents:
+                document_frequency.update(terms.keys())
+            # Smoothed, so terms seen in every topic still count a little
+            self._idf = {term: math.log((len(documents) + 1) / (count + 1)) + 1 for term, count in document_frequency.items()}
+            self._vectors = [(meeting_id, index, title, self._weigh(terms)) for meeting_id, index, title, terms in documents]
+        return self._vectors
+
+    def _weigh(self, terms: Dict[str, int]) -> Dict[str, float]:
+        # Unit-length TF-IDF vector; terms not in the index get the highest IDF
+        default_idf = math.log(len(self._vectors or []) + 1) + 1
+        weights = {term: count * self._idf.get(term, default_idf) for term, count in terms.items()}
+        norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+        return {term: weight / norm for term, weight in weights.items()} if norm else {}
+
+_topic_indexes: Dict[str, TopicIndex] = {}
+_topic_indexes_lock = threading.Lock()
+
+def get_topic_index(meetings_dir: str) -> TopicIndex:
+    """
+    Get the shared topic index of a meetings directory.
+
+    Args:
+        meetings_dir: Directory holding one directory per meeting
+
+    Returns:
+        TopicIndex, loaded on first use
+    """
+    key = os.path.abspath(meetings_dir)
+    with _topic_indexes_lock:
+        if key not in _topic_indexes:
+            _topic_indexes[key] = TopicIndex(key)
+        return _topic_indexes[key]
+
+def update_topic_index(meeting_dir: str) -> bool:
+    """
+    Re-index a meeting in its meetings directory's topic index, if that index is in use in this process.
+
+    Called at the end of every successful graph run, so later lookups see
+    the meeting's topics without rescanning the meetings directory. An
+    index that isn't loaded yet picks the meeting up on its first lookup.
+
+    Args:
+        meeting_dir: Meeting directory
+
+    Returns:
+        Whether the index changed
+    """
+    meeting_dir = os.path.abspath(meeting_dir)
+    with _topic_indexes_lock:
+        index = _topic_indexes.get(os.path.dirname(meeting_dir))
+    return index.update_meeting(os.path.basename(meeting_dir)) if index is not None else False
+
+def find_duplicate_topic(
+    topic: Dict[str, Any],
+    outputs_dir: str,
+    mode: Optional[str] = None,
+    threshold: Optional[float] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Find a near-duplicate of a topic among other meetings' topics.
+
+    Args:
+        topic: Ranked topic dictionary
+        outputs_dir: Outputs directory of the meeting the topic belongs to
+        mode: Dedup mode (see get_dedup_settings)
+        threshold: Similarity threshold (see get_dedup_settings)
+
+    Returns:
+        The duplicate (see TopicIndex.find_duplicate) with the dedup mode
+        added, or None if there is none or dedup is off
+    """
+    mode, threshold = get_dedup_settings(mode, threshold)
+    if mode == "off":
+        return None
+    meeting_dir = os.path.dirname(os.path.abspath(outputs_dir))
+    index = get_topic_index(os.path.dirname(meeting_dir))
+    duplicate = index.find_duplicate(topic, threshold, exclude_meeting=os.path.basename(meeting_dir))
+    if duplicate is not None:
+        duplicate["mode"] = mode
+    return duplicate
@@ -0,0 +1,102 @@
+"""Check CLI startup against an import-time budget: python -m src.utils.startup_utils"""
+import os
+import sys
+import argparse
+import subprocess
+from typing import Any, Dict, List, Optional, Sequence
+
+# Milliseconds importing the CLI module may take (the best of several runs)
+DEFAULT_IMPORT_BUDGET_MS = 50.0
+
+# Modules the CLI must not import until a command needs them
+DEFERRED_MODULES = ("asyncio", "openai", "httpx", "src.utils.graph_utils", "src.utils.llm_utils", "src.processors")
+
+def measure_import_time(module: str = "src.main", runs: int = 5) -> Dict[str, Any]:
+    """
+    Measure how long importing a module takes in a fresh interpreter, using -X importtime.
+
+    Args:
+        module: Module to import
+        runs: Number of interpreters to start; the fastest run is reported, as the others mostly measure noise
+
+    Returns:
+        Dictionary with the module's cumulative import time in milliseconds,
+        the names of every module imported, and the slowest modules by
+        their own import time
+    """
+    best: Optional[Dict[str, Any]] = None
+    for _ in range(max(1, runs)):
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        )
+
+        # Lines look like "import time:  self [us] | cumulative | imported package"
+        modules = {}
+        total_us = 0
+        for line in completed.stderr.splitlines():
+            if not line.startswith("import time:") or "[us]" in line:
+                continue
+            self_us, cumulative_us, name = line[len("import time:"):].split("|")
+            name = name.strip()
+            modules[name] = int(self_us)
+            if name == module:
+                total_us = int(cumulative_us)
+
+        if best is None or total_us < best["total_ms"] * 1000:
+            slowest = sorted(modules.items(), key=lambda item: item[1], reverse=True)[:10]
+            best = {
+                "module": module,
+                "total_ms": total_us / 1000,
+                "modules": sorted(modules),
+                "slowest_ms": {name: self_us / 1000 for name, self_us in slowest}
+            }
+    return best
+
+def check_import_budget(
+    measurement: Dict[str, Any],
+    budget_ms: float = DEFAULT_IMPORT_BUDGET_MS,
+    deferred: Sequence[str] = DEFERRED_MODULES
+) -> List[str]:
+    """
+    Check that importing a module stays within a time budget and doesn't load deferred modules.
+
+    Args:
+        measurement: Result of measure_import_time
+        budget_ms: Maximum import time in milliseconds
+        deferred: Modules (or packages) that must not be imported
+
+    Returns:
+        Descriptions of every problem found (empty if within budget)
+    """
+    module = measurement["module"]
+    problems = []
+    if measurement["total_ms"] > budget_ms:
+        slowest = ", ".join(f"{name} {ms:.1f}ms" for name, ms in measurement["slowest_ms"].items())
+        problems.append(f"Importing {module} took {measurement['total_ms']:.1f}ms, over the {budget_ms:g}ms budget (slowest: {slowest})")
+    for name in measurement["modules"]:
+        if name != module and any(name == prefix or name.startswith(f"{prefix}.") for prefix in deferred):
+            problems.append(f"Importing {module} imports {name}, which should only be imported when it is used")
+    return problems
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Check CLI import time against a budget")
+    parser.add_argument("--module", default="src.main", help="Module to import")
+    parser.add_argument("--budget-ms", type=float,
+                        default=float(os.environ.get("NOTEGOLD_IMPORT_BUDGET_MS", DEFAULT_IMPORT_BUDGET_MS)),
+                        help="Maximum import time in milliseconds (default NOTEGOLD_IMPORT_BUDGET_MS or 50)")
+    parser.add_argument("--runs", type=int, default=5, help="Number of measurements; the fastest is used")
+    args = parser.parse_args(argv)
+
+    measurement = measure_import_time(args.module, args.runs)
+    problems = check_import_budget(measurement, args.budget_ms)
+    for problem in problems:
+        print(f"❌ {problem}")
+    if not problems:
+        print(f"✅ Importing {args.module} took {measurement['total_ms']:.1f}ms, within the {args.budget_ms:g}ms budget "
+              f"({len(measurement['modules'])} modules)")
+    return 1 if problems else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
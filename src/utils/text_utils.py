@@ -0,0 +1,178 @@
+"""Token counting and transcript chunking utilities."""
+import re
+import functools
+from typing import List, Optional
+from src.utils.rate_limit_utils import estimate_tokens
+
+# Start of a speaker turn, e.g. "Todd:", "[00:12:01] Jane Doe:" or "**Speaker 2**:"
+SPEAKER_TURN_PATTERN = re.compile(
+    r"^\s*(?:\[?\(?\d{1,2}:\d{2}(?::\d{2})?\)?\]?\s*)?(?:\*\*)?[A-Z][\w .'\-]{0,40}?(?:\*\*)?:\s",
+    re.MULTILINE
+)
+
+SENTENCE_BOUNDARY_PATTERN = re.compile(r"(?<=[.!?])\s+")
+
+@functools.lru_cache(maxsize=None)
+def _get_encoder(model: str):
+    """Get a tiktoken encoder for model, or None if tiktoken isn't installed."""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+def count_tokens(text: str, model: str = "gpt-4") -> int:
+    """
+    Count the tokens in text.
+
+    Uses tiktoken when it is installed, otherwise a character-based estimate.
+
+    Args:
+        text: Text to count
+        model: Model whose tokenizer to use
+
+    Returns:
+        Number of tokens
+    """
+    encoder = _get_encoder(model)
+    if encoder is None:
+        return estimate_tokens(text)
+    return len(encoder.encode(text, disallowed_special=()))
+
+def split_speaker_turns(text: str) -> List[str]:
+    """
+    Split a transcript into speaker turns.
+
+    Falls back to paragraphs, then lines, when no speaker labels are found.
+
+    Args:
+        text: Transcript text
+
+    Returns:
+        List of turns, in order, which together contain all of the text
+    """
+    starts = [match.start() for match in SPEAKER_TURN_PATTERN.finditer(text)]
+    if len(starts) > 1:
+        if starts[0] != 0:
+            starts.insert(0, 0)
+        turns = [text[start:end] for start, end in zip(starts, starts[1:] + [len(text)])]
+    elif "\n\n" in text:
+        turns = [paragraph + "\n\n" for paragraph in text.split("\n\n")]
+    else:
+        turns = [line + "\n" for line in text.split("\n")]
+
+    return [turn for turn in turns if turn.strip()]
+
+def _token_prefix_length(text: str, max_tokens: int, model: str) -> int:
+    """Find the length of the longest prefix of text that fits in max_tokens, preferring to end at whitespace."""
+    low, high = 1, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if count_tokens(text[:middle], model) <= max_tokens:
+            low = middle
+        else:
+            high = middle - 1
+
+    # Back off to the end of the last word, unless that gives up most of the prefix
+    boundary = max(text.rfind(" ", 0, low), text.rfind("\n", 0, low)) + 1
+    return boundary if boundary > low // 2 else low
+
+def _split_oversized(turn: str, max_tokens: int, model: str) -> List[str]:
+    """
+    Split a single turn that exceeds max_tokens at sentence boundaries, then by tokens.
+
+    The pieces keep the turn's own whitespace, and each piece after the
+    first starts with the turn's speaker label (if it has one), so a chunk
+    never starts mid-monologue without saying who is speaking.
+
+    Args:
+        turn: Speaker turn (or paragraph) longer than max_tokens
+        max_tokens: Maximum tokens per piece, including the repeated label
+        model: Model whose tokenizer to use for counting
+
+    Returns:
+        Pieces of at most max_tokens each
+    """
+    label_match = SPEAKER_TURN_PATTERN.match(turn)
+    label = label_match.group(0).lstrip() if label_match else ""
+    if count_tokens(label, model) * 2 > max_tokens:
+        label = ""
+
+    # Sentences with the whitespace that follows them, so joining them gives back the turn
+    ends = [match.end() for match in SENTENCE_BOUNDARY_PATTERN.finditer(turn)] + [len(turn)]
+    sentences = [turn[start:end] for start, end in zip([0] + ends[:-1], ends) if end > start]
+
+    pieces: List[str] = []
+    current = ""
+
+    def prefix() -> str:
+        return label if pieces else ""
+
+    for sentence in sentences:
+        if count_tokens(prefix() + current + sentence, model) <= max_tokens:
+            current += sentence
+            continue
+
+        if current:
+            pieces.append(prefix() + current)
+            current = ""
+
+        # A single sentence longer than the limit is cut at the last word that fits
+        while count_tokens(prefix() + sentence, model) > max_tokens:
+            cut = _token_prefix_length(sentence, max_tokens - count_tokens(prefix(), model), model)
+            pieces.append(prefix() + sentence[:cut])
+            sentence = sentence[cut:]
+        current = sentence
+
+    if current:
+        pieces.append(prefix() + current)
+    return pieces
+
+def chunk_transcript(text: str, max_tokens: int = 3000, model: str = "gpt-4") -> List[str]:
+    """
+    Split a transcript into chunks of at most max_tokens, on speaker turn boundaries.
+
+    Turns are packed greedily into chunks, keeping the transcript's text
+    and whitespace as is. A turn longer than max_tokens is split at
+    sentence boundaries, and each of its later pieces repeats the speaker
+    label.
+
+    Args:
+        text: Transcript text
+        max_tokens: Maximum tokens per chunk
+        model: Model whose tokenizer to use for counting
+
+    Returns:
+        List of chunks in transcript order (a single chunk for short transcripts)
+    """
+    if count_tokens(text, model) <= max_tokens:
+        return [text] if text.strip() else []
+
+    chunks = []
+    current: List[str] = []
+    current_tokens = 0
+
+    for turn in split_speaker_turns(text):
+        turn_tokens = count_tokens(turn, model)
+        pieces = [turn] if turn_tokens <= max_tokens else _split_oversized(turn, max_tokens, model)
+
+        for piece in pieces:
+            piece_tokens = turn_tokens if len(pieces) == 1 else count_tokens(piece, model)
+            if current and current_tokens + piece_tokens > max_tokens:
+                chunks.append("".join(current))
+                current = []
+                current_tokens = 0
+            current.append(piece)
+            current_tokens += piece_tokens
+
+    if current:
+        chunks.append("".join(current))
+    return chunks
+
+def normalize_text(text: Optional[str]) -> str:
+    """Normalize text for duplicate detection: lowercase alphanumeric words separated by single spaces."""
+    return " ".join(re.findall(r"[a-z0-9]+", (text or "").lower()))
@@ -0,0 +1,399 @@
+"""Watch-folder daemon that processes meeting notes as they are dropped into a directory."""
+import os
+import time
+import errno
+import select
+import signal
+import struct
+import hashlib
+import threading
+import ctypes
+import ctypes.util
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional, Set, Tuple
+from src.utils.batch_utils import NOTES_EXTENSIONS, meeting_id_for, process_meeting
+from src.utils.deadline_utils import Deadline, cancel_on_interrupt
+from src.utils.file_utils import load_json, save_json_atomic
+from src.utils.graph_utils import ExecutionPlan, get_max_parallelism
+
+WATCH_STATE_FILENAME = "watch_state.json"
+
+# Seconds a file's size and modification time must stay unchanged before it is processed
+DEFAULT_SETTLE_SECONDS = 2.0
+
+# Seconds between directory scans when inotify isn't available
+DEFAULT_POLL_SECONDS = 2.0
+
+# inotify event flags (see inotify(7))
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+_INOTIFY_EVENT = struct.Struct("iIII")
+
+def is_notes_file(name: str) -> bool:
+    """Check whether a filename in a watched directory is meeting notes."""
+    return name.lower().endswith(NOTES_EXTENSIONS) and not name.startswith(".")
+
+def file_digest(path: str) -> str:
+    """SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class InotifyWatcher:
+    """
+    Reports files created, written or moved into a directory, using Linux inotify.
+
+    Raises OSError on creation where inotify isn't available, so callers
+    can fall back to PollingWatcher.
+    """
+
+    def __init__(self, directory: str):
+        """
+        Start watching a directory.
+
+        Args:
+            directory: Directory to watch (not its subdirectories)
+        """
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError(errno.ENOSYS, "inotify is not available")
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), mask) < 0:
+            error = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(error, f"Cannot watch {directory}")
+
+    def changes(self, timeout: float) -> Optional[Set[str]]:
+        """
+        Wait for changes.
+
+        Args:
+            timeout: Seconds to wait for a change
+
+        Returns:
+            Names of the files that changed (empty if none did), or None if
+            events were lost and the whole directory should be rescanned
+        """
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+
+        names = set()
+        offset = 0
+        while offset + _INOTIFY_EVENT.size <= len(data):
+            _, mask, _, length = _INOTIFY_EVENT.unpack_from(data, offset)
+            offset += _INOTIFY_EVENT.size
+            if mask & IN_Q_OVERFLOW:
+                return None
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            if name:
+                names.add(os.fsdecode(name))
+        return names
+
+    def close(self) -> None:
+        """Stop watching."""
+        os.close(self.fd)
+
+class PollingWatcher:
+    """Reports changed files in a directory by rescanning it at an interval."""
+
+    def __init__(self, directory: str, interval: float = DEFAULT_POLL_SECONDS):
+        """
+        Start watching a directory.
+
+        Args:
+            directory: Directory to watch (not its subdirectories)
+            interval: Seconds between scans
+        """
+        self.directory = directory
+        self.interval = interval
+        self._next_scan = 0.0
+        self._signatures = self._scan()
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        signatures = {}
+        for entry in os.scandir(self.directory):
+            try:
+                if entry.is_file():
+                    stat = entry.stat()
+                    signatures[entry.name] = (stat.st_size, stat.st_mtime_ns)
+            except FileNotFoundError:
+                continue
+        return signatures
+
+    def changes(self, timeout: float) -> Optional[Set[str]]:
+        """
+        Wait for changes.
+
+        Args:
+            timeout: Seconds to wait for a change
+
+        Returns:
+            Names of the files that changed since the last scan
+        """
+        wait = max(0.0, self._next_scan - time.time())
+        if wait > timeout:
+            time.sleep(timeout)
+            return set()
+        time.sleep(wait)
+        self._next_scan = time.time() + self.interval
+
+        signatures = self._scan()
+        changed = {name for name, signature in signatures.items() if self._signatures.get(name) != signature}
+        self._signatures = signatures
+        return changed
+
+    def close(self) -> None:
+        """Stop watching."""
+
+def create_watcher(directory: str, polling: bool = False, poll_interval: float = DEFAULT_POLL_SECONDS):
+    """
+    Create a watcher for a directory, using inotify where available.
+
+    Args:
+        directory: Directory to watch
+        polling: Always poll, e.g. for network filesystems where inotify misses changes
+        poll_interval: Seconds between scans when polling
+
+    Returns:
+        InotifyWatcher or PollingWatcher
+    """
+    if not polling:
+        try:
+            return InotifyWatcher(directory)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(directory, poll_interval)
+
+class WatchState:
+    """
+    Notes files a watch daemon has processed, persisted across restarts.
+
+    Each file is recorded with the digest of the contents that were
+    processed, so a restarted daemon skips files it already processed and
+    picks up new or changed ones. Failed files are retried on restart.
+    """
+
+    def __init__(self, output_dir: str):
+        """
+        Load the state kept in an output directory.
+
+        Args:
+            output_dir: Output directory the daemon processes meetings into
+        """
+        self.path = os.path.join(output_dir, WATCH_STATE_FILENAME)
+        self._lock = threading.Lock()
+        self.files: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(self.path):
+            try:
+                self.files = load_json(self.path).get("files", {})
+            except (OSError, ValueError):
+                self.files = {}
+
+    def is_processed(self, path: str, digest: str) -> bool:
+        """Check whether a file's current contents were processed successfully."""
+        with self._lock:
+            entry = self.files.get(os.path.abspath(path))
+        return entry is not None and entry["digest"] == digest and entry["status"] == "success"
+
+    def owner(self, meeting_id: str) -> Optional[str]:
+        """Get the notes file recorded for a meeting ID, if any."""
+        with self._lock:
+            for path, entry in self.files.items():
+                if entry["meeting_id"] == meeting_id:
+                    return path
+        return None
+
+    def record(self, path: str, digest: str, meeting_id: str, status: str, error: Optional[str] = None) -> None:
+        """
+        Record a processed file and save the state.
+
+        Args:
+            path: Notes file
+            digest: Digest of the contents that were processed
+            meeting_id: Meeting the file was processed as
+            status: Processing status ("success" or "error")
+            error: Error message, if processing failed
+        """
+        with self._lock:
+            self.files[os.path.abspath(path)] = {
+                "digest": digest,
+                "meeting_id": meeting_id,
+                "status": status,
+                "error": error,
+                "processed_at": datetime.now().isoformat()
+            }
+            save_json_atomic({"files": self.files}, self.path)
+
+@contextmanager
+def _stop_on_terminate(deadline: Deadline) -> Iterator[None]:
+    """Cancel a deadline on SIGTERM within the block, so a supervised daemon stops cleanly."""
+    if threading.current_thread() is not threading.main_thread():
+        yield
+        return
+    previous = signal.signal(signal.SIGTERM, lambda signum, frame: deadline.cancel("terminated"))
+    try:
+        yield
+    finally:
+        signal.signal(signal.SIGTERM, previous)
+
+def watch_directory(
+    directory: str,
+    plan: ExecutionPlan,
+    output_dir: str = '.',
+    max_parallelism: Optional[int] = None,
+    max_meetings: Optional[int] = None,
+    settle_seconds: float = DEFAULT_SETTLE_SECONDS,
+    polling: bool = False,
+    poll_interval: float = DEFAULT_POLL_SECONDS,
+    node_timeout: Optional[float] = None
+) -> Dict[str, int]:
+    """
+    Process meeting notes as they appear in a directory, until stopped.
+
+    Notes files already in the directory are processed at startup unless
+    the watch state says their current contents were. A new or changed
+    file is processed once its size and modification time have been stable
+    for settle_seconds, so files still being written aren't picked up; a
+    file that changes while its meeting is running is processed again
+    afterwards. Meetings run concurrently as in run_batch, sharing one
+    compiled graph and node thread pool. Ctrl-C or SIGTERM cancels running
+    meetings and stops the daemon.
+
+    Args:
+        directory: Directory to watch (not its subdirectories)
+        plan: Compiled processing graph
+        output_dir: Base output directory
+        max_parallelism: Maximum graph nodes running at once across all meetings
+        max_meetings: Maximum meetings in progress at once (defaults to max_parallelism)
+        settle_seconds: Seconds a file must stay unchanged before it is processed
+        polling: Poll instead of using inotify
+        poll_interval: Seconds between scans when polling
+        node_timeout: Seconds each node may take, for nodes without their own timeout
+
+    Returns:
+        Counts of meetings that succeeded and failed while watching
+
+    Raises:
+        ValueError: If the directory doesn't exist
+    """
+    if not os.path.isdir(directory):
+        raise ValueError(f"Not a directory: {directory}")
+
+    max_parallelism = get_max_parallelism(max_parallelism)
+    max_meetings = max(1, max_meetings or max_parallelism)
+    state = WatchState(output_dir)
+    stop = Deadline(name="Watch")
+    counts = {"success": 0, "error": 0}
+    # Files waiting to settle, with their last (size, mtime) and when it was first seen
+    settling: Dict[str, Tuple[Tuple[int, int], float]] = {}
+    running: Dict[str, Future] = {}
+    changed_while_running: Set[str] = set()
+    lock = threading.Lock()
+
+    def queue(name: str) -> None:
+        if is_notes_file(name):
+            settling.setdefault(os.path.join(directory, name), ((-1, -1), 0.0))
+
+    def process(path: str, meeting_id: str, digest: str) -> None:
+        print(f"[{datetime.now().strftime('%H:%M:%S')}] ▶ {meeting_id} ({os.path.basename(path)})")
+        result = process_meeting(path, meeting_id, plan, output_dir, node_executor, max_parallelism,
+                                 node_timeout=node_timeout, deadline=stop)
+        if result["status"] == "cancelled":
+            # Not recorded, so the file is processed again on restart
+            print(f"[{datetime.now().strftime('%H:%M:%S')}] ⏹ {meeting_id} cancelled")
+            return
+        state.record(path, digest, meeting_id, result["status"], result["error"])
+        with lock:
+            counts[result["status"]] += 1
+        symbol = "✅" if result["status"] == "success" else "❌"
+        line = f"[{datetime.now().strftime('%H:%M:%S')}] {symbol} {meeting_id} ({result['duration_s']:.1f}s)"
+        print(f"{line}: {result['error']}" if result["error"] else line)
+
+    def start(path: str) -> None:
+        try:
+            digest = file_digest(path)
+        except FileNotFoundError:
+            return
+        if state.is_processed(path, digest):
+            return
+        meeting_id = meeting_id_for(path)
+        owner = state.owner(meeting_id)
+        if owner is not None and owner != os.path.abspath(path):
+            print(f"Skipping {path}: meeting {meeting_id} is already processed from {owner}")
+            return
+        running[path] = meeting_executor.submit(process, path, meeting_id, digest)
+
+    def settle(now: float) -> float:
+        # Start files whose size and modification time stopped changing; return seconds until the next may settle
+        next_check = poll_interval
+        for path, (signature, since) in list(settling.items()):
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                del settling[path]
+                continue
+            current = (stat.st_size, stat.st_mtime_ns)
+            if current != signature:
+                settling[path] = (current, now)
+                next_check = min(next_check, settle_seconds)
+            elif now - since >= settle_seconds:
+                del settling[path]
+                if path in running:
+                    changed_while_running.add(path)
+                else:
+                    start(path)
+            else:
+                next_check = min(next_check, settle_seconds - (now - since))
+        return max(0.05, next_check)
+
+    watcher = create_watcher(directory, polling, poll_interval)
+    kind = "inotify" if isinstance(watcher, InotifyWatcher) else f"polling every {poll_interval:g}s"
+    print(f"Watching {directory} ({kind}; {max_meetings} meetings at a time, {max_parallelism} nodes)")
+    print("Press Ctrl-C to stop")
+
+    node_executor = ThreadPoolExecutor(max_workers=max_parallelism, thread_name_prefix="notegold-node")
+    meeting_executor = ThreadPoolExecutor(max_workers=max_meetings, thread_name_prefix="notegold-meeting")
+    try:
+        with cancel_on_interrupt(stop), _stop_on_terminate(stop):
+            for name in os.listdir(directory):
+                queue(name)
+            timeout = 0.0
+            while not stop.cancelled():
+                changes = watcher.changes(timeout)
+                for name in os.listdir(directory) if changes is None else changes:
+                    queue(name)
+
+                # Files that changed while their meeting ran are processed again
+                for path, future in list(running.items()):
+                    if future.done():
+                        del running[path]
+                        if future.exception() is not None:
+                            print(f"❌ {os.path.basename(path)}: {future.exception()}")
+                        if path in changed_while_running:
+                            changed_while_running.discard(path)
+                            settling[path] = ((-1, -1), 0.0)
+
+                timeout = settle(time.time()) if settling else poll_interval
+    finally:
+        watcher.close()
+        print(f"Stopping; waiting for {len(running)} running meetings to stop" if running else "Stopping")
+        meeting_executor.shutdown(wait=True, cancel_futures=True)
+        node_executor.shutdown(wait=False, cancel_futures=True)
+
+    return counts
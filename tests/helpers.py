@@ -0,0 +1,58 @@
+"""Helpers for building graphs whose processors are defined in the tests, and for faking the LLM."""
+import os
+import json
+import tempfile
+import unittest
+from typing import Any, Callable, Dict, Iterable
+from unittest import mock
+from src.models.data_models import ProcessingEdge, ProcessingGraph, ProcessingNode
+from src.utils.graph_utils import ExecutionPlan, compile_graph
+from src.utils.llm_utils import create_fake_llm_client, get_provider_registry
+
+def build_plan(
+    nodes: Iterable[ProcessingNode],
+    edges: Iterable[ProcessingEdge],
+    processors: Dict[str, Callable],
+    **graph_fields
+) -> ExecutionPlan:
+    """
+    Compile a graph, resolving each node's processor_function (and reduce_function) from processors.
+
+    Args:
+        nodes: Graph nodes
+        edges: Graph edges
+        processors: Functions by the name nodes refer to them by
+        graph_fields: Other ProcessingGraph fields (e.g. timeout)
+
+    Returns:
+        ExecutionPlan
+    """
+    graph = ProcessingGraph(nodes=list(nodes), edges=list(edges), **graph_fields)
+    with mock.patch("src.utils.graph_utils.import_processor_function", side_effect=processors.__getitem__):
+        return compile_graph(graph)
+
+def use_fake_llm(test: unittest.TestCase, **config: Any) -> None:
+    """
+    Answer a test's LLM calls with a fresh fake client that responds instantly, without the completion cache.
+
+    Args:
+        test: Test case; the environment and client are restored when it finishes
+        config: Fake LLM settings overriding the instant defaults (see fake_llm_utils)
+    """
+    config = {"latency": {"distribution": "fixed", "median_ms": 0}, "tokens_per_second": 0, **config}
+    config_file = tempfile.NamedTemporaryFile("w", suffix=".json", delete=False)
+    with config_file:
+        json.dump(config, config_file)
+    test.addCleanup(os.remove, config_file.name)
+
+    environment = mock.patch.dict(os.environ, {
+        "LLM_PROVIDER": "fake",
+        "NOTEGOLD_CACHE": "0",
+        "NOTEGOLD_FAKE_LLM_CONFIG": config_file.name
+    })
+    environment.start()
+    test.addCleanup(environment.stop)
+
+    # Re-registering drops the shared client, so the next call creates one with this config
+    get_provider_registry().register("fake", create_fake_llm_client)
+    test.addCleanup(get_provider_registry().register, "fake", create_fake_llm_client)
@@ -0,0 +1,98 @@
+import os
+import json
+import hashlib
+import tempfile
+import threading
+import unittest
+from src.models.data_models import ProcessingEdge, ProcessingNode
+from src.utils.artifact_utils import ArtifactWriter, artifact_digest, defer_write, load_artifact, save_artifact, use_artifact_writer
+from src.utils.graph_utils import execute_graph
+from tests.helpers import build_plan
+
+def read_json(path):
+    with open(path) as f:
+        return json.load(f)
+
+class ArtifactWriterTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.writer = ArtifactWriter()
+        self.addCleanup(self.writer.close)
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, "artifacts", name)
+
+    def test_serves_saved_artifacts_from_memory_before_they_are_written(self):
+        blocked = threading.Event()
+        self.writer.submit(blocked.wait, 5)
+        with use_artifact_writer(self.writer):
+            save_artifact({"topics": ["pricing"]}, self.path("topics.json"))
+            self.assertEqual(load_artifact(self.path("topics.json")), {"topics": ["pricing"]})
+        self.assertFalse(os.path.exists(self.path("topics.json")))
+
+        blocked.set()
+        self.writer.flush()
+        self.assertEqual(read_json(self.path("topics.json")), {"topics": ["pricing"]})
+
+    def test_digest_matches_the_written_file(self):
+        with use_artifact_writer(self.writer):
+            save_artifact([1, 2, 3], self.path("numbers.json"))
+            digest = artifact_digest(self.path("numbers.json"))
+        self.writer.flush()
+        with open(self.path("numbers.json"), "rb") as f:
+            self.assertEqual(digest, hashlib.sha256(f.read()).hexdigest())
+
+    def test_writes_run_in_the_order_they_were_queued(self):
+        seen = []
+        with use_artifact_writer(self.writer):
+            save_artifact({"step": 1}, self.path("step.json"))
+            defer_write(lambda: seen.append(read_json(self.path("step.json"))))
+            save_artifact({"step": 2}, self.path("step.json"))
+        self.writer.flush()
+        self.assertEqual(seen, [{"step": 1}])
+        self.assertEqual(read_json(self.path("step.json")), {"step": 2})
+
+    def test_flush_raises_a_failed_write_after_finishing_the_others(self):
+        with use_artifact_writer(self.writer):
+            save_artifact({"unserializable": {1, 2}}, self.path("bad.json"))
+            save_artifact({"ok": True}, self.path("good.json"))
+        with self.assertRaises(TypeError):
+            self.writer.flush()
+        self.assertEqual(read_json(self.path("good.json")), {"ok": True})
+        self.writer.flush()
+
+def extract(notes, artifacts_dir):
+    return {"facts_path": save_artifact({"facts": [notes]}, os.path.join(artifacts_dir, "facts.json"))}
+
+def summarize(facts_path, artifacts_dir):
+    facts = load_artifact(facts_path)["facts"]
+    if facts == ["fail"]:
+        raise RuntimeError("summarize failed")
+    return {"summary_path": save_artifact({"summary": facts[0].upper()}, os.path.join(artifacts_dir, "summary.json"))}
+
+class WriteBehindRunTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.artifacts_dir = os.path.join(self.tmp.name, "artifacts")
+        nodes = [
+            ProcessingNode(id="extract", name="Extract", processor_function="extract",
+                           input_artifacts=["notes"], output_artifacts=["facts_path"]),
+            ProcessingNode(id="summarize", name="Summarize", processor_function="summarize",
+                           input_artifacts=["facts_path"], output_artifacts=["summary_path"])
+        ]
+        self.plan = build_plan(nodes, [ProcessingEdge("extract", "summarize")], {"extract": extract, "summarize": summarize})
+
+    def test_artifacts_are_on_disk_when_the_run_returns(self):
+        context = execute_graph(self.plan, {"notes": "hello", "artifacts_dir": self.artifacts_dir})
+        self.assertEqual(read_json(context["summary_path"]), {"summary": "HELLO"})
+
+    def test_artifacts_saved_before_a_failure_are_still_written(self):
+        with self.assertRaises(RuntimeError):
+            execute_graph(self.plan, {"notes": "fail", "artifacts_dir": self.artifacts_dir})
+        self.assertEqual(read_json(os.path.join(self.artifacts_dir, "facts.json")), {"facts": ["fail"]})
+        self.assertFalse(os.path.exists(os.path.join(self.artifacts_dir, "summary.json")))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import os
+import time
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from src.models.data_models import ProcessingNode
+from src.utils.batch_utils import find_notes_files, meeting_id_for, run_batch
+from src.utils.deadline_utils import check_deadline
+from src.utils.file_utils import load_json
+from tests.helpers import build_plan
+
+def summarize(meeting_notes_path, artifacts_dir, cooperative=True):
+    """Fail on notes saying "fail"; otherwise work for about two seconds, checking the deadline if cooperative."""
+    with open(meeting_notes_path) as f:
+        if "fail" in f.read():
+            raise ValueError("unreadable notes")
+    # Long enough that a loaded machine still sees the failure well within it
+    for _ in range(40):
+        if cooperative:
+            check_deadline()
+        time.sleep(0.05)
+    path = os.path.join(artifacts_dir, "summary.txt")
+    with open(path, "w") as f:
+        f.write("summary")
+    return {"summary_path": path}
+
+def summary_plan(cooperative=True):
+    node = ProcessingNode(id="summarize", name="Summarize", processor_function="summarize",
+                          input_artifacts=["meeting_notes_path"], output_artifacts=["summary_path"],
+                          parameters={"cooperative": cooperative})
+    return build_plan([node], [], {"summarize": summarize})
+
+class BatchTest(unittest.TestCase):
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+        self.notes_dir = tempfile.mkdtemp()
+
+    def write_notes(self, **notes):
+        for name, text in notes.items():
+            with open(os.path.join(self.notes_dir, f"{name}.txt"), "w") as f:
+                f.write(text)
+        return find_notes_files(self.notes_dir)
+
+    def test_finds_notes_and_derives_meeting_ids(self):
+        paths = self.write_notes(b="ok", a="ok", meeting_c="ok")
+        self.assertEqual([meeting_id_for(path) for path in paths], ["meeting_a", "meeting_b", "meeting_c"])
+        with self.assertRaises(ValueError):
+            find_notes_files(os.path.join(self.notes_dir, "*.pdf"))
+
+    def test_processes_every_meeting_and_writes_report(self):
+        paths = self.write_notes(a="ok", b="fail", c="ok")
+        report = run_batch(paths, summary_plan(), self.output_dir, max_parallelism=3)
+        self.assertEqual(report["counts"], {"success": 2, "error": 1, "cancelled": 0, "skipped": 0})
+        self.assertEqual(load_json(os.path.join(self.output_dir, "batch_report.json"))["meetings"], 3)
+        self.assertTrue(os.path.exists(os.path.join(self.output_dir, "meetings", "meeting_a", "logs", "console.log")))
+
+    def test_rejects_meetings_with_the_same_id(self):
+        paths = self.write_notes(a="ok")
+        with self.assertRaises(ValueError):
+            run_batch(paths + [os.path.join(self.output_dir, "meeting_a.md")], summary_plan(), self.output_dir)
+
+    @mock.patch.dict(os.environ, {"NOTEGOLD_CANCEL_GRACE": "0.5"})
+    def test_fail_fast_cancels_running_meetings_and_waits_for_them(self):
+        for cooperative in (True, False):
+            with self.subTest(cooperative=cooperative):
+                output_dir = tempfile.mkdtemp()
+                paths = self.write_notes(a="ok", b="fail", c="ok", d="ok")
+                report = run_batch(paths, summary_plan(cooperative), output_dir, max_parallelism=3,
+                                   max_meetings=3, continue_on_error=False)
+                statuses = {meeting["meeting_id"]: meeting["status"] for meeting in report["results"]}
+                self.assertEqual(statuses, {"meeting_a": "cancelled", "meeting_b": "error",
+                                            "meeting_c": "cancelled", "meeting_d": "skipped"})
+                # Nothing of the batch is left running to write artifacts after it returns
+                self.assertFalse([thread for thread in threading.enumerate()
+                                  if thread.name.startswith(("notegold-node", "notegold-meeting"))])
+
+if __name__ == "__main__":
+    unittest.main()
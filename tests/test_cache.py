@@ -0,0 +1,135 @@
+import os
+import time
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from src.utils.cache_utils import CompletionCache, get_completion_cache, make_cache_key
+from src.utils.llm_utils import chat_completion
+from tests.helpers import use_fake_llm
+
+class CompletionCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.cache = CompletionCache(self.tmp.name, max_entries=3)
+
+    def test_key_covers_every_request_setting(self):
+        key = make_cache_key("gpt-4", 0.7, "system", "prompt", 100)
+        self.assertEqual(key, make_cache_key("gpt-4", 0.7, "system", "prompt", 100))
+        for other in (
+            make_cache_key("gpt-4o", 0.7, "system", "prompt", 100),
+            make_cache_key("gpt-4", 0.2, "system", "prompt", 100),
+            make_cache_key("gpt-4", 0.7, "other", "prompt", 100),
+            make_cache_key("gpt-4", 0.7, "system", "other", 100),
+            make_cache_key("gpt-4", 0.7, "system", "prompt", 200),
+            make_cache_key("gpt-4", 0.7, "system", "prompt", 100, {"type": "json_object"})
+        ):
+            self.assertNotEqual(key, other)
+
+    def test_evicts_least_recently_used_and_expired_entries(self):
+        now = time.time()
+        for i, key in enumerate(["a1", "b2", "c3", "d4"]):
+            self.cache.set(key, key)
+            os.utime(self.cache._entry_path(key), (now - 100 + i, now - 100 + i))
+        # Reading an entry makes it the most recently used
+        self.assertEqual(self.cache.get("a1"), "a1")
+        self.assertEqual(self.cache.evict(), 1)
+        self.assertIsNone(self.cache.get("b2"))
+        self.assertEqual(self.cache.get("a1"), "a1")
+
+        self.cache.max_age_seconds = 50
+        os.utime(self.cache._entry_path("c3"), (now - 60, now - 60))
+        self.assertIsNone(self.cache.get("c3"))
+        self.assertEqual(self.cache.stats()["evictions"], 2)
+
+    def test_merges_identical_requests_in_flight(self):
+        calls = []
+        release = threading.Event()
+
+        def compute():
+            calls.append(1)
+            release.wait(5)
+            return "answer", True
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.cache.get_or_compute("k", compute))) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.1)
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual((len(calls), results), (1, ["answer"] * 4))
+        self.assertEqual({k: self.cache.stats()[k] for k in ("misses", "coalesced", "writes")}, {"misses": 1, "coalesced": 3, "writes": 1})
+        self.assertEqual(self.cache.get_or_compute("k", compute), "answer")
+        self.assertEqual(len(calls), 1)
+
+    def test_shares_a_failure_with_merged_requests_without_caching_it(self):
+        started = threading.Event()
+
+        def compute():
+            started.set()
+            time.sleep(0.1)
+            raise RuntimeError("provider down")
+
+        errors = []
+        def follower():
+            started.wait(5)
+            try:
+                self.cache.get_or_compute("k", lambda: ("unused", True))
+            except RuntimeError as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=follower)
+        thread.start()
+        with self.assertRaises(RuntimeError):
+            self.cache.get_or_compute("k", compute)
+        thread.join()
+        self.assertEqual(len(errors), 1)
+        self.assertIsNone(self.cache.get("k"))
+
+class CacheLocationTest(unittest.TestCase):
+    def test_defaults_to_the_user_cache_directory_whatever_the_working_directory(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(tmp.name)
+        with mock.patch("src.utils.cache_utils._completion_cache", None), \
+                mock.patch.dict(os.environ, {"XDG_CACHE_HOME": "/srv/cache", "NOTEGOLD_CACHE": "1"}):
+            os.environ.pop("NOTEGOLD_CACHE_DIR", None)
+            self.assertEqual(get_completion_cache().cache_dir, "/srv/cache/notegold/completions")
+        with mock.patch("src.utils.cache_utils._completion_cache", None), \
+                mock.patch.dict(os.environ, {"NOTEGOLD_CACHE_DIR": "cache", "NOTEGOLD_CACHE": "1"}):
+            self.assertEqual(get_completion_cache().cache_dir, os.path.join(os.path.realpath(tmp.name), "cache"))
+
+class CachedCompletionTest(unittest.TestCase):
+    def setUp(self):
+        use_fake_llm(self)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.cache = CompletionCache(self.tmp.name)
+        patcher = mock.patch("src.utils.llm_utils.get_completion_cache", return_value=self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_caches_finished_responses(self):
+        for stream in (False, True):
+            with self.subTest(stream=stream):
+                prompt = f"Describe the meeting (stream={stream})"
+                first = chat_completion(prompt, model="fake", temperature=0, stream=stream)
+                first = first if isinstance(first, str) else "".join(first)
+                key = make_cache_key("fake", 0, "", prompt, None)
+                self.assertEqual(self.cache.get(key), first)
+
+    def test_does_not_cache_truncated_responses(self):
+        for stream in (False, True):
+            with self.subTest(stream=stream):
+                prompt = f"Describe the meeting (stream={stream})"
+                response = chat_completion(prompt, model="fake", temperature=0, max_tokens=2, stream=stream)
+                self.assertEqual(len(response if isinstance(response, str) else "".join(response)), 8)
+                self.assertIsNone(self.cache.get(make_cache_key("fake", 0, "", prompt, 2)))
+        self.assertEqual(self.cache.stats()["writes"], 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import os
+import json
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+from src.utils.llm_utils import chat_completion, get_provider_registry, structured_completion, use_llm_settings
+from src.utils.metrics_utils import LLMUsageRecorder
+from src.utils.rate_limit_utils import AdaptiveConcurrencyLimiter, RequestThrottle, TokenBucketLimiter
+from src.utils.schema_utils import list_json_schema
+
+SCHEMA = list_json_schema({"type": "object", "properties": {"score": {"type": "integer"}}, "required": ["score"]}, "topics")
+
+class PerModelCompletions:
+    """Chat completions answering with a fixed response per model, recording each request."""
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.requests = []
+
+    def create(self, **params):
+        self.requests.append(params)
+        message = SimpleNamespace(content=self.responses[params["model"]])
+        return SimpleNamespace(choices=[SimpleNamespace(message=message, finish_reason="stop")], usage=None)
+
+def topics(*scores):
+    return json.dumps({"topics": [{"score": score} for score in scores]})
+
+def check_scores(data):
+    return [f"score {topic['score']} out of range" for topic in data.get("topics", []) if not 1 <= topic["score"] <= 10]
+
+class CascadeTest(unittest.TestCase):
+    def setUp(self):
+        self.completions = PerModelCompletions({
+            "gpt-4o-mini": '{"topics": [{"score": 3},]}',
+            "gpt-4o": topics(5, 42),
+            "gpt-4.1": topics(5, 7)
+        })
+        client = SimpleNamespace(chat=SimpleNamespace(completions=self.completions))
+        get_provider_registry().register("per_model", lambda: client)
+        throttle = RequestThrottle(TokenBucketLimiter(), AdaptiveConcurrencyLimiter(initial_limit=4))
+        for patcher in (
+            mock.patch.dict(os.environ, {"LLM_PROVIDER": "per_model", "NOTEGOLD_LLM_HEDGE": "0", "NOTEGOLD_CACHE": "0"}),
+            mock.patch("src.utils.llm_utils.get_request_throttle", return_value=throttle)
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def models(self):
+        return [request["model"] for request in self.completions.requests]
+
+    def test_escalates_until_a_response_passes_schema_and_check(self):
+        recorder = LLMUsageRecorder()
+        with use_llm_settings({"cascade": ["gpt-4o-mini", "gpt-4o", "gpt-4.1"]}, recorder):
+            data, response = structured_completion("Rank these", "", SCHEMA, "ranked", check_scores)
+        self.assertEqual(data, {"topics": [{"score": 5}, {"score": 7}]})
+        self.assertEqual(response, topics(5, 7))
+        self.assertEqual(self.models(), ["gpt-4o-mini", "gpt-4o", "gpt-4.1"])
+        self.assertEqual([(e["from"], e["to"]) for e in recorder.summary()["escalations"]],
+                         [("gpt-4o-mini", "gpt-4o"), ("gpt-4o", "gpt-4.1")])
+        self.assertIn("42", recorder.summary()["escalations"][1]["reason"])
+
+    def test_stops_at_the_first_accepted_response(self):
+        with use_llm_settings({"cascade": ["gpt-4o", "gpt-4.1"]}):
+            data, _ = structured_completion("Rank these", "", SCHEMA, "ranked")
+        self.assertEqual(data, {"topics": [{"score": 5}, {"score": 42}]})
+        self.assertEqual(self.models(), ["gpt-4o"])
+
+    def test_last_model_answer_is_returned_even_if_rejected(self):
+        with use_llm_settings({"cascade": ["gpt-4o-mini", "gpt-4o"]}):
+            data, _ = structured_completion("Rank these", "", SCHEMA, "ranked", check_scores)
+        self.assertEqual(data, {"topics": [{"score": 5}, {"score": 42}]})
+        self.assertEqual(self.models(), ["gpt-4o-mini", "gpt-4o"])
+
+    def test_only_the_last_model_answer_is_repaired(self):
+        with mock.patch("src.utils.llm_utils.repair_json", return_value={"topics": [{"score": 3}]}) as repair_json:
+            with use_llm_settings({"cascade": ["gpt-4o-mini", "gpt-4.1"]}):
+                structured_completion("Rank these", "", SCHEMA, "ranked")
+            repair_json.assert_not_called()
+            with use_llm_settings({"cascade": ["gpt-4o", "gpt-4o-mini"]}):
+                data, _ = structured_completion("Rank these", "", SCHEMA, "ranked", check_scores)
+        self.assertEqual(data, {"topics": [{"score": 3}]})
+        repair_json.assert_called_once()
+
+    def test_explicit_model_skips_the_cascade(self):
+        with use_llm_settings({"cascade": ["gpt-4o-mini", "gpt-4.1"]}):
+            structured_completion("Rank these", "", SCHEMA, "ranked", model="gpt-4o")
+        self.assertEqual(self.models(), ["gpt-4o"])
+
+    def test_node_settings_route_plain_completions(self):
+        with use_llm_settings({"model": "gpt-4o", "temperature": 0.1, "max_tokens": 50}):
+            chat_completion("Summarize")
+            chat_completion("Summarize", model="gpt-4.1", temperature=0.9)
+        self.assertEqual([(r["model"], r["temperature"], r["max_tokens"]) for r in self.completions.requests],
+                         [("gpt-4o", 0.1, 50), ("gpt-4.1", 0.9, 50)])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import os
+import json
+import tempfile
+import unittest
+from unittest import mock
+from src.utils.catalog_utils import catalog_stats, get_catalog_path, rebuild_catalog, search_catalog, update_catalog
+
+def write_meeting(meetings_dir, meeting_id, title, date, topics, aida=(), social_posts=()):
+    artifacts_dir = os.path.join(meetings_dir, meeting_id, "artifacts")
+    os.makedirs(artifacts_dir, exist_ok=True)
+    artifacts = {
+        f"{meeting_id}_metadata.json": {"meeting_title": title, "meeting_date": date, "client_name": "Acme",
+                                        "main_topics": [topic["title"] for topic in topics]},
+        "ranked_topics.json": topics,
+        "aida_content.json": list(aida),
+        "social_posts.json": list(social_posts)
+    }
+    for filename, content in artifacts.items():
+        with open(os.path.join(artifacts_dir, filename), "w") as f:
+            json.dump(content, f)
+    return os.path.join(meetings_dir, meeting_id)
+
+def topic(title, description, priority, value_score):
+    return {"title": title, "description": description, "priority": priority, "value_score": value_score}
+
+class CatalogTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.meetings_dir = self.tmp.name
+        self.pricing = write_meeting(
+            self.meetings_dir, "pricing_review", "Pricing review", "2025-03-10",
+            [topic("Usage-based pricing", "Moving invoices to metered billing", "High", 8.5),
+             topic("Discount policy", "Who may approve discounts", "Low", 2.0)],
+            aida=[{"topic": {"title": "Usage-based pricing"}, "attention": "Invoices confuse customers",
+                   "interest": "Metered billing", "desire": "Pay for use", "action": "Book a call"}],
+            social_posts=[{"topic_title": "Usage-based pricing", "platform": "LinkedIn", "content": "Why we meter billing"}]
+        )
+        self.onboarding = write_meeting(
+            self.meetings_dir, "onboarding_sync", "Onboarding sync", "2025-05-02",
+            [topic("Faster onboarding", "Cutting setup from days to hours", "Medium", 5.0)]
+        )
+        rebuild_catalog(self.meetings_dir)
+
+    def search(self, text=None, **filters):
+        return [(result["kind"], result["meeting_id"], result["title"]) for result in search_catalog(self.meetings_dir, text, **filters)]
+
+    def test_rebuild_indexes_every_meeting(self):
+        os.makedirs(os.path.join(self.meetings_dir, "not_processed"))
+        self.assertEqual(rebuild_catalog(self.meetings_dir), 2)
+        self.assertEqual(catalog_stats(self.meetings_dir), {"meetings": 2, "topics": 3, "aida": 1, "social_posts": 1})
+
+    def test_full_text_search_stems_and_matches_all_words(self):
+        results = self.search("billing", kinds=["topic"])
+        self.assertEqual(results, [("topic", "pricing_review", "Usage-based pricing")])
+        self.assertEqual(self.search("metered invoice", kinds=["topic"]), results)
+        self.assertEqual(self.search("onboard*", kinds=["topic"]), [("topic", "onboarding_sync", "Faster onboarding")])
+        self.assertEqual(self.search("billing onboarding"), [])
+
+    def test_filters_by_kind_priority_score_and_meeting(self):
+        self.assertEqual({kind for kind, _, _ in self.search(priority="high")}, {"topic", "aida", "social"})
+        self.assertEqual(self.search(kinds=["topic"], min_score=5.0, meeting_id="pricing_review"),
+                         [("topic", "pricing_review", "Usage-based pricing")])
+        self.assertEqual(self.search(kinds=["meeting"]), [("meeting", "onboarding_sync", "Onboarding sync"),
+                                                          ("meeting", "pricing_review", "Pricing review")])
+
+    def test_filters_by_meeting_date(self):
+        self.assertEqual(self.search(kinds=["meeting"], since="2025-04-01"), [("meeting", "onboarding_sync", "Onboarding sync")])
+        self.assertEqual(self.search(kinds=["meeting"], until="2025-04-01"), [("meeting", "pricing_review", "Pricing review")])
+
+    def test_rejects_invalid_searches(self):
+        with self.assertRaisesRegex(ValueError, "Dates must be YYYY-MM-DD"):
+            search_catalog(self.meetings_dir, since="March 2025")
+        with self.assertRaisesRegex(ValueError, "Unknown document kind"):
+            search_catalog(self.meetings_dir, kinds=["slides"])
+        with self.assertRaisesRegex(ValueError, "No catalog"):
+            search_catalog(os.path.join(self.meetings_dir, "pricing_review"))
+
+    def test_update_replaces_a_meetings_rows(self):
+        write_meeting(self.meetings_dir, "onboarding_sync", "Onboarding sync", "2025-05-02",
+                      [topic("Self-serve setup", "Customers configure accounts alone", "High", 7.0)])
+        self.assertTrue(update_catalog(self.onboarding))
+        self.assertEqual(self.search(kinds=["topic"], meeting_id="onboarding_sync"),
+                         [("topic", "onboarding_sync", "Self-serve setup")])
+        self.assertEqual(catalog_stats(self.meetings_dir)["topics"], 3)
+
+    def test_update_adds_a_new_meeting(self):
+        retro = write_meeting(self.meetings_dir, "retro", "Retro", "2025-06-01", [topic("Release cadence", "Weekly releases", "Low", 1.0)])
+        self.assertTrue(update_catalog(retro))
+        self.assertEqual(catalog_stats(self.meetings_dir)["meetings"], 3)
+
+    @mock.patch.dict(os.environ, {"NOTEGOLD_CATALOG": "0"})
+    def test_update_can_be_turned_off(self):
+        os.remove(get_catalog_path(self.meetings_dir))
+        self.assertFalse(update_catalog(self.pricing))
+        self.assertFalse(os.path.exists(get_catalog_path(self.meetings_dir)))
+
+    def test_update_skips_directories_without_artifacts(self):
+        empty = os.path.join(self.meetings_dir, "empty")
+        os.makedirs(empty)
+        self.assertFalse(update_catalog(empty))
+
+if __name__ == "__main__":
+    unittest.main()
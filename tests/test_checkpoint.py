@@ -0,0 +1,120 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from collections import Counter
+from src.models.data_models import ProcessingEdge, ProcessingNode
+from src.utils.checkpoint_utils import RunCheckpoint
+from src.utils.graph_utils import execute_graph
+from tests.helpers import build_plan
+
+calls = Counter()
+calls_lock = threading.Lock()
+failing = set()
+
+def record_call(name):
+    with calls_lock:
+        calls[name] += 1
+    if name in failing:
+        raise RuntimeError(f"{name} failed")
+
+def outline(topic, artifacts_dir=None):
+    record_call("outline")
+    return {"outline": f"outline of {topic}"}
+
+def draft(outline, artifacts_dir=None):
+    record_call("draft")
+    return {"draft": f"draft from {outline}"}
+
+def expand(item):
+    record_call(f"expand {item}")
+    return {"expanded": item.upper()}
+
+def chain_plan():
+    nodes = [
+        ProcessingNode(id="outline", name="Outline", processor_function="outline", input_artifacts=["topic"], output_artifacts=["outline"]),
+        ProcessingNode(id="draft", name="Draft", processor_function="draft", input_artifacts=["outline"], output_artifacts=["draft"])
+    ]
+    return build_plan(nodes, [ProcessingEdge("outline", "draft")], {"outline": outline, "draft": draft})
+
+def map_plan():
+    nodes = [ProcessingNode(id="expand", name="Expand", processor_function="expand", input_artifacts=["items"],
+                            output_artifacts=["expanded"], map_over="items")]
+    return build_plan(nodes, [], {"expand": expand})
+
+class CheckpointTest(unittest.TestCase):
+    def setUp(self):
+        calls.clear()
+        failing.clear()
+        self.metadata_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.metadata_dir)
+
+    def forget_node_runs(self):
+        """Remove the memo records, so only the checkpoint can skip nodes."""
+        path = os.path.join(self.metadata_dir, "node_runs.json")
+        if os.path.exists(path):
+            os.remove(path)
+
+    def test_failed_run_records_completed_nodes_and_failure(self):
+        failing.add("draft")
+        with self.assertRaisesRegex(RuntimeError, "draft failed"):
+            execute_graph(chain_plan(), {"topic": "tests", "metadata_dir": self.metadata_dir})
+        state = RunCheckpoint(self.metadata_dir).load()
+        self.assertEqual(state["status"], "failed")
+        self.assertEqual(state["completed_nodes"], ["outline"])
+        self.assertEqual(state["failed_node"], "draft")
+        self.assertEqual(state["context"]["outline"], "outline of tests")
+
+    def test_resume_continues_from_first_unfinished_node(self):
+        failing.add("draft")
+        with self.assertRaises(RuntimeError):
+            execute_graph(chain_plan(), {"topic": "tests", "metadata_dir": self.metadata_dir})
+        failing.clear()
+        self.forget_node_runs()
+
+        context = execute_graph(chain_plan(), {"topic": "tests", "metadata_dir": self.metadata_dir}, resume=True)
+        self.assertEqual(calls, Counter(outline=1, draft=2))
+        self.assertEqual(context["draft"], "draft from outline of tests")
+        self.assertEqual(RunCheckpoint(self.metadata_dir).load()["status"], "complete")
+
+    def test_without_resume_completed_nodes_run_again(self):
+        failing.add("draft")
+        with self.assertRaises(RuntimeError):
+            execute_graph(chain_plan(), {"topic": "tests", "metadata_dir": self.metadata_dir})
+        failing.clear()
+        self.forget_node_runs()
+
+        execute_graph(chain_plan(), {"topic": "tests", "metadata_dir": self.metadata_dir})
+        self.assertEqual(calls, Counter(outline=2, draft=2))
+
+    def test_force_node_overrides_resume(self):
+        failing.add("draft")
+        with self.assertRaises(RuntimeError):
+            execute_graph(chain_plan(), {"topic": "tests", "metadata_dir": self.metadata_dir})
+        failing.clear()
+
+        execute_graph(chain_plan(), {"topic": "tests", "metadata_dir": self.metadata_dir}, resume=True, force_nodes=["outline"])
+        self.assertEqual(calls, Counter(outline=2, draft=2))
+
+    def test_resume_keeps_finished_map_items(self):
+        failing.add("expand c")
+        with self.assertRaisesRegex(RuntimeError, "expand c failed"):
+            execute_graph(map_plan(), {"items": ["a", "b", "c"], "metadata_dir": self.metadata_dir}, max_parallelism=1)
+        self.assertEqual(set(RunCheckpoint.map_results(RunCheckpoint(self.metadata_dir).load())["expand"]), {0, 1})
+        failing.clear()
+        self.forget_node_runs()
+
+        context = execute_graph(map_plan(), {"items": ["a", "b", "c"], "metadata_dir": self.metadata_dir}, resume=True)
+        self.assertEqual(context["expanded"], ["A", "B", "C"])
+        self.assertEqual(calls, Counter({"expand a": 1, "expand b": 1, "expand c": 2}))
+
+    def test_unreadable_checkpoint_starts_afresh(self):
+        with open(os.path.join(self.metadata_dir, "checkpoint.json"), "w") as f:
+            f.write("{truncated")
+        self.assertIsNone(RunCheckpoint(self.metadata_dir).load())
+        execute_graph(chain_plan(), {"topic": "tests", "metadata_dir": self.metadata_dir}, resume=True)
+        self.assertEqual(calls, Counter(outline=1, draft=1))
+
+if __name__ == "__main__":
+    unittest.main()
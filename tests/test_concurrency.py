@@ -0,0 +1,64 @@
+import os
+import time
+import threading
+import unittest
+from unittest import mock
+from src.utils.llm_utils import chat_completion, chat_completions, get_llm_settings, run_with_concurrency, use_llm_settings
+from tests.helpers import use_fake_llm
+
+class RunWithConcurrencyTest(unittest.TestCase):
+    def test_keeps_order_and_bounds_calls_in_flight(self):
+        lock = threading.Lock()
+        in_flight = [0, 0]
+
+        def call(i):
+            with lock:
+                in_flight[0] += 1
+                in_flight[1] = max(in_flight[1], in_flight[0])
+            # Later calls finish first
+            time.sleep(0.05 * (6 - i))
+            with lock:
+                in_flight[0] -= 1
+            return i
+
+        self.assertEqual(run_with_concurrency([lambda i=i: call(i) for i in range(6)], max_concurrency=2), list(range(6)))
+        self.assertEqual(in_flight[1], 2)
+
+    def test_calls_see_the_node_settings(self):
+        with use_llm_settings({"model": "gpt-4o"}):
+            models = run_with_concurrency([lambda: get_llm_settings().get("model")] * 3)
+        self.assertEqual(models, ["gpt-4o"] * 3)
+
+    def test_default_limit_comes_from_the_environment(self):
+        lock = threading.Lock()
+        in_flight = [0, 0]
+
+        def call():
+            with lock:
+                in_flight[0] += 1
+                in_flight[1] = max(in_flight[1], in_flight[0])
+            time.sleep(0.05)
+            with lock:
+                in_flight[0] -= 1
+
+        with mock.patch.dict(os.environ, {"NOTEGOLD_LLM_CONCURRENCY": "3"}):
+            run_with_concurrency([call] * 9)
+        self.assertEqual(in_flight[1], 3)
+
+    def test_an_error_is_raised_to_the_caller(self):
+        def fail():
+            raise RuntimeError("request failed")
+        with self.assertRaises(RuntimeError):
+            run_with_concurrency([lambda: 1, fail])
+
+class ChatCompletionsTest(unittest.TestCase):
+    def test_answers_match_sequential_calls_in_order(self):
+        use_fake_llm(self, latency={"distribution": "fixed", "median_ms": 50})
+        prompts = [f"Describe topic {i}" for i in range(8)]
+        start_time = time.time()
+        answers = chat_completions([{"prompt": prompt, "model": "fake"} for prompt in prompts], max_concurrency=8)
+        self.assertLess(time.time() - start_time, 0.05 * 8)
+        self.assertEqual(answers, [chat_completion(prompt, model="fake") for prompt in prompts])
+
+if __name__ == "__main__":
+    unittest.main()
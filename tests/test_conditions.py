@@ -0,0 +1,48 @@
+import os
+import tempfile
+import unittest
+from src.utils.condition_utils import Condition, ConditionError
+from src.utils.file_utils import save_json
+
+RANKED_TOPICS = [
+    {"title": "Onboarding", "value_score": 3.5, "priority": "High"},
+    {"title": "Pricing", "value_score": 1.0, "priority": "Low"}
+]
+
+class ConditionTest(unittest.TestCase):
+    def test_evaluates_against_context(self):
+        context = {"ranked_topics": RANKED_TOPICS}
+        self.assertTrue(Condition("max(ranked_topics.value_score) > 2.0").evaluate(context))
+        self.assertTrue(Condition('len(ranked_topics) > 0 and ranked_topics[0].priority == "High"').evaluate(context))
+        self.assertFalse(Condition('"Hiring" in ranked_topics.title').evaluate(context))
+        self.assertEqual(Condition("mean(ranked_topics.value_score) * 2 % 3 == 1.5").evaluate(context), True)
+
+    def test_short_circuits(self):
+        self.assertFalse(Condition("len(topics) > 0 and max(topics) > 1").evaluate({"topics": []}))
+
+    def test_loads_names_from_artifact_paths(self):
+        path = os.path.join(tempfile.mkdtemp(), "ranked_topics.json")
+        save_json(RANKED_TOPICS, path)
+        self.assertTrue(Condition("len(ranked_topics) == 2").evaluate({"ranked_topics_path": path}))
+
+    def test_rejects_syntax_outside_the_language(self):
+        for expression in ("__import__('os')", "open('x')", "topics.__class__", "[t for t in topics]",
+                           "lambda: 1", "2 ** 10", "len(topics, key=1)", "x" * 501):
+            with self.subTest(expression=expression[:40]):
+                with self.assertRaises(ConditionError):
+                    Condition(expression)
+
+    def test_unknown_name_fails(self):
+        with self.assertRaisesRegex(ConditionError, "Unknown name in condition: topics"):
+            Condition("len(topics) > 0").evaluate({})
+
+    def test_arithmetic_only_applies_to_numbers(self):
+        # String formatting, repetition and concatenation could build huge values
+        for expression in ('len("%01000000d" % 1) > 0', 'len("ab" * 1000000) > 0', 'len([0] * 1000000) > 0',
+                           'len("a" + title) > 0', 'len(topics + topics) > 0'):
+            with self.subTest(expression=expression):
+                with self.assertRaisesRegex(ConditionError, "Only numbers"):
+                    Condition(expression).evaluate({"title": "x", "topics": [1]})
+
+if __name__ == "__main__":
+    unittest.main()
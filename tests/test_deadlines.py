@@ -0,0 +1,73 @@
+import os
+import time
+import unittest
+from unittest import mock
+from src.models.data_models import ProcessingEdge, ProcessingNode
+from src.utils.deadline_utils import Deadline, DeadlineExceeded, RunCancelled
+from src.utils.graph_utils import execute_graph
+from tests.helpers import build_plan
+
+def format_slowly(item):
+    time.sleep(0.3)
+    return {"formatted": f"formatted {item}"}
+
+def post(formatted, delay=0.05):
+    time.sleep(delay)
+    return {"post": f"post of {formatted}"}
+
+def pipelined_plan(post_delay):
+    """A map node formatting three items one after another, feeding a map node posting each one."""
+    nodes = [
+        ProcessingNode(id="format", name="Format", processor_function="format", output_artifacts=["formatted"],
+                       map_over="items", timeout=5),
+        ProcessingNode(id="post", name="Post", processor_function="post", output_artifacts=["post"],
+                       map_over="formatted", parameters={"delay": post_delay})
+    ]
+    return build_plan(nodes, [ProcessingEdge("format", "post")], {"format": format_slowly, "post": post})
+
+class DeadlineTest(unittest.TestCase):
+    def test_child_is_bounded_by_parent(self):
+        parent = Deadline(0.5)
+        self.assertLessEqual(Deadline(10, parent).expires_at, parent.expires_at)
+        self.assertEqual(Deadline(None, parent).expires_at, parent.expires_at)
+
+    def test_cancelling_parent_cancels_child(self):
+        parent = Deadline()
+        child = Deadline(None, parent, "Node a")
+        parent.cancel("cancelled by test")
+        with self.assertRaisesRegex(RunCancelled, "Node a cancelled by test"):
+            child.check()
+
+    def test_expired_deadline_raises(self):
+        deadline = Deadline(0.01, name="Node a")
+        time.sleep(0.02)
+        with self.assertRaisesRegex(DeadlineExceeded, "Node a exceeded its 0.01s timeout"):
+            deadline.check()
+
+    def test_restart_counts_from_now(self):
+        deadline = Deadline(0.01)
+        time.sleep(0.02)
+        deadline.restart(5)
+        self.assertFalse(deadline.expired())
+        self.assertGreater(deadline.remaining(), 4)
+
+class NodeTimeoutTest(unittest.TestCase):
+    def test_node_timeout_fails_run(self):
+        nodes = [ProcessingNode(id="slow", name="Slow", processor_function="format", output_artifacts=["formatted"],
+                                map_over="items")]
+        plan = build_plan(nodes, [], {"format": format_slowly})
+        with self.assertRaisesRegex(DeadlineExceeded, "Node slow exceeded its 0.4s timeout"):
+            execute_graph(plan, {"items": ["a", "b", "c"]}, max_parallelism=1, node_timeout=0.4)
+
+    def test_pipelined_node_timeout_excludes_waiting_for_upstream(self):
+        # The upstream node takes about 0.9s; the node it feeds only needs 0.15s of its 0.5s
+        context = execute_graph(pipelined_plan(0.05), {"items": ["a", "b", "c"]}, max_parallelism=1, node_timeout=0.5)
+        self.assertEqual(context["post"], ["post of formatted a", "post of formatted b", "post of formatted c"])
+
+    @mock.patch.dict(os.environ, {"NOTEGOLD_CANCEL_GRACE": "1"})
+    def test_pipelined_node_timeout_still_bounds_its_own_work(self):
+        with self.assertRaisesRegex(DeadlineExceeded, "Node post exceeded its 0.5s timeout"):
+            execute_graph(pipelined_plan(0.3), {"items": ["a", "b", "c"]}, max_parallelism=1, node_timeout=0.5)
+
+if __name__ == "__main__":
+    unittest.main()
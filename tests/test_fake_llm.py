@@ -0,0 +1,106 @@
+import json
+import threading
+import unittest
+import urllib.error
+import urllib.request
+from src.utils.fake_llm_utils import FakeLLM, FakeLLMError, create_fake_llm_server, detect_task, load_fake_llm_config
+from src.utils.schema_utils import validate_json
+
+def fake_config(latency=None, **overrides):
+    """Default settings answering instantly, with overrides."""
+    config = load_fake_llm_config()
+    config["latency"].update({"distribution": "fixed", "median_ms": 0}, **(latency or {}))
+    config.update({"tokens_per_second": 0}, **overrides)
+    return config
+
+def request(messages, **params):
+    return dict(model="fake", messages=messages, **params)
+
+TOPICS_PROMPT = [{"role": "user", "content": "Generate content topic ideas from these notes: pricing, hiring"}]
+
+class FakeLLMTest(unittest.TestCase):
+    def test_same_request_gets_the_same_answer(self):
+        first = FakeLLM(fake_config()).complete(request(TOPICS_PROMPT))
+        second = FakeLLM(fake_config()).complete(request(TOPICS_PROMPT))
+        self.assertEqual(first, second)
+        self.assertNotEqual(first["content"], FakeLLM(fake_config()).complete(request([{"role": "user", "content": "Other"}]))["content"])
+
+    def test_answers_match_the_task_and_output_mode(self):
+        self.assertEqual(detect_task(TOPICS_PROMPT), "topics")
+        self.assertEqual(detect_task([{"role": "user", "content": "Hello"}]), "generic")
+
+        fake = FakeLLM(fake_config(topic_count=3))
+        schema = {"type": "object", "properties": {"topics": {"type": "array"}}, "required": ["topics"]}
+        answer = fake.complete(request(TOPICS_PROMPT, response_format={"type": "json_object"}))
+        data = json.loads(answer["content"])
+        self.assertEqual(validate_json(data, schema), [])
+        self.assertEqual(len(data["topics"]), 3)
+        self.assertTrue(fake.complete(request(TOPICS_PROMPT))["content"].startswith("```json"))
+
+    def test_canned_responses_override_generated_ones(self):
+        fake = FakeLLM(fake_config(responses={"topics": [{"title": "Pricing"}], "generic": "Hi"}))
+        self.assertEqual(json.loads(fake.complete(request(TOPICS_PROMPT))["content"]), [{"title": "Pricing"}])
+        self.assertEqual(fake.complete(request([{"role": "user", "content": "Hello"}]))["content"], "Hi")
+
+    def test_stream_chunks_add_up_to_the_completion(self):
+        fake = FakeLLM(fake_config())
+        chunks = list(fake.stream(request(TOPICS_PROMPT)))
+        completion = fake.complete(request(TOPICS_PROMPT))
+        self.assertEqual("".join(chunk["content"] for chunk in chunks), completion["content"])
+        self.assertEqual(chunks[-2]["finish_reason"], "stop")
+        self.assertEqual(chunks[-1]["usage"], completion["usage"])
+
+    def test_stops_at_max_tokens(self):
+        answer = FakeLLM(fake_config()).complete(request(TOPICS_PROMPT, max_tokens=3))
+        self.assertEqual((len(answer["content"]), answer["finish_reason"]), (12, "length"))
+
+    def test_injects_errors_with_retry_after(self):
+        fake = FakeLLM(fake_config(error_rate=1.0, error_status=503, retry_after=2))
+        with self.assertRaises(FakeLLMError) as raised:
+            fake.complete(request(TOPICS_PROMPT))
+        self.assertEqual(raised.exception.status_code, 503)
+        self.assertEqual(raised.exception.response.headers, {"retry-after": "2"})
+
+    def test_times_out_like_a_real_client(self):
+        fake = FakeLLM(fake_config(latency={"median_ms": 1000}))
+        with self.assertRaises(TimeoutError):
+            fake.complete(request(TOPICS_PROMPT), timeout=0.05)
+
+class FakeLLMServerTest(unittest.TestCase):
+    def start(self, **overrides):
+        server = create_fake_llm_server(port=0, config=fake_config(**overrides))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+    def post(self, url, body):
+        return urllib.request.urlopen(urllib.request.Request(
+            f"{url}/chat/completions", data=json.dumps(body).encode(), headers={"Content-Type": "application/json"}
+        ))
+
+    def test_serves_completions_and_streams(self):
+        url = self.start()
+        with self.post(url, request(TOPICS_PROMPT)) as response:
+            completion = json.loads(response.read())
+        self.assertEqual(completion["object"], "chat.completion")
+        self.assertEqual(completion["choices"][0]["finish_reason"], "stop")
+
+        with self.post(url, request(TOPICS_PROMPT, stream=True, stream_options={"include_usage": True})) as response:
+            self.assertEqual(response.headers["Content-Type"], "text/event-stream")
+            events = [line[len("data: "):] for line in response.read().decode().splitlines() if line.startswith("data: ")]
+        self.assertEqual(events[-1], "[DONE]")
+        chunks = [json.loads(event) for event in events[:-1]]
+        text = "".join(chunk["choices"][0]["delta"]["content"] for chunk in chunks if chunk["choices"])
+        self.assertEqual(text, completion["choices"][0]["message"]["content"])
+        self.assertEqual(chunks[-1]["usage"], completion["usage"])
+
+    def test_reports_injected_errors_as_http_errors(self):
+        url = self.start(error_rate=1.0, error_status=429, retry_after=3)
+        with self.assertRaises(urllib.error.HTTPError) as raised:
+            self.post(url, request(TOPICS_PROMPT))
+        self.assertEqual(raised.exception.code, 429)
+        self.assertEqual(raised.exception.headers["retry-after"], "3")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,186 @@
+import os
+import time
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+from src.utils.llm_utils import _call_cancellable, chat_completion, get_provider_registry
+from src.utils.rate_limit_utils import (
+    AdaptiveConcurrencyLimiter,
+    HedgeCancelled,
+    HedgePolicy,
+    RequestThrottle,
+    TokenBucketLimiter
+)
+
+class SlowFirstCompletions:
+    """Chat completions whose first request hangs until released; later ones answer at once."""
+
+    def __init__(self):
+        self.calls = 0
+        self.release = threading.Event()
+        self.lock = threading.Lock()
+
+    def create(self, **params):
+        with self.lock:
+            call = self.calls
+            self.calls += 1
+        if call == 0:
+            self.release.wait(5)
+        message = SimpleNamespace(content=f"answer {call}")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+class RateLimited(Exception):
+    status_code = 429
+    response = SimpleNamespace(headers={"retry-after": "0.3"})
+
+class ThrottledOnceCompletions:
+    """Chat completions rejecting the first request with a 429; later ones answer at once."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def create(self, **params):
+        self.calls += 1
+        if self.calls == 1:
+            raise RateLimited("slow down")
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content="answer"))], usage=None)
+
+class Closable:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+def wait_for(condition, timeout=2.0):
+    """Poll until condition() is true or the timeout passes, returning its last value."""
+    end = time.time() + timeout
+    while not condition() and time.time() < end:
+        time.sleep(0.01)
+    return condition()
+
+class HedgedRequestTest(unittest.TestCase):
+    def setUp(self):
+        self.completions = SlowFirstCompletions()
+        self.addCleanup(self.completions.release.set)
+        client = SimpleNamespace(chat=SimpleNamespace(completions=self.completions))
+        get_provider_registry().register("slow_first", lambda: client)
+
+        self.policy = HedgePolicy(budget=1.0, min_samples=1)
+        self.policy.record(0.01, ("completion", None, "test-model"))
+        self.throttle = RequestThrottle(TokenBucketLimiter(), AdaptiveConcurrencyLimiter(initial_limit=4))
+        for patcher in (
+            mock.patch.dict(os.environ, {"LLM_PROVIDER": "slow_first", "NOTEGOLD_LLM_HEDGE": "1", "NOTEGOLD_CACHE": "0"}),
+            mock.patch("src.utils.llm_utils.get_hedge_policy", return_value=self.policy),
+            mock.patch("src.utils.llm_utils.get_request_throttle", return_value=self.throttle)
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_losing_request_in_flight_frees_its_slot_at_once(self):
+        start_time = time.time()
+        self.assertEqual(chat_completion("hello", model="test-model"), "answer 1")
+        self.assertLess(time.time() - start_time, 1.0)
+        self.assertEqual(self.policy.hedges, 1)
+
+        # The first request is still waiting on the provider, but no longer holds a slot
+        self.assertTrue(wait_for(lambda: self.throttle.concurrency.in_flight == 0))
+        self.assertFalse(self.completions.release.is_set())
+
+    def test_latency_excludes_rate_limit_waits_and_retries(self):
+        client = SimpleNamespace(chat=SimpleNamespace(completions=ThrottledOnceCompletions()))
+        get_provider_registry().register("throttled_once", lambda: client)
+        policy = HedgePolicy(min_samples=1000)
+        with mock.patch.dict(os.environ, {"LLM_PROVIDER": "throttled_once"}), \
+                mock.patch("src.utils.llm_utils.get_hedge_policy", return_value=policy):
+            start_time = time.time()
+            self.assertEqual(chat_completion("hello", model="test-model"), "answer")
+            self.assertGreaterEqual(time.time() - start_time, 0.3)
+
+        latencies = policy.histograms()[("completion", None, "test-model")]
+        self.assertEqual(latencies["count"], 1)
+        self.assertLess(latencies["p99"], 100)
+
+class HedgePolicyTest(unittest.TestCase):
+    def slow_then_fast(self):
+        """An attempt that is slow the first time it runs in each request and fast after."""
+        calls = []
+
+        def attempt(cancelled):
+            calls.append(1)
+            if len(calls) % 2 == 1:
+                cancelled.wait(0.2)
+                if cancelled.is_set():
+                    raise HedgeCancelled()
+                return "slow"
+            return "fast"
+        return attempt
+
+    def test_waits_for_enough_samples_then_uses_the_fallback_key(self):
+        policy = HedgePolicy(percentile=50, min_samples=3)
+        key, fallback_key = ("completion", "node", "model"), ("completion", None, "model")
+        for latency in (0.01, 0.02):
+            policy.record(latency, key, fallback_key)
+        self.assertIsNone(policy.threshold(key, fallback_key))
+        policy.record(0.03, fallback_key)
+        self.assertAlmostEqual(policy.threshold(key, fallback_key), 0.02, delta=0.005)
+        self.assertIsNone(policy.threshold(("completion", "other", "other-model")))
+
+    def test_slow_request_is_hedged_and_the_hedge_wins(self):
+        policy = HedgePolicy(budget=1.0, min_samples=1)
+        policy.record(0.01, "key")
+        self.assertEqual(policy.run(self.slow_then_fast(), "key"), ("fast", True, True))
+        self.assertEqual(policy.run(lambda cancelled: "quick", "key"), ("quick", False, False))
+
+    def test_hedges_stay_within_the_budget(self):
+        policy = HedgePolicy(budget=0.25, min_samples=1)
+        policy.record(0.01, "key")
+        results = [policy.run(self.slow_then_fast(), "key") for _ in range(8)]
+        self.assertEqual(policy.hedges, 2)
+        self.assertEqual(sum(hedged for _, hedged, _ in results), 2)
+        self.assertEqual(policy.requests, 8)
+
+    def test_error_is_raised_only_when_every_attempt_fails(self):
+        policy = HedgePolicy(budget=1.0, min_samples=1)
+        policy.record(0.01, "key")
+        calls = []
+
+        def attempt(cancelled):
+            calls.append(1)
+            if len(calls) == 1:
+                time.sleep(0.1)
+                raise RuntimeError("first attempt failed")
+            time.sleep(0.2)
+            return "second"
+        self.assertEqual(policy.run(attempt, "key")[0], "second")
+
+        def failing(cancelled):
+            time.sleep(0.05)
+            raise RuntimeError("down")
+        with self.assertRaises(RuntimeError):
+            policy.run(failing, "key")
+
+class CallCancellableTest(unittest.TestCase):
+    def test_cancelled_call_returns_early_and_closes_late_response(self):
+        release = threading.Event()
+        response = Closable()
+
+        def request():
+            release.wait(5)
+            return response
+
+        cancelled = threading.Event()
+        threading.Timer(0.05, cancelled.set).start()
+        with self.assertRaises(HedgeCancelled):
+            _call_cancellable(request, cancelled)
+        self.assertFalse(response.closed)
+
+        release.set()
+        self.assertTrue(wait_for(lambda: response.closed))
+
+    def test_uncancelled_call_returns_the_response(self):
+        self.assertEqual(_call_cancellable(lambda: "response", threading.Event()), "response")
+
+if __name__ == "__main__":
+    unittest.main()
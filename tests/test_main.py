@@ -0,0 +1,40 @@
+import os
+import sys
+import json
+import tempfile
+import subprocess
+import unittest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class ProcessCommandTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.notes_path = os.path.join(self.tmp.name, "kickoff.md")
+        with open(self.notes_path, "w") as f:
+            f.write("Jane: We need faster onboarding.\nTodd: Let's automate the checklists.\n")
+        config_path = os.path.join(self.tmp.name, "fake_llm.json")
+        with open(config_path, "w") as f:
+            json.dump({"latency": {"distribution": "fixed", "median_ms": 0}, "tokens_per_second": 0, "topic_count": 2}, f)
+        self.environment = dict(os.environ, LLM_PROVIDER="fake", NOTEGOLD_CACHE="0", NOTEGOLD_CATALOG="0",
+                                NOTEGOLD_FAKE_LLM_CONFIG=config_path)
+
+    def run_cli(self, *args):
+        return subprocess.run([sys.executable, "-m", "src.main", *args], cwd=ROOT_DIR, env=self.environment,
+                              capture_output=True, text=True, timeout=120)
+
+    def test_successful_run_exits_zero_without_printing_results(self):
+        for extra in (["--dry-run"], []):
+            with self.subTest(extra=extra):
+                completed = self.run_cli("process", self.notes_path, "--output-dir", self.tmp.name, *extra)
+                self.assertEqual(completed.returncode, 0, completed.stdout[-2000:])
+                self.assertEqual(completed.stderr, "")
+
+    def test_failed_run_exits_one(self):
+        completed = self.run_cli("process", os.path.join(self.tmp.name, "missing.md"), "--output-dir", self.tmp.name)
+        self.assertEqual(completed.returncode, 1)
+        self.assertIn("Error processing meeting notes", completed.stdout)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import os
+import tempfile
+import threading
+import unittest
+from collections import Counter
+from src.models.data_models import ProcessingEdge, ProcessingNode
+from src.utils.graph_utils import execute_graph
+from tests.helpers import build_plan
+
+calls = Counter()
+calls_lock = threading.Lock()
+
+def record_call(name):
+    with calls_lock:
+        calls[name] += 1
+
+def format_item(item, suffix="!"):
+    record_call("format")
+    return {"formatted": f"{item}{suffix}"}
+
+def post_item(formatted):
+    record_call(f"post {formatted}")
+    return {"post": f"post of {formatted}"}
+
+def count_posts(results):
+    return {"posts": [result["post"] for result in results], "post_count": len(results)}
+
+def pipeline_plan(map_limit=0, suffix="!"):
+    nodes = [
+        ProcessingNode(id="format", name="Format", processor_function="format", input_artifacts=["items"], output_artifacts=["formatted"],
+                       map_over="items", map_limit=map_limit, parameters={"suffix": suffix}),
+        ProcessingNode(id="post", name="Post", processor_function="post", output_artifacts=["posts"],
+                       map_over="formatted", reduce_function="count_posts")
+    ]
+    return build_plan(nodes, [ProcessingEdge("format", "post")],
+                      {"format": format_item, "post": post_item, "count_posts": count_posts})
+
+class MapNodeTest(unittest.TestCase):
+    def setUp(self):
+        calls.clear()
+        self.metadata_dir = tempfile.mkdtemp()
+
+    def test_maps_items_in_order_and_reduces(self):
+        context = execute_graph(pipeline_plan(), {"items": ["a", "b", "c"]}, max_parallelism=4)
+        self.assertEqual(context["formatted"], ["a!", "b!", "c!"])
+        self.assertEqual(context["posts"], ["post of a!", "post of b!", "post of c!"])
+        self.assertEqual(context["post_count"], 3)
+
+    def test_map_limit_keeps_first_items(self):
+        context = execute_graph(pipeline_plan(map_limit=2), {"items": ["a", "b", "c"]})
+        self.assertEqual(context["posts"], ["post of a!", "post of b!"])
+
+    def test_mapping_over_a_non_list_fails(self):
+        with self.assertRaisesRegex(ValueError, "not a list"):
+            execute_graph(pipeline_plan(), {"items": "abc"})
+
+    def test_pipelined_node_reuses_items_whose_input_is_unchanged(self):
+        context = {"items": ["a", "b"], "metadata_dir": self.metadata_dir}
+        execute_graph(pipeline_plan(), context)
+        self.assertEqual(calls, Counter({"format": 2, "post a!": 1, "post b!": 1}))
+
+        # Re-running the upstream node with the same outputs doesn't run the pipelined node's items again
+        result = execute_graph(pipeline_plan(), context, force_nodes=["format"])
+        self.assertEqual(calls, Counter({"format": 4, "post a!": 1, "post b!": 1}))
+        self.assertEqual(result["posts"], ["post of a!", "post of b!"])
+
+    def test_pipelined_node_reruns_only_changed_items(self):
+        execute_graph(pipeline_plan(), {"items": ["a", "b"], "metadata_dir": self.metadata_dir})
+        result = execute_graph(pipeline_plan(), {"items": ["a", "c"], "metadata_dir": self.metadata_dir})
+        self.assertEqual(calls["post a!"], 1)
+        self.assertEqual(calls["post c!"], 1)
+        self.assertEqual(result["posts"], ["post of a!", "post of c!"])
+
+    def test_forced_pipelined_node_runs_every_item(self):
+        context = {"items": ["a"], "metadata_dir": self.metadata_dir}
+        execute_graph(pipeline_plan(), context)
+        execute_graph(pipeline_plan(), context, force=True)
+        self.assertEqual(calls["post a!"], 2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+import os
+import tempfile
+import threading
+import unittest
+from collections import Counter
+from src.models.data_models import ProcessingEdge, ProcessingNode
+from src.utils.graph_utils import execute_graph
+from src.utils.memo_utils import NodeRunStore, node_fingerprint
+from tests.helpers import build_plan
+
+calls = Counter()
+calls_lock = threading.Lock()
+
+def write_file(path, text):
+    with open(path, "w") as f:
+        f.write(text)
+    return path
+
+def extract(transcript_path, artifacts_dir, style="plain"):
+    with calls_lock:
+        calls["extract"] += 1
+    with open(transcript_path) as f:
+        text = f.read()
+    return {"notes_path": write_file(os.path.join(artifacts_dir, "notes.txt"), f"{style}: {text}")}
+
+def summarize(notes_path, artifacts_dir):
+    with calls_lock:
+        calls["summarize"] += 1
+    with open(notes_path) as f:
+        notes = f.read()
+    return {"summary_path": write_file(os.path.join(artifacts_dir, "summary.txt"), notes.upper())}
+
+def memo_plan(style="plain"):
+    nodes = [
+        ProcessingNode(id="extract", name="Extract", processor_function="extract", input_artifacts=["transcript_path"],
+                       output_artifacts=["notes_path"], parameters={"style": style}),
+        ProcessingNode(id="summarize", name="Summarize", processor_function="summarize", input_artifacts=["notes_path"],
+                       output_artifacts=["summary_path"])
+    ]
+    return build_plan(nodes, [ProcessingEdge("extract", "summarize")], {"extract": extract, "summarize": summarize})
+
+class MemoTestCase(unittest.TestCase):
+    def setUp(self):
+        calls.clear()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.artifacts_dir = os.path.join(self.tmp.name, "artifacts")
+        self.metadata_dir = os.path.join(self.tmp.name, "metadata")
+        os.makedirs(self.artifacts_dir)
+        os.makedirs(self.metadata_dir)
+        self.transcript_path = write_file(os.path.join(self.tmp.name, "transcript.txt"), "hello")
+
+    def context(self):
+        return {"transcript_path": self.transcript_path, "artifacts_dir": self.artifacts_dir, "metadata_dir": self.metadata_dir}
+
+class NodeFingerprintTest(MemoTestCase):
+    def fingerprint(self, **parameters):
+        node = ProcessingNode(id="extract", name="Extract", processor_function="extract",
+                              input_artifacts=["transcript_path"], parameters=parameters)
+        return node_fingerprint(node, self.context(), extract)
+
+    def test_depends_on_input_content_not_path_alone(self):
+        before = self.fingerprint()
+        self.assertEqual(self.fingerprint(), before)
+        write_file(self.transcript_path, "hello again")
+        self.assertNotEqual(self.fingerprint(), before)
+
+    def test_depends_on_parameters_and_prompt_version(self):
+        fingerprints = {self.fingerprint(), self.fingerprint(style="bullets"), self.fingerprint(prompt_version=2)}
+        self.assertEqual(len(fingerprints), 3)
+
+    def test_ignores_context_outside_input_artifacts(self):
+        node = ProcessingNode(id="extract", name="Extract", processor_function="extract", input_artifacts=["transcript_path"])
+        self.assertEqual(node_fingerprint(node, {**self.context(), "unrelated": 1}, extract),
+                         node_fingerprint(node, self.context(), extract))
+
+class NodeRunStoreTest(MemoTestCase):
+    def setUp(self):
+        super().setUp()
+        self.path = os.path.join(self.metadata_dir, "node_runs.json")
+        self.output_path = write_file(os.path.join(self.artifacts_dir, "notes.txt"), "notes")
+        NodeRunStore(self.path).record("extract", "abc", {"notes_path": self.output_path})
+
+    def test_reuses_recorded_run_from_disk(self):
+        store = NodeRunStore(self.path)
+        self.assertEqual(store.lookup("extract", "abc"), {"notes_path": self.output_path})
+        self.assertEqual(store.describe("extract", "abc"), "up to date")
+
+    def test_explains_why_a_node_must_run(self):
+        store = NodeRunStore(self.path)
+        self.assertEqual(store.describe("summarize", "abc"), "no previous run")
+        self.assertIsNone(store.lookup("extract", "def"))
+        self.assertEqual(store.describe("extract", "def"), "inputs, parameters or code changed")
+
+    def test_modified_or_missing_outputs_invalidate_the_run(self):
+        store = NodeRunStore(self.path)
+        write_file(self.output_path, "edited by hand")
+        self.assertIsNone(store.lookup("extract", "abc"))
+        self.assertEqual(store.describe("extract", "abc"), "outputs missing or modified")
+        os.remove(self.output_path)
+        self.assertIsNone(store.lookup("extract", "abc"))
+
+    def test_ignores_a_corrupt_store(self):
+        write_file(self.path, "{not json")
+        self.assertIsNone(NodeRunStore(self.path).last_result("extract"))
+
+class ExecuteGraphMemoTest(MemoTestCase):
+    def test_second_run_skips_up_to_date_nodes(self):
+        first = execute_graph(memo_plan(), self.context())
+        second = execute_graph(memo_plan(), self.context())
+        self.assertEqual(calls, Counter(extract=1, summarize=1))
+        self.assertEqual(second["summary_path"], first["summary_path"])
+
+    def test_changed_input_reruns_node_and_its_dependents(self):
+        execute_graph(memo_plan(), self.context())
+        write_file(self.transcript_path, "goodbye")
+        context = execute_graph(memo_plan(), self.context())
+        self.assertEqual(calls, Counter(extract=2, summarize=2))
+        with open(context["summary_path"]) as f:
+            self.assertEqual(f.read(), "PLAIN: GOODBYE")
+
+    def test_changed_parameter_reruns_node(self):
+        execute_graph(memo_plan(), self.context())
+        execute_graph(memo_plan(style="bullets"), self.context())
+        self.assertEqual(calls, Counter(extract=2, summarize=2))
+
+    def test_unchanged_rerun_output_skips_dependents(self):
+        execute_graph(memo_plan(), self.context())
+        execute_graph(memo_plan(), self.context(), force_nodes=["extract"])
+        self.assertEqual(calls, Counter(extract=2, summarize=1))
+
+    def test_force_reruns_every_node(self):
+        execute_graph(memo_plan(), self.context())
+        execute_graph(memo_plan(), self.context(), force=True)
+        self.assertEqual(calls, Counter(extract=2, summarize=2))
+
+    def test_without_metadata_dir_nothing_is_memoized(self):
+        context = self.context()
+        del context["metadata_dir"]
+        execute_graph(memo_plan(), context)
+        execute_graph(memo_plan(), context)
+        self.assertEqual(calls, Counter(extract=2, summarize=2))
+
+if __name__ == "__main__":
+    unittest.main()
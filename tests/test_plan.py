@@ -0,0 +1,86 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+from src.models.data_models import ProcessingEdge, ProcessingGraph, ProcessingNode
+from src.utils import graph_utils
+from src.utils.graph_utils import compile_graph, create_default_graph, load_execution_plan, save_graph
+from tests.helpers import build_plan
+
+def summarize(notes, artifacts_dir, style="short"):
+    return {"summary": notes}
+
+def publish(summary, artifacts_dir):
+    return {"post": summary}
+
+class PlanCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.graph_path = save_graph(create_default_graph(), os.path.join(self.tmp.name, "graph.json"))
+        patcher = mock.patch.object(graph_utils, "_plan_cache", {})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_compiles_a_graph_file_once(self):
+        with mock.patch.object(graph_utils, "compile_graph", wraps=graph_utils.compile_graph) as compile_graph:
+            plan = load_execution_plan(self.graph_path)
+            self.assertIs(load_execution_plan(self.graph_path), plan)
+            self.assertIs(load_execution_plan(os.path.relpath(self.graph_path)), plan)
+        self.assertEqual(compile_graph.call_count, 1)
+
+    def test_recompiles_when_the_graph_file_changes(self):
+        plan = load_execution_plan(self.graph_path)
+        graph = plan.graph
+        graph.nodes[0].timeout = 12
+        save_graph(graph, self.graph_path)
+        stat = os.stat(self.graph_path)
+        os.utime(self.graph_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        updated = load_execution_plan(self.graph_path)
+        self.assertIsNot(updated, plan)
+        self.assertEqual(updated.nodes[graph.nodes[0].id].node.timeout, 12)
+        # Only the plan for the current version of the file is kept
+        self.assertEqual(list(graph_utils._plan_cache.values()), [updated])
+
+    def test_default_graph_is_compiled_once(self):
+        self.assertIs(load_execution_plan(), load_execution_plan())
+
+class CompileTest(unittest.TestCase):
+    def nodes(self, **summarize_fields):
+        fields = dict(id="summarize", name="Summarize", processor_function="summarize",
+                      input_artifacts=["notes"], output_artifacts=["summary"])
+        fields.update(summarize_fields)
+        return [
+            ProcessingNode(**fields),
+            ProcessingNode(id="publish", name="Publish", processor_function="publish",
+                           input_artifacts=["summary"], output_artifacts=["post"])
+        ]
+
+    def compile(self, nodes, edges=None):
+        edges = [ProcessingEdge("summarize", "publish")] if edges is None else edges
+        return build_plan(nodes, edges, {"summarize": summarize, "publish": publish})
+
+    def test_orders_nodes_and_resolves_processors(self):
+        plan = self.compile(self.nodes(parameters={"style": "long", "model": "gpt-4o"}))
+        self.assertEqual(plan.order, ("summarize", "publish"))
+        self.assertIs(plan.nodes["summarize"].processor, summarize)
+        self.assertEqual(plan.upstream_outputs["publish"], {"summary"})
+
+    def test_rejects_mismatched_processors_before_running(self):
+        misspelled = ProcessingNode(id="extract", name="Extract", processor_function="processors.metadata_extractor.extract_metadat")
+        with self.assertRaisesRegex(ValueError, "extract: cannot import"):
+            compile_graph(ProcessingGraph(nodes=[misspelled], edges=[]))
+        with self.assertRaisesRegex(ValueError, r"does not take arguments \['tone'\]"):
+            self.compile(self.nodes(parameters={"tone": "formal"}))
+        with self.assertRaisesRegex(ValueError, "cycle"):
+            self.compile(self.nodes(), [ProcessingEdge("summarize", "publish"), ProcessingEdge("publish", "summarize")])
+
+    def test_reports_missing_inputs(self):
+        plan = self.compile(self.nodes())
+        plan.check_inputs({"notes": "hello", "artifacts_dir": "artifacts"})
+        with self.assertRaisesRegex(ValueError, r"summarize: notes"):
+            plan.check_inputs({"artifacts_dir": "artifacts"})
+
+if __name__ == "__main__":
+    unittest.main()
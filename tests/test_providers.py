@@ -0,0 +1,54 @@
+import threading
+import unittest
+from src.utils.llm_utils import ProviderRegistry
+
+class Client:
+    created = 0
+
+    def __init__(self):
+        Client.created += 1
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+class ProviderRegistryTest(unittest.TestCase):
+    def setUp(self):
+        Client.created = 0
+        self.registry = ProviderRegistry()
+        self.registry.register("stub", Client)
+
+    def test_threads_share_one_client(self):
+        clients = []
+        threads = [threading.Thread(target=lambda: clients.append(self.registry.get_client("stub"))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(Client.created, 1)
+        self.assertTrue(all(client is clients[0] for client in clients))
+
+    def test_rejects_unknown_providers(self):
+        with self.assertRaisesRegex(ValueError, "Unsupported LLM provider: other"):
+            self.registry.get_client("other")
+
+    def test_registering_again_replaces_the_client(self):
+        first = self.registry.get_client("stub")
+        self.registry.register("stub", Client)
+        self.assertIsNot(self.registry.get_client("stub"), first)
+
+    def test_close_closes_every_client(self):
+        client = self.registry.get_client("stub")
+        self.registry.close()
+        self.assertTrue(client.closed)
+        self.assertIsNot(self.registry.get_client("stub"), client)
+
+    def test_forked_child_drops_the_parent_clients_without_closing_them(self):
+        client = self.registry.get_client("stub")
+        # As seen from a forked child, whose PID differs from the registry's
+        self.registry._pid = -1
+        self.assertIsNot(self.registry.get_client("stub"), client)
+        self.assertFalse(client.closed)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,157 @@
+import os
+import json
+import time
+import tempfile
+import threading
+import unittest
+from email.utils import formatdate
+from types import SimpleNamespace
+from src.utils.deadline_utils import Deadline, RunCancelled, use_deadline
+from src.utils.rate_limit_utils import (
+    AdaptiveConcurrencyLimiter,
+    RequestThrottle,
+    TokenBucketLimiter,
+    get_retry_after,
+    is_retryable_error,
+    retry_with_backoff
+)
+
+class APIError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(headers=headers or {})
+
+def failing(*errors):
+    """A function raising the given errors in turn, then returning "ok"; calls are counted in .calls."""
+    def func():
+        func.calls += 1
+        if func.calls <= len(errors):
+            raise errors[func.calls - 1]
+        return "ok"
+    func.calls = 0
+    return func
+
+class TokenBucketTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.state_path = os.path.join(self.tmp.name, "limiter.json")
+
+    def bucket(self):
+        return TokenBucketLimiter(requests_per_minute=60, tokens_per_minute=6000, state_path=self.state_path)
+
+    def levels(self):
+        with open(self.state_path) as f:
+            state = json.load(f)
+        return state["requests"]["level"], state["tokens"]["level"]
+
+    def test_limiters_sharing_a_state_file_share_one_budget(self):
+        self.bucket().acquire(2000)
+        self.bucket().acquire(2000)
+        requests, tokens = self.levels()
+        self.assertAlmostEqual(requests, 58, delta=0.5)
+        self.assertAlmostEqual(tokens, 2000, delta=50)
+
+    def test_refund_and_reconcile_correct_the_charge(self):
+        bucket = self.bucket()
+        bucket.acquire(2000)
+        bucket.reconcile(2000, 500)
+        self.assertAlmostEqual(self.levels()[1], 5500, delta=50)
+        bucket.acquire(1000)
+        bucket.refund(1000)
+        requests, tokens = self.levels()
+        self.assertAlmostEqual(requests, 59, delta=0.5)
+        self.assertAlmostEqual(tokens, 5500, delta=50)
+
+    def test_gives_up_when_the_wait_would_pass_the_deadline(self):
+        bucket = TokenBucketLimiter(requests_per_minute=1)
+        bucket.acquire()
+        with self.assertRaises(TimeoutError):
+            bucket.acquire(deadline=time.time() + 1)
+
+class RetryTest(unittest.TestCase):
+    def test_reads_retry_after_in_every_format(self):
+        self.assertEqual(get_retry_after(APIError(429, {"retry-after-ms": "1500"})), 1.5)
+        self.assertEqual(get_retry_after(APIError(429, {"retry-after": "7"})), 7.0)
+        self.assertAlmostEqual(get_retry_after(APIError(429, {"retry-after": formatdate(time.time() + 30, usegmt=True)})), 30, delta=2)
+        self.assertIsNone(get_retry_after(APIError(429)))
+
+    def test_retries_only_transient_errors(self):
+        self.assertTrue(is_retryable_error(APIError(429)))
+        self.assertTrue(is_retryable_error(APIError(503)))
+        self.assertTrue(is_retryable_error(TimeoutError()))
+        self.assertFalse(is_retryable_error(APIError(400)))
+        self.assertFalse(is_retryable_error(RunCancelled()))
+
+        func = failing(APIError(400))
+        with self.assertRaises(APIError):
+            retry_with_backoff(func, base_delay=0)
+        self.assertEqual(func.calls, 1)
+
+    def test_honors_retry_after_as_the_minimum_delay(self):
+        delays = []
+        func = failing(APIError(429, {"retry-after": "0.2"}), APIError(503))
+        start_time = time.time()
+        self.assertEqual(retry_with_backoff(func, base_delay=0.01, on_retry=lambda e, attempt, delay: delays.append(delay)), "ok")
+        self.assertEqual(func.calls, 3)
+        self.assertGreaterEqual(delays[0], 0.2)
+        self.assertGreaterEqual(time.time() - start_time, 0.2)
+
+    def test_gives_up_when_retries_run_out_or_would_pass_the_deadline(self):
+        with self.assertRaises(APIError):
+            retry_with_backoff(failing(*[APIError(503)] * 3), max_retries=2, base_delay=0)
+        func = failing(APIError(429, {"retry-after": "10"}))
+        with self.assertRaises(APIError):
+            retry_with_backoff(func, deadline=time.time() + 1)
+        self.assertEqual(func.calls, 1)
+
+    def test_backoff_stops_when_the_run_is_cancelled(self):
+        deadline = Deadline()
+        threading.Timer(0.1, deadline.cancel).start()
+        start_time = time.time()
+        with use_deadline(deadline), self.assertRaises(RunCancelled):
+            retry_with_backoff(failing(APIError(429, {"retry-after": "30"})))
+        self.assertLess(time.time() - start_time, 1.0)
+
+class RequestThrottleTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.state_path = os.path.join(tmp.name, "limiter.json")
+        self.throttle = RequestThrottle(
+            TokenBucketLimiter(requests_per_minute=60, tokens_per_minute=6000, state_path=self.state_path),
+            AdaptiveConcurrencyLimiter(initial_limit=1, max_limit=1)
+        )
+
+    def levels(self):
+        with open(self.state_path) as f:
+            state = json.load(f)
+        return state["requests"]["level"], state["tokens"]["level"]
+
+    def test_request_that_never_gets_a_slot_is_refunded(self):
+        with self.throttle.request(1000):
+            with self.assertRaises(TimeoutError):
+                with self.throttle.request(3000, deadline=time.time() + 0.1):
+                    self.fail("the request should not have been sent")
+        requests, tokens = self.levels()
+        self.assertAlmostEqual(requests, 59, delta=0.5)
+        self.assertAlmostEqual(tokens, 5000, delta=50)
+
+    def test_waiting_for_a_slot_stops_when_the_run_is_cancelled(self):
+        deadline = Deadline()
+        threading.Timer(0.1, deadline.cancel).start()
+        with self.throttle.request(1000):
+            with use_deadline(deadline), self.assertRaises(RunCancelled):
+                with self.throttle.request(1000):
+                    self.fail("the request should not have been sent")
+        self.assertAlmostEqual(self.levels()[1], 5000, delta=50)
+
+    def test_actual_usage_corrects_the_estimate(self):
+        with self.throttle.request(3000) as usage:
+            usage["total_tokens"] = 100
+        self.assertAlmostEqual(self.levels()[1], 5900, delta=50)
+        self.assertEqual(self.throttle.concurrency.in_flight, 0)
+
+if __name__ == "__main__":
+    unittest.main()
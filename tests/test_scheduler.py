@@ -0,0 +1,110 @@
+import os
+import time
+import threading
+import unittest
+from unittest import mock
+from src.models.data_models import ProcessingEdge, ProcessingGraph, ProcessingNode
+from src.utils.graph_utils import execute_graph, get_max_parallelism, topological_order
+from tests.helpers import build_plan
+
+class Tracker:
+    """Records which processors ran and how many ran at once."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.running = 0
+        self.peak = 0
+        self.ran = []
+
+    def work(self, name, seconds=0.2):
+        with self.lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+            self.ran.append(name)
+        time.sleep(seconds)
+        with self.lock:
+            self.running -= 1
+
+def diamond_plan(tracker, fail_branch=False):
+    """start -> left, right -> join, where join combines both branches' outputs."""
+    def start(artifacts_dir=None):
+        tracker.work("start", 0)
+        return {"notes": "notes"}
+
+    def left(notes, artifacts_dir=None):
+        tracker.work("left")
+        return {"left": f"left({notes})"}
+
+    def right(notes, artifacts_dir=None):
+        tracker.work("right")
+        if fail_branch:
+            raise RuntimeError("right failed")
+        return {"right": f"right({notes})"}
+
+    def join(left, right, artifacts_dir=None):
+        tracker.work("join", 0)
+        return {"joined": f"{left}+{right}"}
+
+    nodes = [
+        ProcessingNode(id="start", name="Start", processor_function="start", output_artifacts=["notes"]),
+        ProcessingNode(id="left", name="Left", processor_function="left", input_artifacts=["notes"], output_artifacts=["left"]),
+        ProcessingNode(id="right", name="Right", processor_function="right", input_artifacts=["notes"], output_artifacts=["right"]),
+        ProcessingNode(id="join", name="Join", processor_function="join", input_artifacts=["left", "right"], output_artifacts=["joined"])
+    ]
+    edges = [ProcessingEdge("start", "left"), ProcessingEdge("start", "right"),
+             ProcessingEdge("left", "join"), ProcessingEdge("right", "join")]
+    return build_plan(nodes, edges, {"start": start, "left": left, "right": right, "join": join})
+
+class SchedulerTest(unittest.TestCase):
+    def test_runs_independent_branches_concurrently(self):
+        tracker = Tracker()
+        context = execute_graph(diamond_plan(tracker), {}, max_parallelism=2)
+        self.assertEqual(context["joined"], "left(notes)+right(notes)")
+        self.assertEqual(tracker.peak, 2)
+        self.assertEqual(tracker.ran[0], "start")
+        self.assertEqual(tracker.ran[-1], "join")
+
+    def test_max_parallelism_bounds_running_nodes(self):
+        tracker = Tracker()
+        execute_graph(diamond_plan(tracker), {}, max_parallelism=1)
+        self.assertEqual(tracker.peak, 1)
+
+    def test_failed_node_stops_its_dependents(self):
+        tracker = Tracker()
+        with self.assertRaisesRegex(RuntimeError, "right failed"):
+            execute_graph(diamond_plan(tracker, fail_branch=True), {}, max_parallelism=2)
+        # The sibling already running finishes; the node depending on the failure never starts
+        self.assertIn("left", tracker.ran)
+        self.assertNotIn("join", tracker.ran)
+
+    def test_missing_processor_input_fails_before_running(self):
+        tracker = Tracker()
+        plan = diamond_plan(tracker)
+        with self.assertRaisesRegex(ValueError, "Missing processor inputs"):
+            execute_graph(build_plan([plan.nodes["join"].node], [], {"join": plan.nodes["join"].processor}), {})
+        self.assertEqual(tracker.ran, [])
+
+    @mock.patch.dict(os.environ, {"NOTEGOLD_GRAPH_PARALLELISM": "7"})
+    def test_max_parallelism_defaults_to_environment(self):
+        self.assertEqual(get_max_parallelism(), 7)
+        self.assertEqual(get_max_parallelism(0), 1)
+
+class TopologicalOrderTest(unittest.TestCase):
+    def graph(self, node_ids, edges):
+        return ProcessingGraph(nodes=[ProcessingNode(id=node_id, name=node_id) for node_id in node_ids],
+                               edges=[ProcessingEdge(source, target) for source, target in edges])
+
+    def test_orders_dependencies_first_keeping_graph_order(self):
+        graph = self.graph(["c", "a", "b", "d"], [("a", "b"), ("b", "d"), ("c", "d")])
+        self.assertEqual(topological_order(graph), ["c", "a", "b", "d"])
+
+    def test_rejects_invalid_graphs(self):
+        for graph, message in ((self.graph(["a", "a"], []), "Duplicate node IDs"),
+                               (self.graph(["a"], [("a", "b")]), "unknown node"),
+                               (self.graph(["a", "b", "c"], [("a", "b"), ("b", "c"), ("c", "b")]), "cycle")):
+            with self.subTest(message=message):
+                with self.assertRaisesRegex(ValueError, message):
+                    topological_order(graph)
+
+if __name__ == "__main__":
+    unittest.main()
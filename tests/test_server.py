@@ -0,0 +1,125 @@
+import os
+import json
+import http.client
+import time
+import tempfile
+import threading
+import unittest
+import urllib.error
+import urllib.request
+from unittest import mock
+from src.models.data_models import ProcessingNode
+from src.utils.server_utils import JobQueue, JobServer, MAX_JOBS_LIMIT, create_job_server
+from tests.helpers import build_plan
+
+def summarize(meeting_notes_path, artifacts_dir):
+    path = os.path.join(artifacts_dir, "summary.txt")
+    with open(meeting_notes_path) as f, open(path, "w") as out:
+        out.write(f.read().upper())
+    return {"summary_path": path}
+
+class JobQueueTest(unittest.TestCase):
+    def setUp(self):
+        self.db_path = os.path.join(tempfile.mkdtemp(), "jobs.db")
+        self.queue = JobQueue(self.db_path)
+
+    def tearDown(self):
+        self.queue.close()
+
+    def test_claims_oldest_job_and_records_outcome(self):
+        first = self.queue.submit("meeting_a", "a.txt")
+        self.queue.submit("meeting_b", "b.txt")
+        claimed = self.queue.claim()
+        self.assertEqual((claimed["id"], claimed["status"]), (first["id"], "running"))
+        self.queue.finish(first["id"], "boom")
+        self.assertEqual(self.queue.get(first["id"])["status"], "failed")
+        self.assertEqual(self.queue.counts()["queued"], 1)
+
+    def test_does_not_run_two_jobs_of_one_meeting_at_once(self):
+        self.queue.submit("meeting_a", "a1.txt")
+        self.queue.submit("meeting_a", "a2.txt")
+        self.assertIsNotNone(self.queue.claim())
+        self.assertIsNone(self.queue.claim())
+
+    def test_requeues_running_jobs_when_reopened(self):
+        job = self.queue.submit("meeting_a", "a.txt")
+        self.queue.claim()
+        self.queue.close()
+        self.queue = JobQueue(self.db_path)
+        self.assertEqual(self.queue.get(job["id"])["status"], "queued")
+
+    def test_lists_newest_first_with_limit(self):
+        ids = [self.queue.submit(f"meeting_{i}", f"{i}.txt")["id"] for i in range(3)]
+        self.assertEqual([job["id"] for job in self.queue.list(limit=2)], ids[:0:-1])
+        self.assertEqual(self.queue.list(status="running"), [])
+
+class JobServerTest(unittest.TestCase):
+    def setUp(self):
+        # The server creates its LLM client up front
+        environment = mock.patch.dict(os.environ, {"LLM_PROVIDER": "fake"})
+        environment.start()
+        self.addCleanup(environment.stop)
+        node = ProcessingNode(id="summarize", name="Summarize", processor_function="summarize",
+                              input_artifacts=["meeting_notes_path"], output_artifacts=["summary_path"])
+        self.job_server = JobServer(build_plan([node], [], {"summarize": summarize}), tempfile.mkdtemp(), max_parallelism=2)
+        self.server = create_job_server(self.job_server, port=0)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = "http://127.0.0.1:%d" % self.server.server_address[1]
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.job_server.close()
+
+    def request(self, path, data=None):
+        try:
+            with urllib.request.urlopen(urllib.request.Request(self.url + path, data=data)) as response:
+                return response.status, json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            return e.code, json.loads(e.read())
+
+    def test_processes_submitted_notes(self):
+        status, job = self.request("/jobs?meeting_id=acme", b"hello")
+        self.assertEqual(status, 202)
+        for _ in range(100):
+            if self.request(f"/jobs/{job['id']}")[1]["status"] == "succeeded":
+                break
+            time.sleep(0.05)
+        self.assertEqual(self.request(f"/jobs/{job['id']}/artifacts")[1]["files"], ["artifacts/summary.txt"])
+        self.assertEqual(self.request(f"/jobs/{job['id']}/artifacts/../../../server/jobs.db")[0], 404)
+
+    def test_rejects_invalid_submissions(self):
+        self.assertEqual(self.request("/jobs?meeting_id=../etc", b"hello")[0], 400)
+        self.assertEqual(self.request("/jobs", b"  ")[0], 400)
+
+    def test_rejects_malformed_bodies(self):
+        def post(body, content_type="application/json", content_length=None):
+            connection = http.client.HTTPConnection("127.0.0.1", self.server.server_address[1], timeout=5)
+            self.addCleanup(connection.close)
+            connection.putrequest("POST", "/jobs")
+            connection.putheader("Content-Type", content_type)
+            connection.putheader("Content-Length", str(len(body) if content_length is None else content_length))
+            connection.endheaders(body)
+            response = connection.getresponse()
+            return response.status, json.loads(response.read())
+
+        self.assertEqual(post(b"[]"), (400, {"error": "Expected a JSON object"}))
+        self.assertEqual(post(b'{"notes": ["hello"]}')[0], 400)
+        self.assertEqual(post(b'{"notes": "hello", "meeting_id": 7}')[0], 400)
+        self.assertEqual(post(b"\xff\xfe", content_type="text/plain")[0], 400)
+        self.assertEqual(post(b"hello", content_type="text/plain", content_length=-1)[0], 400)
+        self.assertEqual(post(b"hello", content_type="text/plain", content_length="five")[0], 400)
+        self.assertEqual(self.request("/jobs")[1]["jobs"], [])
+
+    def test_validates_and_clamps_list_limit(self):
+        for _ in range(3):
+            self.request("/jobs", b"hello")
+        self.assertEqual(self.request("/jobs?limit=abc"), (400, {"error": "Invalid limit: 'abc'"}))
+        self.assertEqual(len(self.request("/jobs?limit=-1")[1]["jobs"]), 1)
+        self.assertEqual(len(self.request("/jobs?limit=2")[1]["jobs"]), 2)
+        with mock.patch.object(self.job_server.queue, "list", wraps=self.job_server.queue.list) as list_jobs:
+            self.request("/jobs?limit=99999999999999999999")
+        list_jobs.assert_called_once_with(None, MAX_JOBS_LIMIT)
+
+if __name__ == "__main__":
+    unittest.main()
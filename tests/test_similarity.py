@@ -0,0 +1,137 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from src.processors.aida_formatter import format_topic
+from src.utils.file_utils import save_json
+from src.utils.memo_utils import NodeRunStore
+from src.utils.similarity_utils import TopicIndex, find_duplicate_topic, get_dedup_settings, get_topic_index, update_topic_index
+from tests.helpers import use_fake_llm
+
+ONBOARDING = {
+    "title": "Faster customer onboarding with automated checklists",
+    "description": "How automated checklists cut onboarding time for new customers",
+    "pain_point": "Onboarding new customers takes weeks of manual follow-up",
+    "value_proposition": "Customers reach their first result in days"
+}
+
+PRICING = {
+    "title": "Pricing experiments for enterprise plans",
+    "description": "Running pricing tests without upsetting existing accounts",
+    "pain_point": "Enterprise discounts are set by gut feel",
+    "value_proposition": "Higher margins on large deals"
+}
+
+def add_meeting(meetings_dir, meeting_id, topics, with_posts=True):
+    """Write a processed meeting's AIDA content (and social posts) for the given topics."""
+    artifacts_dir = os.path.join(meetings_dir, meeting_id, "artifacts")
+    os.makedirs(os.path.join(meetings_dir, meeting_id, "outputs"), exist_ok=True)
+    save_json([{"topic": topic, "attention": f"Attention for {topic['title']}", "interest": "", "desire": "",
+                "action": "", "full_content": f"Content from {meeting_id}"} for topic in topics],
+              os.path.join(artifacts_dir, "aida_content.json"))
+    if with_posts:
+        save_json([{"topic_title": topic["title"], "platform": "LinkedIn", "approach": "outcome",
+                    "content": f"Post from {meeting_id}", "estimated_time": 5} for topic in topics],
+                  os.path.join(artifacts_dir, "social_posts.json"))
+    return os.path.join(meetings_dir, meeting_id)
+
+class DedupSettingsTest(unittest.TestCase):
+    @mock.patch.dict(os.environ, {}, clear=True)
+    def test_defaults_to_linking(self):
+        self.assertEqual(get_dedup_settings(), ("link", 0.85))
+
+    @mock.patch.dict(os.environ, {"NOTEGOLD_TOPIC_DEDUP": "reuse", "NOTEGOLD_TOPIC_DEDUP_THRESHOLD": "0.9"})
+    def test_reads_environment(self):
+        self.assertEqual(get_dedup_settings(), ("reuse", 0.9))
+        self.assertEqual(get_dedup_settings("off", 0.5), ("off", 0.5))
+
+    def test_rejects_invalid_settings(self):
+        with self.assertRaises(ValueError):
+            get_dedup_settings("copy")
+        with self.assertRaises(ValueError):
+            get_dedup_settings("link", 1.5)
+
+class TopicIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.meetings_dir = tempfile.mkdtemp()
+        add_meeting(self.meetings_dir, "meeting_a", [ONBOARDING, PRICING])
+
+    def test_finds_identical_topic(self):
+        duplicate = TopicIndex(self.meetings_dir).find_duplicate(ONBOARDING, 0.85, exclude_meeting="meeting_b")
+        self.assertEqual(duplicate, {"meeting_id": "meeting_a", "title": ONBOARDING["title"], "index": 0, "similarity": 1.0})
+
+    def test_ignores_own_meeting_and_dissimilar_topics(self):
+        index = TopicIndex(self.meetings_dir)
+        self.assertIsNone(index.find_duplicate(ONBOARDING, 0.85, exclude_meeting="meeting_a"))
+        unrelated = {"title": "Hiring backend engineers", "description": "Interview loops for platform teams"}
+        self.assertIsNone(index.find_duplicate(unrelated, 0.85))
+
+    def test_index_is_persisted_and_refreshed(self):
+        TopicIndex(self.meetings_dir).refresh()
+        self.assertTrue(os.path.exists(os.path.join(self.meetings_dir, "topic_index.json")))
+        index = TopicIndex(self.meetings_dir)
+        self.assertFalse(index.refresh())
+        add_meeting(self.meetings_dir, "meeting_c", [PRICING])
+        self.assertTrue(index.refresh())
+
+    def test_only_the_first_lookup_scans_the_meetings(self):
+        index = TopicIndex(self.meetings_dir)
+        with mock.patch("src.utils.similarity_utils.os.scandir", wraps=os.scandir) as scandir:
+            for _ in range(3):
+                index.find_duplicate(ONBOARDING, 0.85, exclude_meeting="meeting_b")
+        self.assertEqual(scandir.call_count, 1)
+
+    def test_finished_meetings_are_indexed_one_by_one(self):
+        index = get_topic_index(self.meetings_dir)
+        self.assertIsNone(index.find_duplicate(PRICING, 0.85, exclude_meeting="meeting_a"))
+        meeting_c = add_meeting(self.meetings_dir, "meeting_c", [PRICING])
+        self.assertIsNone(index.find_duplicate(PRICING, 0.85, exclude_meeting="meeting_a"))
+
+        with mock.patch("src.utils.similarity_utils.os.scandir", wraps=os.scandir) as scandir:
+            self.assertTrue(update_topic_index(meeting_c))
+            self.assertFalse(update_topic_index(meeting_c))
+        scandir.assert_not_called()
+        self.assertEqual(index.find_duplicate(PRICING, 0.85, exclude_meeting="meeting_a")["meeting_id"], "meeting_c")
+
+        shutil.rmtree(meeting_c)
+        self.assertTrue(update_topic_index(meeting_c))
+        self.assertIsNone(index.find_duplicate(PRICING, 0.85, exclude_meeting="meeting_a"))
+
+    def test_off_mode_finds_nothing(self):
+        outputs_dir = os.path.join(self.meetings_dir, "meeting_b", "outputs")
+        self.assertIsNone(find_duplicate_topic(ONBOARDING, outputs_dir, "off"))
+        self.assertEqual(find_duplicate_topic(ONBOARDING, outputs_dir, "link")["mode"], "link")
+
+class ReuseTest(unittest.TestCase):
+    def setUp(self):
+        self.meetings_dir = tempfile.mkdtemp()
+        self.source_dir = add_meeting(self.meetings_dir, "meeting_a", [ONBOARDING])
+        self.outputs_dir = os.path.join(self.meetings_dir, "meeting_b", "outputs")
+        os.makedirs(self.outputs_dir)
+
+    def test_reuse_copies_content_and_lists_its_source(self):
+        result = format_topic(ONBOARDING, self.outputs_dir, dedup="reuse")
+        self.assertEqual(result["aida_content"]["full_content"], "Content from meeting_a")
+        self.assertEqual(result["aida_content"]["duplicate_of"]["meeting_id"], "meeting_a")
+        self.assertIn(os.path.join(self.source_dir, "artifacts", "aida_content.json"), result["dependency_paths"])
+
+    def test_linked_content_does_not_depend_on_its_source(self):
+        use_fake_llm(self)
+        result = format_topic(ONBOARDING, self.outputs_dir, dedup="link")
+        self.assertEqual(result["aida_content"]["duplicate_of"]["meeting_id"], "meeting_a")
+        self.assertNotEqual(result["aida_content"]["full_content"], "Content from meeting_a")
+        self.assertEqual(result["dependency_paths"], [])
+
+    def test_recorded_run_is_stale_once_its_source_changes(self):
+        result = format_topic(ONBOARDING, self.outputs_dir, dedup="reuse")
+        store = NodeRunStore(os.path.join(self.meetings_dir, "meeting_b", "node_runs.json"))
+        store.record("apply_aida", "fingerprint", result)
+        self.assertIsNotNone(store.lookup("apply_aida", "fingerprint"))
+
+        add_meeting(self.meetings_dir, "meeting_a", [ONBOARDING, PRICING])
+        self.assertIsNone(store.lookup("apply_aida", "fingerprint"))
+        self.assertEqual(store.describe("apply_aida", "fingerprint"), "files it depends on changed")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,29 @@
+import os
+import unittest
+from src.utils.startup_utils import check_import_budget, measure_import_time
+
+# Shared CI machines are slower and noisier than a laptop, so the test allows more than the 50ms default
+CI_IMPORT_BUDGET_MS = 200.0
+
+class StartupTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.measurement = measure_import_time("src.main", runs=3)
+
+    def test_cli_import_defers_heavy_modules(self):
+        self.assertEqual(check_import_budget(self.measurement, budget_ms=float("inf")), [])
+
+    def test_cli_import_within_budget(self):
+        budget_ms = float(os.environ.get("NOTEGOLD_IMPORT_BUDGET_MS", CI_IMPORT_BUDGET_MS))
+        self.assertEqual(check_import_budget(self.measurement, budget_ms=budget_ms, deferred=()), [])
+
+    def test_reports_deferred_imports_and_overruns(self):
+        measurement = {"module": "src.main", "total_ms": 80.0, "modules": ["src.main", "asyncio.events"],
+                       "slowest_ms": {"asyncio.events": 30.0}}
+        problems = check_import_budget(measurement, budget_ms=50)
+        self.assertEqual(len(problems), 2)
+        self.assertIn("over the 50ms budget", problems[0])
+        self.assertIn("imports asyncio.events", problems[1])
+
+if __name__ == "__main__":
+    unittest.main()
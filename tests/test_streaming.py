@@ -0,0 +1,37 @@
+import os
+import tempfile
+import unittest
+from src.utils.llm_utils import chat_completion, stream_chat_completion, stream_completion_to_file
+from tests.helpers import use_fake_llm
+
+class StreamCompletionTest(unittest.TestCase):
+    def setUp(self):
+        use_fake_llm(self, tokens_per_second=2000)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_streams_the_same_text_as_a_plain_completion(self):
+        chunks = list(stream_chat_completion("Describe the meeting", model="fake"))
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual("".join(chunks), chat_completion("Describe the meeting", model="fake"))
+
+    def test_file_grows_as_chunks_arrive(self):
+        path = os.path.join(self.tmp.name, "post.md")
+        seen = []
+
+        def on_chunk(chunk):
+            with open(path) as f:
+                seen.append(f.read())
+
+        text, timings = stream_completion_to_file("Describe the meeting", "", path, header="# Post\n\n",
+                                                  on_chunk=on_chunk, model="fake")
+        with open(path) as f:
+            self.assertEqual(f.read(), "# Post\n\n" + text)
+        # Each chunk is on disk before the next one arrives
+        self.assertEqual(seen[0], "# Post\n\n")
+        self.assertTrue(all(len(before) < len(after) for before, after in zip(seen, seen[1:])))
+        self.assertEqual(timings["output_path"], path)
+        self.assertLessEqual(timings["ttfb_ms"], timings["total_ms"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import os
+import unittest
+from dataclasses import dataclass
+from typing import List, Optional
+from unittest import mock
+from src.utils.json_utils import IncrementalJSONExtractor
+from src.utils.llm_utils import parse_json_response, structured_output_format
+from src.utils.schema_utils import coerce_to_schema, dataclass_json_schema, list_json_schema, validate_json
+
+@dataclass
+class Topic:
+    title: str
+    score: int
+    tags: List[str]
+    summary: Optional[str] = None
+
+TOPIC_SCHEMA = dataclass_json_schema(Topic)
+TOPICS_SCHEMA = list_json_schema(TOPIC_SCHEMA, "topics")
+
+class SchemaTest(unittest.TestCase):
+    def test_dataclass_schema_is_strict(self):
+        self.assertEqual(TOPIC_SCHEMA, {
+            "type": "object",
+            "properties": {
+                "title": {"type": "string"},
+                "score": {"type": "integer"},
+                "tags": {"type": "array", "items": {"type": "string"}},
+                "summary": {"type": "string"}
+            },
+            "required": ["title", "score", "tags", "summary"],
+            "additionalProperties": False
+        })
+        self.assertNotIn("score", dataclass_json_schema(Topic, exclude=("score",))["properties"])
+
+    def test_validation_reports_every_problem_with_its_path(self):
+        topic = {"title": "Pricing", "score": 8, "tags": ["sales"], "summary": "Raise prices"}
+        self.assertEqual(validate_json({"topics": [topic]}, TOPICS_SCHEMA), [])
+        self.assertEqual(validate_json({"topics": [dict(topic, score=True, tags=[1])]}, TOPICS_SCHEMA),
+                         ["$.topics[0].score: expected integer", "$.topics[0].tags[0]: expected string"])
+        self.assertEqual(validate_json({"topics": [{"title": "Pricing"}]}, TOPICS_SCHEMA)[:2],
+                         ["$.topics[0].score: missing", "$.topics[0].tags: missing"])
+
+    def test_lists_are_wrapped_in_the_object_the_schema_expects(self):
+        self.assertEqual(coerce_to_schema([1], TOPICS_SCHEMA), {"topics": [1]})
+        self.assertEqual(coerce_to_schema({"items": [1]}, TOPICS_SCHEMA), {"topics": [1]})
+        self.assertEqual(coerce_to_schema({"error": "x", "raw": []}, TOPICS_SCHEMA), {"error": "x", "raw": []})
+        self.assertEqual(coerce_to_schema({"title": "x"}, TOPIC_SCHEMA), {"title": "x"})
+
+    def test_response_format_follows_model_support(self):
+        with mock.patch.dict(os.environ, {"LLM_PROVIDER": "openai", "NOTEGOLD_STRUCTURED_OUTPUT": "1"}):
+            self.assertEqual(structured_output_format("topics", TOPICS_SCHEMA, "gpt-4o-mini")["type"], "json_schema")
+            self.assertEqual(structured_output_format("topics", TOPICS_SCHEMA, "gpt-3.5-turbo"), {"type": "json_object"})
+            self.assertIsNone(structured_output_format("topics", TOPICS_SCHEMA, "gpt-4"))
+        with mock.patch.dict(os.environ, {"LLM_PROVIDER": "openai", "NOTEGOLD_STRUCTURED_OUTPUT": "0"}):
+            self.assertIsNone(structured_output_format("topics", TOPICS_SCHEMA, "gpt-4o"))
+
+class ParseJSONTest(unittest.TestCase):
+    def test_extracts_values_across_chunk_boundaries(self):
+        extractor = IncrementalJSONExtractor()
+        completed = []
+        for chunk in ['Here you go:\n```json\n{"a": "x}', '", "b": [1, ', '2]}\n```', ' and [3]']:
+            completed.extend(extractor.feed(chunk))
+        extractor.close()
+        self.assertEqual(completed, [{"a": "x}", "b": [1, 2]}, [3]])
+        self.assertEqual(extractor.best_value(), {"a": "x}", "b": [1, 2]})
+
+    def test_parses_without_calling_the_llm(self):
+        with mock.patch("src.utils.llm_utils.chat_completion") as chat_completion:
+            self.assertEqual(parse_json_response('```json\n[{"title": "Pricing"}]\n```'), [{"title": "Pricing"}])
+        chat_completion.assert_not_called()
+
+    def test_repairs_only_the_invalid_fragment(self):
+        response = 'Topics below.\n{"topics": [{"title": "Pricing",}]}\nThanks!'
+        with mock.patch("src.utils.llm_utils.chat_completion", return_value='{"topics": [{"title": "Pricing"}]}') as chat_completion:
+            self.assertEqual(parse_json_response(response, TOPICS_SCHEMA), {"topics": [{"title": "Pricing"}]})
+        prompt = chat_completion.call_args.args[0]
+        self.assertIn('{"topics": [{"title": "Pricing",}]}', prompt)
+        self.assertNotIn("Topics below", prompt)
+        self.assertNotIn("Thanks", prompt)
+
+    def test_reports_an_error_when_repair_fails_or_is_disabled(self):
+        response = '{"title": "Pricing",}'
+        with mock.patch("src.utils.llm_utils.chat_completion", return_value="Sorry, I can't.") as chat_completion:
+            self.assertEqual(parse_json_response(response)["error"], "Could not extract JSON from response")
+            parse_json_response(response, repair=False)
+        self.assertEqual(chat_completion.call_count, 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+import os
+import tempfile
+import threading
+import unittest
+from collections import Counter
+from src.models.data_models import ProcessingEdge, ProcessingGraph, ProcessingNode
+from src.utils.graph_utils import execute_graph, plan_graph, resolve_input_artifacts, select_subgraph
+from tests.helpers import build_plan
+
+calls = Counter()
+calls_lock = threading.Lock()
+
+def transform(name, input_path, artifacts_dir, filename):
+    with calls_lock:
+        calls[name] += 1
+    with open(input_path) as f:
+        text = f.read()
+    output_path = os.path.join(artifacts_dir, filename)
+    with open(output_path, "w") as f:
+        f.write(f"{name}({text})")
+    return output_path
+
+def find_topics(transcript_path, artifacts_dir):
+    return {"topics_path": transform("topics", transcript_path, artifacts_dir, "topic_ideas.json")}
+
+def rank_topics(topics_path, artifacts_dir):
+    return {"ranked_topics_path": transform("rank", topics_path, artifacts_dir, "ranked_topics.json")}
+
+def write_report(ranked_topics_path, artifacts_dir):
+    return {"report_path": transform("report", ranked_topics_path, artifacts_dir, "report.txt")}
+
+def write_digest(topics_path, artifacts_dir):
+    return {"digest_path": transform("digest", topics_path, artifacts_dir, "digest.txt")}
+
+NODES = [
+    ProcessingNode(id="topics", name="Topics", processor_function="topics", input_artifacts=["transcript_path"], output_artifacts=["topics_path"]),
+    ProcessingNode(id="rank", name="Rank", processor_function="rank", input_artifacts=["topics_path"], output_artifacts=["ranked_topics_path"]),
+    ProcessingNode(id="report", name="Report", processor_function="report", input_artifacts=["ranked_topics_path"], output_artifacts=["report_path"]),
+    ProcessingNode(id="digest", name="Digest", processor_function="digest", input_artifacts=["topics_path"], output_artifacts=["digest_path"])
+]
+EDGES = [ProcessingEdge("topics", "rank"), ProcessingEdge("rank", "report"), ProcessingEdge("topics", "digest")]
+
+def subgraph_plan():
+    return build_plan(NODES, EDGES, {"topics": find_topics, "rank": rank_topics, "report": write_report, "digest": write_digest})
+
+class SelectSubgraphTest(unittest.TestCase):
+    graph = ProcessingGraph(nodes=NODES, edges=EDGES, name="subgraph")
+
+    def selected(self, **selection):
+        subgraph = select_subgraph(self.graph, **selection)
+        return [node.id for node in subgraph.nodes], [(edge.source_node_id, edge.target_node_id) for edge in subgraph.edges]
+
+    def test_without_selection_keeps_the_graph(self):
+        self.assertIs(select_subgraph(self.graph), self.graph)
+
+    def test_from_node_keeps_it_and_everything_downstream(self):
+        self.assertEqual(self.selected(from_node="rank"), (["rank", "report"], [("rank", "report")]))
+
+    def test_until_node_keeps_it_and_everything_upstream(self):
+        self.assertEqual(self.selected(until_node="rank"), (["topics", "rank"], [("topics", "rank")]))
+
+    def test_selections_combine(self):
+        self.assertEqual(self.selected(from_node="topics", until_node="report")[0], ["topics", "rank", "report"])
+        self.assertEqual(self.selected(from_node="topics", only=["digest", "report"])[0], ["report", "digest"])
+
+    def test_rejects_unknown_or_empty_selections(self):
+        with self.assertRaisesRegex(ValueError, "Unknown node IDs"):
+            select_subgraph(self.graph, only=["publish"])
+        with self.assertRaisesRegex(ValueError, "No nodes match"):
+            select_subgraph(self.graph, from_node="report", until_node="topics")
+
+class PartialRunTest(unittest.TestCase):
+    def setUp(self):
+        calls.clear()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.artifacts_dir = os.path.join(self.tmp.name, "artifacts")
+        self.metadata_dir = os.path.join(self.tmp.name, "metadata")
+        os.makedirs(self.artifacts_dir)
+        os.makedirs(self.metadata_dir)
+        self.transcript_path = os.path.join(self.tmp.name, "transcript.txt")
+        with open(self.transcript_path, "w") as f:
+            f.write("transcript")
+
+    def context(self):
+        return {"transcript_path": self.transcript_path, "artifacts_dir": self.artifacts_dir, "metadata_dir": self.metadata_dir}
+
+    def resolve(self, **selection):
+        graph = ProcessingGraph(nodes=NODES, edges=EDGES)
+        return resolve_input_artifacts(graph, select_subgraph(graph, **selection), self.context())
+
+    def test_only_runs_selected_nodes_with_recorded_inputs(self):
+        execute_graph(subgraph_plan(), self.context())
+        calls.clear()
+        context = execute_graph(subgraph_plan(), self.context(), only=["report"], force=True)
+        self.assertEqual(calls, Counter(report=1))
+        with open(context["report_path"]) as f:
+            self.assertEqual(f.read(), "report(rank(topics(transcript)))")
+
+    def test_resolves_inputs_from_run_records_then_artifact_files(self):
+        execute_graph(subgraph_plan(), self.context())
+        ranked_topics_path = os.path.join(self.artifacts_dir, "ranked_topics.json")
+        self.assertEqual(self.resolve(only=["report"]), {"ranked_topics_path": ranked_topics_path})
+
+        os.remove(os.path.join(self.metadata_dir, "node_runs.json"))
+        self.assertEqual(self.resolve(only=["report"]), {"ranked_topics_path": ranked_topics_path})
+
+        os.remove(ranked_topics_path)
+        with self.assertRaisesRegex(ValueError, "Missing artifacts for partial run"):
+            self.resolve(only=["report"])
+
+    def test_inputs_in_the_context_are_not_resolved(self):
+        self.assertEqual(self.resolve(from_node="topics"), {})
+
+    def test_plan_reports_what_would_run(self):
+        def actions(**options):
+            return {step["node_id"]: (step["action"], step["reason"]) for step in plan_graph(subgraph_plan(), self.context(), **options)}
+
+        self.assertEqual(actions()["topics"], ("run", "no previous run"))
+        execute_graph(subgraph_plan(), self.context())
+        calls.clear()
+        self.assertEqual({action for action, _ in actions().values()}, {"skip"})
+        self.assertEqual(actions(force_nodes=["rank"]), {"topics": ("skip", "up to date"), "rank": ("run", "forced"),
+                                                         "report": ("run", "upstream node will run"), "digest": ("skip", "up to date")})
+        self.assertEqual(actions(from_node="rank", force=True), {"rank": ("run", "forced"), "report": ("run", "forced")})
+
+        with open(self.transcript_path, "w") as f:
+            f.write("new transcript")
+        self.assertEqual(actions()["topics"], ("run", "inputs, parameters or code changed"))
+        self.assertEqual(calls, Counter())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+from src.utils.text_utils import chunk_transcript, count_tokens, split_speaker_turns
+
+MONOLOGUE = "Todd: " + " ".join(f"Point {i} is about the migration plan." for i in range(80)) + "\nA new line of the same turn.\n\n"
+TRANSCRIPT = "Jane: Shall we start?\n" + MONOLOGUE + "Jane: Thanks, Todd.\nTodd: Sure.\n"
+
+class ChunkTranscriptTest(unittest.TestCase):
+    def rebuild(self, chunks, text, label):
+        """Join chunks, dropping the speaker labels repeated at the start of continuation chunks."""
+        rebuilt = ""
+        for chunk in chunks:
+            if not text.startswith(chunk, len(rebuilt)):
+                self.assertTrue(chunk.startswith(label), chunk[:40])
+                chunk = chunk[len(label):]
+            rebuilt += chunk
+        return rebuilt
+
+    def test_short_transcript_is_one_chunk(self):
+        self.assertEqual(chunk_transcript("Jane: Hi.\nTodd: Hello.\n", 100), ["Jane: Hi.\nTodd: Hello.\n"])
+        self.assertEqual(chunk_transcript("  \n", 100), [])
+
+    def test_chunks_on_turn_boundaries_without_changing_the_text(self):
+        text = "".join(f"Speaker {i % 3}: Turn {i} says something short.\n" for i in range(60))
+        chunks = chunk_transcript(text, 60)
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual("".join(chunks), text)
+        for chunk in chunks:
+            self.assertTrue(chunk.startswith("Speaker "))
+            self.assertLessEqual(count_tokens(chunk), 60)
+
+    def test_long_turn_is_split_within_the_token_limit(self):
+        for max_tokens in (40, 100, 333):
+            with self.subTest(max_tokens=max_tokens):
+                chunks = chunk_transcript(TRANSCRIPT, max_tokens)
+                self.assertLessEqual(max(count_tokens(chunk) for chunk in chunks), max_tokens)
+                self.assertEqual(self.rebuild(chunks, TRANSCRIPT, "Todd: "), TRANSCRIPT)
+
+    def test_continuation_chunks_repeat_the_speaker_and_keep_line_breaks(self):
+        chunks = chunk_transcript(TRANSCRIPT, 100)
+        self.assertTrue(all(chunk.startswith(("Jane: ", "Todd: ")) for chunk in chunks))
+        self.assertTrue(any(chunk.endswith("plan.\n") or "plan.\nA new line" in chunk for chunk in chunks))
+        self.assertTrue(any("A new line of the same turn.\n\n" in chunk for chunk in chunks))
+
+    def test_sentence_longer_than_the_limit_is_cut_by_tokens(self):
+        text = "Jane: Hi.\nTodd: " + " ".join(["word"] * 400) + "\n"
+        chunks = chunk_transcript(text, 50)
+        self.assertLessEqual(max(count_tokens(chunk) for chunk in chunks), 50)
+        self.assertEqual(self.rebuild(chunks, text, "Todd: "), text)
+        # Cuts fall between words
+        self.assertTrue(all(chunk.endswith((" ", "\n")) for chunk in chunks))
+
+    def test_unlabelled_text_splits_on_paragraphs(self):
+        text = "".join(f"Paragraph {i} has a few words in it.\n\n" for i in range(30))
+        self.assertEqual(len(split_speaker_turns(text)), 31 - 1)
+        chunks = chunk_transcript(text, 40)
+        self.assertLessEqual(max(count_tokens(chunk) for chunk in chunks), 40)
+        self.assertEqual("".join(chunks).strip(), text.strip())
+
+if __name__ == "__main__":
+    unittest.main()
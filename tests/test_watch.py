@@ -0,0 +1,141 @@
+import os
+import time
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from src.models.data_models import ProcessingNode
+from src.utils import watch_utils
+from src.utils.watch_utils import WatchState, watch_directory
+from tests.helpers import build_plan
+
+processed = []
+processed_lock = threading.Lock()
+# Notes starting with "slow" are held until this is set
+release = threading.Event()
+
+def summarize(meeting_notes_path, artifacts_dir):
+    with open(meeting_notes_path) as f:
+        notes = f.read()
+    with processed_lock:
+        processed.append(notes)
+    if notes.startswith("slow"):
+        release.wait(5)
+    if "fail" in notes:
+        raise ValueError("unreadable notes")
+    return {}
+
+def wait_for(condition, timeout=5.0):
+    """Poll until condition() is true or the timeout passes, returning its last value."""
+    end = time.time() + timeout
+    while not condition() and time.time() < end:
+        time.sleep(0.02)
+    return condition()
+
+class WatchStateTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_remembers_processed_contents_across_restarts(self):
+        notes = os.path.join(self.tmp.name, "a.txt")
+        state = WatchState(self.tmp.name)
+        state.record(notes, "digest-1", "meeting_a", "success")
+        state.record(os.path.join(self.tmp.name, "b.txt"), "digest-2", "meeting_b", "error", "unreadable notes")
+
+        restarted = WatchState(self.tmp.name)
+        self.assertTrue(restarted.is_processed(notes, "digest-1"))
+        self.assertFalse(restarted.is_processed(notes, "digest-changed"))
+        self.assertFalse(restarted.is_processed(os.path.join(self.tmp.name, "b.txt"), "digest-2"))
+        self.assertEqual(restarted.owner("meeting_a"), os.path.abspath(notes))
+        self.assertIsNone(restarted.owner("meeting_c"))
+
+    def test_starts_empty_when_the_state_file_is_unreadable(self):
+        with open(os.path.join(self.tmp.name, watch_utils.WATCH_STATE_FILENAME), "w") as f:
+            f.write("{not json")
+        self.assertEqual(WatchState(self.tmp.name).files, {})
+
+class WatchDirectoryTest(unittest.TestCase):
+    def setUp(self):
+        processed.clear()
+        release.clear()
+        self.addCleanup(release.set)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.notes_dir = os.path.join(self.tmp.name, "inbox")
+        self.output_dir = os.path.join(self.tmp.name, "output")
+        os.makedirs(self.notes_dir)
+        node = ProcessingNode(id="summarize", name="Summarize", processor_function="summarize",
+                              input_artifacts=["meeting_notes_path"], output_artifacts=[])
+        self.plan = build_plan([node], [], {"summarize": summarize})
+
+    def write(self, name, text, mode="w"):
+        with open(os.path.join(self.notes_dir, name), mode) as f:
+            f.write(text)
+
+    def start_daemon(self, settle_seconds=0.2):
+        """Run the daemon on a thread, returning a function that stops it and returns its counts."""
+        deadlines = []
+        make_deadline = watch_utils.Deadline
+
+        def track(*args, **kwargs):
+            deadlines.append(make_deadline(*args, **kwargs))
+            return deadlines[-1]
+
+        result = {}
+        def run():
+            with mock.patch.object(watch_utils, "Deadline", side_effect=track):
+                result["counts"] = watch_directory(self.notes_dir, self.plan, self.output_dir, max_parallelism=2,
+                                                   settle_seconds=settle_seconds, polling=True, poll_interval=0.05)
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        self.assertTrue(wait_for(lambda: deadlines))
+
+        def stop():
+            deadlines[0].cancel()
+            thread.join(5)
+            return result["counts"]
+        return stop
+
+    def test_restart_skips_processed_files_and_retries_changed_or_failed_ones(self):
+        self.write("a.txt", "alpha")
+        self.write("b.txt", "fail")
+        stop = self.start_daemon()
+        self.assertTrue(wait_for(lambda: len(processed) == 2))
+        self.assertEqual(stop(), {"success": 1, "error": 1})
+
+        self.write("b.txt", "beta")
+        self.write("c.txt", "gamma")
+        processed.clear()
+        stop = self.start_daemon()
+        self.assertTrue(wait_for(lambda: len(processed) == 2))
+        time.sleep(0.3)
+        self.assertEqual(stop(), {"success": 2, "error": 0})
+        self.assertEqual(sorted(processed), ["beta", "gamma"])
+
+    def test_waits_for_a_file_to_settle_before_processing_it_once(self):
+        stop = self.start_daemon(settle_seconds=0.3)
+        self.write("a.txt", "first part")
+        for part in (" second part", " third part"):
+            time.sleep(0.1)
+            self.write("a.txt", part, mode="a")
+        self.assertTrue(wait_for(lambda: processed))
+        time.sleep(0.3)
+        self.assertEqual(stop(), {"success": 1, "error": 0})
+        self.assertEqual(processed, ["first part second part third part"])
+
+    def test_file_changed_while_its_meeting_runs_is_processed_again(self):
+        self.write("a.txt", "slow first")
+        stop = self.start_daemon(settle_seconds=0.1)
+        self.assertTrue(wait_for(lambda: processed))
+        self.write("a.txt", "second version")
+        time.sleep(0.3)
+        self.assertEqual(processed, ["slow first"])
+        release.set()
+        self.assertTrue(wait_for(lambda: len(processed) == 2))
+        self.assertEqual(stop(), {"success": 2, "error": 0})
+        self.assertEqual(processed, ["slow first", "second version"])
+
+if __name__ == "__main__":
+    unittest.main()